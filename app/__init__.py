@@ -4,12 +4,28 @@ and other actions through a plug-and-play command system. The App class orchestr
 command plugins, registering them for use, and handling user input to execute commands dynamically.
 """
 import os
-import pkgutil
+import atexit
 import importlib
 import sys
-from dotenv import load_dotenv
-import logging.config
-from app.commands import Command, CommandHandler
+import time
+import logging
+from app.commands import Command, CommandHandler, LazyCommand
+from app.commands.manifest import PluginManifest, default_manifest_path
+from app.calculator.calculations import CalculationHistory
+from app.calculator.memo import RESULT_CACHE
+from app.calculator.metrics import METRICS
+from app.calculator.numeric import backend_from_settings, create_backend, set_backend
+from app.calculator.tracing import TRACER, traced
+from app.lazy_imports import lazy_import
+from app.profiling import PROFILER
+
+# Imported on first use: most sessions need none of these
+dotenv = lazy_import('dotenv')
+columnar = lazy_import('app.calculator.columnar')
+journal = lazy_import('app.calculator.journal')
+logging_pipeline = lazy_import('app.logging_pipeline')
+ring_buffer = lazy_import('app.calculator.ring_buffer')
+sqlite_history = lazy_import('app.calculator.sqlite_history')
 
 class App:
     """
@@ -20,11 +36,20 @@ class App:
     def __init__(self):
         os.makedirs('logs', exist_ok=True)
         self.configure_logging()
-        load_dotenv()
+        self.load_environment_file()
         self.settings = self.load_environment_variables()
+        self.configure_logging_pipeline()
+        self.configure_history()
+        self.configure_result_cache()
+        self.configure_numeric_backend()
+        self.configure_metrics()
+        self.configure_profiling()
+        self.configure_tracing()
         self.command_handler = CommandHandler()
+        self.last_result = None  # Result of the latest calculation, substituted for `_` in the REPL
 
-    def configure_logging(self):
+    @staticmethod
+    def configure_logging():
         """
         Configures application logging based on an external configuration (logging.conf) file or 
         fallback defaults.
@@ -39,11 +64,43 @@ class App:
         """
         logging_conf_path = 'logging.conf'
         if os.path.exists(logging_conf_path):
-            logging.config.fileConfig(logging_conf_path, disable_existing_loggers=False)
+            import logging.config as logging_config  # Pulls in the handler modules; only needed here
+            logging_config.fileConfig(logging_conf_path, disable_existing_loggers=False)
         else:
             logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         logging.info("Logging configured.")
 
+    def configure_logging_pipeline(self):
+        """
+        Applies the logging settings that depend on the environment. CALC_LOG_QUEUE=true moves the log
+        handlers to a background thread fed by a queue, so calculations never wait on log I/O, and
+        CALC_LOG_SAMPLE_RATE (0 to 1) keeps only that fraction of the per-operation INFO records.
+        """
+        if self.get_environment_variable('CALC_LOG_QUEUE', 'false').lower() == 'true':
+            logging_pipeline.start_queue_logging()
+        sample_rate = self.get_environment_variable('CALC_LOG_SAMPLE_RATE')
+        if sample_rate:
+            try:
+                logging_pipeline.set_operation_sampling(float(sample_rate))
+            except ValueError as e:
+                logging.warning(f"Invalid CALC_LOG_SAMPLE_RATE '{sample_rate}': {e}")
+
+    def load_environment_file(self):
+        """
+        Loads the nearest .env file into the environment, searching from the application package
+        upwards like dotenv.load_dotenv() does. python-dotenv is imported only when a .env file exists.
+        """
+        directory = os.path.dirname(os.path.abspath(__file__))
+        while True:
+            dotenv_path = os.path.join(directory, '.env')
+            if os.path.isfile(dotenv_path):
+                dotenv.load_dotenv(dotenv_path)
+                return
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return
+            directory = parent
+
     def load_environment_variables(self):
         """
         Loads all environment variables into the application's settings.
@@ -60,6 +117,146 @@ class App:
         logging.info("Environment variables loaded.")
         return settings
     
+    def configure_history(self):
+        """
+        Configures the calculation history storage and persistence from the settings.
+
+        CALC_HISTORY_STORAGE selects the storage backend: 'list' (default), 'columnar' for the compact
+        ColumnarHistory, whose result column is enabled by CALC_HISTORY_CACHE_RESULTS=true, 'ring' for
+        the bounded RingBufferHistory, or 'sqlite' for the persistent SQLiteHistory database at
+        CALC_HISTORY_DB. The ring buffer keeps CALC_HISTORY_CAPACITY calculations (default 10,000) in
+        memory and spills older ones to CALC_HISTORY_SPILL_FILE. Of the spilled calculations it keeps the
+        newest CALC_HISTORY_RETENTION (default 1,000,000) and drops the older ones.
+
+        When CALC_HISTORY_JOURNAL is set, the write-ahead journal at that path is replayed so the history
+        survives restarts, and every later change is appended to it. CALC_JOURNAL_FSYNC selects the fsync
+        policy ('always', 'interval' or 'never'). A damaged journal is logged and left untouched.
+        """
+        storage = self.get_environment_variable('CALC_HISTORY_STORAGE', 'list')
+        if storage == 'columnar':
+            cache_results = self.get_environment_variable('CALC_HISTORY_CACHE_RESULTS', 'false').lower() == 'true'
+            CalculationHistory.use_storage(columnar.ColumnarHistory(cache_results=cache_results))
+        elif storage == 'ring':
+            capacity = self.get_count_variable('CALC_HISTORY_CAPACITY', 10000, minimum=1)
+            retention = self.get_count_variable('CALC_HISTORY_RETENTION', 1000000, minimum=0)
+            data_dir = self.get_environment_variable('DATA_DIR', './')
+            spill_path = self.get_environment_variable('CALC_HISTORY_SPILL_FILE',
+                                                       os.path.join(data_dir, 'calculator_history.spill'))
+            CalculationHistory.use_storage(ring_buffer.RingBufferHistory(capacity, spill_path, retention))
+        elif storage == 'sqlite':
+            data_dir = self.get_environment_variable('DATA_DIR', './')
+            database_path = self.get_environment_variable('CALC_HISTORY_DB',
+                                                          os.path.join(data_dir, 'calculator_history.db'))
+            CalculationHistory.use_storage(sqlite_history.SQLiteHistory(database_path))
+        elif storage != 'list':
+            logging.warning(f"Unknown history storage '{storage}'. Using the default list storage.")
+
+        journal_path = self.get_environment_variable('CALC_HISTORY_JOURNAL')
+        if not journal_path:
+            return
+        fsync_policy = self.get_environment_variable('CALC_JOURNAL_FSYNC', journal.FSYNC_INTERVAL)
+        history_journal = journal.HistoryJournal(journal_path, fsync_policy=fsync_policy)
+        try:
+            CalculationHistory.attach_journal(history_journal)
+        except journal.JournalCorruptedError as e:
+            history_journal.close()
+            logging.error(f"History journal not attached: {e} Repair or move it aside to journal the history again.")
+
+    def configure_result_cache(self):
+        """
+        Sizes the result cache shared by every calculation from CALC_RESULT_CACHE_SIZE. The default of 0
+        leaves it disabled, since for the basic operations a lookup costs more than the computation.
+        """
+        RESULT_CACHE.resize(self.get_count_variable('CALC_RESULT_CACHE_SIZE', 0))
+
+    def configure_metrics(self):
+        """
+        Registers the gauges of the shared metrics, read whenever the metrics are shown or exported, and
+        turns recording on when CALC_METRICS is true. Otherwise instrumented code skips the metrics.
+        """
+        METRICS.register_gauge('calculator_history_size', "Calculations in the history.",
+                               lambda: len(CalculationHistory.get_history()))
+        METRICS.register_gauge('calculator_result_cache_size', "Results in the result cache.",
+                               lambda: RESULT_CACHE.stats()['size'])
+        if self.get_environment_variable('CALC_METRICS', 'false').lower() == 'true':
+            METRICS.enable()
+
+    def configure_profiling(self):
+        """
+        Starts profiling from the settings, for runs that cannot type `profile` commands. CALC_PROFILE lists
+        'cpu' to profile every command with cProfile and/or 'memory' to trace allocations, e.g. 'cpu,memory'.
+        The reports are logged at exit, and the CPU profile is also written in pstats format to
+        CALC_PROFILE_OUTPUT when set. CALC_PROFILE_SORT sets the sort key of the CPU report.
+        """
+        modes = {mode.strip() for mode in self.get_environment_variable('CALC_PROFILE', '').split(',') if mode.strip()}
+        if not modes:
+            return
+        for unknown in sorted(modes - {'cpu', 'memory'}):
+            logging.warning(f"Unknown CALC_PROFILE mode '{unknown}'. Use 'cpu' and/or 'memory'.")
+        if 'cpu' in modes:
+            PROFILER.start_cpu()
+        if 'memory' in modes:
+            PROFILER.memory_snapshot()  # The baseline the exit report is compared with
+        if modes & {'cpu', 'memory'}:
+            atexit.register(self.report_profiling, self.get_environment_variable('CALC_PROFILE_OUTPUT'),
+                            self.get_environment_variable('CALC_PROFILE_SORT', 'cumulative'))
+
+    @staticmethod
+    def report_profiling(output_path=None, sort='cumulative'):
+        """Stops the profiling started from the settings and logs its reports, writing the CPU profile to output_path if given."""
+        try:
+            if PROFILER.stop_cpu():
+                logging.info(f"CPU profile of this session:\n{PROFILER.cpu_stats(sort)}")
+                if output_path:
+                    PROFILER.dump_cpu(output_path)
+            if PROFILER.tracing:
+                logging.info(f"Memory growth during this session:\n{PROFILER.memory_snapshot()}")
+                PROFILER.stop_memory()
+        except (ValueError, OSError) as e:
+            logging.error(f"Could not report profiling: {e}")
+
+    def configure_tracing(self):
+        """
+        Turns span tracing on when CALC_TRACE_FILE is set: every REPL line and command is traced down to
+        the history, and the trace is written to that file at exit in the Chrome trace-event format.
+        CALC_TRACE_SAMPLE_RATE (0 to 1, default 1) keeps only that fraction of the traces, and the spans
+        of the log handlers show the time spent logging.
+        """
+        trace_path = self.get_environment_variable('CALC_TRACE_FILE')
+        if not trace_path:
+            return
+        sample_rate = self.get_environment_variable('CALC_TRACE_SAMPLE_RATE', '1')
+        try:
+            TRACER.enable(float(sample_rate))
+        except ValueError as e:
+            logging.warning(f"Invalid CALC_TRACE_SAMPLE_RATE '{sample_rate}': {e}. Tracing every line.")
+            TRACER.enable()
+        TRACER.trace_handlers()
+        atexit.register(self.write_trace, trace_path)
+        logging.info(f"Tracing to {trace_path} with a sample rate of {TRACER.sample_rate:g}.")
+
+    @staticmethod
+    def write_trace(trace_path):
+        """Writes the spans traced in this session to trace_path."""
+        try:
+            TRACER.write_chrome_trace(trace_path)
+        except OSError as e:
+            logging.error(f"Could not write the trace to {trace_path}: {e}")
+
+    def configure_numeric_backend(self):
+        """
+        Selects the session's numeric backend from CALC_NUMERIC_BACKEND: 'decimal' (default), 'fraction' for
+        exact rational arithmetic or 'float' for fast float64 arithmetic. CALC_DECIMAL_PRECISION and
+        CALC_DECIMAL_ROUNDING (e.g. ROUND_HALF_EVEN) configure the decimal context.
+        """
+        try:
+            backend = backend_from_settings(self.settings)
+        except ValueError as e:
+            logging.warning(f"Invalid numeric backend settings: {e}. Using the default decimal backend.")
+            backend = create_backend('decimal')
+        set_backend(backend)
+        logging.info(f"Numeric backend: {backend!r}")
+
     def get_environment_variable(self, env_var: str = 'ENVIRONMENT', default_value = None):
         """
         Retrieves the value of a specified environment variable from the application's settings.
@@ -78,11 +275,32 @@ class App:
         """
         return self.settings.get(env_var, default_value)
 
+    def get_count_variable(self, env_var: str, default_value: int, minimum: int = 0) -> int:
+        """
+        Retrieves an environment variable holding a whole number of at least `minimum`.
+
+        A missing value gives the default; an invalid one is logged and also gives the default, so a
+        typo in the environment does not stop the application from starting.
+        """
+        value = self.get_environment_variable(env_var)
+        if value is None:
+            return default_value
+        try:
+            count = int(value)
+        except ValueError:
+            count = None
+        if count is None or count < minimum:
+            logging.warning(f"Invalid {env_var} '{value}': expected a whole number of at least {minimum}. "
+                            f"Using {default_value}.")
+            return default_value
+        return count
+
     def load_plugins(self):
         """
         Loads command plugins from the designated plugins directory, registering each discovered command
         with the command handler.
         """
+        import pkgutil  # Only the eager loader needs it
         plugins_package = 'app.plugins'
         plugins_path = plugins_package.replace('.', '/')
         if not os.path.exists(plugins_path):
@@ -118,40 +336,111 @@ class App:
                 self.command_handler.register_command(command_instance)
                 logging.info(f"Command '{command_instance.name}' from plugin '{command_instance.name}' registered.")
 
+    def load_plugin_manifest(self):
+        """
+        Registers the plugin commands from the cached plugin manifest without importing the plugins.
+
+        Each command is registered as a LazyCommand that imports its plugin on first use. The manifest
+        (CALC_PLUGIN_MANIFEST, by default .plugin_manifest.json in DATA_DIR) is refreshed for plugins
+        whose files changed since it was written, which imports only those plugins.
+        """
+        plugins_path = 'app/plugins'
+        if not os.path.exists(plugins_path):
+            logging.warning(f"Plugins directory '{plugins_path}' not found.")
+            return
+        manifest_path = default_manifest_path(self.settings)
+        for entry in PluginManifest(manifest_path, plugins_path, 'app.plugins').load():
+            self.command_handler.register_command(
+                LazyCommand(entry['name'], entry['description'], entry['module'], entry['class']))
+
+    def initialize_commands(self):
+        """
+        Registers the plugin commands from the plugin manifest and the dynamic menu command, preparing
+        the command handler for use by the REPL or any other front end.
+        """
+        self.load_plugin_manifest()
+        # Dynamically generate and register the menu command
+        dynamic_menu_command = DynamicMenuCommand(self.command_handler)
+        self.command_handler.register_command(dynamic_menu_command)
+
+    @traced('repl')
+    def execute_line(self, line: str):
+        """
+        Executes one line of REPL input.
+
+        The line may hold several commands separated by ';', run in order, and each command may take its
+        arguments inline (`add 2 3`). An argument '_' stands for the result of the previous calculation,
+        so `add 2 3 ; multiply _ 4` prints 5 and then 20. An unknown command or a missing previous result
+        stops the rest of the line.
+
+        Args:
+            line (str): The input line.
+        """
+        for segment in line.split(';'):
+            segment = segment.strip()
+            if not segment:
+                continue
+            if segment.lower() == "exit":
+                logging.info("Application exit.")
+                sys.exit(0)
+            cmd_name, *args = segment.split()
+            if '_' in args:
+                if self.last_result is None:
+                    logging.error(f"No previous result for '_' in: {segment}")
+                    print("Error: there is no previous result to use for '_'.")
+                    return
+                args = [self.last_result if arg == '_' else arg for arg in args]
+            history_size = len(CalculationHistory.get_history())
+            try:
+                self.command_handler.execute_command(cmd_name, *args)
+            except KeyError:
+                logging.error(f"Unknown command: {segment}")
+                self.command_handler.execute_command("show_menu") # Show menu if unknown command
+                return
+            self.update_last_result(history_size)
+
+    def update_last_result(self, history_size: int):
+        """
+        Takes the result of the latest calculation as the previous result if the history grew past
+        `history_size` while a command ran. A failed calculation, such as a division by zero, leaves no
+        previous result.
+        """
+        history = CalculationHistory.get_history()
+        if len(history) <= history_size:
+            return
+        try:
+            self.last_result = str(history[-1].compute())
+        except ArithmeticError:
+            self.last_result = None
+
     def start(self):
         """
         Starts the application's REPL loop, dynamically loading plugins and awaiting user commands.
 
         This method first loads available command plugins, then enters a loop to process user input,
         invoking commands based on the input provided. Special commands include 'exit' to terminate the application
-        and 'show_menu' to display available commands.
+        and 'show_menu' to display available commands. See execute_line for the input syntax.
         """
-        self.load_plugins()
-        # Dynamically generate and register the menu command
-        dynamic_menu_command = DynamicMenuCommand(self.command_handler)
-        self.command_handler.register_command(dynamic_menu_command)
+        self.initialize_commands()
 
         logging.info("Application started. Type 'show_menu' to see the menu or 'exit' to exit.\n")
+        session_start = time.perf_counter_ns()
         try:
             while True:
                 cmd_input = input(">>> ")
-                if cmd_input.lower() == "exit":
-                    logging.info("Application exit.")
-                    sys.exit(0)
-                elif cmd_input == '':
+                if cmd_input == '':
                     # If the input is empty, show the dynamic menu of commands
                     self.command_handler.execute_command("show_menu") # Execute the show_menu command
                 else:
-                    try:
-                        cmd_name, *args = cmd_input.split()
-                        self.command_handler.execute_command(cmd_name, *args)
-                    except KeyError:
-                        logging.error(f"Unknown command: {cmd_input}")
-                        self.command_handler.execute_command("show_menu") # Show menu if unknown command
+                    self.execute_line(cmd_input)
         except KeyboardInterrupt:
             logging.info("Application interrupted and exiting gracefully.")
             sys.exit(0) # Assuming a KeyboardInterrupt should also result in a clean exit.
         finally:
+            CalculationHistory.detach_journal()  # Sync and close the history journal, if attached
+            CalculationHistory.flush_storage()
+            if TRACER.enabled:
+                TRACER.record('repl', 'session', session_start, time.perf_counter_ns())
             logging.info("Application shutdown.")
 
 class DynamicMenuCommand(Command):
@@ -0,0 +1,148 @@
+"""app/batch/__init__.py
+This module provides the non-interactive batch mode of the calculator. Lines such as `add 2 3` or
+`eval (2 + 3) * 4` are read from a file or stdin, evaluated and written to an output stream as a chain of generators, so input of any
+size is processed in constant memory and without the prompts and menus of the interactive REPL.
+"""
+import sys
+import logging
+from decimal import InvalidOperation
+from typing import Iterable, Iterator, Optional, TextIO, Tuple, Union
+from app.calculator import Calculator
+from app.calculator.expression import ExpressionError, compile_expression
+from app.calculator.numeric import NumericBackend, get_backend, use_backend
+from app.calculator.registry import OPERATIONS, UNUSED_OPERAND
+
+READ_BUFFER_SIZE = 1 << 20   # Bytes requested from the input file per read
+WRITE_CHUNK_LINES = 4096     # Result lines joined into one write call
+
+def read_lines(stream: TextIO) -> Iterator[str]:
+    """
+    Yields the meaningful lines of the input stream, skipping blank lines and `#` comments.
+
+    Parameters:
+    - stream (TextIO): The input stream to read from.
+    """
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+def parse_line(line: str, arity: int = 2) -> Tuple[str, ...]:
+    """
+    Splits a batch line into its operation name and `arity` operands.
+
+    Raises:
+    ValueError: If the line does not have exactly 1 + arity fields.
+    """
+    parts = line.split()
+    if len(parts) != arity + 1:
+        usage = "<operation> <operand1> <operand2>" if arity == 2 else "<operation> <operand>"
+        raise ValueError(f"Invalid line format: '{line}'. Please use: {usage}")
+    return tuple(parts)
+
+def evaluate_line(line: str, record_history: bool = False) -> str:
+    """
+    Evaluates a single batch line and returns the result or an error message as text.
+
+    Parameters:
+    - line (str): A line such as `add 2 3`, or `eval` followed by an expression.
+    - record_history (bool): Whether to record the calculation in the shared history.
+    """
+    if line.startswith('eval '):
+        return evaluate_expression_line(line[5:], record_history)
+    parts = line.split()
+    operation = OPERATIONS.commands.get(parts[0]) if parts else None
+    if operation is None:
+        return f"error: Unknown operation: {parts[0] if parts else ''}"
+    operation_function, arity = operation.function, operation.arity
+    if len(parts) != arity + 1:
+        try:
+            parse_line(line, arity)  # Raises the format error with the operation's usage
+        except ValueError as e:
+            return f"error: {e}"
+
+    try:
+        parse = get_backend().parse
+        num1 = parse(parts[1])
+        num2 = parse(parts[2]) if arity == 2 else UNUSED_OPERAND
+    except InvalidOperation:
+        return f"error: Invalid number input: {' or '.join(parts[1:])} is not a valid number."
+
+    try:
+        if record_history:
+            result = Calculator.calculate(num1, num2, operation_function)
+        else:
+            result = operation_function(num1, num2)
+    except ZeroDivisionError:
+        return "error: Cannot divide by zero"
+    except ArithmeticError as e:
+        return f"error: {e}"
+    return str(result)
+
+def evaluate_expression_line(expression: str, record_history: bool = False) -> str:
+    """
+    Evaluates the expression of an `eval` line. Compiled expressions are cached by their text, so an
+    expression repeated across the input is parsed only once.
+    """
+    try:
+        return str(compile_expression(expression).evaluate(record=record_history))
+    except ExpressionError as e:
+        return f"error: {e}"
+    except ZeroDivisionError:
+        return "error: Cannot divide by zero"
+    except ArithmeticError as e:
+        return f"error: {e}"
+
+def evaluate_lines(lines: Iterable[str], record_history: bool = False) -> Iterator[str]:
+    """Lazily evaluates every line, yielding one result line per input line."""
+    for line in lines:
+        yield evaluate_line(line, record_history)
+
+def write_results(results: Iterable[str], output: TextIO) -> int:
+    """
+    Writes result lines to the output stream in chunks of WRITE_CHUNK_LINES lines.
+
+    Returns:
+        int: The number of result lines written.
+    """
+    count = 0
+    chunk = []
+    for result in results:
+        chunk.append(result)
+        if len(chunk) == WRITE_CHUNK_LINES:
+            output.write('\n'.join(chunk) + '\n')
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        output.write('\n'.join(chunk) + '\n')
+        count += len(chunk)
+    output.flush()
+    return count
+
+def run_batch(source: str, output: Optional[TextIO] = None, record_history: bool = False,
+              backend: Union[str, NumericBackend, None] = None) -> int:
+    """
+    Runs the batch pipeline from a file path, or stdin when the source is '-', to the output stream.
+
+    Parameters:
+    - source (str): The input file path or '-' for stdin.
+    - output (Optional[TextIO]): The stream results are written to. Defaults to stdout.
+    - record_history (bool): Whether to record every calculation in the shared history. This makes
+      memory grow with the input, so it is off by default.
+    - backend (Union[str, NumericBackend, None]): The numeric backend for this run, e.g. 'float' for
+      high-volume input. Defaults to the session's backend.
+
+    Returns:
+        int: The number of lines evaluated.
+    """
+    output = output or sys.stdout
+    with use_backend(backend) as numeric_backend:
+        logging.info(f"Starting batch run from {'stdin' if source == '-' else source} "
+                     f"with the {numeric_backend.name} backend.")
+        if source == '-':
+            count = write_results(evaluate_lines(read_lines(sys.stdin), record_history), output)
+        else:
+            with open(source, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE) as stream:
+                count = write_results(evaluate_lines(read_lines(stream), record_history), output)
+    logging.info(f"Batch run finished: {count} lines evaluated.")
+    return count
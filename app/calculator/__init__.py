@@ -1,16 +1,23 @@
 """calculator/__init__.py
 This module defines the Calculator class, centralizing arithmetic functionality with support
-for addition, subtraction, multiplication, and division. It seamlessly records each calculation
-in a shared history, enabling not just computation but also easy retrieval of past calculations.
+for addition, subtraction, multiplication, division, power, modulo and square root. It seamlessly
+records each calculation in the current session's history, enabling not just computation but also easy retrieval
+of past calculations.
 Designed for simplicity and ease of use, the Calculator serves as the core component of the
 basic calculator system, leveraging the ArithmeticOperations for mathematical operations and
-CalculationHistory for maintaining a log of all calculations.
+CalculationHistory for maintaining a log of all calculations. To record in a session of its own, such as
+one per thread or client, run the calculations under that Session (see calculations.py).
 """
 from decimal import Decimal
-from typing import Callable
-from app.calculator.calculation import Calculation
+from itertools import repeat
+from typing import Callable, Iterable, List, Mapping, Optional, Tuple
+from app.calculator.calculation import Calculation, paused_gc
 from app.calculator.operations import ArithmeticOperations as ao
-from app.calculator.calculations import CalculationHistory as ch
+from app.calculator.calculations import CalculationHistory, current_history
+from app.calculator.expression import compile_expression
+from app.calculator.metrics import METRICS
+from app.calculator.numeric import get_backend
+from app.calculator.tracing import TRACER
 
 class Calculator:
     """
@@ -20,10 +27,19 @@ class Calculator:
 
     @staticmethod
     def _calculate_and_record(a: Decimal, b: Decimal, operation: Callable[[Decimal, Decimal], Decimal]) -> Decimal:
-        """Internal method to perform and record a calculation."""
-        calculation = Calculation.create_calculation(a, b, operation)
-        ch.add_calculation(calculation)
-        return calculation.compute()
+        """
+        Internal method to perform and record a calculation, timed per operation when metrics are enabled
+        and traced as spans when tracing is on.
+        """
+        record_and_compute = _traced_record_and_compute if TRACER.enabled else _record_and_compute
+        if METRICS.enabled:
+            return METRICS.timed('operation', operation.__name__, record_and_compute, a, b, operation)
+        return record_and_compute(a, b, operation)
+
+    @staticmethod
+    def calculate(a: Decimal, b: Decimal, operation: Callable[[Decimal, Decimal], Decimal]) -> Decimal:
+        '''Perform and record any operation, such as one resolved from the operation registry'''
+        return Calculator._calculate_and_record(a, b, operation)
 
     @staticmethod
     def add(a: Decimal, b: Decimal) -> Decimal:
@@ -44,3 +60,129 @@ class Calculator:
     def divide(a: Decimal, b: Decimal) -> Decimal:
         '''Perform division by delegating to the _calculate_and_record method'''
         return Calculator._calculate_and_record(a, b, ao.division)
+
+    @staticmethod
+    def power(a: Decimal, b: Decimal) -> Decimal:
+        '''Perform exponentiation by delegating to the _calculate_and_record method'''
+        return Calculator._calculate_and_record(a, b, ao.power)
+
+    @staticmethod
+    def modulo(a: Decimal, b: Decimal) -> Decimal:
+        '''Perform the remainder of a division by delegating to the _calculate_and_record method'''
+        return Calculator._calculate_and_record(a, b, ao.modulo)
+
+    @staticmethod
+    def sqrt(a: Decimal) -> Decimal:
+        '''Perform the square root by delegating to the _calculate_and_record method; num2 is recorded as 0'''
+        return Calculator._calculate_and_record(a, Decimal(0), ao.square_root)
+
+    @staticmethod
+    def evaluate(expression: str, env: Optional[Mapping[str, Decimal]] = None, record: bool = True) -> Decimal:
+        """
+        Evaluate an arithmetic expression such as '(2 + 3) * 4 / 7', compiled once and cached by its text.
+        Every sub-operation is recorded in the history as its own calculation unless `record` is False.
+
+        Parameters:
+            expression (str): The expression, using + - * /, parentheses, numbers and names.
+            env (Mapping[str, Decimal] | None): The values of the names used in the expression.
+            record (bool): Whether to record the sub-operations in the history. Defaults to True.
+
+        Raises:
+            ExpressionError: If the expression is invalid or uses an undefined name.
+            ZeroDivisionError: If the expression divides by zero.
+        """
+        return compile_expression(expression).evaluate(env, record)
+
+    @staticmethod
+    def batch(operation: Callable[[Decimal, Decimal], Decimal], a_seq: Iterable, b_seq: Iterable,
+              record: bool = True) -> Tuple[List[Optional[Decimal]], List[bool]]:
+        """
+        Perform one operation over paired sequences of operands in a single pass.
+
+        Operands may be any sequences (lists, tuples, NumPy arrays) of numbers; they are converted to the
+        number type of the current numeric backend first (Decimal by default). With the float backend the
+        basic operations run as NumPy array operations. Every pair is recorded in the history with one
+        bulk append instead of one append per call. An ArithmeticError, such as a division by zero, an
+        invalid operation or an overflow, does not abort the batch: the failing position gets a result of
+        None and is flagged in the returned mask.
+
+        Parameters:
+            operation (Callable[[Decimal, Decimal], Decimal]): The operation to apply to each pair.
+            a_seq (Iterable): The first operands.
+            b_seq (Iterable): The second operands.
+            record (bool): Whether to record the calculations in the history. Defaults to True.
+
+        Returns:
+            Tuple[List[Optional[Decimal]], List[bool]]: The results and a mask that is True where the
+            result is undefined (division by zero or another arithmetic error).
+
+        Raises:
+            ValueError: If the operand sequences have different lengths.
+        """
+        backend = get_backend()
+        a_values = backend.convert_many(a_seq)
+        b_values = backend.convert_many(b_seq)
+        if len(a_values) != len(b_values):
+            raise ValueError("Operand sequences must have the same length.")
+
+        vectorized = backend.vectorized(operation)
+        if vectorized is not None:
+            results, undefined = vectorized(a_values, b_values)
+        else:
+            try:
+                # Fast path: a single C-level map over all pairs
+                results: List[Optional[Decimal]] = list(map(operation, a_values, b_values))
+                undefined = [False] * len(results)
+            except ArithmeticError:
+                results, undefined = _compute_with_mask(operation, a_values, b_values)
+
+        if record:
+            with paused_gc():
+                current_history().add_calculations(list(map(Calculation, a_values, b_values, repeat(operation))))
+        return results, undefined
+
+    @staticmethod
+    def add_many(a_seq: Iterable, b_seq: Iterable) -> Tuple[List[Optional[Decimal]], List[bool]]:
+        '''Perform addition over paired sequences by delegating to the batch method'''
+        return Calculator.batch(ao.addition, a_seq, b_seq)
+
+    @staticmethod
+    def subtract_many(a_seq: Iterable, b_seq: Iterable) -> Tuple[List[Optional[Decimal]], List[bool]]:
+        '''Perform subtraction over paired sequences by delegating to the batch method'''
+        return Calculator.batch(ao.subtraction, a_seq, b_seq)
+
+    @staticmethod
+    def multiply_many(a_seq: Iterable, b_seq: Iterable) -> Tuple[List[Optional[Decimal]], List[bool]]:
+        '''Perform multiplication over paired sequences by delegating to the batch method'''
+        return Calculator.batch(ao.multiplication, a_seq, b_seq)
+
+    @staticmethod
+    def divide_many(a_seq: Iterable, b_seq: Iterable) -> Tuple[List[Optional[Decimal]], List[bool]]:
+        '''Perform division over paired sequences by delegating to the batch method'''
+        return Calculator.batch(ao.division, a_seq, b_seq)
+
+def _record_and_compute(a: Decimal, b: Decimal, operation: Callable[[Decimal, Decimal], Decimal]) -> Decimal:
+    """Record a calculation in the current session's history and compute it."""
+    calculation = Calculation.create_calculation(a, b, operation)
+    CalculationHistory.add_calculation(calculation)  # The current session's history, by its fastest path
+    return calculation.compute()
+
+def _traced_record_and_compute(a: Decimal, b: Decimal, operation: Callable[[Decimal, Decimal], Decimal]) -> Decimal:
+    """Record a calculation and compute it, with the history append and the computation as spans of the current trace."""
+    calculation = Calculation.create_calculation(a, b, operation)
+    TRACER.span('history', 'add_calculation', current_history().add_calculation, calculation)
+    return TRACER.span('operation', operation.__name__, calculation.compute)
+
+def _compute_with_mask(operation: Callable[[Decimal, Decimal], Decimal], a_values: List[Decimal],
+                       b_values: List[Decimal]) -> Tuple[List[Optional[Decimal]], List[bool]]:
+    """Compute every pair, substituting None and flagging the mask where an arithmetic error occurs."""
+    results: List[Optional[Decimal]] = []
+    undefined: List[bool] = []
+    for a, b in zip(a_values, b_values):
+        try:
+            results.append(operation(a, b))
+            undefined.append(False)
+        except ArithmeticError:
+            results.append(None)
+            undefined.append(True)
+    return results, undefined
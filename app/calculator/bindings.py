@@ -0,0 +1,319 @@
+"""calculator/bindings.py
+Defines named bindings for using the calculator like a small spreadsheet: `let x = add 2 3` binds x to
+a calculation and `let y = x * 2 + 1` to an expression over other names. The bindings form a dependency
+graph (a DAG) whose operation nodes are Formula calculations. Rebinding a name recomputes only the values
+downstream of it, lowest first, and stops wherever a recomputed value did not change. Identical
+subexpressions are interned, so `(x + 1) * (x + 1)` computes `x + 1` once and every binding that uses
+`x + 1` shares that node.
+"""
+import heapq
+import itertools
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory
+from app.calculator.expression import (BinaryOperation, ExpressionError, Name, Negation, Node, Number,
+                                       fold_constants, negate, parse_expression)
+from app.calculator.numeric import get_backend
+from app.calculator.registry import OPERATIONS, UNUSED_OPERAND
+
+NAME_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+class CircularReferenceError(ExpressionError):
+    """Raised for a binding that would make a name depend on itself."""
+
+class Variable:
+    """A named value. Its source is a constant, another variable or a Formula."""
+    __slots__ = ('name', 'source', 'value', 'error', 'dependents', 'height')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.source: Optional['Operand'] = None
+        self.value: Optional[Decimal] = None
+        self.error: Optional[ArithmeticError] = None
+        self.dependents: Dict[int, 'Formula'] = {}  # Keyed by id(), in the order they were added
+        self.height = 0  # Greater than the height of every node it depends on
+
+    def recompute(self, trace: Optional[List[Calculation]]) -> bool:
+        """Takes the value of the source. Returns whether the value changed."""
+        return _set_result(self, *_operand_result(self.source))
+
+    def __repr__(self) -> str:
+        return f"Variable({self.name}={self.value if self.error is None else self.error!r})"
+
+class Formula(Calculation):
+    """
+    An operation node of the graph: a Calculation whose operands are taken from constants or other nodes.
+    num1 and num2 hold the operand values of the latest computation.
+    """
+    __slots__ = ('left', 'right', 'key', 'value', 'error', 'dependents', 'height')
+    recorded = True  # Whether computations of the node are recorded in the calculation history
+
+    def __init__(self, operation: Callable[[Decimal, Decimal], Decimal], left: 'Operand', right: 'Operand', key):
+        super().__init__(Decimal(0), Decimal(0), operation)
+        self.left = left
+        self.right = right
+        self.key = key
+        self.value: Optional[Decimal] = None
+        self.error: Optional[ArithmeticError] = None
+        self.dependents: Dict[int, Union[Variable, 'Formula']] = {}
+        self.height = 1 + max(_height(left), _height(right))
+
+    def recompute(self, trace: Optional[List[Calculation]]) -> bool:
+        """
+        Computes the operation on the current operand values, appending the calculation to the trace if one
+        is given. An operand in error puts the node in the same error. Returns whether the result changed.
+        """
+        num1, error = _operand_result(self.left)
+        num2, right_error = _operand_result(self.right)
+        error = error or right_error
+        value = None
+        if error is None:
+            self.num1, self.num2 = num1, num2
+            if trace is not None and self.recorded:
+                trace.append(Calculation(num1, num2, self.operation))
+            try:
+                value = self.compute()
+            except ArithmeticError as e:
+                error = e
+        return _set_result(self, value, error)
+
+    def __repr__(self) -> str:
+        return f"Formula({self.operation.__name__}, {self.value if self.error is None else self.error!r})"
+
+class NegationFormula(Formula):
+    """A negated operand. Negating is not an operation of the calculator, so it is not recorded."""
+    __slots__ = ()
+    recorded = False
+
+Operand = Union[Decimal, Variable, Formula]  # Constants are numbers of the current numeric backend
+
+def _is_node(operand: Operand) -> bool:
+    return isinstance(operand, (Variable, Formula))
+
+def _height(operand: Operand) -> int:
+    return operand.height if _is_node(operand) else 0
+
+def _operand_result(operand: Operand) -> Tuple[Optional[Decimal], Optional[ArithmeticError]]:
+    if not _is_node(operand):
+        return operand, None
+    return operand.value, operand.error
+
+def _set_result(node: Union[Variable, Formula], value: Optional[Decimal], error: Optional[ArithmeticError]) -> bool:
+    if error is not None:
+        changed = not (type(node.error) is type(error) and node.error.args == error.args)
+    else:
+        # Comparing the text too tells Decimal 2 from 2.0, which are equal but print differently
+        changed = (node.error is not None or node.value is None or node.value != value
+                   or str(node.value) != str(value))
+    node.value, node.error = value, error
+    return changed
+
+def _upstream(operand: Operand) -> Iterator[Union[Variable, Formula]]:
+    """Yields every node the operand depends on, itself included."""
+    stack, seen = [operand], set()
+    while stack:
+        node = stack.pop()
+        if not _is_node(node) or id(node) in seen:
+            continue
+        seen.add(id(node))
+        yield node
+        if isinstance(node, Variable):
+            stack.append(node.source)
+        else:
+            stack.extend((node.left, node.right))
+
+def parse_definition(definition: str) -> Node:
+    """
+    Parses the right-hand side of a binding into an expression AST. It is either a calculator command,
+    `<operation> <operand1> <operand2>` (or `<operation> <operand>` for a unary operation) with numbers
+    or names as operands, or an expression.
+
+    Raises:
+        ExpressionError: If the definition is invalid.
+    """
+    parts = definition.split()
+    operation = OPERATIONS.commands.get(parts[0]) if parts else None
+    if operation is None or (len(parts) > 1 and parts[1].startswith('(')):
+        return parse_expression(definition)  # Including calls such as `sqrt (x + 1)`
+    if len(parts) != operation.arity + 1:
+        usage = "<operation> <operand1> <operand2>" if operation.arity == 2 else "<operation> <operand>"
+        raise ExpressionError(f"Invalid definition: {definition!r}. Please use: {usage}")
+    operands = [_parse_operand(part) for part in parts[1:]]
+    if operation.arity == 1:
+        operands.append(Number(UNUSED_OPERAND))
+    return BinaryOperation(operation.function, *operands)
+
+def _parse_operand(text: str) -> Union[Number, Name]:
+    if NAME_PATTERN.match(text):
+        return Name(text)
+    try:
+        return Number(get_backend().parse(text))
+    except InvalidOperation:
+        raise ExpressionError(f"Invalid operand: {text!r}.") from None
+
+def _names(node: Node) -> Iterator[str]:
+    if isinstance(node, Name):
+        yield node.name
+    elif isinstance(node, Negation):
+        yield from _names(node.operand)
+    elif isinstance(node, BinaryOperation):
+        yield from _names(node.left)
+        yield from _names(node.right)
+
+class DependencyGraph:
+    """
+    Named bindings and the DAG of calculations behind them.
+
+    Every operation node is interned by its operation and operands, so identical subexpressions are
+    computed once and shared between bindings. Nodes that no binding uses any more are dropped. With
+    `record` set, every calculation the graph performs is added to the calculation history.
+    """
+    def __init__(self, record: bool = False):
+        self.record = record
+        self.recomputations = 0  # Nodes recomputed because a binding changed
+        self._variables: Dict[str, Variable] = {}
+        self._formulas: Dict[tuple, Formula] = {}
+        self._order = itertools.count()  # Tie-breaker for nodes of equal height
+
+    def bind(self, name: str, definition: str) -> List[Variable]:
+        """
+        Binds a name to a definition (see parse_definition) and recomputes what depends on it.
+
+        Returns:
+            List[Variable]: The variables whose value changed, in the order they were recomputed.
+
+        Raises:
+            ExpressionError: If the name or the definition is invalid, or the definition uses an undefined name.
+            CircularReferenceError: If the definition depends on the name being bound.
+        """
+        if not NAME_PATTERN.match(name):
+            raise ExpressionError(f"Invalid name: {name!r}.")
+        tree = fold_constants(parse_definition(definition))
+        variable = self._variables.get(name)
+        for used in _names(tree):
+            if used not in self._variables:
+                raise ExpressionError(f"Name '{used}' is not defined.")
+            if variable is not None and any(node is variable for node in _upstream(self._variables[used])):
+                raise CircularReferenceError(f"'{name}' cannot depend on itself (through '{used}').")
+        if variable is None:
+            variable = self._variables[name] = Variable(name)
+
+        trace: Optional[List[Calculation]] = [] if self.record else None
+        try:
+            source = self._build(tree, trace)
+            previous = variable.source
+            variable.source = source
+            if _is_node(source):
+                source.dependents[id(variable)] = variable
+            if previous is not None and _is_node(previous) and previous is not source:
+                del previous.dependents[id(variable)]
+                self._release(previous)
+            self._raise_height(variable, _height(source) + 1)
+            return self._propagate(variable, trace)
+        finally:
+            if trace:
+                CalculationHistory.add_calculations(trace)
+
+    def get(self, name: str) -> Decimal:
+        """
+        Returns the value bound to a name.
+
+        Raises:
+            ExpressionError: If the name is not defined.
+            ArithmeticError: The error of the calculation behind the value, such as ZeroDivisionError.
+        """
+        variable = self.variable(name)
+        if variable.error is not None:
+            raise variable.error
+        return variable.value
+
+    def variable(self, name: str) -> Variable:
+        """Returns the Variable of a name, raising ExpressionError if it is not defined."""
+        try:
+            return self._variables[name]
+        except KeyError:
+            raise ExpressionError(f"Name '{name}' is not defined.") from None
+
+    def variables(self) -> List[Variable]:
+        """Returns every variable in the order the names were first bound."""
+        return list(self._variables.values())
+
+    def node_count(self) -> int:
+        """Returns the number of operation nodes in the graph."""
+        return len(self._formulas)
+
+    def _build(self, node: Node, trace: Optional[List[Calculation]]) -> Operand:
+        """Turns an AST into graph operands, interning its operations."""
+        if isinstance(node, Number):
+            if trace is not None:
+                trace.extend(node.steps)  # Folded while parsing
+            return node.value
+        if isinstance(node, Name):
+            return self._variables[node.name]
+        if isinstance(node, Negation):
+            operation, formula_type = negate, NegationFormula
+            left, right = self._build(node.operand, trace), UNUSED_OPERAND
+        else:
+            operation, formula_type = node.operation, Formula
+            left = self._build(node.left, trace)
+            right = self._build(node.right, trace)
+        key = (operation, _operand_key(left), _operand_key(right))
+        formula = self._formulas.get(key)
+        if formula is None:
+            formula = self._formulas[key] = formula_type(operation, left, right, key)
+            for operand in (left, right):
+                if _is_node(operand):
+                    operand.dependents[id(formula)] = formula
+            formula.recompute(trace)
+        return formula
+
+    def _release(self, node: Operand):
+        """Drops operation nodes that nothing depends on any more, and then their unused operands."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, Formula) or node.dependents:
+                continue
+            del self._formulas[node.key]
+            for operand in (node.left, node.right):
+                if _is_node(operand):
+                    operand.dependents.pop(id(node), None)
+                    stack.append(operand)
+
+    @staticmethod
+    def _raise_height(node: Variable, height: int):
+        """Keeps every node higher than the nodes it depends on after a variable got a new source."""
+        stack = [(node, height)]
+        while stack:
+            node, height = stack.pop()
+            if node.height >= height:
+                continue
+            node.height = height
+            stack.extend((dependent, height + 1) for dependent in node.dependents.values())
+
+    def _propagate(self, variable: Variable, trace: Optional[List[Calculation]]) -> List[Variable]:
+        """
+        Recomputes the variable and, lowest first, every node downstream of a value that changed. A node is
+        recomputed after all of its changed inputs and at most once.
+        """
+        changed: List[Variable] = []
+        queue = [(variable.height, next(self._order), variable)]
+        queued = {id(variable)}
+        while queue:
+            _, _, node = heapq.heappop(queue)
+            self.recomputations += 1
+            if not node.recompute(trace):
+                continue
+            if isinstance(node, Variable):
+                changed.append(node)
+            for dependent in node.dependents.values():
+                if id(dependent) not in queued:
+                    queued.add(id(dependent))
+                    heapq.heappush(queue, (dependent.height, next(self._order), dependent))
+        return changed
+
+def _operand_key(operand: Operand):
+    # repr() keeps 2 and 2.0, and numbers of different types, apart; nodes are identified by identity
+    return id(operand) if _is_node(operand) else repr(operand)
@@ -1,73 +1,121 @@
 """app/calculator/calc_utils.py:
 This module captures user input from the command line, performs arithmetic operations
 using the Calculator class, and handles invalid inputs and exceptions.
+Being on the path of every calculation, it logs with lazy %-style arguments to the operations logger,
+whose records can be sampled (see app/logging_pipeline.py).
+While tracing is on, parsing and performing the operation are spans of the trace (see tracing.py).
 """
 from decimal import Decimal, InvalidOperation
+from functools import partial
 from app.calculator import Calculator
+from app.calculator.metrics import ErrorResult
+from app.calculator.numeric import get_backend
+from app.calculator.registry import OPERATIONS
+from app.calculator.tracing import TRACER, traced
 import logging
 
-def perform_operation(num1: Decimal, num2: Decimal, operation_name: str) -> str:
+log = logging.getLogger('calculator.operations')  # logging_pipeline.OPERATION_LOGGER
+
+class CalculationError(ValueError):
+    """
+    Raised by a strict calculation that failed; the message is the error message shown to the user and
+    `error_type` names the underlying error, as in ErrorResult.
+    """
+    def __init__(self, message: str, error_type: str = 'CalculationError'):
+        super().__init__(message)
+        self.error_type = error_type
+
+def _failure(message: str, error_type: str, strict: bool) -> str:
+    """Returns the error message as an ErrorResult, or raises it as a CalculationError when `strict`."""
+    if strict:
+        raise CalculationError(message, error_type)
+    return ErrorResult(message, error_type)
+
+@traced('calculator')
+def perform_operation(num1: Decimal, num2: Decimal, operation_name: str, strict: bool = False) -> str:
     """
     Attempts to perform the specified arithmetic operation on two operands.
     
     Args:
         num1 (Decimal): The first operand.
-        num2 (Decimal): The second operand.
+        num2 (Decimal): The second operand, not used by unary operations such as sqrt.
         operation_name (str): The operation to perform.
+        strict (bool): Raise errors as CalculationError instead of returning their message.
         
     Returns:
-        str: A message with the result of the operation or an error.
+        str: A message with the result of the operation, or an error as an ErrorResult.
     """
-    # Mapping of operation names to Calculator class methods
-    operation_mapping = {
-        'add': Calculator.add,
-        'subtract': Calculator.subtract,
-        'multiply': Calculator.multiply,
-        'divide': Calculator.divide,
-    }
+    log.info("Attempting to perform operation: %s with operands %s and %s", operation_name, num1, num2)
 
-    logging.info(f"Attempting to perform operation: {operation_name} with operands {num1} and {num2}")
+    # Resolve the operation from the registry's dispatch table
+    operation = OPERATIONS.get(operation_name)
+    if operation is None:
+        log.error("Unknown operation: %s", operation_name)
+        return _failure(f"Unknown operation: {operation_name}", 'UnknownOperation', strict)
 
     try:
-        # Retrieve the corresponding method from the mapping
-        operation_callable = operation_mapping.get(operation_name)
-        if operation_callable is None:
-            logging.error(f"Unknown operation: {operation_name}")
-            return f"Unknown operation: {operation_name}"
-
         # Execute the operation
-        result = operation_callable(num1, num2)
-        logging.info(f"Operation {operation_name} completed successfully. Result: {result}")
+        result = Calculator.calculate(num1, num2, operation.function)
+        log.info("Operation %s completed successfully. Result: %s", operation_name, result)
+        if operation.arity == 1:
+            return f"The result of {operation_name} {num1} is equal to {result}"
         return f"The result of {num1} {operation_name} {num2} is equal to {result}"
     except ZeroDivisionError:
-        logging.warning(f"Division by zero attempt.")
-        return "An error occurred: Cannot divide by zero"
+        log.warning("Division by zero attempt.")
+        return _failure("An error occurred: Cannot divide by zero", 'ZeroDivisionError', strict)
+    except ArithmeticError as e:
+        log.warning("Undefined result in %s: %s", operation_name, e)
+        return _failure(f"An error occurred: {e}", type(e).__name__, strict)
     except ValueError as e:
-        logging.error(f"Value error in operation.\n")
-        return str(e)
+        log.error("Value error in operation.\n")
+        return _failure(str(e), type(e).__name__, strict)
     except Exception as e:
-        logging.critical(f"Unexpected error in operation.\n", exc_info=True)
-        return f"An unexpected error occurred: {e}"
+        log.critical("Unexpected error in operation.\n", exc_info=True)
+        return _failure(f"An unexpected error occurred: {e}", type(e).__name__, strict)
 
-def calculate_and_print(num1_str, num2_str, operation_name):
+@traced('calculator')
+def calculate(num1_str, num2_str, operation_name, strict: bool = False) -> str:
     """
-    Validates the input, performs the operation, and prints the result or an error message.
+    Validates the input, performs the operation, and returns the result or an error message.
     
     Args:
         num1_str (str): The first operand as a string.
         num2_str (str): The second operand as a string.
         operation_name (str): The name of the operation to perform.
+        strict (bool): Raise errors as CalculationError instead of returning their message.
+
+    Returns:
+        str: A message with the result of the operation, or an error as an ErrorResult.
+
+    Raises:
+        CalculationError: If `strict` and the input is invalid or the operation failed.
     """
-    logging.info(f"Calculating {operation_name} for inputs '{num1_str}' and '{num2_str}'")
+    log.info("Calculating %s for inputs '%s' and '%s'", operation_name, num1_str, num2_str)
 
     try:
-        num1_decimal = Decimal(num1_str)
-        num2_decimal = Decimal(num2_str)
+        # Parsed by the session's numeric backend: Decimal by default, or Fraction or float
+        parse = get_backend().parse
+        if TRACER.enabled:  # Each operand is parsed in its own span
+            parse = partial(TRACER.span, 'calculator', 'parse', parse)
+        num1_decimal = parse(num1_str)
+        num2_decimal = parse(num2_str)
     except InvalidOperation:
-        logging.warning(f"Invalid number input: '{num1_str}' or '{num2_str}' is not a valid number.\n")
-        print(f"Invalid number input: {num1_str} or {num2_str} is not a valid number.")
-        return
+        log.warning("Invalid number input: '%s' or '%s' is not a valid number.\n", num1_str, num2_str)
+        return _failure(f"Invalid number input: {num1_str} or {num2_str} is not a valid number.", 'InvalidOperation',
+                        strict)
     
-    result_message = perform_operation(num1_decimal, num2_decimal, operation_name)
-    logging.info(f"Result of {operation_name}: {result_message}\n")
-    print(result_message)
+    result_message = perform_operation(num1_decimal, num2_decimal, operation_name, strict)
+    log.info("Result of %s: %s\n", operation_name, result_message)
+    return result_message
+
+@traced('calculator')
+def calculate_and_print(num1_str, num2_str, operation_name):
+    """
+    Validates the input, performs the operation, and prints the result or an error message.
+    
+    Args:
+        num1_str (str): The first operand as a string.
+        num2_str (str): The second operand as a string.
+        operation_name (str): The name of the operation to perform.
+    """
+    print(calculate(num1_str, num2_str, operation_name))
@@ -4,8 +4,11 @@ This module provides the Calculation class, which offers a flexible way to encap
 single arithmetic operation, including operands and the operation itself, within an object.
 This abstraction is designed to be used within a Calculator class for executing operations.
 """
+import gc
+from contextlib import contextmanager
 from decimal import Decimal
-from typing import Callable
+from typing import Callable, Iterator
+from app.calculator.memo import RESULT_CACHE
 
 class Calculation:
     """
@@ -13,6 +16,7 @@ class Calculation:
     structured way to perform and represent individual calculations, with support for extending
     functionality through subclassing or custom operation functions.
     """
+    __slots__ = ('num1', 'num2', 'operation')  # No per-instance __dict__: histories hold millions of these
 
     def __init__(self, num1: Decimal, num2: Decimal, operation: Callable[[Decimal, Decimal], Decimal]) -> None:
         """
@@ -52,12 +56,25 @@ class Calculation:
 
         This method calls the operation provided at instantiation with the operands,
         returning the result of the operation. It abstracts the execution of the operation,
-        allowing the operation logic to be defined externally.
+        allowing the operation logic to be defined externally. Results go through the shared
+        RESULT_CACHE, which returns repeated results without recomputing them when enabled.
 
         Returns:
             Decimal: The result of performing the operation on the operands.
         """
-        return self.operation(self.num1, self.num2)
+        return RESULT_CACHE.compute(self.operation, self.num1, self.num2)
+
+    def __eq__(self, other) -> bool:
+        """
+        Two calculations are equal when they have equal operands and the same operation, so stored
+        copies or views of a calculation compare equal to the original.
+        """
+        if not isinstance(other, Calculation):
+            return NotImplemented
+        return (self.num1 == other.num1 and self.num2 == other.num2 and self.operation is other.operation)
+
+    def __hash__(self) -> int:
+        return hash((self.num1, self.num2, self.operation))
 
     def __repr__(self) -> str:
         """
@@ -70,3 +87,19 @@ class Calculation:
                  operands, and operation.
         """
         return f"Calculation({self.num1}, {self.num2}, {self.operation.__name__})"
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Suspends cyclic garbage collection while many Calculation objects are created in a burst.
+
+    Calculations never form reference cycles, but allocating millions of them would otherwise trigger
+    repeated collection passes over the whole, growing history.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
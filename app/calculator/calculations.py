@@ -1,81 +1,240 @@
 """calculator/calculations.py
-Defines the CalculationHistory class for managing a shared history of calculations
-performed within the calculator application. This class offers class methods to add
-calculations to the history, retrieve the full history or the most recent calculation,
-and clear the history. The history is maintained as a class-level list, allowing easy
-access and modification across different parts of the application.
+Defines the calculation histories of the calculator application. A History holds the calculations of one
+Session and is safe to share between threads. Each thread, asyncio task or request runs under a current
+session, the default one unless another is made current with Session.active() or Session.run(). The
+CalculationHistory class offers class methods to add calculations to the current session's history,
+retrieve the full history or the most recent calculation, and clear the history, so the calculator,
+commands and plugins reach the right history without passing it around.
 """
+import contextlib
+import contextvars
+import itertools
 import os
-import pandas as pd
-from dotenv import load_dotenv
-from typing import List, Optional
-from decimal import Decimal
-from app.calculator.calculation import Calculation
-from app.calculator.operations import ArithmeticOperations as AO
+import threading
+from collections.abc import MutableSequence
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, TypeVar
+from app.calculator.calculation import Calculation, paused_gc
+from app.calculator.history_csv import EmptyHistoryFileError, read_history_csv, write_history_csv
+from app.calculator.registry import OPERATIONS
+from app.calculator.tracing import traced
 import logging
 
-load_dotenv()
+if TYPE_CHECKING:  # The journal module is only imported when a journal is configured
+    from app.calculator.journal import HistoryJournal
 
-class CalculationHistory:
-    """Manages the history of calculations performed by the calculator.
-    
-    This class offers class methods to add calculations to the history,
-    retrieve the full history or the most recent calculation, and clear
-    the history. The history is maintained as a class-level list, allowing
-    easy access and modification across different parts of the application.
+T = TypeVar('T')
+
+class _StorageState:
+    """
+    A History's storage and whether appends to it may skip the lock. The History replaces its state as a
+    whole, so a lock-free append reads both at once; it then checks that the state is still current, as
+    the storage may have been replaced before the append landed.
     """
-    _history: List[Calculation] = []  # Class-level attribute to store instances of Calculation
+    __slots__ = ('calculations', 'lock_free', 'append', 'retired_length', 'carried')
 
-    @classmethod
-    def add_calculation(cls, calculation: Calculation):
+    def __init__(self, calculations: MutableSequence, lock_free: bool):
+        self.calculations = calculations
+        self.lock_free = lock_free
+        self.append = calculations.append if lock_free else None  # Checked alone on the append hot path
+        self.retired_length = 0  # Calculations the storage held when the state was replaced
+        self.carried = set()  # Indexes of late appends to the replaced storage that were added again
+
+class History:
+    """
+    The history of calculations of one session.
+
+    A History may be shared between threads. With the default list storage and no journal, appending is
+    a single list append, which is atomic, so concurrent appends take no lock. Every other change, and
+    every change to another storage backend or with a journal attached, holds the history's lock (and
+    the journal's), so histories of different sessions never contend. Replacing the storage or attaching
+    a journal first makes appends take the lock; a lock-free append that lands in the replaced storage
+    after its calculations were moved is added again through the lock.
+
+    Attributes:
+        lock (threading.RLock): Held while the history changes, other than by lock-free appends.
+    """
+    def __init__(self, storage: Optional[MutableSequence] = None):
+        """
+        Parameters:
+            storage (MutableSequence | None): The storage of the calculations. Defaults to a new list.
+        """
+        self._calculations: MutableSequence = [] if storage is None else storage
+        self._journal: Optional['HistoryJournal'] = None  # Write-ahead journal persisting every change, if attached
+        self.lock = threading.RLock()
+        self._state = _StorageState(self._calculations, type(self._calculations) is list)
+
+    @contextlib.contextmanager
+    def _changing(self) -> Iterator[Optional['HistoryJournal']]:
+        """Holds the history's lock, and the journal's while one is attached, yielding the journal."""
+        with self.lock:
+            journal = self._journal
+            if journal is None:
+                yield None
+                return
+            # The journal's lock keeps a compaction from seeing a change without its record
+            with journal.lock:
+                yield journal
+
+    def _retire_state(self) -> int:
+        """
+        Makes appends take the lock, which the caller holds, and returns how many calculations the storage
+        held then. Lock-free appends that land in it later are added again by _add_late.
+        """
+        retired = self._state
+        self._state = _StorageState(retired.calculations, False)
+        retired.retired_length = len(retired.calculations)
+        return retired.retired_length
+
+    def _add_late(self, retired: _StorageState, calculations: List[Calculation]):
+        """Adds again the calculations appended lock-free to replaced storage after it was retired."""
+        with self.lock:
+            stored = retired.calculations
+            late = []
+            start = retired.retired_length
+            for calculation in calculations:  # Landed in this order, so each is searched for after the last
+                for index in range(start, len(stored)):
+                    if stored[index] is calculation and index not in retired.carried:
+                        retired.carried.add(index)
+                        late.append(calculation)
+                        start = index + 1
+                        break
+            if late:
+                self.add_calculations(late)
+
+    def add_calculation(self, calculation: Calculation):
         """Add a calculation to the history.
-        
+
         Args:
             calculation (Calculation): The calculation to add to the history.
         """
-        cls._history.append(calculation)
-    
-    @classmethod
-    def get_history(cls) -> List[Calculation]:
+        state = self._state
+        append = state.append
+        if append is not None:  # Lock-free
+            append(calculation)
+            if self._state is not state:
+                self._add_late(state, [calculation])
+            return
+        with self._changing() as journal:
+            self._calculations.append(calculation)
+            if journal is not None:
+                journal.record_add(calculation)
+
+    def add_calculations(self, calculations: List[Calculation]):
+        """Add several calculations to the history in one bulk append.
+
+        Args:
+            calculations (List[Calculation]): The calculations to add, in order.
+        """
+        state = self._state
+        if state.lock_free:
+            state.calculations.extend(calculations)
+            if self._state is not state:
+                self._add_late(state, calculations)
+            return
+        with self._changing() as journal:
+            self._calculations.extend(calculations)
+            if journal is not None:
+                journal.record_adds(calculations)
+
+    def get_history(self) -> MutableSequence:
         """Retrieve the entire calculation history.
-        
+
         Returns:
-            List[Calculation]: The list of calculations.
+            MutableSequence: The calculations, a list unless another storage is in use.
         """
-        return cls._history
+        return self._calculations
 
-    @classmethod
-    def clear_history(cls):
+    def clear_history(self):
         """Clear the calculation history."""
-        cls._history.clear()
+        with self._changing() as journal:
+            self._calculations.clear()
+            if journal is not None:
+                journal.record_clear()
 
-    @classmethod
-    def get_latest_history(cls) -> Optional[Calculation]:
+    def get_latest_history(self) -> Optional[Calculation]:
         """Retrieves the most recent calculation & returns None if there are no calculations in history."""
-        if cls._history:
-            return cls._history[-1]
-        else:
+        try:
+            return self._calculations[-1]
+        except IndexError:  # Also when another thread cleared the history
             return None
 
-    @classmethod
-    def delete_calculation_by_index(cls, index: int):
+    def delete_calculation_by_index(self, index: int):
         """Delete a calculation from the history by its index.
 
+        The history CSV is rewritten afterwards unless a journal is attached or the storage is itself
+        persistent (has a true `persistent` attribute), as SQLiteHistory is.
+
         Args:
             index (int): The index of the calculation to delete.
         """
-        if 0 <= index < len(cls._history):
-            del cls._history[index]
-            cls.save_history_to_csv()  # Optionally save the updated history to CSV
-        else:
-            raise IndexError("Calculation index out of range.")
+        with self._changing() as journal:
+            if not 0 <= index < len(self._calculations):
+                raise IndexError("Calculation index out of range.")
+            del self._calculations[index]
+            if journal is not None:
+                journal.record_delete(index)  # A tombstone instead of rewriting the whole CSV
+                return
+            if getattr(self._calculations, 'persistent', False):
+                return  # The storage has already saved the delete
+        self.save_history_to_csv()  # Optionally save the updated history to CSV
+
+    # Storage methods
+    def use_storage(self, storage: MutableSequence):
+        """Replace the history storage backend, moving the current calculations into it.
+
+        Any MutableSequence of calculations can serve as storage, for example a ColumnarHistory or an
+        SQLiteHistory.
+
+        Args:
+            storage (MutableSequence): The new, empty storage.
+        """
+        with self.lock:
+            length = self._retire_state()
+            storage.extend(itertools.islice(self._calculations, length))
+            self._calculations = storage
+            self._state = _StorageState(storage, type(storage) is list and self._journal is None)
+        logging.info(f"History storage switched to {type(storage).__name__}.")
+
+    @traced('history')
+    def flush_storage(self):
+        """Write out calculations the storage backend has buffered, for backends with a flush() method."""
+        flush = getattr(self._calculations, 'flush', None)
+        if flush is not None:
+            flush()
+
+    # Journal methods
+    def attach_journal(self, journal: 'HistoryJournal'):
+        """Replay a write-ahead journal into the history and persist every later change to it.
+
+        Args:
+            journal (HistoryJournal): The journal to replay and append to.
+        """
+        with self.lock:
+            self.detach_journal()
+            replayed = journal.replay()
+            if self._state.lock_free:
+                self._retire_state()
+                self._calculations = []  # Late lock-free appends land in the retired list, not unjournaled here
+            self._calculations.clear()
+            self._calculations.extend(replayed)
+            journal.bind(lambda: self._calculations)
+            self._journal = journal
+            self._state = _StorageState(self._calculations, False)
+        logging.info(f"History journal {journal.path} attached with {len(self._calculations)} calculations.")
+
+    def detach_journal(self):
+        """Stop journaling changes and close the attached journal, if any."""
+        with self.lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+                self._state = _StorageState(self._calculations, type(self._calculations) is list)
 
     # CSV methods
-    @classmethod
-    def save_history_to_csv(cls):
+    def save_history_to_csv(self):
         """Save the calculation history to a CSV file."""
         
-        if not cls._history:
+        if not self._calculations:
             print("No calculations in history to save.")
             return
 
@@ -86,43 +245,155 @@ class CalculationHistory:
         # Ensure the directory exists
         os.makedirs(data_dir, exist_ok=True)
 
-        # Convert history to a DataFrame and save
-        df = pd.DataFrame([{
-            'fld_Operation': calc.operation.__name__,
-            'fld_Operand1': calc.num1,
-            'fld_Operand2': calc.num2
-        } for calc in cls._history])
-        df.to_csv(file_path, index=False)
+        # Stream the history to the file row by row
+        write_history_csv(file_path, self._calculations)
         logging.info(f"History saved to {file_name}")
 
-    @classmethod
-    def load_history_from_csv(cls):
+    def load_history_from_csv(self):
         """Load the calculation history from a CSV file."""
         data_dir = os.getenv('DATA_DIR', './')
         file_name = os.getenv('CALC_HISTORY_FILE', 'calculator_history.csv')
         file_path = os.path.join(data_dir, file_name)
 
-        operation_mapping = {
-            'addition': AO.addition,
-            'subtraction': AO.subtraction,
-            'multiplication': AO.multiplication,
-            'division': AO.division,
-        }
-
         try:
-            df = pd.read_csv(file_path)
-            # Ensure only valid operations are loaded
-            cls._history = [
-                Calculation(
-                    Decimal(row['fld_Operand1']),
-                    Decimal(row['fld_Operand2']),
-                    operation_mapping.get(row['fld_Operation'], lambda x, y: None)
-                ) for index, row in df.iterrows() if row['fld_Operation'] in operation_mapping
-            ]
+            # Only rows with valid operations are loaded
+            with paused_gc():
+                loaded = list(read_history_csv(file_path, OPERATIONS.functions))
+            with self._changing() as journal:
+                self._calculations.clear()
+                self._calculations.extend(loaded)
+                if journal is not None:
+                    journal.record_clear()
+                    journal.record_adds(self._calculations)
             logging.info("Calculation history loaded successfully.")
-        except pd.errors.EmptyDataError:
+        except EmptyHistoryFileError:
             logging.info("The history CSV file is empty. No history to load.")
         except FileNotFoundError:
             logging.info("The history CSV file was not found.")
         except Exception as e:
             logging.error(f"An error occurred while loading history: {e}")
+
+class Session:
+    """
+    A calculator session, such as the REPL or one client of a server, owning its calculation history.
+
+    Calculations, commands and plugins run under the current session and record in its history. A
+    session is current in the thread or asyncio task that made it so, and nowhere else.
+
+    Attributes:
+        history (History): The session's calculation history.
+    """
+    def __init__(self, history: Optional[History] = None):
+        """
+        Parameters:
+            history (History | None): The history of the session. Defaults to a new, empty one.
+        """
+        self.history = History() if history is None else history
+
+    @contextlib.contextmanager
+    def active(self) -> Iterator['Session']:
+        """Makes this the current session until the block ends."""
+        token = _CURRENT_SESSION.set(self)
+        try:
+            yield self
+        finally:
+            _CURRENT_SESSION.reset(token)
+
+    def run(self, function: Callable[..., T], *args) -> T:
+        """Calls function(*args) with this as the current session, for example in a thread pool."""
+        with self.active():
+            return function(*args)
+
+DEFAULT_SESSION = Session()  # The session of the REPL, and of any code that does not choose one
+_CURRENT_SESSION: contextvars.ContextVar[Session] = contextvars.ContextVar('calculator_session',
+                                                                         default=DEFAULT_SESSION)
+
+_get_session = _CURRENT_SESSION.get  # Bound once: the history facade calls it on every append
+
+def current_session() -> Session:
+    """The current session: the one made current in this thread or task, or else DEFAULT_SESSION."""
+    return _get_session()
+
+def current_history() -> History:
+    """The history of the current session."""
+    return _get_session().history
+
+class CalculationHistory:
+    """Manages the history of calculations of the current session.
+
+    This class offers class methods to add calculations to the history,
+    retrieve the full history or the most recent calculation, and clear
+    the history. Each acts on the current session's History, allowing
+    easy access and modification across different parts of the application.
+    """
+    @classmethod
+    def add_calculation(cls, calculation: Calculation):
+        """Add a calculation to the current session's history."""
+        # History.add_calculation, with its lock-free path inlined: this is the calculator's hottest call
+        history = _get_session().history
+        state = history._state  # pylint: disable=protected-access
+        append = state.append
+        if append is None:
+            history.add_calculation(calculation)
+            return
+        append(calculation)
+        if history._state is not state:  # pylint: disable=protected-access
+            history._add_late(state, [calculation])  # pylint: disable=protected-access
+
+    @classmethod
+    def add_calculations(cls, calculations: List[Calculation]):
+        """Add several calculations to the current session's history in one bulk append."""
+        _get_session().history.add_calculations(calculations)
+
+    @classmethod
+    def get_history(cls) -> MutableSequence:
+        """Retrieve the current session's entire calculation history."""
+        return current_history().get_history()
+
+    @classmethod
+    def clear_history(cls):
+        """Clear the current session's calculation history."""
+        current_history().clear_history()
+
+    @classmethod
+    def get_latest_history(cls) -> Optional[Calculation]:
+        """Retrieves the most recent calculation & returns None if there are no calculations in history."""
+        return current_history().get_latest_history()
+
+    @classmethod
+    def delete_calculation_by_index(cls, index: int):
+        """Delete a calculation from the current session's history by its index."""
+        current_history().delete_calculation_by_index(index)
+
+    # Storage methods
+    @classmethod
+    def use_storage(cls, storage: MutableSequence):
+        """Replace the current session's history storage backend, moving the calculations into it."""
+        current_history().use_storage(storage)
+
+    @classmethod
+    def flush_storage(cls):
+        """Write out calculations the current session's storage backend has buffered."""
+        current_history().flush_storage()
+
+    # Journal methods
+    @classmethod
+    def attach_journal(cls, journal: 'HistoryJournal'):
+        """Replay a write-ahead journal into the current session's history and journal every later change."""
+        current_history().attach_journal(journal)
+
+    @classmethod
+    def detach_journal(cls):
+        """Stop journaling the current session's history and close the journal, if any."""
+        current_history().detach_journal()
+
+    # CSV methods
+    @classmethod
+    def save_history_to_csv(cls):
+        """Save the current session's calculation history to a CSV file."""
+        current_history().save_history_to_csv()
+
+    @classmethod
+    def load_history_from_csv(cls):
+        """Load the current session's calculation history from a CSV file."""
+        current_history().load_history_from_csv()
@@ -0,0 +1,168 @@
+"""calculator/columnar.py
+Defines ColumnarHistory, a compact in-memory storage backend for CalculationHistory. Instead of one
+Calculation object per entry, the history is kept in parallel typed arrays: a one-byte operation code
+and two four-byte indexes into a table of interned operand values, plus an optional column of cached
+results. Entries are handed out as lightweight CalculationView objects built on access, so the
+get_history()/get_latest_history() API keeps working unchanged.
+"""
+from array import array
+from collections.abc import MutableSequence, Sequence
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Iterator, List
+from app.calculator.calculation import Calculation
+
+NOT_CACHED = object()  # Result column marker: the result has not been computed yet
+UNDEFINED = object()   # Result column marker: computing the result raised ZeroDivisionError
+
+class CalculationView(Calculation):
+    """
+    A Calculation read from a ColumnarHistory. It behaves like the calculation that was stored, and
+    when the history caches results, compute() reads and fills the history's result column.
+    """
+    __slots__ = ('_store', '_index', '_generation')
+
+    def __init__(self, store: 'ColumnarHistory', index: int) -> None:
+        super().__init__(store._values[store._num1[index]], store._values[store._num2[index]],
+                         store._operations[store._codes[index]])
+        self._store = store
+        self._index = index
+        self._generation = store._generation
+
+    def compute(self) -> Decimal:
+        """Returns the cached result when available, computing and caching it otherwise."""
+        store = self._store
+        if not store.cache_results or store._generation != self._generation:
+            return super().compute()
+        cached = store._results[self._index]
+        if cached is UNDEFINED:
+            raise ZeroDivisionError("Cannot divide by zero.")
+        if cached is not NOT_CACHED:
+            return cached
+        try:
+            result = self.operation(self.num1, self.num2)
+        except ZeroDivisionError:
+            store._results[self._index] = UNDEFINED
+            raise
+        store._results[self._index] = result
+        return result
+
+class ColumnarHistory(MutableSequence):
+    """
+    A MutableSequence of calculations stored column by column.
+
+    Memory per entry is 9 bytes plus the interned operand values, which are shared by every entry
+    that uses the same value; the optional result column adds a reference and the result object. Operands are interned by their exact text, so
+    Decimal('2') and Decimal('2.0') stay distinct. Interned values are only released by clear().
+    """
+
+    def __init__(self, calculations: Iterable[Calculation] = (), cache_results: bool = False) -> None:
+        """
+        Parameters:
+            calculations (Iterable[Calculation]): Initial entries.
+            cache_results (bool): Keep a column of computed results so each entry is computed once.
+        """
+        self.cache_results = cache_results
+        self._operations: List[Callable[[Decimal, Decimal], Decimal]] = []  # Operation code -> function
+        self._operation_codes: Dict[Callable, int] = {}
+        self._values: List[Decimal] = []                                     # Value index -> operand
+        self._value_indexes: Dict[str, int] = {}
+        self._generation = 0  # Bumped whenever positions shift, so outstanding views stop using the cache
+        self._reset_columns()
+        self.extend(calculations)
+
+    def _reset_columns(self):
+        self._codes = array('B')
+        self._num1 = array('I')
+        self._num2 = array('I')
+        self._results: List = []  # Results are rarely repeated, so they are kept as objects, not interned
+
+    def _intern(self, value: Decimal) -> int:
+        key = repr(value)  # Includes the type and the exact digits and exponent
+        index = self._value_indexes.get(key)
+        if index is None:
+            index = self._value_indexes[key] = len(self._values)
+            self._values.append(value)
+        return index
+
+    def _operation_code(self, operation: Callable) -> int:
+        code = self._operation_codes.get(operation)
+        if code is None:
+            if len(self._operations) > 0xFF:
+                raise ValueError("ColumnarHistory supports at most 256 distinct operations.")
+            code = self._operation_codes[operation] = len(self._operations)
+            self._operations.append(operation)
+        return code
+
+    # Sequence protocol
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CalculationView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Calculation index out of range.")
+        return CalculationView(self, index)
+
+    def __iter__(self) -> Iterator[CalculationView]:
+        for index in range(len(self)):
+            yield CalculationView(self, index)
+
+    def __setitem__(self, index: int, calculation: Calculation):
+        if index < 0:
+            index += len(self)
+        self._codes[index] = self._operation_code(calculation.operation)
+        self._num1[index] = self._intern(calculation.num1)
+        self._num2[index] = self._intern(calculation.num2)
+        if self.cache_results:
+            self._results[index] = NOT_CACHED
+        self._generation += 1
+
+    def __delitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        del self._codes[index]
+        del self._num1[index]
+        del self._num2[index]
+        if self.cache_results:
+            del self._results[index]
+        self._generation += 1
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def insert(self, index: int, calculation: Calculation):
+        """Inserts a calculation before the given index."""
+        self._codes.insert(index, self._operation_code(calculation.operation))
+        self._num1.insert(index, self._intern(calculation.num1))
+        self._num2.insert(index, self._intern(calculation.num2))
+        if self.cache_results:
+            self._results.insert(index, NOT_CACHED)
+        self._generation += 1
+
+    # Fast paths for the operations CalculationHistory uses most
+    def append(self, calculation: Calculation):
+        """Appends a calculation."""
+        self._codes.append(self._operation_code(calculation.operation))
+        self._num1.append(self._intern(calculation.num1))
+        self._num2.append(self._intern(calculation.num2))
+        if self.cache_results:
+            self._results.append(NOT_CACHED)
+
+    def extend(self, calculations: Iterable[Calculation]):
+        """Appends several calculations."""
+        for calculation in calculations:
+            self.append(calculation)
+
+    def clear(self):
+        """Removes every entry and releases the interned values."""
+        self._operations.clear()
+        self._operation_codes.clear()
+        self._values.clear()
+        self._value_indexes.clear()
+        self._reset_columns()
+        self._generation += 1
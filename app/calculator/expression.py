@@ -0,0 +1,320 @@
+"""calculator/expression.py
+Defines the expression engine of the calculator. An input such as `(2 + 3) * 4 / 7` is tokenized and
+parsed into a small AST, constant subexpressions are folded, and the rest is compiled into a chain of
+closures calling the ArithmeticOperations functions. Compiled expressions are kept in an LRU cache
+keyed by their source text, so an expression that repeats, as in a batch run, is parsed only once.
+Names such as `x` may appear in an expression and are looked up in a mapping at evaluation time.
+Operators and functions are resolved through the operation registry: the symbols `+ - * / % ^` and
+unary operations called by name, as in `sqrt(2)`. A leading minus sign negates its operand without
+being recorded as a calculation, as it is not an operation of the calculator.
+"""
+import re
+from decimal import Decimal, InvalidOperation, getcontext
+from functools import lru_cache
+from typing import Callable, List, Mapping, Optional, Tuple, Union
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory
+from app.calculator.numeric import get_backend
+from app.calculator.registry import OPERATIONS, UNUSED_OPERAND
+
+EXPRESSION_CACHE_SIZE = 1024  # Compiled expressions kept by compile_expression
+
+TOKEN_PATTERN = re.compile(r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+                           r"|(?P<name>[A-Za-z_][A-Za-z0-9_]*)|(?P<symbol>[-+*/%^()]))")
+
+class ExpressionError(ValueError):
+    """Raised for an expression that cannot be parsed or names a value that is not defined."""
+
+# AST
+class Number:
+    """A constant. `steps` are the calculations folded into it, in evaluation order."""
+    __slots__ = ('value', 'steps')
+
+    def __init__(self, value: Decimal, steps: Tuple[Calculation, ...] = ()):
+        self.value = value
+        self.steps = steps
+
+class Name:
+    """A value looked up by name when the expression is evaluated."""
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+class BinaryOperation:
+    """An arithmetic operation on two subexpressions."""
+    __slots__ = ('operation', 'left', 'right')
+
+    def __init__(self, operation: Callable[[Decimal, Decimal], Decimal], left, right):
+        self.operation = operation
+        self.left = left
+        self.right = right
+
+class Negation:
+    """The negated value of a subexpression, as in `-x`."""
+    __slots__ = ('operand',)
+
+    def __init__(self, operand):
+        self.operand = operand
+
+Node = Union[Number, Name, BinaryOperation, Negation]
+
+def negate(value: Decimal, _unused: Decimal = UNUSED_OPERAND) -> Decimal:
+    """Negates a number; copy_negate keeps every digit of a Decimal, where unary minus rounds it."""
+    return value.copy_negate() if isinstance(value, Decimal) else -value
+
+# Parsing
+def tokenize(source: str) -> List[Tuple[str, str, int]]:
+    """Splits an expression into (kind, text, position) tokens, kind being 'number', 'name' or 'symbol'."""
+    tokens = []
+    position = 0
+    source = source.rstrip()
+    while position < len(source):
+        match = TOKEN_PATTERN.match(source, position)
+        if match is None:
+            position += len(source[position:]) - len(source[position:].lstrip())
+            raise ExpressionError(f"Unexpected character {source[position]!r} at position {position}.")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind), match.start(kind)))
+        position = match.end()
+    return tokens
+
+class Parser:
+    """
+    A recursive-descent parser for the grammar
+
+        expression := term (('+' | '-') term)*
+        term       := factor (('*' | '/' | '%') factor)*
+        factor     := ('+' | '-') factor | power
+        power      := primary ('^' factor)?
+        primary    := NUMBER | NAME | NAME '(' expression ')' | '(' expression ')'
+
+    so `^` binds tighter than a sign and is right-associative: -2 ^ 2 is -4 and 2 ^ 3 ^ 2 is 512. A call
+    applies the unary operation registered under that name.
+    """
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens = tokenize(source)
+        self.index = 0
+
+    def parse(self) -> Node:
+        """Returns the AST of the whole expression."""
+        if not self.tokens:
+            raise ExpressionError("Empty expression.")
+        node = self.expression()
+        if self.index < len(self.tokens):
+            _, text, position = self.tokens[self.index]
+            raise ExpressionError(f"Unexpected {text!r} at position {position}.")
+        return node
+
+    def _peek(self) -> Optional[str]:
+        if self.index < len(self.tokens):
+            kind, text, _ = self.tokens[self.index]
+            return text if kind == 'symbol' else None
+        return None
+
+    def _operator(self) -> Callable[[Decimal, Decimal], Decimal]:
+        operation = OPERATIONS.symbols.get(self.tokens[self.index][1])
+        if operation is None:
+            _, text, position = self.tokens[self.index]
+            raise ExpressionError(f"Unknown operator {text!r} at position {position}.")
+        self.index += 1
+        return operation.function
+
+    def expression(self) -> Node:
+        node = self.term()
+        while self._peek() in ('+', '-'):
+            node = BinaryOperation(self._operator(), node, self.term())
+        return node
+
+    def term(self) -> Node:
+        node = self.factor()
+        while self._peek() in ('*', '/', '%'):
+            node = BinaryOperation(self._operator(), node, self.factor())
+        return node
+
+    def factor(self) -> Node:
+        symbol = self._peek()
+        if symbol not in ('+', '-'):
+            return self.power()
+        self.index += 1
+        operand = self.factor()
+        if symbol == '+':
+            return operand
+        if isinstance(operand, Number) and not operand.steps:
+            return Number(negate(operand.value))  # A negative literal
+        return Negation(operand)
+
+    def power(self) -> Node:
+        node = self.primary()
+        if self._peek() == '^':
+            node = BinaryOperation(self._operator(), node, self.factor())
+        return node
+
+    def primary(self) -> Node:
+        if self.index >= len(self.tokens):
+            raise ExpressionError("Unexpected end of expression.")
+        kind, text, position = self.tokens[self.index]
+        self.index += 1
+        if kind == 'number':
+            try:
+                return Number(get_backend().parse(text))
+            except InvalidOperation as e:
+                raise ExpressionError(f"Invalid number {text!r} at position {position}.") from e
+        if kind == 'name':
+            if self._peek() != '(':
+                return Name(text)
+            operation = OPERATIONS.commands.get(text)
+            if operation is None or operation.arity != 1:
+                raise ExpressionError(f"Unknown function {text!r} at position {position}.")
+            return BinaryOperation(operation.function, self.primary(), Number(UNUSED_OPERAND))
+        if text == '(':
+            node = self.expression()
+            if self._peek() != ')':
+                raise ExpressionError(f"Missing ')' for '(' at position {position}.")
+            self.index += 1
+            return node
+        raise ExpressionError(f"Unexpected {text!r} at position {position}.")
+
+def parse_expression(source: str) -> Node:
+    """Parses an expression into its AST."""
+    return Parser(source).parse()
+
+# Constant folding
+def fold_constants(node: Node) -> Node:
+    """
+    Replaces every operation on constants by its result, remembering the folded calculations so they can
+    still be recorded. Operations that fail, such as a division by zero, are left in place to fail when
+    the expression is evaluated.
+    """
+    if isinstance(node, Negation):
+        operand = fold_constants(node.operand)
+        return Number(negate(operand.value), operand.steps) if isinstance(operand, Number) else Negation(operand)
+    if not isinstance(node, BinaryOperation):
+        return node
+    left = fold_constants(node.left)
+    right = fold_constants(node.right)
+    if isinstance(left, Number) and isinstance(right, Number):
+        try:
+            value = node.operation(left.value, right.value)
+        except ArithmeticError:
+            return BinaryOperation(node.operation, left, right)
+        return Number(value, left.steps + right.steps + (Calculation(left.value, right.value, node.operation),))
+    return BinaryOperation(node.operation, left, right)
+
+# Compilation
+Trace = Optional[List[Calculation]]
+Closure = Callable[[Mapping[str, Decimal], Trace], Decimal]
+
+def compile_node(node: Node) -> Closure:
+    """
+    Compiles an AST into a closure called with the name bindings and a trace list. When the trace is a
+    list, every calculation is appended to it before it runs, as Calculator records before computing.
+    """
+    if isinstance(node, Number):
+        value, steps = node.value, node.steps
+        if not steps:
+            return lambda env, trace: value
+
+        def constant(env, trace):
+            if trace is not None:
+                trace.extend(steps)
+            return value
+        return constant
+
+    if isinstance(node, Name):
+        name = node.name
+
+        def lookup(env, trace):
+            try:
+                return env[name]
+            except KeyError:
+                raise ExpressionError(f"Name '{name}' is not defined.") from None
+        return lookup
+
+    if isinstance(node, Negation):
+        operand = compile_node(node.operand)
+        return lambda env, trace: negate(operand(env, trace))
+
+    operation = node.operation
+    left = compile_node(node.left)
+    right = compile_node(node.right)
+
+    def apply(env, trace):
+        a = left(env, trace)
+        b = right(env, trace)
+        if trace is not None:
+            trace.append(Calculation(a, b, operation))
+        return operation(a, b)
+    return apply
+
+class CompiledExpression:
+    """An expression parsed, folded and compiled once, ready to be evaluated any number of times."""
+    __slots__ = ('source', 'names', '_closure')
+
+    def __init__(self, source: str):
+        """
+        Parameters:
+            source (str): The expression text.
+
+        Raises:
+            ExpressionError: If the expression is invalid.
+        """
+        tree = fold_constants(parse_expression(source))
+        self.source = source
+        self.names = frozenset(_names(tree))
+        self._closure = compile_node(tree)
+
+    def evaluate(self, env: Optional[Mapping[str, Decimal]] = None, record: bool = False) -> Decimal:
+        """
+        Evaluates the expression.
+
+        Parameters:
+            env (Mapping[str, Decimal] | None): The values of the names used in the expression.
+            record (bool): Record every sub-operation, folded ones included, in the calculation history.
+
+        Raises:
+            ExpressionError: If a name is not defined.
+            ArithmeticError: If an operation fails, such as a ZeroDivisionError for a division by zero.
+        """
+        env = {} if env is None else env
+        if not record:
+            return self._closure(env, None)
+        trace: List[Calculation] = []
+        try:
+            return self._closure(env, trace)
+        finally:
+            CalculationHistory.add_calculations(trace)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.source!r})"
+
+def _names(node: Node):
+    if isinstance(node, Name):
+        yield node.name
+    elif isinstance(node, Negation):
+        yield from _names(node.operand)
+    elif isinstance(node, BinaryOperation):
+        yield from _names(node.left)
+        yield from _names(node.right)
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _compile_cached(source: str, backend: str, precision: int, rounding: str) -> CompiledExpression:
+    # Literals and folded constants depend on the numeric backend and the decimal context, so both are part of the key
+    return CompiledExpression(source)
+
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Returns the compiled form of an expression from the LRU cache, compiling it on first use. The cache
+    is keyed by the source text, the current numeric backend and the decimal precision and rounding.
+    """
+    context = getcontext()
+    return _compile_cached(source.strip(), get_backend().name, context.prec, context.rounding)
+
+def evaluate_expression(source: str, env: Optional[Mapping[str, Decimal]] = None, record: bool = False) -> Decimal:
+    """Compiles (or fetches from the cache) and evaluates an expression."""
+    return compile_expression(source).evaluate(env, record)
+
+def expression_cache_info():
+    """Returns the hit, miss and size statistics of the compiled expression cache."""
+    return _compile_cached.cache_info()
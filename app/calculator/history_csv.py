@@ -0,0 +1,69 @@
+"""calculator/history_csv.py
+Streaming reader and writer for calculation history CSV files, built on the standard library `csv`
+module. Rows are processed one at a time through large buffered file objects, so memory use does not
+depend on the file size, and operands are kept as exact text in both directions (see numeric.parse_stored_number).
+"""
+import csv
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Iterator
+from app.calculator.calculation import Calculation
+from app.calculator.numeric import parse_stored_number
+
+HEADER = ('fld_Operation', 'fld_Operand1', 'fld_Operand2')
+IO_BUFFER_SIZE = 1 << 20  # Bytes read or written per system call
+
+class EmptyHistoryFileError(Exception):
+    """Raised when a history CSV file does not even contain a header row."""
+
+def write_history_csv(file_path: str, calculations: Iterable[Calculation]) -> int:
+    """
+    Writes calculations to a CSV file, one row per calculation.
+
+    Args:
+        file_path (str): The file to create or overwrite.
+        calculations (Iterable[Calculation]): The calculations to write, consumed lazily.
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    with open(file_path, 'w', encoding='utf-8', newline='', buffering=IO_BUFFER_SIZE) as stream:
+        writer = csv.writer(stream)
+        writer.writerow(HEADER)
+        for calc in calculations:
+            writer.writerow((calc.operation.__name__, calc.num1, calc.num2))
+            count += 1
+    return count
+
+def read_history_csv(file_path: str, operation_mapping: Dict[str, Callable[[Decimal, Decimal], Decimal]]) -> Iterator[Calculation]:
+    """
+    Lazily reads calculations from a CSV file written by write_history_csv (or the former pandas
+    writer). Blank rows, rows too short to hold every column, and rows whose operation is not in
+    operation_mapping are skipped.
+
+    Args:
+        file_path (str): The file to read.
+        operation_mapping (Dict[str, Callable]): Maps stored operation names to operation functions.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        EmptyHistoryFileError: If the file has no header row.
+        ValueError: If a required column is missing.
+    """
+    with open(file_path, 'r', encoding='utf-8', newline='', buffering=IO_BUFFER_SIZE) as stream:
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if not header:
+            raise EmptyHistoryFileError(f"{file_path} is empty.")
+        try:
+            operation_column, num1_column, num2_column = (header.index(name) for name in HEADER)
+        except ValueError as e:
+            raise ValueError(f"{file_path} is missing a required column: {e}") from e
+        width = max(operation_column, num1_column, num2_column) + 1
+
+        for row in reader:
+            if len(row) < width:  # A blank or short row
+                continue
+            operation = operation_mapping.get(row[operation_column])
+            if operation is not None:
+                yield Calculation(parse_stored_number(row[num1_column]), parse_stored_number(row[num2_column]), operation)
@@ -0,0 +1,318 @@
+"""calculator/journal.py
+Defines the HistoryJournal class, an append-only write-ahead log for the calculation history.
+Every change to the history is persisted as one short record (an add, a delete tombstone or a clear),
+so saving a change costs O(1) instead of rewriting the whole history. On startup the journal is
+replayed on top of the latest snapshot, and compaction folds the journal into a new snapshot on a
+background thread.
+
+The journal starts with an epoch record, and the snapshot records the journal epoch and byte offset it
+covers. Compaction publishes the snapshot before it truncates the journal, so after a crash between the
+two, replay skips the journal records the snapshot already holds.
+
+Every record ends with a CRC32 checksum of its fields, so a record cut short by a crash is rejected even
+when what is left of it still parses. Replay truncates the journal after its last intact record, so a
+torn record never has the next one appended onto it.
+"""
+import os
+import csv
+import itertools
+import zlib
+import time
+import logging
+import threading
+from decimal import InvalidOperation
+from typing import Callable, Iterable, List, Optional, Tuple
+from app.calculator.calculation import Calculation
+from app.calculator.numeric import parse_stored_number
+from app.calculator.registry import OPERATIONS
+
+FSYNC_ALWAYS = 'always'      # fsync after every record: no acknowledged change is ever lost
+FSYNC_INTERVAL = 'interval'  # fsync at most once per interval: bounded loss on power failure
+FSYNC_NEVER = 'never'        # leave syncing to the OS: survives process crashes, not power loss
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER)
+
+ADD, DELETE, CLEAR = 'A', 'D', 'C'
+EPOCH = 'E'     # First record of a journal: its epoch, incremented by every compaction
+SNAPSHOT = 'S'  # First row of a snapshot: the journal epoch and byte offset it covers
+CHECKSUMMED = 'crc32'  # Third field of the epoch record when every record carries a checksum
+FIELDS = {ADD: 4, DELETE: 2, CLEAR: 1}  # Fields of each record type, without the checksum
+
+class JournalCorruptedError(ValueError):
+    """Raised when a journal record other than the last one cannot be read, so replay cannot continue."""
+
+def _fsync_directory(path: str):
+    """Makes a rename into the directory of `path` durable; a no-op where directories cannot be opened."""
+    try:
+        descriptor = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+def _checksum(fields: List[str]) -> str:
+    return f"{zlib.crc32(','.join(fields).encode('utf-8')):08x}"
+
+def _frame(row: list) -> List[str]:
+    """The record's fields followed by their checksum."""
+    fields = [str(field) for field in row]
+    fields.append(_checksum(fields))
+    return fields
+
+def _unframe(row: List[str], checksummed: bool) -> List[str]:
+    """
+    The record's fields without their checksum. Raises ValueError if the checksum does not match.
+    Journals written before checksums were added may mix records with and without one.
+    """
+    if checksummed or len(row) == FIELDS.get(row[0], 0) + 1:
+        *row, checksum = row
+        if _checksum(row) != checksum:
+            raise ValueError("Journal record checksum mismatch")
+    return row
+
+class HistoryJournal:
+    """
+    Append-only journal of calculation history changes, with snapshot compaction.
+
+    The journal lives in `path` and the snapshot next to it in `path + '.snapshot'`. Both are CSV
+    files with operands stored as exact Decimal text. Callers must hold `lock` while they change the
+    history and record that change, so a compaction never sees one without the other.
+    """
+
+    def __init__(self, path: str, fsync_policy: str = FSYNC_INTERVAL, fsync_interval: float = 1.0,
+                 compact_every: int = 100_000) -> None:
+        """
+        Parameters:
+            path (str): Path of the journal file; it is created if it does not exist.
+            fsync_policy (str): One of 'always', 'interval' or 'never'.
+            fsync_interval (float): Seconds between fsyncs under the 'interval' policy.
+            compact_every (int): Journal records after which a background compaction is started.
+                Zero disables automatic compaction.
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync_policy}'. Use one of: {', '.join(FSYNC_POLICIES)}")
+        self.path = path
+        self.snapshot_path = path + '.snapshot'
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self.records_since_compaction = 0
+        self._state: Optional[Callable[[], List[Calculation]]] = None
+        self.lock = threading.RLock()  # Held by the history while it mutates and records a change
+        self._last_fsync = time.monotonic()
+        self._compaction_thread: Optional[threading.Thread] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self.epoch = 0
+            self._writer.writerow([EPOCH, self.epoch, CHECKSUMMED])
+            self._file.flush()
+        else:
+            self.epoch = self._read_epoch()
+
+    def bind(self, state: Callable[[], List[Calculation]]):
+        """
+        Sets the callable that returns the current history; compaction snapshots what it returns.
+        """
+        self._state = state
+
+    # Writing
+    def _write(self, rows: Iterable[list]):
+        with self.lock:
+            count = 0
+            for row in rows:
+                self._writer.writerow(_frame(row))
+                count += 1
+            self._file.flush()
+            if self.fsync_policy == FSYNC_ALWAYS:
+                os.fsync(self._file.fileno())
+            elif self.fsync_policy == FSYNC_INTERVAL and time.monotonic() - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = time.monotonic()
+            self.records_since_compaction += count
+        if self.compact_every and self.records_since_compaction >= self.compact_every:
+            self.compact_in_background()
+
+    def record_add(self, calculation: Calculation):
+        """Appends an add record for one calculation."""
+        self._write([[ADD, calculation.operation.__name__, calculation.num1, calculation.num2]])
+
+    def record_adds(self, calculations: Iterable[Calculation]):
+        """Appends add records for several calculations with a single flush."""
+        self._write([ADD, calc.operation.__name__, calc.num1, calc.num2] for calc in calculations)
+
+    def record_delete(self, index: int):
+        """Appends a tombstone for the calculation at the given index."""
+        self._write([[DELETE, index]])
+
+    def record_clear(self):
+        """Appends a record that clears the whole history."""
+        self._write([[CLEAR]])
+
+    # Reading
+    def _read_epoch(self) -> int:
+        """The epoch in the journal's first record; 0 for a journal written before epochs were recorded."""
+        with open(self.path, 'r', encoding='utf-8', newline='') as journal:
+            row = next(csv.reader(journal), [])
+        return int(row[1]) if row[:1] == [EPOCH] else 0
+
+    def replay(self) -> List[Calculation]:
+        """
+        Rebuilds the history from the snapshot and the journal records written after it.
+
+        Returns:
+            List[Calculation]: The calculations in history order.
+
+        Raises:
+            JournalCorruptedError: If a record before the last one cannot be read, or the snapshot is
+                newer than the journal. Only a torn final record, from a crash mid-write, is skipped,
+                and the journal is truncated before it so later records are appended after intact ones.
+        """
+        history, covered = self._read_snapshot()
+        with self.lock:
+            self._file.flush()
+            with open(self.path, 'rb') as journal:
+                first = journal.readline().decode('utf-8').rstrip('\r\n').split(',')
+                if first[0] == EPOCH:
+                    epoch, start, checksummed = int(first[1]), journal.tell(), first[2:3] == [CHECKSUMMED]
+                else:
+                    epoch, start, checksummed = 0, 0, False
+                if covered is not None:
+                    covered_epoch, covered_offset = covered
+                    if covered_epoch == epoch:
+                        # Compaction published the snapshot but did not truncate the journal
+                        start = max(start, covered_offset)
+                    elif covered_epoch > epoch:
+                        raise JournalCorruptedError(f"The snapshot of {self.path} is newer than the journal.")
+                journal.seek(start)
+                intact = start  # Byte offset just past the last intact record
+                lines = iter(journal.readline, b'')
+                for number, line in enumerate(lines, start=1):
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("Incomplete journal record")
+                        row = next(csv.reader([line.decode('utf-8')]))
+                        self._apply(history, _unframe(row, checksummed))
+                    except (IndexError, KeyError, ValueError, InvalidOperation, csv.Error) as e:
+                        if next(lines, None) is not None:
+                            raise JournalCorruptedError(
+                                f"Unreadable journal record {number} in {self.path}: {e}") from e
+                        logging.warning(f"Dropping the torn final journal record in {self.path}")
+                        break
+                    intact += len(line)
+                else:
+                    return history
+            self._truncate(intact)
+        return history
+
+    def _truncate(self, length: int):
+        """Durably cuts the journal to `length` bytes and reopens it for appending. Call with the lock held."""
+        self._file.close()
+        with open(self.path, 'r+b') as journal:
+            journal.truncate(length)
+            os.fsync(journal.fileno())
+        self._file = open(self.path, 'a', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+
+    @staticmethod
+    def _apply(history: List[Calculation], row: List[str]):
+        kind = row[0]
+        if kind == ADD:
+            history.append(Calculation(parse_stored_number(row[2]), parse_stored_number(row[3]), OPERATIONS.functions[row[1]]))
+        elif kind == DELETE:
+            del history[int(row[1])]
+        elif kind == CLEAR:
+            history.clear()
+        else:
+            raise ValueError(f"Unknown journal record type '{kind}'")
+
+    def _read_snapshot(self) -> Tuple[List[Calculation], Optional[Tuple[int, int]]]:
+        """The snapshot's calculations, and the journal epoch and offset it covers (None for an old snapshot)."""
+        try:
+            functions = OPERATIONS.functions
+            with open(self.snapshot_path, 'r', encoding='utf-8', newline='') as snapshot:
+                rows = csv.reader(snapshot)
+                first = next(rows, None)
+                if first is None:
+                    return [], None
+                covered = None
+                history = []
+                if first[0] == SNAPSHOT:
+                    covered = (int(first[1]), int(first[2]))
+                else:
+                    rows = itertools.chain([first], rows)
+                history.extend(Calculation(parse_stored_number(num1), parse_stored_number(num2), functions[name])
+                               for name, num1, num2 in rows)
+                return history, covered
+        except FileNotFoundError:
+            return [], None
+
+    # Compaction
+    def compact(self):
+        """
+        Writes the current history to a new snapshot and truncates the journal.
+
+        The history is copied under the journal lock, the snapshot is written and fsynced without
+        holding it, and finally any records appended meanwhile are carried over into the new journal of
+        the next epoch. The snapshot names the epoch and offset it covers, so a crash after it is
+        published and before the journal is truncated replays neither record twice.
+        """
+        if self._state is None:
+            raise RuntimeError("The journal is not bound to a history.")
+        with self.lock:
+            self._file.flush()
+            entries = [(calc.operation.__name__, calc.num1, calc.num2) for calc in self._state()]
+            epoch, offset = self.epoch, self._file.tell()
+            self.records_since_compaction = 0
+
+        temporary_path = self.snapshot_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8', newline='') as snapshot:
+            writer = csv.writer(snapshot)
+            writer.writerow([SNAPSHOT, epoch, offset])
+            writer.writerows(entries)
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temporary_path, self.snapshot_path)
+        _fsync_directory(self.snapshot_path)
+
+        with self.lock:
+            self._file.flush()
+            with open(self.path, 'r', encoding='utf-8', newline='') as journal:
+                journal.seek(offset)
+                tail = journal.read()
+            temporary_path = self.path + '.tmp'
+            with open(temporary_path, 'w', encoding='utf-8', newline='') as journal:
+                csv.writer(journal).writerow([EPOCH, epoch + 1, CHECKSUMMED])
+                journal.write(tail)
+                journal.flush()
+                os.fsync(journal.fileno())
+            self._file.close()
+            os.replace(temporary_path, self.path)
+            _fsync_directory(self.path)
+            self.epoch = epoch + 1
+            self._file = open(self.path, 'a', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file)
+        logging.info(f"History journal compacted into {self.snapshot_path} ({len(entries)} entries).")
+
+    def compact_in_background(self) -> Optional[threading.Thread]:
+        """Starts a compaction on a daemon thread unless one is already running."""
+        if self._state is None or (self._compaction_thread and self._compaction_thread.is_alive()):
+            return None
+        self._compaction_thread = threading.Thread(target=self.compact, name='history-journal-compaction', daemon=True)
+        self._compaction_thread.start()
+        return self._compaction_thread
+
+    def close(self):
+        """Waits for a running compaction, then syncs and closes the journal file."""
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+        with self.lock:
+            if not self._file.closed:
+                self._file.flush()
+                if self.fsync_policy != FSYNC_NEVER:
+                    os.fsync(self._file.fileno())
+                self._file.close()
@@ -0,0 +1,87 @@
+"""calculator/memo.py
+Defines ResultCache, a bounded, thread-safe LRU cache of calculation results shared by Calculation and
+Calculator. Results are keyed on the operation, the exact text of both operands and the decimal context
+that shapes the result, so a cached result is always the one the operation would return.
+"""
+import threading
+from collections import OrderedDict
+from decimal import Decimal, getcontext
+from typing import Callable, Dict
+
+class ResultCache:
+    """
+    An LRU cache of operation results with hit, miss and eviction counters.
+
+    Every lookup builds a key from the operands' text and the context, which costs several times more
+    than the C implementation of Decimal arithmetic needs for the four basic operations. The cache pays
+    off only for operations that are expensive to recompute, such as very long operands, very high
+    precision or slow plugin operations. A maxsize of 0 disables it and computations run directly.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """
+        Parameters:
+            maxsize (int): Results kept before the least recently used one is evicted; 0 disables caching.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative.")
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._results: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(operation: Callable, num1: Decimal, num2: Decimal) -> tuple:
+        context = getcontext()  # Per thread; precision and rounding change the result
+        # str() keeps Decimal('2') and Decimal('2.0') apart, which hash alike but give differently scaled results
+        return (operation, type(num1), str(num1), type(num2), str(num2),
+                context.prec, context.rounding, context.Emin, context.Emax, context.clamp)
+
+    def compute(self, operation: Callable[[Decimal, Decimal], Decimal], num1: Decimal, num2: Decimal) -> Decimal:
+        """
+        Returns operation(num1, num2), from the cache when possible. Exceptions such as ZeroDivisionError
+        are raised as usual and not cached.
+        """
+        if not self.maxsize:
+            return operation(num1, num2)
+        key = self._key(operation, num1, num2)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = operation(num1, num2)  # Outside the lock: other threads keep using the cache meanwhile
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def resize(self, maxsize: int):
+        """Changes the capacity, evicting the least recently used results if it shrinks."""
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative.")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._results) > maxsize:
+                self._results.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drops every cached result and resets the counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the counters and current size."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self._results), 'maxsize': self.maxsize}
+
+RESULT_CACHE = ResultCache(maxsize=0)  # Shared by Calculation.compute; enabled through App settings
@@ -0,0 +1,239 @@
+"""calculator/metrics.py
+Defines the calculator's built-in metrics: call and error counters and latency histograms per command and
+per operation, plus gauges read when the metrics are collected, such as the history size. The shared
+METRICS registry is off by default; instrumented code checks `METRICS.enabled` once and otherwise runs
+exactly as before. The metrics are shown by the `stats` command and can be written out in the Prometheus
+text exposition format. A call fails when it raises, or when it returns an ErrorResult: commands report
+most failures, such as a division by zero, as a message to show rather than an exception.
+
+Latency histograms are HDR-style: log-linear buckets over integer nanoseconds with a bounded relative
+error, so recording a value is a few integer operations and percentiles stay accurate from microseconds
+to seconds.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+class ErrorResult(str):
+    """
+    The message returned by a call that failed without raising. It is an ordinary string to its callers,
+    but Metrics.timed() counts the call as an error of type `error_type`.
+    """
+    def __new__(cls, message: str, error_type: str = 'Error'):
+        result = super().__new__(cls, message)
+        result.error_type = error_type
+        return result
+
+class LatencyHistogram:
+    """
+    A log-linear histogram of durations in nanoseconds. Each power-of-two range is split into
+    2 ** (precision_bits - 1) buckets, so a recorded value is known to within 2 ** -(precision_bits - 1)
+    of itself (about 3% with the default of 6 bits).
+    """
+    __slots__ = ('precision_bits', 'count', 'total', 'min', 'max', '_buckets')
+
+    def __init__(self, precision_bits: int = 6):
+        if precision_bits < 2:
+            raise ValueError("precision_bits must be at least 2.")
+        self.precision_bits = precision_bits
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+        self._buckets: Dict[int, int] = {}
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Returns the lowest and highest value counted in a bucket."""
+        half = 1 << (self.precision_bits - 1)
+        if index < 2 * half:
+            return index, index
+        shift = index // half - 1
+        mantissa = index - shift * half
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int):
+        """Records a duration, a non-negative number of nanoseconds."""
+        shift = value.bit_length() - self.precision_bits
+        # Values below 2 ** precision_bits get a bucket each; above, the top precision_bits bits pick the bucket
+        index = value if shift <= 0 else (shift << (self.precision_bits - 1)) + (value >> shift)
+        buckets = self._buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.max is None:
+            self.min = self.max = value
+        elif value > self.max:
+            self.max = value
+        elif value < self.min:
+            self.min = value
+
+    def percentile(self, percent: float) -> int:
+        """Returns the value below which `percent` percent of the recorded values fall, or 0 if none were recorded."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))  # Ceiling without float rounding surprises
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self._bounds(index)[1], self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """The mean recorded value, 0 if none were recorded."""
+        return self.total / self.count if self.count else 0.0
+
+class Metrics:
+    """
+    Counters, latency histograms and gauges of commands and operations.
+
+    Attributes:
+        enabled (bool): Whether instrumented code records anything. Defaults to False.
+        errors (Dict[Tuple[str, str, str], int]): Errors by (kind, name, exception type name).
+        latencies (Dict[Tuple[str, str], LatencyHistogram]): Durations by (kind, name), where kind is
+            'command' or 'operation'.
+    """
+    QUANTILES = (50, 90, 99)
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+        self.errors: Dict[Tuple[str, str, str], int] = {}
+        self.latencies: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def enable(self):
+        """Starts recording."""
+        self.enabled = True
+
+    def disable(self):
+        """Stops recording. Recorded values are kept until reset()."""
+        self.enabled = False
+
+    def reset(self):
+        """Discards every recorded value."""
+        with self._lock:
+            self.errors.clear()
+            self.latencies.clear()
+
+    @property
+    def calls(self) -> Dict[Tuple[str, str], int]:
+        """Calls by (kind, name)."""
+        with self._lock:
+            return {key: histogram.count for key, histogram in self.latencies.items()}
+
+    def register_gauge(self, name: str, description: str, read: Callable[[], float]):
+        """Registers a gauge, a value read by calling `read` whenever the metrics are collected."""
+        self._gauges[name] = (description, read)
+
+    def record(self, kind: str, name: str, duration_ns: int, error: Union[BaseException, ErrorResult, None] = None):
+        """
+        Records one call of a command or operation, its duration and the exception it raised or the error it
+        returned, if any. Errors are counted by their `error_type`, or else by the name of their class.
+        """
+        key = (kind, name)
+        with self._lock:
+            histogram = self.latencies.get(key)
+            if histogram is None:
+                histogram = self.latencies[key] = LatencyHistogram()
+            histogram.record(duration_ns)
+            if error is not None:
+                error_key = (kind, name, getattr(error, 'error_type', type(error).__name__))
+                self.errors[error_key] = self.errors.get(error_key, 0) + 1
+
+    def timed(self, kind: str, name: str, function: Callable, *args):
+        """
+        Calls function(*args), recording the call, its duration and any exception, which is re-raised, or
+        ErrorResult it returns.
+        """
+        start = time.perf_counter_ns()
+        try:
+            result = function(*args)
+        except Exception as e:
+            self.record(kind, name, time.perf_counter_ns() - start, e)
+            raise
+        self.record(kind, name, time.perf_counter_ns() - start, result if isinstance(result, ErrorResult) else None)
+        return result
+
+    def gauges(self) -> Dict[str, float]:
+        """Reads every gauge. A gauge that fails to read is left out."""
+        values = {}
+        for name, (_, read) in self._gauges.items():
+            try:
+                values[name] = read()
+            except Exception:  # A gauge must never break reporting
+                continue
+        return values
+
+    def report(self) -> str:
+        """Returns the metrics as a plain-text table."""
+        with self._lock:
+            rows = sorted(self.latencies.items())
+            errors = dict(self.errors)
+        lines = []
+        if rows:
+            lines.append(f"{'kind':<10} {'name':<16} {'calls':>8} {'errors':>7} {'mean µs':>10} "
+                         + ' '.join(f"{'p' + str(q) + ' µs':>10}" for q in self.QUANTILES) + f" {'max µs':>10}")
+            for (kind, name), histogram in rows:
+                error_count = sum(count for (k, n, _), count in errors.items() if (k, n) == (kind, name))
+                lines.append(f"{kind:<10} {name:<16} {histogram.count:>8} {error_count:>7} "
+                             f"{histogram.mean / 1000:>10.1f} "
+                             + ' '.join(f"{histogram.percentile(q) / 1000:>10.1f}" for q in self.QUANTILES)
+                             + f" {histogram.max / 1000:>10.1f}")
+        else:
+            lines.append("No calls recorded.")
+        for (kind, name, error_type), count in sorted(errors.items()):
+            lines.append(f"error {kind} {name} {error_type}: {count}")
+        for name, value in self.gauges().items():
+            lines.append(f"{name}: {value:g}")
+        return '\n'.join(lines)
+
+    def to_prometheus(self) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format: counters of calls and errors and a
+        summary of latencies in seconds per command and operation, then the gauges.
+        """
+        with self._lock:
+            errors, latencies = sorted(self.errors.items()), sorted(self.latencies.items())
+        lines: List[str] = [
+            "# HELP calculator_calls_total Calls of a command or operation.",
+            "# TYPE calculator_calls_total counter",
+        ]
+        lines += [f'calculator_calls_total{{kind="{kind}",name="{_escape(name)}"}} {histogram.count}'
+                  for (kind, name), histogram in latencies]
+        lines += [
+            "# HELP calculator_errors_total Calls of a command or operation that raised, by exception type.",
+            "# TYPE calculator_errors_total counter",
+        ]
+        lines += [f'calculator_errors_total{{kind="{kind}",name="{_escape(name)}",type="{error_type}"}} {count}'
+                  for (kind, name, error_type), count in errors]
+        lines += [
+            "# HELP calculator_latency_seconds Duration of a command or operation.",
+            "# TYPE calculator_latency_seconds summary",
+        ]
+        for (kind, name), histogram in latencies:
+            labels = f'kind="{kind}",name="{_escape(name)}"'
+            lines += [f'calculator_latency_seconds{{{labels},quantile="{q / 100:g}"}} {histogram.percentile(q) / 1e9:.9f}'
+                      for q in self.QUANTILES]
+            lines.append(f'calculator_latency_seconds_sum{{{labels}}} {histogram.total / 1e9:.9f}')
+            lines.append(f'calculator_latency_seconds_count{{{labels}}} {histogram.count}')
+        for name, value in self.gauges().items():
+            lines += [f"# HELP {name} {self._gauges[name][0]}", f"# TYPE {name} gauge", f"{name} {value:g}"]
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str):
+        """
+        Writes the metrics to a Prometheus text file, for example for the node exporter's textfile
+        collector. The file is replaced atomically, so a scrape never sees it half-written.
+        """
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            file.write(self.to_prometheus())
+        os.replace(temporary_path, path)
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+METRICS = Metrics()
@@ -0,0 +1,274 @@
+"""calculator/numeric.py
+Defines the numeric backends of the calculator. Operands typed by the user or passed to Calculator.batch
+are parsed and converted by the current backend:
+
+- 'decimal' (default): decimal.Decimal under a configurable context, exact for decimal fractions.
+- 'fraction': fractions.Fraction, exact rational arithmetic, so 1 / 3 * 3 is exactly 1.
+- 'float': binary float64, much faster and precise enough for high-volume telemetry. Calculator.batch
+  evaluates the basic operations on NumPy arrays when NumPy is installed.
+
+The backend is chosen per session with set_backend() or for a block, such as one batch run, with
+use_backend(). Like the decimal context it is kept in a context variable, so threads and asyncio tasks
+each see their own. The ArithmeticOperations functions work on the numbers of every backend.
+"""
+import decimal
+import math
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+Number = Union[Decimal, Fraction, float]
+
+class NumericBackend:
+    """The number type operands are parsed and converted to, and how it is set up for arithmetic."""
+    name = ''
+    type: type = object
+
+    def parse(self, text: str) -> Number:
+        """
+        Parses an operand typed by the user.
+
+        Raises:
+            InvalidOperation: If the text is not a number.
+        """
+        raise NotImplementedError
+
+    def convert(self, value) -> Number:
+        """Converts a number of another type, such as an int or a NumPy scalar, to this backend's type."""
+        raise NotImplementedError
+
+    def convert_many(self, values: Iterable) -> List[Number]:
+        """Converts a sequence or NumPy array of numbers to a list of this backend's numbers."""
+        if hasattr(values, 'tolist'):  # NumPy arrays: unbox to Python scalars in one call
+            values = values.tolist()
+        number_type, convert = self.type, self.convert
+        return [value if value.__class__ is number_type else convert(value) for value in values]
+
+    def activate(self) -> ContextManager:
+        """Returns a context manager setting up the arithmetic environment of this backend."""
+        return nullcontext()
+
+    def vectorized(self, operation: Callable) -> Optional[Callable[[List, List], Tuple[List, List[bool]]]]:
+        """
+        Returns a function evaluating the operation over two lists of operands at once, with a mask of
+        undefined results, or None when the backend has no vectorized form of the operation.
+        """
+        return None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+class DecimalBackend(NumericBackend):
+    """decimal.Decimal arithmetic under `context`, or under the caller's current context when None."""
+    name = 'decimal'
+    type = Decimal
+
+    def __init__(self, context: Optional[decimal.Context] = None):
+        self.context = context
+
+    def parse(self, text: str) -> Decimal:
+        return Decimal(text)
+
+    def convert(self, value) -> Decimal:
+        if isinstance(value, float):
+            return Decimal(str(value))  # Keeps the shortest form: 0.1 rather than its binary expansion
+        if isinstance(value, Fraction):
+            return Decimal(value.numerator) / Decimal(value.denominator)
+        return Decimal(value)
+
+    def activate(self) -> ContextManager:
+        return nullcontext() if self.context is None else decimal.localcontext(self.context)
+
+    def __repr__(self) -> str:
+        if self.context is None:
+            return "DecimalBackend()"
+        return f"DecimalBackend(prec={self.context.prec}, rounding={self.context.rounding})"
+
+class FractionBackend(NumericBackend):
+    """Exact rational arithmetic with fractions.Fraction. Operands may be written as 1/3."""
+    name = 'fraction'
+    type = Fraction
+
+    def parse(self, text: str) -> Fraction:
+        try:
+            return Fraction(text)
+        except (ValueError, ZeroDivisionError) as e:
+            raise InvalidOperation(f"Invalid number: {text!r}") from e
+
+    def convert(self, value) -> Fraction:
+        if isinstance(value, float):
+            return Fraction(str(value))  # 0.1 as 1/10, not as the nearest binary fraction
+        return Fraction(value)
+
+class FloatBackend(NumericBackend):
+    """Binary float64 arithmetic, vectorized with NumPy for batches when it is available."""
+    name = 'float'
+    type = float
+
+    def parse(self, text: str) -> float:
+        try:
+            return float(text)
+        except ValueError as e:
+            raise InvalidOperation(f"Invalid number: {text!r}") from e
+
+    def convert(self, value) -> float:
+        return float(value)
+
+    def convert_many(self, values: Iterable) -> List[float]:
+        if hasattr(values, 'astype'):  # NumPy arrays: cast and unbox in two C loops
+            return values.astype(float).tolist()
+        return list(map(float, values))
+
+    def vectorized(self, operation: Callable) -> Optional[Callable[[List, List], Tuple[List, List[bool]]]]:
+        try:
+            import numpy  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            return None
+        from app.calculator.operations import ArithmeticOperations as AO  # pylint: disable=import-outside-toplevel
+        ufuncs = {AO.addition: numpy.add, AO.subtraction: numpy.subtract,
+                  AO.multiplication: numpy.multiply, AO.division: numpy.divide}
+        ufunc = ufuncs.get(operation)
+        if ufunc is None:
+            return None
+
+        def evaluate(a_values: List[float], b_values: List[float]) -> Tuple[List[Optional[float]], List[bool]]:
+            a_array = numpy.array(a_values, dtype=numpy.float64)
+            b_array = numpy.array(b_values, dtype=numpy.float64)
+            if ufunc is not numpy.divide:
+                return ufunc(a_array, b_array).tolist(), [False] * len(a_values)
+            zero_divisors = b_array == 0
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                results = numpy.divide(a_array, b_array).tolist()
+            if not zero_divisors.any():
+                return results, [False] * len(a_values)
+            undefined = zero_divisors.tolist()
+            return [None if masked else result for result, masked in zip(results, undefined)], undefined
+        return evaluate
+
+BACKENDS: Dict[str, type] = {
+    DecimalBackend.name: DecimalBackend,
+    FractionBackend.name: FractionBackend,
+    FloatBackend.name: FloatBackend,
+}
+
+_current_backend: ContextVar[NumericBackend] = ContextVar('numeric_backend', default=DecimalBackend())
+
+def create_backend(name: str, precision: Optional[int] = None, rounding: Optional[str] = None) -> NumericBackend:
+    """
+    Creates a backend by name. `precision` and `rounding` configure the context of the 'decimal' backend,
+    starting from a copy of the current context.
+
+    Raises:
+        ValueError: If there is no backend of that name, the precision or rounding mode is invalid, or they
+                    are given for another backend.
+    """
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown numeric backend '{name}'. Choose from: {', '.join(BACKENDS)}.")
+    if backend_class is not DecimalBackend:
+        if precision is not None or rounding is not None:
+            raise ValueError(f"Precision and rounding only apply to the decimal backend, not '{name}'.")
+        return backend_class()
+    if precision is None and rounding is None:
+        return DecimalBackend()
+    context = decimal.getcontext().copy()
+    if precision is not None:
+        context.prec = precision
+    if rounding is not None:
+        try:
+            context.rounding = rounding
+        except TypeError:
+            raise ValueError(f"Unknown rounding mode '{rounding}'.") from None
+    return DecimalBackend(context)
+
+def backend_from_settings(settings: Mapping[str, str]) -> NumericBackend:
+    """
+    Creates the backend selected by the CALC_NUMERIC_BACKEND setting, 'decimal' by default, with the
+    decimal context configured by CALC_DECIMAL_PRECISION and CALC_DECIMAL_ROUNDING.
+
+    Raises:
+        ValueError: If a setting is invalid.
+    """
+    name = settings.get('CALC_NUMERIC_BACKEND', 'decimal')
+    if name != 'decimal':
+        return create_backend(name)
+    precision = settings.get('CALC_DECIMAL_PRECISION')
+    rounding = settings.get('CALC_DECIMAL_ROUNDING')
+    return create_backend(name, int(precision) if precision else None, rounding or None)
+
+def get_backend() -> NumericBackend:
+    """Returns the numeric backend of the current thread or task."""
+    return _current_backend.get()
+
+def set_backend(backend: Union[str, NumericBackend]) -> NumericBackend:
+    """
+    Makes a backend, or the backend of that name, current for the rest of the session (the current thread
+    or task). A decimal backend with a context also installs that context.
+    """
+    if isinstance(backend, str):
+        backend = create_backend(backend)
+    if isinstance(backend, DecimalBackend) and backend.context is not None:
+        decimal.setcontext(backend.context.copy())
+    _current_backend.set(backend)
+    return backend
+
+@contextmanager
+def use_backend(backend: Union[str, NumericBackend, None]) -> Iterator[NumericBackend]:
+    """Makes a backend current inside a with block, such as one batch run. None keeps the current one."""
+    if backend is None:
+        yield get_backend()
+        return
+    if isinstance(backend, str):
+        backend = create_backend(backend)
+    token = _current_backend.set(backend)
+    try:
+        with backend.activate():
+            yield backend
+    finally:
+        _current_backend.reset(token)
+
+def parse_stored_number(text: str) -> Number:
+    """
+    Parses an operand read back from a history file, journal or database. The text of a Fraction (1/3)
+    becomes a Fraction; anything else becomes the exact Decimal of its digits.
+    """
+    return Fraction(text) if '/' in text else Decimal(text)
+
+# Operation helpers for every number type
+def is_integral(value: Number) -> bool:
+    """Returns whether a number has no fractional part."""
+    if isinstance(value, Decimal):
+        return value == value.to_integral_value()
+    if isinstance(value, Fraction):
+        return value.denominator == 1
+    return float(value).is_integer()
+
+def remainder(num1: Number, num2: Number) -> Number:
+    """The remainder of a division truncated toward zero, so it has the sign of the dividend."""
+    if isinstance(num1, Decimal):
+        return num1 % num2
+    if isinstance(num1, float) or isinstance(num2, float):
+        return math.fmod(num1, num2)
+    return num1 - num2 * math.trunc(num1 / num2)
+
+def power(num1: Number, num2: Number) -> Number:
+    """num1 ** num2, kept a Fraction for Fractions; fractional powers of Fractions go through the Decimal context."""
+    if isinstance(num1, Fraction) and not is_integral(num2):
+        return Fraction(_fraction_to_decimal(num1) ** _fraction_to_decimal(Fraction(num2)))
+    return num1 ** num2
+
+def square_root(value: Number) -> Number:
+    """The square root of a non-negative number, exact for Fractions that are perfect squares."""
+    if isinstance(value, Decimal):
+        return value.sqrt()
+    if isinstance(value, Fraction):
+        numerator, denominator = math.isqrt(value.numerator), math.isqrt(value.denominator)
+        if numerator * numerator == value.numerator and denominator * denominator == value.denominator:
+            return Fraction(numerator, denominator)
+        return Fraction(_fraction_to_decimal(value).sqrt())
+    return math.sqrt(value)
+
+def _fraction_to_decimal(value: Fraction) -> Decimal:
+    return Decimal(value.numerator) / Decimal(value.denominator)
@@ -1,10 +1,12 @@
 """calculator/operations.py
 This module defines the `ArithmeticOperations` class, which provides staticmethods for basic arithmetic
-operations including addition, subtraction, multiplication, and division. These methods are implemented
+operations including addition, subtraction, multiplication, division, power, modulo and square root. These methods are implemented
 with Decimal numbers to ensure precision, suitable for financial calculations or any scenario where
-floating-point arithmetic may lead to inaccuracies.
+floating-point arithmetic may lead to inaccuracies. They equally accept the Fraction and float numbers of
+the other numeric backends (see calculator/numeric.py).
 """
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
+from app.calculator.numeric import is_integral, power, remainder, square_root
 
 class ArithmeticOperations:
     """
@@ -75,3 +77,69 @@ class ArithmeticOperations:
             raise ZeroDivisionError("Cannot divide by zero.")
         else:
             return num1 / num2
+
+    @staticmethod
+    def power(num1: Decimal, num2: Decimal) -> Decimal:
+        """
+        Raise a Decimal number to the power of another.
+
+        Parameters:
+        - num1 (Decimal): The base.
+        - num2 (Decimal): The exponent.
+
+        Raises:
+        - ZeroDivisionError: If `num1` is zero and `num2` is negative.
+        - InvalidOperation: If the result is undefined: 0 to the power of 0, or a negative base with a
+          fractional exponent.
+
+        Returns:
+        - Decimal: `num1` raised to the power of `num2`.
+        """
+        if num1 == 0:
+            if num2 < 0:
+                raise ZeroDivisionError("Cannot divide by zero.")
+            if num2 == 0:
+                raise InvalidOperation("0 to the power of 0 is undefined.")
+        elif num1 < 0 and not is_integral(num2):
+            raise InvalidOperation("Cannot raise a negative number to a fractional power.")
+        return power(num1, num2)
+
+    @staticmethod
+    def modulo(num1: Decimal, num2: Decimal) -> Decimal:
+        """
+        Perform the remainder of the division between two Decimal numbers. As with Decimal's `%`, the
+        remainder has the sign of the dividend.
+
+        Parameters:
+        - num1 (Decimal): The dividend.
+        - num2 (Decimal): The divisor.
+
+        Raises:
+        - ZeroDivisionError: If `num2` is zero.
+
+        Returns:
+        - Decimal: The remainder of `num1` divided by `num2`.
+        """
+        if num2 == 0:
+            raise ZeroDivisionError("Cannot divide by zero.")
+        return remainder(num1, num2)
+
+    @staticmethod
+    def square_root(num1: Decimal, num2: Decimal = Decimal(0)) -> Decimal:
+        """
+        Perform the square root of a Decimal number. Like every operation it takes two operands, but
+        `num2` is not used.
+
+        Parameters:
+        - num1 (Decimal): The radicand.
+        - num2 (Decimal): Not used.
+
+        Raises:
+        - InvalidOperation: If `num1` is negative.
+
+        Returns:
+        - Decimal: The square root of `num1`.
+        """
+        if num1 < 0:
+            raise InvalidOperation("Cannot take the square root of a negative number.")
+        return square_root(num1)
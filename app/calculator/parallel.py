@@ -0,0 +1,184 @@
+"""calculator/parallel.py
+Defines the ParallelCalculator class for evaluating large batches of calculations on several CPU cores.
+A batch of (operation, num1, num2) tuples is split into chunks that are evaluated on a
+ProcessPoolExecutor. Every worker runs with a copy of the caller's decimal context and numeric backend so
+results match the single-process path exactly, and results and history entries are merged back in input order.
+
+Where processes can be forked, the workers are forked for each batch and inherit it, so the caller only
+sends index ranges and parses the results back; elsewhere the caller encodes every chunk for a reused pool.
+"""
+import os
+import decimal
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory as ch
+from app.calculator.numeric import NumericBackend, get_backend, set_backend, use_backend
+
+Operation = Tuple[Callable[[Decimal, Decimal], Decimal], Decimal, Decimal]
+Chunk = Tuple[Tuple[Callable, ...], List[int], List[str], List[str]]  # (operation table, codes, num1s, num2s)
+
+_BATCH: Sequence[Operation] = ()  # The batch being evaluated, inherited by the workers forked for it
+_FORK_LOCK = threading.Lock()     # Held while workers are forked with _BATCH set
+
+def _initialize_worker(context: decimal.Context, backend: NumericBackend):
+    """Install the parent's numeric backend and decimal context in a worker process."""
+    set_backend(backend)
+    decimal.setcontext(context)
+
+def _evaluate_chunk(chunk: Chunk) -> Tuple[List[Optional[str]], List[bool]]:
+    """
+    Evaluate one chunk of operations in a worker, masking arithmetic errors instead of raising.
+
+    Operands and results travel as strings and operations as indexes into a small table, because
+    pickling Decimal objects costs several times more than the arithmetic itself. The worker's numeric
+    backend parses them back.
+    """
+    table, codes, num1_strs, num2_strs = chunk
+    parse = get_backend().parse
+    results: List[Optional[str]] = []
+    undefined: List[bool] = []
+    for code, num1, num2 in zip(codes, num1_strs, num2_strs):
+        try:
+            results.append(str(table[code](parse(num1), parse(num2))))
+            undefined.append(False)
+        except ArithmeticError:
+            results.append(None)
+            undefined.append(True)
+    return results, undefined
+
+def _evaluate_range(bounds: Tuple[int, int]) -> Tuple[List[Optional[str]], List[bool]]:
+    """Evaluate one range of the inherited batch in a forked worker, encoding the results as strings."""
+    start, stop = bounds
+    results, undefined = _evaluate_in_process(_BATCH[start:stop])
+    return [None if result is None else str(result) for result in results], undefined
+
+def _evaluate_in_process(operations: Sequence[Operation]) -> Tuple[List[Optional[Decimal]], List[bool]]:
+    """Evaluate operations in the calling process, masking arithmetic errors instead of raising."""
+    results: List[Optional[Decimal]] = []
+    undefined: List[bool] = []
+    for operation, num1, num2 in operations:
+        try:
+            results.append(operation(num1, num2))
+            undefined.append(False)
+        except ArithmeticError:
+            results.append(None)
+            undefined.append(True)
+    return results, undefined
+
+def _encode_chunks(operations: Sequence[Operation], chunk_size: int) -> Iterator[Chunk]:
+    """Split operations into chunks encoded as an operation table, operation codes and operand strings."""
+    codes_by_operation = {}
+    for operation, _, _ in operations:
+        codes_by_operation.setdefault(operation, len(codes_by_operation))
+    table = tuple(codes_by_operation)
+    for start in range(0, len(operations), chunk_size):
+        window = operations[start:start + chunk_size]
+        yield (table,
+               [codes_by_operation[operation] for operation, _, _ in window],
+               [str(num1) for _, num1, _ in window],
+               [str(num2) for _, _, num2 in window])
+
+class ParallelCalculator:
+    """
+    Evaluates batches of calculations on a pool of worker processes.
+
+    When forking, each batch gets workers forked for it. Otherwise the pool is created on first use and
+    reused for later batches; use the instance as a context manager, or call close(), to shut it down.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 10_000,
+                 context: Optional[decimal.Context] = None, backend: Optional[NumericBackend] = None,
+                 fork: Optional[bool] = None) -> None:
+        """
+        Parameters:
+            workers (Optional[int]): Number of worker processes. Defaults to the machine's core count.
+                With a single worker the batch is evaluated in-process.
+            chunk_size (int): Number of operations sent to a worker at a time.
+            context (Optional[decimal.Context]): Decimal context used in every worker. Defaults to a
+                copy of the caller's current context.
+            backend (Optional[NumericBackend]): Numeric backend the workers parse operands and results
+                with. Defaults to the caller's current backend.
+            fork (Optional[bool]): Whether workers are forked for each batch and encode it themselves,
+                instead of the caller encoding every chunk. Defaults to whether the platform can fork.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.context = (context or decimal.getcontext()).copy()
+        self.backend = backend or get_backend()
+        self.fork = 'fork' in multiprocessing.get_all_start_methods() if fork is None else fork
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_initialize_worker,
+                                                 initargs=(self.context, self.backend))
+        return self._executor
+
+    def _map_chunks(self, operations: List[Operation]) -> Iterator[Tuple[List[Optional[str]], List[bool]]]:
+        """Evaluates the batch on the workers, yielding each chunk's encoded results in input order."""
+        if not self.fork:
+            return self._get_executor().map(_evaluate_chunk, _encode_chunks(operations, self.chunk_size))
+        global _BATCH  # pylint: disable=global-statement
+        ranges = [(start, min(start + self.chunk_size, len(operations)))
+                  for start in range(0, len(operations), self.chunk_size)]
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('fork'),
+                                       initializer=_initialize_worker, initargs=(self.context, self.backend))
+        with _FORK_LOCK:
+            _BATCH = operations
+            try:
+                # map() submits every range, which forks the workers while they can inherit the batch
+                chunks = executor.map(_evaluate_range, ranges)
+            finally:
+                _BATCH = ()
+        return _shutdown_after(chunks, executor)
+
+    def evaluate(self, operations: Iterable[Operation], record: bool = True) -> Tuple[List[Optional[Decimal]], List[bool]]:
+        """
+        Evaluates a batch of (operation, num1, num2) tuples.
+
+        Parameters:
+            operations (Iterable[Operation]): The calculations to evaluate.
+            record (bool): Whether to record the calculations in the history, in input order.
+
+        Returns:
+            Tuple[List[Optional[Decimal]], List[bool]]: The results in input order and a mask that is
+            True where the result is undefined (division by zero or another arithmetic error).
+        """
+        operations = list(operations)
+        if self.workers == 1:
+            with use_backend(self.backend), decimal.localcontext(self.context):
+                results, undefined = _evaluate_in_process(operations)
+        else:
+            results, undefined = [], []
+            parse = self.backend.parse
+            # Executor.map yields chunk results in submission order, whatever order workers finish in
+            for chunk_results, chunk_undefined in self._map_chunks(operations):
+                results.extend(None if result is None else parse(result) for result in chunk_results)
+                undefined.extend(chunk_undefined)
+
+        if record:
+            ch.add_calculations([Calculation(num1, num2, operation) for operation, num1, num2 in operations])
+        return results, undefined
+
+    def close(self):
+        """Shuts down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'ParallelCalculator':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def _shutdown_after(chunks: Iterator, executor: ProcessPoolExecutor) -> Iterator:
+    """Yields the chunks, then shuts down the executor whose workers were forked for them."""
+    with executor:
+        yield from chunks
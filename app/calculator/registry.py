@@ -0,0 +1,112 @@
+"""calculator/registry.py
+Defines the operation registry, the single place where the calculator's operations are declared. Each
+operation is registered once with its command name (`add`), the name stored in history files (the
+function name, `addition`), its arity and, optionally, its expression symbol (`+`). The registry keeps
+read-only dispatch tables that are rebuilt only when an operation is registered, so resolving an operation
+from the REPL, batch mode, the expression parser or a history file is a single dictionary lookup.
+
+Plugins can add operations at import time:
+
+    OPERATIONS.register('cube', cube, arity=1, description="Cube a number.")
+
+Unary operations take their operand as num1; num2 is recorded as 0.
+"""
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Callable, Dict, Iterator, Mapping, NamedTuple, Optional
+from app.calculator.operations import ArithmeticOperations as AO
+
+UNUSED_OPERAND = Decimal(0)  # The num2 of a unary operation
+
+class Operation(NamedTuple):
+    """A registered operation."""
+    command: str                                    # The REPL and batch command, e.g. 'add'
+    function: Callable[[Decimal, Decimal], Decimal]
+    arity: int = 2                                  # 1 for operations that only use num1
+    symbol: Optional[str] = None                    # The infix operator in expressions, e.g. '+'
+    description: str = ''
+
+    @property
+    def name(self) -> str:
+        """The name stored in history files, journals and databases: the function name."""
+        return self.function.__name__
+
+class OperationRegistry:
+    """
+    The registered operations and their dispatch tables.
+
+    Attributes:
+        commands (Mapping[str, Operation]): Operations by command name.
+        names (Mapping[str, Operation]): Operations by stored name.
+        symbols (Mapping[str, Operation]): Operations by expression symbol.
+        functions (Mapping[str, Callable]): Operation functions by stored name, for history readers.
+    """
+    def __init__(self):
+        self._operations: Dict[str, Operation] = {}
+        self.commands: Mapping[str, Operation] = MappingProxyType({})
+        self.names: Mapping[str, Operation] = MappingProxyType({})
+        self.symbols: Mapping[str, Operation] = MappingProxyType({})
+        self.functions: Mapping[str, Callable[[Decimal, Decimal], Decimal]] = MappingProxyType({})
+
+    def register(self, command: str, function: Callable[[Decimal, Decimal], Decimal], arity: int = 2,
+                 symbol: Optional[str] = None, description: str = '') -> Operation:
+        """
+        Registers an operation and rebuilds the dispatch tables. Registering the same operation again
+        has no effect.
+
+        Raises:
+            ValueError: If the arity is not 1 or 2, or the command, stored name or symbol is already taken
+                        by another operation.
+        """
+        operation = Operation(command, function, arity, symbol, description)
+        if self._operations.get(command) == operation:
+            return operation
+        if arity not in (1, 2):
+            raise ValueError(f"Operation '{command}' must take 1 or 2 operands, not {arity}.")
+        if command in self.commands:
+            raise ValueError(f"Operation '{command}' is already registered.")
+        if operation.name in self.names:
+            raise ValueError(f"An operation named '{operation.name}' is already registered.")
+        if symbol is not None and symbol in self.symbols:
+            raise ValueError(f"Symbol '{symbol}' is already used by '{self.symbols[symbol].command}'.")
+        self._operations[command] = operation
+        self._rebuild()
+        return operation
+
+    def unregister(self, command: str):
+        """Removes an operation. Calculations already holding its function keep working."""
+        del self._operations[command]
+        self._rebuild()
+
+    def _rebuild(self):
+        operations = self._operations.values()
+        self.commands = MappingProxyType(dict(self._operations))
+        self.names = MappingProxyType({operation.name: operation for operation in operations})
+        self.symbols = MappingProxyType({operation.symbol: operation for operation in operations
+                                         if operation.symbol is not None})
+        self.functions = MappingProxyType({operation.name: operation.function for operation in operations})
+
+    def get(self, command: str) -> Optional[Operation]:
+        """Returns the operation of a command name, or None if there is none."""
+        return self.commands.get(command)
+
+    def __getitem__(self, command: str) -> Operation:
+        return self.commands[command]
+
+    def __contains__(self, command: str) -> bool:
+        return command in self.commands
+
+    def __iter__(self) -> Iterator[Operation]:
+        return iter(self.commands.values())
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+OPERATIONS = OperationRegistry()
+OPERATIONS.register('add', AO.addition, symbol='+', description="Add two numbers together.")
+OPERATIONS.register('subtract', AO.subtraction, symbol='-', description="Subtract two numbers from one another.")
+OPERATIONS.register('multiply', AO.multiplication, symbol='*', description="Multiply two numbers together.")
+OPERATIONS.register('divide', AO.division, symbol='/', description="Divide two numbers from one another.")
+OPERATIONS.register('power', AO.power, symbol='^', description="Raise the first number to the power of the second.")
+OPERATIONS.register('modulo', AO.modulo, symbol='%', description="Remainder of dividing the first number by the second.")
+OPERATIONS.register('sqrt', AO.square_root, arity=1, description="Square root of a number.")
@@ -0,0 +1,245 @@
+"""calculator/ring_buffer.py
+Defines RingBufferHistory, a bounded storage backend for CalculationHistory. The most recent
+`capacity` calculations are kept in memory in a ring buffer; older ones are evicted to an append-only
+segment file on disk instead of being kept in RAM. Evicted entries stay reachable by index through a
+lazy page-in path, and hot/cold access counters are exposed for monitoring. With a retention limit the
+oldest evicted entries are eventually dropped for good, and the segment file is compacted once most of it
+is dead space.
+"""
+import os
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import MutableSequence
+from typing import Dict, Iterable, Iterator, List, Optional
+from app.calculator.calculation import Calculation
+from app.calculator.numeric import parse_stored_number
+from app.calculator.registry import OPERATIONS
+
+PAGE_SIZE = 256    # Evicted entries read from disk together on a page-in
+CACHED_PAGES = 8   # Paged-in pages kept in memory
+
+class RingBufferHistory(MutableSequence):
+    """
+    A MutableSequence of calculations holding at most `capacity` entries in memory.
+
+    Index 0 is the oldest calculation kept: indexes below `cold_size` refer to evicted entries in the
+    segment file and the rest to the in-memory ring. Memory use is the capacity plus eight bytes per
+    evicted entry for its file offset. With a `retention` limit, once more than a quarter over it, the
+    oldest evicted entries are dropped down to the limit, which bounds both. Deleted, overwritten and
+    dropped entries leave dead lines in the segment file, which is rewritten with only the live entries
+    once the dead ones outnumber them.
+    """
+
+    def __init__(self, capacity: int, spill_path: str, retention: Optional[int] = None) -> None:
+        """
+        Parameters:
+            capacity (int): Calculations kept in memory before the oldest are evicted to disk.
+            spill_path (str): Path of the segment file; it is truncated when the history is created.
+            retention (Optional[int]): Evicted calculations kept on disk; older ones are dropped. None
+                keeps them all.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        if retention is not None and retention < 0:
+            raise ValueError("retention must not be negative.")
+        self.capacity = capacity
+        self.retention = retention
+        self.spill_path = spill_path
+        directory = os.path.dirname(spill_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._segment = open(spill_path, 'w+b')
+        self._segment_size = 0
+        self._at_end = True  # False after a page-in moved the file position away from the end
+        self._hot: deque = deque()
+        self._offsets = array('Q')  # Segment byte offset of every evicted entry, oldest first
+        self._dead = 0  # Lines in the segment no offset refers to any more
+        self._pages: OrderedDict = OrderedDict()
+        self.hot_hits = 0
+        self.cold_hits = 0
+        self.page_ins = 0
+        self.evictions = 0
+        self.dropped = 0
+        self.compactions = 0
+
+    # Spilling and paging
+    def _spill(self, calculation: Calculation) -> int:
+        line = f"{calculation.operation.__name__},{calculation.num1},{calculation.num2}\n".encode('utf-8')
+        if not self._at_end:  # Only seek when needed: a seek flushes the write buffer
+            self._segment.seek(self._segment_size)
+            self._at_end = True
+        self._segment.write(line)
+        offset = self._segment_size
+        self._segment_size += len(line)
+        return offset
+
+    def _evict_oldest(self):
+        self._offsets.append(self._spill(self._hot.popleft()))
+        self._pages.pop((len(self._offsets) - 1) // PAGE_SIZE, None)  # That page just grew
+        self.evictions += 1
+        retention = self.retention
+        # Dropping in batches of a quarter of the retention keeps the cost of shifting the index amortized O(1)
+        if retention is not None and len(self._offsets) > retention + max(1, retention // 4):
+            excess = len(self._offsets) - retention
+            del self._offsets[:excess]
+            self.dropped += excess
+            self._invalidate_pages()
+            self._add_dead(excess)
+
+    def _add_dead(self, count: int):
+        self._dead += count
+        if self._dead > max(len(self._offsets), PAGE_SIZE):
+            self._compact()
+
+    def _compact(self):
+        """Rewrites the segment file with only the live entries, reclaiming the space of the dead ones."""
+        self._segment.flush()
+        temporary_path = self.spill_path + '.tmp'
+        offsets = array('Q')
+        size = 0
+        with open(temporary_path, 'wb') as compacted:
+            for offset in self._offsets:
+                self._segment.seek(offset)
+                line = self._segment.readline()
+                compacted.write(line)
+                offsets.append(size)
+                size += len(line)
+        self._segment.close()
+        os.replace(temporary_path, self.spill_path)
+        self._segment = open(self.spill_path, 'r+b')
+        self._segment.seek(size)
+        self._at_end = True
+        self._offsets = offsets  # Same entries at the same indexes, so cached pages stay valid
+        self._segment_size = size
+        self._dead = 0
+        self.compactions += 1
+
+    def _page(self, page: int) -> List[Calculation]:
+        entries = self._pages.get(page)
+        if entries is not None:
+            self._pages.move_to_end(page)
+            return entries
+        self._segment.flush()
+        self._at_end = False
+        entries = []
+        functions = OPERATIONS.functions
+        for offset in self._offsets[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]:
+            # Offsets are mostly ascending, so these seeks usually stay inside the read buffer
+            self._segment.seek(offset)
+            name, num1, num2 = self._segment.readline().decode('utf-8').rstrip('\n').split(',')
+            entries.append(Calculation(parse_stored_number(num1), parse_stored_number(num2), functions[name]))
+        self._pages[page] = entries
+        if len(self._pages) > CACHED_PAGES:
+            self._pages.popitem(last=False)
+        self.page_ins += 1
+        return entries
+
+    def _invalidate_pages(self):
+        self._pages.clear()
+
+    # Sequence protocol
+    @property
+    def cold_size(self) -> int:
+        """Number of evicted entries stored in the segment file."""
+        return len(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._hot)
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Calculation index out of range.")
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = self._normalize(index)
+        cold = len(self._offsets)
+        if index >= cold:
+            self.hot_hits += 1
+            return self._hot[index - cold]
+        self.cold_hits += 1
+        return self._page(index // PAGE_SIZE)[index % PAGE_SIZE]
+
+    def __iter__(self) -> Iterator[Calculation]:
+        for page in range((len(self._offsets) + PAGE_SIZE - 1) // PAGE_SIZE):
+            yield from self._page(page)
+        yield from list(self._hot)
+
+    def __setitem__(self, index: int, calculation: Calculation):
+        index = self._normalize(index)
+        cold = len(self._offsets)
+        if index >= cold:
+            self._hot[index - cold] = calculation
+        else:
+            self._offsets[index] = self._spill(calculation)
+            self._invalidate_pages()
+            self._add_dead(1)
+
+    def __delitem__(self, index: int):
+        index = self._normalize(index)
+        cold = len(self._offsets)
+        if index >= cold:
+            del self._hot[index - cold]
+        else:
+            del self._offsets[index]  # The line stays in the segment as dead space until a compaction
+            self._invalidate_pages()
+            self._add_dead(1)
+
+    def insert(self, index: int, calculation: Calculation):
+        """Inserts a calculation before the given index, evicting the oldest in-memory entry if full."""
+        cold = len(self._offsets)
+        if index < 0:
+            index = max(0, index + len(self))
+        if index >= cold:
+            self._hot.insert(index - cold, calculation)
+            if len(self._hot) > self.capacity:
+                self._evict_oldest()
+        else:
+            self._offsets.insert(index, self._spill(calculation))
+            self._invalidate_pages()
+
+    def append(self, calculation: Calculation):
+        """Appends a calculation, evicting the oldest in-memory entry if the ring is full."""
+        self._hot.append(calculation)
+        if len(self._hot) > self.capacity:
+            self._evict_oldest()
+
+    def extend(self, calculations: Iterable[Calculation]):
+        """Appends several calculations."""
+        for calculation in calculations:
+            self.append(calculation)
+
+    def clear(self):
+        """Removes every entry and truncates the segment file."""
+        self._hot.clear()
+        self._offsets = array('Q')
+        self._invalidate_pages()
+        self._segment.seek(0)
+        self._segment.truncate(0)
+        self._segment_size = 0
+        self._dead = 0
+        self._at_end = True
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hot/cold counters and sizes for monitoring."""
+        return {
+            'capacity': self.capacity,
+            'hot_size': len(self._hot),
+            'cold_size': len(self._offsets),
+            'hot_hits': self.hot_hits,
+            'cold_hits': self.cold_hits,
+            'page_ins': self.page_ins,
+            'evictions': self.evictions,
+            'dropped': self.dropped,
+            'dead_entries': self._dead,
+            'compactions': self.compactions,
+            'segment_bytes': self._segment_size,
+        }
+
+    def close(self):
+        """Closes the segment file."""
+        self._segment.close()
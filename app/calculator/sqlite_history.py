@@ -0,0 +1,232 @@
+"""calculator/sqlite_history.py
+Defines SQLiteHistory, a persistent storage backend for CalculationHistory built on the standard
+library's sqlite3 module. Calculations are rows of an indexed table in a WAL-mode database, so the
+history survives restarts, appends are committed in batched transactions, and queries such as "all
+divisions since T" or deletes by id run inside SQLite without loading the history into memory.
+"""
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableSequence
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Union
+from app.calculator.calculation import Calculation
+from app.calculator.numeric import parse_stored_number
+from app.calculator.registry import OPERATIONS
+
+FETCH_SIZE = 1000  # Rows read per query while iterating
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS calculations ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " operation TEXT NOT NULL,"
+    " num1 TEXT NOT NULL,"
+    " num2 TEXT NOT NULL,"
+    " created_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_calculations_operation ON calculations (operation)",
+    "CREATE INDEX IF NOT EXISTS idx_calculations_created_at ON calculations (created_at)",
+)
+
+class HistoryRecord(NamedTuple):
+    """A stored calculation with its row id and creation time (seconds since the epoch)."""
+    id: int
+    created_at: float
+    calculation: Calculation
+
+class SQLiteHistory(MutableSequence):
+    """
+    A MutableSequence of calculations stored in a SQLite database, oldest first.
+
+    Appends are buffered and written `batch_size` rows per transaction; any read or other change
+    writes the buffer first, and flush() or close() write it explicitly. The row ids are also kept in
+    memory in order, eight bytes per row, so positional access is a lookup of the row id followed by a
+    primary key seek. Inserting anywhere but the end is not supported because the row order is the row
+    id order. The database is assumed to have no other writer while it is open.
+    """
+
+    persistent = True  # Changes are saved to the database, so the history need not be saved to CSV
+
+    def __init__(self, path: str, batch_size: int = 100) -> None:
+        """
+        Parameters:
+            path (str): Database file, created with its schema if missing (':memory:' for a private database).
+            batch_size (int): Appended calculations buffered before they are committed together.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.lock = threading.RLock()  # The connection is shared with e.g. journal compaction threads
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, safe with WAL
+        with self._connection:
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+        self._pending: List[tuple] = []
+        self._ids = array('q', (row_id for (row_id,) in self._connection.execute(
+            "SELECT id FROM calculations ORDER BY id")))  # Row id of every committed calculation, in order
+
+    @staticmethod
+    def _row(calculation: Calculation, created_at: float) -> tuple:
+        return (calculation.operation.__name__, str(calculation.num1), str(calculation.num2), created_at)
+
+    @staticmethod
+    def _calculation(operation: str, num1: str, num2: str) -> Calculation:
+        return Calculation(parse_stored_number(num1), parse_stored_number(num2), OPERATIONS.functions[operation])
+
+    def flush(self):
+        """Commits the buffered appends in one transaction."""
+        with self.lock:
+            if not self._pending:
+                return
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO calculations (operation, num1, num2, created_at) VALUES (?, ?, ?, ?)",
+                    self._pending)
+                # AUTOINCREMENT numbers the rows of one transaction consecutively, ending at the sequence
+                last_id = self._connection.execute(
+                    "SELECT seq FROM sqlite_sequence WHERE name = 'calculations'").fetchone()[0]
+            self._ids.extend(range(last_id - len(self._pending) + 1, last_id + 1))
+            self._pending = []
+
+    def _row_id(self, index: int) -> int:
+        """Returns the row id at a position, from the in-memory id index."""
+        self.flush()
+        try:
+            return self._ids[index]
+        except IndexError:
+            raise IndexError("Calculation index out of range.") from None
+
+    def _select(self, where: str = "", parameters: tuple = (), after_id: int = -1) -> Iterator[HistoryRecord]:
+        """
+        Yields matching rows after `after_id` in id order, FETCH_SIZE rows per query. Each query resumes
+        after the last row seen, so every page is an index seek rather than an OFFSET scan.
+        """
+        clause = f" AND {where}" if where else ""
+        while True:
+            with self.lock:
+                self.flush()
+                rows = self._connection.execute(
+                    "SELECT id, created_at, operation, num1, num2 FROM calculations"
+                    f" WHERE id > ?{clause} ORDER BY id LIMIT {FETCH_SIZE}", (after_id, *parameters)).fetchall()
+            for row_id, created_at, operation, num1, num2 in rows:
+                yield HistoryRecord(row_id, created_at, self._calculation(operation, num1, num2))
+            if len(rows) < FETCH_SIZE:
+                return
+            after_id = rows[-1][0]
+
+    def _first_id_since(self, timestamp: float) -> Optional[int]:
+        """Returns the id of the first calculation created at or after `timestamp`, via the timestamp index."""
+        row = self._connection.execute(
+            "SELECT id FROM calculations WHERE created_at >= ? ORDER BY created_at, id LIMIT 1", (timestamp,)).fetchone()
+        return row[0] if row else None
+
+    # Sequence protocol
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._pending)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        with self.lock:
+            row = self._connection.execute(
+                "SELECT operation, num1, num2 FROM calculations WHERE id = ?", (self._row_id(index),)).fetchone()
+        return self._calculation(*row)
+
+    def __iter__(self) -> Iterator[Calculation]:
+        for record in self._select():
+            yield record.calculation
+
+    def __setitem__(self, index: int, calculation: Calculation):
+        with self.lock:
+            row_id = self._row_id(index)
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE calculations SET operation = ?, num1 = ?, num2 = ? WHERE id = ?",
+                    (calculation.operation.__name__, str(calculation.num1), str(calculation.num2), row_id))
+
+    def __delitem__(self, index: int):
+        with self.lock:
+            self.delete_by_id(self._row_id(index))
+
+    def insert(self, index: int, calculation: Calculation):
+        """Appends a calculation when `index` is at or past the end; other positions are not supported."""
+        if index < len(self):
+            raise NotImplementedError("SQLiteHistory can only append calculations.")
+        self.append(calculation)
+
+    def append(self, calculation: Calculation):
+        """Buffers a calculation, committing the buffer once it holds `batch_size` calculations."""
+        with self.lock:
+            self._pending.append(self._row(calculation, time.time()))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def extend(self, calculations: Iterable[Calculation]):
+        """Appends several calculations in one transaction."""
+        with self.lock:
+            created_at = time.time()
+            self._pending.extend(self._row(calculation, created_at) for calculation in calculations)
+            self.flush()
+
+    def clear(self):
+        """Deletes every calculation."""
+        with self.lock:
+            self._pending = []
+            with self._connection:
+                self._connection.execute("DELETE FROM calculations")
+            self._ids = array('q')
+
+    # Queries
+    def query(self, operation: Union[str, Callable, None] = None, since: Optional[float] = None,
+              until: Optional[float] = None) -> Iterator[HistoryRecord]:
+        """
+        Yields the stored calculations matching every given filter, oldest first.
+
+        Calculations are appended in creation order, so the time window is turned into a range of row
+        ids through the timestamp index, and an operation filter walks the operation index.
+
+        Parameters:
+            operation (str | Callable | None): Operation name such as 'division', or the operation itself.
+            since (float | None): Only calculations created at or after this time.
+            until (float | None): Only calculations created before this time.
+        """
+        conditions, parameters, after_id = [], [], -1
+        if operation is not None:
+            conditions.append("operation = ?")
+            parameters.append(operation if isinstance(operation, str) else operation.__name__)
+        with self.lock:
+            self.flush()
+            if since is not None:
+                first_id = self._first_id_since(since)
+                if first_id is None:
+                    return iter(())
+                after_id = first_id - 1
+                conditions.append("created_at >= ?")
+                parameters.append(since)
+            if until is not None:
+                end_id = self._first_id_since(until)
+                if end_id is not None:
+                    conditions.append("id < ?")
+                    parameters.append(end_id)
+        return self._select(" AND ".join(conditions), tuple(parameters), after_id)
+
+    def delete_by_id(self, row_id: int):
+        """Deletes the calculation with the given row id, raising KeyError if there is none."""
+        with self.lock:
+            self.flush()
+            with self._connection:
+                deleted = self._connection.execute("DELETE FROM calculations WHERE id = ?", (row_id,)).rowcount
+            if not deleted:
+                raise KeyError(row_id)
+            del self._ids[bisect_left(self._ids, row_id)]
+
+    def close(self):
+        """Commits buffered appends and closes the database."""
+        with self.lock:
+            self.flush()
+            self._connection.close()
@@ -0,0 +1,170 @@
+"""calculator/tracing.py
+Defines span tracing of REPL lines and commands down to the history: each span records where time went
+(parsing, computing, logging, persisting) and the whole trace is written as a Chrome trace-event JSON file,
+which chrome://tracing, Perfetto or speedscope can load.
+
+The shared TRACER is off by default; instrumented code checks `TRACER.enabled` once and otherwise runs
+exactly as before. A trace starts at the outermost traced call on a thread (a REPL line, or a command run
+on its own) and is sampled as a whole, so a sample rate below 1 keeps the overhead bounded without leaving
+traces with missing spans. The number of kept events is bounded too; later events are counted as dropped.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+class _TraceState(threading.local):
+    """Per thread: whether a trace is open and whether it is sampled."""
+    open = False
+    sampled = False
+
+class Tracer:
+    """
+    Collects spans of the sampled traces.
+
+    Attributes:
+        enabled (bool): Whether instrumented code traces anything. Defaults to False.
+        sample_rate (float): The fraction of traces kept, spread evenly (0.25 keeps every fourth trace).
+        max_events (int): The most events kept; later events are dropped and counted.
+        dropped (int): Events dropped since the last reset because max_events was reached.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.max_events = 1_000_000
+        self.dropped = 0
+        self._credit = 0.0
+        self._lock = threading.Lock()
+        self._state = _TraceState()  # Class defaults, since a missing thread-local attribute is slow to look up
+        self._events: List[Tuple[str, str, int, int, int]] = []  # (category, name, start ns, end ns, thread id)
+        self._thread_names: Dict[int, str] = {}
+
+    def enable(self, sample_rate: float = 1.0, max_events: Optional[int] = None):
+        """
+        Starts tracing, keeping a fraction `sample_rate` of the traces and at most `max_events` events.
+
+        Raises:
+            ValueError: If the sample rate is not between 0 and 1.
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"Sampling rate must be between 0 and 1, not {sample_rate}.")
+        self.sample_rate = sample_rate
+        if max_events is not None:
+            self.max_events = max_events
+        self._credit = 0.0
+        self.enabled = True
+
+    def disable(self):
+        """Stops tracing. Recorded events are kept until reset()."""
+        self.enabled = False
+
+    def reset(self):
+        """Discards every recorded event."""
+        with self._lock:
+            self._events.clear()
+            self._thread_names.clear()
+            self.dropped = 0
+
+    @property
+    def events(self) -> List[Tuple[str, str, int, int, int]]:
+        """The recorded events as (category, name, start ns, end ns, thread id), in order of completion."""
+        return list(self._events)
+
+    def _sample(self) -> bool:
+        # Credit accumulation spreads the kept traces evenly. It takes no lock: a race between threads can
+        # only shift which trace is kept, and a lock would cost more than an unsampled trace
+        self._credit += self.sample_rate
+        if self._credit < 1:
+            return False
+        self._credit -= 1
+        return True
+
+    def trace(self, category: str, name: str, function: Callable, /, *args):
+        """
+        Calls function(*args) as a span of the current trace. Outside any trace it starts one, which is kept
+        or skipped as a whole according to the sample rate.
+        """
+        state = self._state
+        if state.open:
+            return self.span(category, name, function, *args) if state.sampled else function(*args)
+        sampled = self._sample()
+        state.open, state.sampled = True, sampled
+        try:
+            if not sampled:
+                return function(*args)
+            thread = threading.current_thread()
+            self._thread_names.setdefault(thread.ident, thread.name)
+            return self.span(category, name, function, *args)
+        finally:
+            state.open = state.sampled = False
+
+    def span(self, category: str, name: str, function: Callable, /, *args):
+        """
+        Calls function(*args), recording it as a span if a sampled trace is open on this thread. Unlike
+        trace() it never starts a trace, so it suits code that also runs outside the traced paths.
+        """
+        if not self._state.sampled:
+            return function(*args)
+        start = time.perf_counter_ns()
+        try:
+            return function(*args)
+        finally:
+            self.record(category, name, start, time.perf_counter_ns())
+
+    def record(self, category: str, name: str, start_ns: int, end_ns: int):
+        """Records a span from perf_counter_ns() timestamps, such as one that does not fit a single call."""
+        # list.append is atomic, so spans from several threads need no lock; the bound may be passed by a few
+        if len(self._events) >= self.max_events:
+            self.dropped += 1
+            return
+        self._events.append((category, name, start_ns, end_ns, threading.get_ident()))
+
+    def trace_handlers(self, logger: Optional[logging.Logger] = None):
+        """
+        Records a 'logging' span for every record the handlers of `logger` (the root logger by default)
+        handle within a sampled trace. With queue logging this is the time to enqueue the record.
+        """
+        for handler in (logger or logging.getLogger()).handlers:
+            if not isinstance(handler.handle, functools.partial):  # Not already traced
+                handler.handle = functools.partial(self.span, 'logging', type(handler).__name__, handler.handle)
+
+    def to_chrome_trace(self) -> dict:
+        """Returns the recorded spans as a Chrome trace-event document, with timestamps in microseconds."""
+        pid = os.getpid()
+        with self._lock:
+            events, thread_names, dropped = list(self._events), dict(self._thread_names), self.dropped
+        trace_events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+                        for tid, thread_name in thread_names.items()]
+        trace_events += [{'name': name, 'cat': category, 'ph': 'X', 'ts': start / 1000, 'dur': (end - start) / 1000,
+                          'pid': pid, 'tid': tid} for category, name, start, end, tid in events]
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms',
+                'otherData': {'sample_rate': self.sample_rate, 'dropped_events': dropped}}
+
+    def write_chrome_trace(self, path: str):
+        """Writes the trace to a JSON file, replaced atomically so a viewer never loads it half-written."""
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_chrome_trace(), file)
+        os.replace(temporary_path, path)
+        logging.info(f"Trace of {len(self._events)} spans written to {path}")
+
+def traced(category: str, name: Optional[str] = None):
+    """
+    Decorates a function so that, while tracing is on, every call is traced as a span named after the
+    function (or `name`), starting a trace when none is open.
+    """
+    def decorate(function: Callable) -> Callable:
+        span_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if TRACER.enabled:
+                return TRACER.trace(category, span_name, functools.partial(function, **kwargs) if kwargs else function, *args)
+            return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+TRACER = Tracer()
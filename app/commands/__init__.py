@@ -3,7 +3,12 @@ This module defines the core command pattern implementations including the base
 and the CommandHandler for managing and executing commands. It enables the application to
 extend its functionality dynamically through commands, facilitating a plugin architecture.
 """
+import importlib
 import logging
+from app.calculator.calc_utils import CalculationError
+from app.calculator.metrics import METRICS
+from app.calculator.tracing import TRACER
+from app.profiling import PROFILER
 
 class Command:
     """
@@ -22,6 +27,8 @@ class Command:
     def execute(self, *args, **kwargs):
         """
         The method to execute the command's logic. This method should be overridden in subclasses.
+        A command that fails without raising may return an ErrorResult (see app.calculator.metrics) so
+        the failure is counted by the command metrics.
 
         Args:
             *args: Variable length argument list.
@@ -32,6 +39,71 @@ class Command:
         """
         raise NotImplementedError("Command execution not implemented.")
 
+    def evaluate(self, *args):
+        """
+        Runs the command non-interactively with the given arguments and returns its output as text,
+        without prompting for input or printing. Commands that can only run interactively keep this
+        default implementation.
+
+        Args:
+            *args: The command arguments, for example the operands of an arithmetic command.
+
+        Raises:
+            NotImplementedError: If the command does not support non-interactive evaluation.
+        """
+        raise NotImplementedError(f"Command '{self.name}' is only available interactively.")
+
+    def available_remotely(self, *args) -> bool:
+        """
+        Whether clients of the calculator server may evaluate the command with the given arguments.
+        Commands that write files on the host or change process-wide state return False. Defaults to True.
+
+        Args:
+            *args: The command arguments.
+        """
+        return True
+
+class LazyCommand(Command):
+    """
+    A stand-in for a plugin command, registered from the plugin manifest with the command's name and
+    description. The plugin module is imported and the real command created the first time the command
+    is executed or evaluated, so listing the commands imports nothing.
+    """
+    def __init__(self, name, description, module, class_name):
+        """
+        Args:
+            name (str): The command name.
+            description (str): The command description.
+            module (str): The module defining the command class.
+            class_name (str): The name of the command class.
+        """
+        super().__init__()
+        self.name = name
+        self.description = description
+        self.module = module
+        self.class_name = class_name
+        self._command = None
+
+    def load(self):
+        """Imports the plugin module and creates the real command, once."""
+        if self._command is None:
+            plugin_module = importlib.import_module(self.module)
+            self._command = getattr(plugin_module, self.class_name)()
+            logging.info(f"Plugin command '{self.name}' loaded from {self.module}.")
+        return self._command
+
+    def execute(self, *args, **kwargs):
+        """Executes the real command, loading it first if needed."""
+        return self.load().execute(*args, **kwargs)
+
+    def evaluate(self, *args):
+        """Evaluates the real command, loading it first if needed."""
+        return self.load().evaluate(*args)
+
+    def available_remotely(self, *args) -> bool:
+        """Asks the real command, loading it first if needed."""
+        return self.load().available_remotely(*args)
+
 class CommandHandler:
     """
     Manages registration and execution of commands within the application. It acts as a central 
@@ -82,6 +154,46 @@ class CommandHandler:
             logging.error(f"Command '{name}' not found.")
             raise KeyError
         try:
-            command.execute(*args)
+            _invoke(name, command.execute, *args)
         except Exception as e:
             logging.error(f"Error executing command '{name}': {e}")
+
+    def evaluate_command(self, name, *args):
+        """
+        Evaluates a command by name without user interaction and returns its output as text.
+
+        Args:
+            name (str): The name of the command to evaluate.
+            *args: Arguments to pass to the command's evaluate method.
+
+        Returns:
+            str: The command output, or an error message if evaluation failed.
+
+        Raises:
+            KeyError: If the command is not registered.
+        """
+        command = self.commands.get(name)
+        if not command:
+            logging.error(f"Command '{name}' not found.")
+            raise KeyError(name)
+        try:
+            return _invoke(name, command.evaluate, *args)
+        except CalculationError as e:  # Already logged, and its message is the one to show
+            return str(e)
+        except Exception as e:
+            logging.error(f"Error evaluating command '{name}': {e}")
+            return f"Error: {e}"
+
+def _invoke(name, method, *args):
+    """
+    Calls a command's execute or evaluate method, as a span while tracing, under the CPU profile while
+    profiling and timed when metrics are on. The metrics count a call as failed when it raises or returns
+    an ErrorResult; the interactive prompts, which report each input's errors themselves, are not counted.
+    """
+    if TRACER.enabled:
+        method, args = TRACER.trace, ('command', name, method, *args)
+    if PROFILER.cpu_profile is not None:
+        method, args = PROFILER.runcall, (method, *args)
+    if METRICS.enabled:
+        return METRICS.timed('command', name, method, *args)
+    return method(*args)
@@ -0,0 +1,116 @@
+"""app/commands/manifest.py
+This module maintains a cached manifest of the command plugins: for every plugin package it records the
+name, description, module and class of each command it defines, together with the modification time of
+the plugin's source files. While the sources are unchanged, the application registers its commands from
+the manifest without importing a single plugin module; a plugin is imported again only when one of its
+files changes or when one of its commands is first used.
+"""
+import importlib
+import json
+import logging
+import os
+from typing import Dict, List
+from app.commands import Command
+
+MANIFEST_VERSION = 1
+
+def default_manifest_path(settings) -> str:
+    """
+    Returns the manifest path configured in `settings` (a mapping such as os.environ): CALC_PLUGIN_MANIFEST,
+    or .plugin_manifest.json in DATA_DIR.
+    """
+    return settings.get('CALC_PLUGIN_MANIFEST') or os.path.join(settings.get('DATA_DIR', './'), '.plugin_manifest.json')
+
+class PluginManifest:
+    """
+    Reads, refreshes and writes the JSON manifest of the plugins found in a plugins directory.
+    """
+    def __init__(self, path: str, plugins_path: str = 'app/plugins', plugins_package: str = 'app.plugins'):
+        """
+        Args:
+            path (str): The manifest file.
+            plugins_path (str): The directory holding one package per plugin.
+            plugins_package (str): The package name of that directory.
+        """
+        self.path = path
+        self.plugins_path = plugins_path
+        self.plugins_package = plugins_package
+
+    def plugin_mtimes(self) -> Dict[str, float]:
+        """
+        Returns the latest modification time of the Python files of every plugin package, found with
+        directory listings and stat calls only.
+        """
+        mtimes = {}
+        for entry in sorted(os.scandir(self.plugins_path), key=lambda entry: entry.name):
+            init_path = os.path.join(entry.path, '__init__.py')
+            if not entry.is_dir() or not os.path.exists(init_path):
+                continue
+            mtimes[entry.name] = max(os.stat(os.path.join(entry.path, name)).st_mtime
+                                     for name in os.listdir(entry.path) if name.endswith('.py'))
+        return mtimes
+
+    def read(self) -> Dict[str, dict]:
+        """Returns the cached plugin entries, or an empty mapping if the manifest is missing or unreadable."""
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION or manifest.get('package') != self.plugins_package:
+            return {}
+        return manifest.get('plugins', {})
+
+    def write(self, plugins: Dict[str, dict]):
+        """Writes the plugin entries, replacing the manifest atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': MANIFEST_VERSION, 'package': self.plugins_package, 'plugins': plugins}, file, indent=1)
+        os.replace(temporary_path, self.path)
+
+    def scan_plugin(self, plugin_name: str) -> List[dict]:
+        """
+        Imports one plugin package and describes the commands it defines, the same way
+        App.register_plugin_commands discovers them.
+        """
+        plugin_module = importlib.import_module(f'{self.plugins_package}.{plugin_name}')
+        commands = []
+        for item_name in dir(plugin_module):
+            item = getattr(plugin_module, item_name)
+            if isinstance(item, type) and issubclass(item, Command) and item is not Command:
+                command = item()
+                commands.append({'name': command.name, 'description': command.description,
+                                 'module': item.__module__, 'class': item.__qualname__})
+        return commands
+
+    def load(self) -> List[dict]:
+        """
+        Returns the commands of every plugin, rescanning only plugins that are new or whose files changed
+        since the manifest was written, and rewriting the manifest if anything was rescanned.
+
+        Returns:
+            List[dict]: One entry per command with its 'name', 'description', 'module' and 'class'.
+        """
+        cached = self.read()
+        plugins = {}
+        changed = False
+        for plugin_name, mtime in self.plugin_mtimes().items():
+            entry = cached.get(plugin_name)
+            if entry is None or entry.get('mtime') != mtime:
+                try:
+                    entry = {'mtime': mtime, 'commands': self.scan_plugin(plugin_name)}
+                except ImportError as e:
+                    logging.error(f"Error importing plugin {plugin_name}: {e}")
+                    continue
+                except Exception as e:
+                    logging.error(f"Error loading plugin {plugin_name}: {e}")
+                    continue
+                changed = True
+            plugins[plugin_name] = entry
+        if changed or plugins.keys() != cached.keys():
+            self.write(plugins)
+            logging.info(f"Plugin manifest {self.path} updated.")
+        return [command for entry in plugins.values() for command in entry['commands']]
@@ -0,0 +1,38 @@
+"""app/lazy_imports.py
+This module provides a small lazy import layer. A module bound with lazy_import() is a placeholder
+that imports the real module on its first attribute access, so optional or heavy dependencies cost
+nothing at startup for sessions that never use them.
+"""
+import importlib
+from types import ModuleType
+
+class LazyModule(ModuleType):
+    """
+    A placeholder for a module that has not been imported yet. The first attribute lookup imports the
+    module; every lookup is then forwarded to it.
+    """
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        # Only called for attributes not set on the placeholder itself, e.g. by unittest.mock.patch
+        return getattr(self._load(), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Returns a placeholder for the named module that imports it on first use.
+
+    Args:
+        name (str): The absolute module name, such as 'dotenv'.
+    """
+    return LazyModule(name)
@@ -0,0 +1,98 @@
+"""app/logging_pipeline.py
+This module provides the non-blocking logging mode of the application. start_queue_logging() moves the
+root logger's handlers (the rotating log file and stderr from logging.conf) behind a QueueListener, so a
+calculation only appends its records to an in-memory queue and a background thread formats and writes
+them. Records are queued unformatted: their %-style arguments are merged into the message on the
+listener thread, not on the hot path.
+
+Per-operation records are logged to the OPERATION_LOGGER logger, whose INFO and DEBUG records can be
+sampled with set_operation_sampling(); warnings and errors are always kept.
+"""
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+OPERATION_LOGGER = 'calculator.operations'  # Logger of the records emitted for every calculation
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction `rate` of the records below WARNING, spread evenly (a rate of 0.25 keeps every
+    fourth record, a rate of 0 none), and every record of level WARNING and above.
+    """
+    def __init__(self, rate: float):
+        super().__init__()
+        if not 0 <= rate <= 1:
+            raise ValueError(f"Sampling rate must be between 0 and 1, not {rate}.")
+        self.rate = rate
+        self._credit = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            self._credit += self.rate
+            if self._credit < 1:
+                return False
+            self._credit -= 1
+        return True
+
+class LocalQueueHandler(QueueHandler):
+    """
+    A QueueHandler for a listener in the same process. QueueHandler.prepare() formats each record in the
+    calling thread so it can be pickled; within one process the record is enqueued as is, so formatting
+    happens on the listener thread. Logged arguments must therefore not be mutated after the call.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[LocalQueueHandler] = None
+
+def start_queue_logging() -> QueueListener:
+    """
+    Routes the root logger's records through a queue to its current handlers, which then run on a
+    background thread. Calling it again returns the running listener. The queue is drained at exit.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+    root = logging.getLogger()
+    handlers = [handler for handler in root.handlers if not isinstance(handler, QueueHandler)]
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = LocalQueueHandler(records)
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_queue_logging)
+    logging.info("Queue logging started with %d handler(s).", len(handlers))
+    return _listener
+
+def stop_queue_logging():
+    """Writes out the queued records, stops the background thread and gives the handlers back to the root logger."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()  # Processes every record still in the queue first
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = _queue_handler = None
+    atexit.unregister(stop_queue_logging)
+
+def set_operation_sampling(rate: float):
+    """
+    Keeps only a fraction `rate` of the INFO and DEBUG records of OPERATION_LOGGER. A rate of 1 keeps
+    them all.
+    """
+    logger = logging.getLogger(OPERATION_LOGGER)
+    for existing in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+        logger.removeFilter(existing)
+    if rate < 1:
+        logger.addFilter(SamplingFilter(rate))
@@ -0,0 +1,88 @@
+"""app/oneshot.py
+This module runs a single command given on the command line, as in `python main.py add 2 3`, and exits.
+It is the fast path for scripts that start the calculator once per calculation: it skips the REPL, the
+copy of the environment into settings, the history configuration and the file log handler, and imports
+only the plugin that defines the requested command, found through the plugin manifest. The numeric
+backend is still selected from the environment, as in the REPL, or by the --backend option.
+"""
+import logging
+import os
+import sys
+from typing import TYPE_CHECKING, Optional
+from app.commands import LazyCommand
+from app.commands.manifest import PluginManifest, default_manifest_path
+
+if TYPE_CHECKING:  # The numeric module is imported when a command runs
+    from app.calculator.numeric import NumericBackend
+
+EXIT_OK = 0
+EXIT_ERROR = 1           # The command failed
+EXIT_UNKNOWN_COMMAND = 2
+
+def configure_oneshot_logging(log: bool = False):
+    """
+    Sends warnings and errors to stderr. With `log`, the application's full logging configuration
+    (logging.conf and its log file) is used instead.
+    """
+    if log:
+        from app import App
+        os.makedirs('logs', exist_ok=True)
+        App.configure_logging()
+    else:
+        logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+def find_command(name: str):
+    """
+    Returns a LazyCommand for the named plugin command, or None if no plugin defines it. Only the manifest
+    is read; the plugin itself is imported when the command runs.
+    """
+    manifest = PluginManifest(default_manifest_path(os.environ), 'app/plugins', 'app.plugins')
+    for entry in manifest.load():
+        if entry['name'] == name:
+            return LazyCommand(entry['name'], entry['description'], entry['module'], entry['class'])
+    return None
+
+def select_backend(backend: Optional[str] = None) -> 'NumericBackend':
+    """
+    Returns the numeric backend to run with: the named one if given, otherwise the one CALC_NUMERIC_BACKEND,
+    CALC_DECIMAL_PRECISION and CALC_DECIMAL_ROUNDING configure, or the default decimal backend if they are
+    invalid.
+    """
+    from app.calculator.numeric import backend_from_settings, create_backend
+    if backend:
+        return create_backend(backend)
+    try:
+        return backend_from_settings(os.environ)
+    except ValueError as e:
+        logging.warning(f"Invalid numeric backend settings: {e}. Using the default decimal backend.")
+        return create_backend('decimal')
+
+def run_command(name: str, args, log: bool = False, backend: Optional[str] = None) -> int:
+    """
+    Evaluates one command non-interactively and prints its output.
+
+    Args:
+        name (str): The command name, for example 'add'.
+        args (list): The command arguments, for example the two operands.
+        log (bool): Use the application's file logging instead of warnings on stderr only.
+        backend (Optional[str]): The numeric backend, overriding CALC_NUMERIC_BACKEND.
+
+    Returns:
+        int: The process exit code.
+    """
+    configure_oneshot_logging(log)
+    command = find_command(name)
+    if command is None:
+        print(f"Unknown command: {name}", file=sys.stderr)
+        return EXIT_UNKNOWN_COMMAND
+    from app.calculator.numeric import use_backend
+    try:
+        with use_backend(select_backend(backend)):
+            output = command.evaluate(*args)
+    except Exception as e:
+        from app.calculator.calc_utils import CalculationError  # Loaded with the plugin anyway
+        logging.debug(f"Command '{name}' failed: {e}")
+        print(e if isinstance(e, CalculationError) else f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    print(output)
+    return EXIT_OK
@@ -5,26 +5,31 @@ These utilities support a consistent user experience across different arithmetic
 such as addition, subtraction, multiplication, and division, by standardizing input handling
 and execution feedback.
 """
-from app.calculator.calc_utils import calculate_and_print
+from app.calculator.calc_utils import CalculationError, calculate, calculate_and_print
+from app.calculator.metrics import ErrorResult
+from app.calculator.registry import OPERATIONS
+from app.calculator.tracing import traced
 import logging
 
+@traced('plugin')
 def execute_operation(user_input_prompt, operation_name):
     """
     Executes an arithmetic operation based on user input and the specified operation name.
 
     Parameters:
     - user_input_prompt (str): The prompt to display to the user for input.
-    - operation_name (str): The name of the operation to perform ('add', 'subtract', 'multiply', 'divide').
+    - operation_name (str): The name of the operation to perform, as registered in the operation registry.
 
     The function leverages a while loop to continuously prompt the user for input, allowing
     multiple operations to be performed in sequence. The loop can be exited by typing 'exit',
     providing a user-friendly way to return to the main menu.
     """
     logging.info(f"Starting {operation_name} operation.")
+    arity = operation_arity(operation_name)
     print(user_input_prompt)
-    print("\tEnter your two numbers separated by space")
+    print("\tEnter your two numbers separated by space" if arity == 2 else "\tEnter a number")
     print("\tType 'exit' at any time to return to the main menu.")
-    print("\t\t[Example]: 2 3")
+    print("\t\t[Example]: 2 3" if arity == 2 else "\t\t[Example]: 9")
 
     while True:
         user_input = input(f"[{operation_name.capitalize()}]:   ")
@@ -34,13 +39,82 @@ def execute_operation(user_input_prompt, operation_name):
             break
 
         try:
-            num1_str, num2_str = parse_input(user_input)
+            num1_str, num2_str = parse_operands(user_input, arity)
             calculate_and_print(num1_str, num2_str, operation_name)
             print(f"Continue to {operation_name} or type 'exit' to return to the main menu.\n")
         except Exception as e:
             logging.warning(f"Invalid input in {operation_name} operation: {e}\n")
             print(f"Error: {e}\nPlease try again or type 'exit' to exit.\n")
 
+def execute_inline(args, operation_name):
+    """
+    Performs an arithmetic operation on operands given inline with the command, as in `add 2 3`, and
+    prints the result without prompting.
+
+    Parameters:
+    - args (tuple): The command arguments, expected to be the operands of the operation.
+    - operation_name (str): The name of the operation to perform.
+
+    Returns:
+    The printed message, an ErrorResult if the operation failed.
+    """
+    try:
+        message = evaluate_operation(args, operation_name)
+    except CalculationError as e:  # Already logged
+        message = ErrorResult(str(e), e.error_type)
+    except ValueError as e:
+        logging.warning(f"Invalid inline arguments for {operation_name}: {e}")
+        message = ErrorResult(f"Error: {e}", type(e).__name__)
+    print(message)
+    return message
+
+def evaluate_operation(args, operation_name):
+    """
+    Evaluates an arithmetic operation on operands passed as command arguments, without prompting.
+
+    Parameters:
+    - args (tuple): The command arguments, expected to be as many operands as the operation takes.
+    - operation_name (str): The name of the operation to perform.
+
+    Returns:
+    The result message of the operation.
+
+    Raises:
+    ValueError: If the number of arguments does not match the operation's arity.
+    CalculationError: If an operand is not a number or the operation failed, with the error message.
+    """
+    num1_str, num2_str = parse_operands(' '.join(args), operation_arity(operation_name))
+    return calculate(num1_str, num2_str, operation_name, strict=True)
+
+def operation_arity(operation_name):
+    """
+    Returns the number of operands an operation takes, from the operation registry. Names that are not
+    registered are treated as binary operations.
+    """
+    operation = OPERATIONS.get(operation_name)
+    return 2 if operation is None else operation.arity
+
+def parse_operands(user_input, arity):
+    """
+    Parses the user input into the operands of an operation taking `arity` operands.
+
+    Parameters:
+    - user_input (str): A string input by the user.
+    - arity (int): The number of operands, 1 or 2.
+
+    Returns:
+    A tuple of two operands as strings; the second is '0' for a unary operation.
+
+    Raises:
+    ValueError: If the input format is incorrect.
+    """
+    if arity == 2:
+        return parse_input(user_input)
+    parts = user_input.split()
+    if len(parts) != 1:
+        raise ValueError("Invalid input format. Please use: <operand>")
+    return parts[0], '0'
+
 def parse_input(user_input):
     """
     Parses the user input into two operands.
@@ -3,7 +3,7 @@ This module defines the AddCommand class for performing addition operations. It
 base class, inheriting its interface for integration into the application's command structure.
 """
 from app.commands import Command
-from app.plugins import execute_operation
+from app.plugins import evaluate_operation, execute_inline, execute_operation
 import logging
 
 class AddCommand(Command):
@@ -20,7 +20,16 @@ class AddCommand(Command):
         """
         Executes the addition operation. Prompts the user for two numbers to add together
         and displays the result.
+        With two operands given inline (e.g. `add 2 3`), evaluates them directly instead.
         """
+        if args:
+            return execute_inline(args, self.name)
         logging.info("Executing addition command")
         user_input_prompt = "Operation: Addition\n"
         execute_operation(user_input_prompt, self.name)
+
+    def evaluate(self, *args):
+        """
+        Evaluates the addition of the two operands given as arguments and returns the result message.
+        """
+        return evaluate_operation(args, self.name)
@@ -3,7 +3,7 @@ This module defines the DivideCommand class for performing division operations.
 base class, inheriting its interface for integration into the application's command structure.
 """
 from app.commands import Command
-from app.plugins import execute_operation
+from app.plugins import evaluate_operation, execute_inline, execute_operation
 import logging
 
 class DivideCommand(Command):
@@ -19,7 +19,16 @@ class DivideCommand(Command):
     def execute(self, *args):
         """
         Executes the division operation. Prompts the user for two numbers to divide and displays the result.
+        With two operands given inline (e.g. `divide 2 3`), evaluates them directly instead.
         """
+        if args:
+            return execute_inline(args, self.name)
         logging.info("Executing division command")
         user_input_prompt = "Operation: Division\n"
         execute_operation(user_input_prompt, self.name)
+
+    def evaluate(self, *args):
+        """
+        Evaluates the division of the two operands given as arguments and returns the result message.
+        """
+        return evaluate_operation(args, self.name)
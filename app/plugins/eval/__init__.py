@@ -0,0 +1,68 @@
+"""app/plugins/eval/__init__.py
+This module defines the EvalCommand class for evaluating arithmetic expressions such as `(2 + 3) * 4 / 7`.
+It extends the Command base class, inheriting its interface for integration into the application's
+command structure.
+"""
+from app.commands import Command
+from app.calculator import Calculator
+from app.calculator.expression import ExpressionError
+from app.calculator.metrics import ErrorResult
+import logging
+
+def evaluate_expression_message(expression: str) -> str:
+    """
+    Evaluates an expression, recording its sub-operations in the history, and returns the result message
+    or an error message as an ErrorResult.
+    """
+    logging.info(f"Evaluating expression: {expression}")
+    try:
+        result = Calculator.evaluate(expression)
+    except ExpressionError as e:
+        logging.warning(f"Invalid expression '{expression}': {e}")
+        return ErrorResult(f"Invalid expression: {e}", type(e).__name__)
+    except ZeroDivisionError:
+        logging.warning("Division by zero attempt.")
+        return ErrorResult("An error occurred: Cannot divide by zero", 'ZeroDivisionError')
+    except ArithmeticError as e:
+        logging.warning(f"Undefined result in expression '{expression}': {e}")
+        return ErrorResult(f"An error occurred: {e}", type(e).__name__)
+    logging.info(f"Expression {expression} evaluated. Result: {result}")
+    return f"The result of {expression} is equal to {result}"
+
+class EvalCommand(Command):
+    """
+    A command for evaluating an arithmetic expression with + - * / % ^, unary functions such as sqrt()
+    and parentheses. This class provides the logic to evaluate an expression given inline or entered at
+    its prompt.
+    """
+    def __init__(self):
+        super().__init__()
+        self.name = "eval"
+        self.description = "Evaluate an arithmetic expression, e.g. (2 + 3) * 4 / 7."
+
+    def execute(self, *args):
+        """
+        Evaluates the expression given inline (e.g. `eval (2 + 3) * 4`), or prompts for expressions
+        until the user types 'exit'.
+        """
+        if args:
+            message = evaluate_expression_message(' '.join(args))
+            print(message)
+            return message
+        logging.info("Executing eval command")
+        print("Operation: Expression\n")
+        print("\tEnter an expression using + - * / % ^, sqrt() and parentheses")
+        print("\tType 'exit' at any time to return to the main menu.")
+        print("\t\t[Example]: (2 + 3) * 4 / 7")
+        while True:
+            expression = input("[Eval]:   ")
+            if expression.lower() == 'exit':
+                logging.info("Exiting eval operation.\n")
+                break
+            print(evaluate_expression_message(expression))
+
+    def evaluate(self, *args):
+        """
+        Evaluates the expression given as arguments and returns the result message.
+        """
+        return evaluate_expression_message(' '.join(args))
@@ -1,9 +1,9 @@
 """app/plugins/history/__init__.py
 
 """
-from unittest.mock import patch
+from typing import Optional
 from app.commands import Command
-from app.calculator.calculations import CalculationHistory
+from app.calculator.calculations import CalculationHistory, Session
 import logging
 
 class HistoryCommand(Command):
@@ -11,11 +11,15 @@ class HistoryCommand(Command):
     A command to manage calculation history. This class provides the logic to handle user input for
     actions such as retrieving the most recent calculation, clearing history, saving history to CSV,
     loading history from CSV, and deleting specific calculations.
+
+    Bound to a session, the command manages that session's history; otherwise the history of the session
+    current when it runs.
     """
-    def __init__(self):
+    def __init__(self, session: Optional[Session] = None):
         super().__init__()
         self.name = "history"
         self.description = "Manage calculation history (retrieve, clear, save, load, delete)."
+        self.history = CalculationHistory if session is None else session.history
 
     def execute(self, *args):
         """
@@ -54,14 +58,14 @@ class HistoryCommand(Command):
             print("Invalid choice. Select a valid option or type 'exit' to return to main menu.")
 
     def _display_most_recent_calculation(self):
-        most_recent = CalculationHistory.get_latest_history()
+        most_recent = self.history.get_latest_history()
         if most_recent:
             self.print_result(most_recent)
         else:
             print("No calculations in history.")
 
     def _display_all_calculations(self):
-        all_calculations = CalculationHistory.get_history()
+        all_calculations = self.history.get_history()
         if all_calculations:
             print("\nAll Calculations:")
             for idx, calculation in enumerate(all_calculations, start=1):
@@ -84,8 +88,8 @@ class HistoryCommand(Command):
             print(f"Error occured: {e}")
 
     def _clear_history(self):
-        if CalculationHistory.get_history():  # Checks if there are any calculations in the history
-            CalculationHistory.clear_history()
+        if self.history.get_history():  # Checks if there are any calculations in the history
+            self.history.clear_history()
             print("Calculation history cleared.")
         else:
             print("History is already empty, no history to clear.")
@@ -93,18 +97,18 @@ class HistoryCommand(Command):
     # CSV methods
     def _save_calculation_history(self):
         '''Save history of calculations to CSV'''
-        CalculationHistory.save_history_to_csv()
+        self.history.save_history_to_csv()
 
     def _load_calculation_history(self):
         '''Load history of calculations from CSV'''
         try:
-            CalculationHistory.load_history_from_csv()
+            self.history.load_history_from_csv()
             # Check if any calculations were loaded
         except Exception as e:
             print(f"\nError loading history: {e}")
 
     def _delete_calculation_from_history(self):
-        if not CalculationHistory.get_history():
+        if not self.history.get_history():
             print("No history available to delete.")
             return  # Return to the history menu
         
@@ -112,7 +116,7 @@ class HistoryCommand(Command):
         
         try:
             index_to_delete = int(input("Enter the index of the calculation to delete: ")) - 1
-            CalculationHistory.delete_calculation_by_index(index_to_delete)
+            self.history.delete_calculation_by_index(index_to_delete)
             print(f"Calculation at index {index_to_delete + 1} has been deleted.")
         except ValueError:
             print("Invalid index. Enter a valid index or 'exit' to return to history menu.")
@@ -0,0 +1,108 @@
+"""app/plugins/let/__init__.py
+This module defines the LetCommand class for binding names to calculations, as in `let x = add 2 3` or
+`let y = x * 2 + 1`. The bindings live in a DependencyGraph, so rebinding a name updates only the values
+that depend on it. Each session, such as the REPL or one server connection, has bindings of its own. It extends the Command base class, inheriting its interface for integration into the
+application's command structure.
+"""
+import threading
+import weakref
+from app.commands import Command
+from app.calculator.calculations import Session, current_session
+from app.calculator.bindings import DependencyGraph, Variable
+from app.calculator.expression import ExpressionError
+from app.calculator.metrics import ErrorResult
+import logging
+
+USAGE = "Please use: let <name> = <operation> <operand1> <operand2>, or let <name> = <expression>"
+
+def format_variable(variable: Variable) -> str:
+    """Formats a binding as `name = value`, or as an ErrorResult with the error its calculation raised."""
+    if isinstance(variable.error, ZeroDivisionError):
+        return ErrorResult(f"{variable.name} = error: Cannot divide by zero", 'ZeroDivisionError')
+    if variable.error is not None:
+        return ErrorResult(f"{variable.name} = error: {variable.error}", type(variable.error).__name__)
+    return f"{variable.name} = {variable.value}"
+
+def evaluate_statement(graph: DependencyGraph, statement: str) -> str:
+    """
+    Evaluates a let statement against the graph and returns the message to show, an ErrorResult if the
+    statement is invalid or the bound calculation failed.
+
+    `<name> = <definition>` binds the name and reports the other bindings it updated, a lone `<name>`
+    shows its value, and an empty statement lists every binding.
+    """
+    name, equals, definition = statement.partition('=')
+    name = name.strip()
+    if not equals:
+        if not name:
+            variables = graph.variables()
+            return '\n'.join(format_variable(v) for v in variables) if variables else "No bindings defined."
+        if ' ' in name:
+            return ErrorResult(f"Invalid let statement: '{statement}'. {USAGE}", 'ValueError')
+        try:
+            return format_variable(graph.variable(name))
+        except ExpressionError as e:
+            return ErrorResult(str(e), type(e).__name__)
+    logging.info(f"Binding {name} = {definition.strip()}")
+    try:
+        changed = graph.bind(name, definition)
+    except ExpressionError as e:
+        logging.warning(f"Invalid let statement '{statement}': {e}")
+        return ErrorResult(f"Invalid let statement: {e}", type(e).__name__)
+    message = format_variable(graph.variable(name))
+    updated = [format_variable(variable) for variable in changed if variable.name != name]
+    if updated:
+        text = message + f" (updated: {', '.join(updated)})"
+        message = ErrorResult(text, message.error_type) if isinstance(message, ErrorResult) else text
+    logging.info(f"Bound {message}")
+    return message
+
+class LetCommand(Command):
+    """
+    A command for binding names to calculations and expressions over other names, like the cells of a
+    small spreadsheet. Each command instance keeps its own bindings for every session.
+    """
+    def __init__(self):
+        super().__init__()
+        self.name = "let"
+        self.description = "Bind a name to a calculation, e.g. let x = add 2 3, let y = x * 2."
+        self._graphs: 'weakref.WeakKeyDictionary[Session, DependencyGraph]' = weakref.WeakKeyDictionary()
+        self._graphs_lock = threading.Lock()
+
+    @property
+    def graph(self) -> DependencyGraph:
+        """The bindings of the current session, created when the session first uses them."""
+        session = current_session()
+        with self._graphs_lock:
+            graph = self._graphs.get(session)
+            if graph is None:
+                graph = self._graphs[session] = DependencyGraph(record=True)
+        return graph
+
+    def execute(self, *args):
+        """
+        Evaluates the statement given inline (e.g. `let x = add 2 3`), or lists the bindings and prompts
+        for statements until the user types 'exit'.
+        """
+        if args:
+            message = evaluate_statement(self.graph, ' '.join(args))
+            print(message)
+            return message
+        logging.info("Executing let command")
+        print("Operation: Bindings\n")
+        print(evaluate_statement(self.graph, ''))
+        print("\tEnter <name> = <operation> <operand1> <operand2>, or <name> = <expression>")
+        print("\tType 'exit' at any time to return to the main menu.")
+        print("\t\t[Example]: x = add 2 3")
+        while True:
+            statement = input("[Let]:   ")
+            if statement.lower() == 'exit':
+                logging.info("Exiting let operation.\n")
+                break
+            print(evaluate_statement(self.graph, statement))
+
+    def evaluate(self, *args):
+        """
+        Evaluates the statement given as arguments and returns the message.
+        """
+        return evaluate_statement(self.graph, ' '.join(args))
@@ -0,0 +1,35 @@
+"""app/plugins/modulo/__init__.py
+This module defines the ModuloCommand class for performing modulo operations. It extends the Command
+base class, inheriting its interface for integration into the application's command structure.
+"""
+from app.commands import Command
+from app.plugins import evaluate_operation, execute_inline, execute_operation
+import logging
+
+class ModuloCommand(Command):
+    """
+    A command for the remainder of dividing two numbers. This class provides the logic to execute the
+    modulo operation from user input.
+    """
+    def __init__(self):
+        super().__init__()
+        self.name = "modulo"
+        self.description = "Remainder of dividing the first number by the second."
+
+    def execute(self, *args):
+        """
+        Executes the modulo operation. Prompts the user for two numbers and displays the remainder of
+        their division.
+        With two operands given inline (e.g. `modulo 7 3`), evaluates them directly instead.
+        """
+        if args:
+            return execute_inline(args, self.name)
+        logging.info("Executing modulo command")
+        user_input_prompt = "Operation: Modulo\n"
+        execute_operation(user_input_prompt, self.name)
+
+    def evaluate(self, *args):
+        """
+        Evaluates the remainder of dividing the two operands given as arguments and returns the result message.
+        """
+        return evaluate_operation(args, self.name)
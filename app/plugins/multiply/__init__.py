@@ -3,7 +3,7 @@ This module defines the MultiplyCommand class for performing multiplication oper
 base class, inheriting its interface for integration into the application's command structure.
 """
 from app.commands import Command
-from app.plugins import execute_operation
+from app.plugins import evaluate_operation, execute_inline, execute_operation
 import logging
 
 class MultiplyCommand(Command):
@@ -20,7 +20,16 @@ class MultiplyCommand(Command):
         """
         Executes the multiplication operation. Prompts the user for two numbers to multiply together
         and displays the result.
+        With two operands given inline (e.g. `multiply 2 3`), evaluates them directly instead.
         """
+        if args:
+            return execute_inline(args, self.name)
         logging.info("Executing multiplication command")
         user_input_prompt = "Operation: Multiplication\n"
         execute_operation(user_input_prompt, self.name)
+
+    def evaluate(self, *args):
+        """
+        Evaluates the multiplication of the two operands given as arguments and returns the result message.
+        """
+        return evaluate_operation(args, self.name)
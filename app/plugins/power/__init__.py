@@ -0,0 +1,34 @@
+"""app/plugins/power/__init__.py
+This module defines the PowerCommand class for performing exponentiation operations. It extends the Command
+base class, inheriting its interface for integration into the application's command structure.
+"""
+from app.commands import Command
+from app.plugins import evaluate_operation, execute_inline, execute_operation
+import logging
+
+class PowerCommand(Command):
+    """
+    A command for raising a number to the power of another. This class provides the logic to execute
+    the power operation from user input.
+    """
+    def __init__(self):
+        super().__init__()
+        self.name = "power"
+        self.description = "Raise the first number to the power of the second."
+
+    def execute(self, *args):
+        """
+        Executes the power operation. Prompts the user for a base and an exponent and displays the result.
+        With two operands given inline (e.g. `power 2 10`), evaluates them directly instead.
+        """
+        if args:
+            return execute_inline(args, self.name)
+        logging.info("Executing power command")
+        user_input_prompt = "Operation: Power\n"
+        execute_operation(user_input_prompt, self.name)
+
+    def evaluate(self, *args):
+        """
+        Evaluates the first operand raised to the power of the second and returns the result message.
+        """
+        return evaluate_operation(args, self.name)
@@ -0,0 +1,85 @@
+"""app/plugins/profile/__init__.py
+This module defines the ProfileCommand class for finding out why a session is slow: it runs cProfile around
+the commands that follow `profile start` and reports their statistics, and takes tracemalloc snapshots
+showing which allocation sites grew. It profiles the whole process and writes profiles to any path, so the
+calculator server does not offer it to its clients. It extends the Command base class, inheriting its
+interface for integration into the application's command structure.
+"""
+from app.commands import Command
+from app.calculator.metrics import ErrorResult
+from app.profiling import PROFILER, SORT_KEYS
+import logging
+
+USAGE = ("Please use: profile start | stop [<sort>] [<limit>] | stats [<sort>] [<limit>] | dump <file> "
+         "| memory [stop]")
+
+def _parse_report_options(options) -> tuple:
+    """Parses the optional sort key and limit of a report, in either order."""
+    sort, limit = 'cumulative', 20
+    for option in options:
+        if option.isdigit():
+            limit = int(option)
+        else:
+            sort = option
+    return sort, limit
+
+def profile_message(*args) -> str:
+    """Runs a profile subcommand and returns the message to show, an ErrorResult if it failed or is invalid."""
+    action = args[0].lower() if args else ''
+    options = args[1:]
+    try:
+        if action == '':
+            cpu = "on" if PROFILER.cpu_profile is not None else "off"
+            memory = "on" if PROFILER.tracing else "off"
+            return f"CPU profiling is {cpu}, memory tracing is {memory}. {USAGE}"
+        if action == 'start' and not options:
+            if not PROFILER.start_cpu():
+                return "CPU profiling is already on."
+            return "CPU profiling started; the following commands are profiled until 'profile stop'."
+        if action == 'stop' and len(options) <= 2:
+            if not PROFILER.stop_cpu():
+                return "CPU profiling is not on."
+            return PROFILER.cpu_stats(*_parse_report_options(options))
+        if action == 'stats' and len(options) <= 2:
+            return PROFILER.cpu_stats(*_parse_report_options(options))
+        if action == 'dump' and len(options) == 1:
+            PROFILER.dump_cpu(options[0])
+            return f"CPU profile written to {options[0]}"
+        if action == 'memory' and not options:
+            return PROFILER.memory_snapshot()
+        if action == 'memory' and [option.lower() for option in options] == ['stop']:
+            return "Memory tracing stopped." if PROFILER.stop_memory() else "Memory tracing is not on."
+    except (ValueError, OSError) as e:
+        logging.warning(f"Profile command failed: {e}")
+        return ErrorResult(f"Profile error: {e}", type(e).__name__)
+    return ErrorResult(f"Invalid profile command: '{' '.join(args)}'. {USAGE} Sort keys: {', '.join(SORT_KEYS)}.",
+                       'ValueError')
+
+class ProfileCommand(Command):
+    """
+    A command for profiling the session: CPU time of the commands run while profiling is on, and memory
+    growth by allocation site between snapshots.
+    """
+    def __init__(self):
+        super().__init__()
+        self.name = "profile"
+        self.description = "Profile commands with cProfile and memory with tracemalloc; see 'profile'."
+
+    def execute(self, *args):
+        """
+        Runs the subcommand given inline (e.g. `profile start`), or shows the profiling status and usage.
+        """
+        logging.info("Executing profile command")
+        message = profile_message(*args)
+        print(message)
+        return message
+
+    def evaluate(self, *args):
+        """
+        Runs the subcommand given as arguments and returns the message.
+        """
+        return profile_message(*args)
+
+    def available_remotely(self, *args) -> bool:
+        """Returns False, keeping the command off the calculator server."""
+        return False
@@ -0,0 +1,34 @@
+"""app/plugins/sqrt/__init__.py
+This module defines the SqrtCommand class for performing square root operations. It extends the Command
+base class, inheriting its interface for integration into the application's command structure.
+"""
+from app.commands import Command
+from app.plugins import evaluate_operation, execute_inline, execute_operation
+import logging
+
+class SqrtCommand(Command):
+    """
+    A command for the square root of a number. This class provides the logic to execute the square root
+    operation from user input.
+    """
+    def __init__(self):
+        super().__init__()
+        self.name = "sqrt"
+        self.description = "Square root of a number."
+
+    def execute(self, *args):
+        """
+        Executes the square root operation. Prompts the user for a number and displays its square root.
+        With the operand given inline (e.g. `sqrt 9`), evaluates it directly instead.
+        """
+        if args:
+            return execute_inline(args, self.name)
+        logging.info("Executing square root command")
+        user_input_prompt = "Operation: Square root\n"
+        execute_operation(user_input_prompt, self.name)
+
+    def evaluate(self, *args):
+        """
+        Evaluates the square root of the operand given as argument and returns the result message.
+        """
+        return evaluate_operation(args, self.name)
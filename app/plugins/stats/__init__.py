@@ -0,0 +1,72 @@
+"""app/plugins/stats/__init__.py
+This module defines the StatsCommand class for reading the calculator's built-in metrics: calls, errors
+and latency percentiles per command and operation, and gauges such as the history size. Clients of the
+calculator server may only read the table, since the subcommands change the process-wide metrics or write
+files. It extends the Command base class, inheriting its interface for integration into the application's
+command structure.
+"""
+import os
+from app.commands import Command
+from app.calculator.metrics import METRICS, ErrorResult
+import logging
+
+USAGE = "Please use: stats [on | off | reset | export [<file>]]"
+
+def stats_message(*args) -> str:
+    """
+    Runs a stats subcommand and returns the message to show: the metrics table with no arguments, or
+    `on`, `off`, `reset`, or `export [<file>]` to write a Prometheus text file (CALC_METRICS_FILE by default).
+    An invalid or failed subcommand returns an ErrorResult.
+    """
+    action = args[0].lower() if args else ''
+    if action == '':
+        status = "" if METRICS.enabled else "Metrics are off; turn them on with 'stats on' or CALC_METRICS=true.\n"
+        return status + METRICS.report()
+    if action == 'on':
+        METRICS.enable()
+        return "Metrics on."
+    if action == 'off':
+        METRICS.disable()
+        return "Metrics off."
+    if action == 'reset':
+        METRICS.reset()
+        return "Metrics reset."
+    if action == 'export' and len(args) <= 2:
+        path = args[1] if len(args) == 2 else os.getenv('CALC_METRICS_FILE', 'calculator_metrics.prom')
+        try:
+            METRICS.write_prometheus(path)
+        except OSError as e:
+            logging.error(f"Could not write metrics to {path}: {e}")
+            return ErrorResult(f"Could not write metrics to {path}: {e}", type(e).__name__)
+        logging.info(f"Metrics written to {path}")
+        return f"Metrics written to {path}"
+    return ErrorResult(f"Invalid stats command: '{' '.join(args)}'. {USAGE}", 'ValueError')
+
+class StatsCommand(Command):
+    """
+    A command for showing the calculator's metrics, turning them on and off, and exporting them in the
+    Prometheus text format.
+    """
+    def __init__(self):
+        super().__init__()
+        self.name = "stats"
+        self.description = "Show call counts, errors and latencies; stats on|off|reset|export [file]."
+
+    def execute(self, *args):
+        """
+        Prints the metrics, or runs the subcommand given inline (e.g. `stats export metrics.prom`).
+        """
+        logging.info("Executing stats command")
+        message = stats_message(*args)
+        print(message)
+        return message
+
+    def evaluate(self, *args):
+        """
+        Runs the subcommand given as arguments and returns the message.
+        """
+        return stats_message(*args)
+
+    def available_remotely(self, *args) -> bool:
+        """Only the read-only metrics table is offered to calculator server clients."""
+        return not args
@@ -3,7 +3,7 @@ This module defines the SubtractCommand class for performing subtraction operati
 base class, inheriting its interface for integration into the application's command structure.
 """
 from app.commands import Command
-from app.plugins import execute_operation
+from app.plugins import evaluate_operation, execute_inline, execute_operation
 import logging
 
 class SubtractCommand(Command):
@@ -19,7 +19,16 @@ class SubtractCommand(Command):
     def execute(self, *args):
         """
         Executes the subtraction operation. Prompts the user for two numbers to subtract and displays the result.
+        With two operands given inline (e.g. `subtract 2 3`), evaluates them directly instead.
         """
+        if args:
+            return execute_inline(args, self.name)
         logging.info("Executing subtraction command")
         user_input_prompt = "Operation: Subtraction\n"
         execute_operation(user_input_prompt, self.name)
+
+    def evaluate(self, *args):
+        """
+        Evaluates the subtraction of the two operands given as arguments and returns the result message.
+        """
+        return evaluate_operation(args, self.name)
@@ -0,0 +1,138 @@
+"""app/profiling.py
+This module provides in-process profiling for slow sessions. The shared PROFILER can run cProfile around
+the commands the CommandHandler executes, so the time spent waiting at the prompt is left out, and report
+the collected statistics sorted by any pstats key. It can also take tracemalloc snapshots and compare each
+one with the previous, showing which allocation sites grew, for example the lines of CalculationHistory
+that keep calculations.
+
+cProfile, pstats and tracemalloc are imported when first used, keeping them out of the application's startup.
+"""
+import io
+import logging
+import threading
+from typing import Optional
+
+SORT_KEYS = ('cumulative', 'tottime', 'ncalls', 'pcalls', 'filename', 'name', 'line', 'module', 'nfl', 'stdname')
+
+class Profiler:
+    """
+    The CPU profile of the commands executed while profiling is on, and the latest memory snapshot.
+
+    Attributes:
+        cpu_profile (Optional[cProfile.Profile]): The running profile; the CommandHandler runs every command
+            under it while it is set.
+        last_profile (Optional[cProfile.Profile]): The running profile, or the latest stopped one.
+    """
+    def __init__(self):
+        self.cpu_profile = None
+        self.last_profile = None
+        self._snapshot = None  # The latest tracemalloc snapshot, compared with the next one
+        self._cpu_lock = threading.Lock()  # Held by the one thread running under the CPU profile
+
+    def start_cpu(self) -> bool:
+        """Starts profiling the commands executed from now on. Returns False if profiling was already on."""
+        if self.cpu_profile is not None:
+            return False
+        import cProfile  # pylint: disable=import-outside-toplevel
+        self.cpu_profile = self.last_profile = cProfile.Profile()
+        logging.info("CPU profiling started.")
+        return True
+
+    def stop_cpu(self) -> bool:
+        """Stops profiling commands, keeping the profile for reports. Returns False if profiling was off."""
+        if self.cpu_profile is None:
+            return False
+        self.cpu_profile.disable()
+        self.cpu_profile = None
+        logging.info("CPU profiling stopped.")
+        return True
+
+    def runcall(self, function, *args):
+        """
+        Calls function(*args) under the running CPU profile. A cProfile.Profile is not thread-safe, so a
+        call made while another thread runs under the profile, or with profiling off, is not profiled.
+        """
+        profile = self.cpu_profile
+        if profile is None or not self._cpu_lock.acquire(blocking=False):
+            return function(*args)
+        try:
+            return profile.runcall(function, *args)
+        finally:
+            self._cpu_lock.release()
+
+    def cpu_stats(self, sort: str = 'cumulative', limit: int = 20) -> str:
+        """
+        Returns the statistics of the running or latest profile, sorted by a pstats key and limited to the
+        first `limit` functions.
+
+        Raises:
+            ValueError: If the sort key is not one of SORT_KEYS or nothing was profiled yet.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort}'. Choose from: {', '.join(SORT_KEYS)}.")
+        if self.last_profile is None:
+            raise ValueError("Nothing has been profiled yet; start with 'profile start'.")
+        import pstats  # pylint: disable=import-outside-toplevel
+        output = io.StringIO()
+        try:
+            stats = pstats.Stats(self.last_profile, stream=output)
+        except TypeError:  # pstats raises TypeError for a profile that recorded no calls
+            return "No calls profiled yet."
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue().strip()
+
+    def dump_cpu(self, path: str):
+        """
+        Writes the running or latest profile in the binary pstats format, for pstats or a viewer such as snakeviz.
+
+        Raises:
+            ValueError: If nothing was profiled yet.
+        """
+        if self.last_profile is None:
+            raise ValueError("Nothing has been profiled yet; start with 'profile start'.")
+        self.last_profile.dump_stats(path)
+        logging.info(f"CPU profile written to {path}")
+
+    @property
+    def tracing(self) -> bool:
+        """Whether tracemalloc is tracing allocations."""
+        import tracemalloc  # pylint: disable=import-outside-toplevel
+        return tracemalloc.is_tracing()
+
+    def memory_snapshot(self, limit: int = 10, frames: int = 1) -> str:
+        """
+        Takes a tracemalloc snapshot and returns the `limit` allocation sites whose memory grew the most
+        since the previous snapshot. The first call starts tracing, keeping `frames` frames per allocation,
+        and only takes the baseline.
+        """
+        import tracemalloc  # pylint: disable=import-outside-toplevel
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._snapshot = None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is None:
+            logging.info("Memory tracing started.")
+            return "Memory tracing started; baseline snapshot taken. Take another snapshot to see the growth."
+        growth = [stat for stat in snapshot.compare_to(previous, 'lineno') if stat.size_diff > 0][:limit]
+        if not growth:
+            return "No memory growth since the previous snapshot."
+        lines = [f"Top {len(growth)} allocation sites by growth since the previous snapshot:"]
+        lines += [f"{stat.traceback[0]}: +{stat.size_diff / 1024:.1f} KiB ({stat.count_diff:+d} blocks), "
+                  f"{stat.size / 1024:.1f} KiB in total" for stat in growth]
+        return '\n'.join(lines)
+
+    def stop_memory(self) -> bool:
+        """Stops tracing allocations and drops the snapshot. Returns False if tracing was off."""
+        import tracemalloc  # pylint: disable=import-outside-toplevel
+        if not tracemalloc.is_tracing():
+            return False
+        tracemalloc.stop()
+        self._snapshot = None
+        logging.info("Memory tracing stopped.")
+        return True
+
+PROFILER = Profiler()
@@ -0,0 +1,150 @@
+"""app/server/__init__.py
+This module exposes the calculator over TCP with a simple line protocol served by asyncio. Each request
+is one line such as `add 2 3`, dispatched through the CommandHandler, and each response is one line of
+text. Clients may pipeline many requests on a connection without waiting for the responses, which always
+come back in request order.
+
+Commands run on worker threads, off the event loop, so a slow command does not stall other connections.
+The requests of a connection that arrive together are dispatched in one batch, to keep the handoff cheap
+when clients pipeline. Each connection runs in a session of its own, so clients never see each other's
+calculations. Commands that write files on the host or change process-wide state, such as `profile`,
+are refused (see Command.available_remotely).
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import List
+from app.calculator.calculations import CalculationHistory, History, Session
+from app.commands import CommandHandler
+
+WRITE_BUFFER_HIGH_WATER = 64 * 1024   # Bytes buffered per connection before the server waits for the client
+MAX_LINE_LENGTH = 64 * 1024           # Longest accepted request line
+READ_CHUNK_SIZE = 64 * 1024           # Bytes read from a connection at a time, dispatched as one batch of lines
+LISTEN_BACKLOG = 4096                 # Pending connections queued by the kernel
+HISTORY_LIMIT = 10_000                # Calculations kept in each connection's history; older ones are dropped
+
+class CalculatorServer:
+    """
+    An asyncio TCP server that answers line-based requests through a CommandHandler.
+
+    Backpressure: responses are written to the connection's transport buffer, and once that buffer
+    passes WRITE_BUFFER_HIGH_WATER the server stops reading requests from that client until it has
+    read enough responses, so a slow reader cannot make the server buffer without bound.
+
+    Each connection's requests are recorded in a session of its own, created by new_session(), whose
+    history keeps only the most recent `history_limit` calculations and is dropped when the connection
+    closes, so a long-running server does not grow without bound.
+    """
+
+    def __init__(self, command_handler: CommandHandler, host: str = '127.0.0.1', port: int = 8765,
+                 history_limit: int = HISTORY_LIMIT):
+        self.command_handler = command_handler
+        self.host = host
+        self.port = port
+        self.history_limit = history_limit
+        self.connections = 0
+        self._server = None
+
+    def new_session(self) -> Session:
+        """Returns the session of a new connection, with an empty bounded history."""
+        return Session(History(deque(maxlen=self.history_limit)))
+
+    def dispatch(self, request: str) -> str:
+        """
+        Evaluates one request line and returns the single-line response.
+
+        Args:
+            request (str): The request, a command name followed by its arguments.
+        """
+        parts = request.split()
+        if not parts:
+            return "Error: Empty request."
+        name, *args = parts
+        command = self.command_handler.commands.get(name)
+        if command is None:
+            return f"Error: Unknown command: {name}"
+        if not command.available_remotely(*args):
+            return f"Error: '{' '.join(parts)}' is not available over the server."
+        try:
+            response = self.command_handler.evaluate_command(name, *args)
+        except KeyError:
+            return f"Error: Unknown command: {name}"
+        return str(response).replace('\n', ' ')
+
+    def dispatch_lines(self, lines: List[bytes]) -> bytes:
+        """Evaluates a batch of request lines and returns their response lines, in order."""
+        return b''.join(self.dispatch(line.decode('utf-8', errors='replace')).encode('utf-8') + b'\n'
+                        for line in lines)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves one connection until the client closes it, answering requests in order."""
+        self.connections += 1
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH_WATER)
+        loop = asyncio.get_running_loop()
+        session = self.new_session()
+        partial = b''
+        try:
+            while True:
+                data = await reader.read(READ_CHUNK_SIZE)
+                if data:
+                    *lines, partial = (partial + data).split(b'\n')
+                else:  # The client closed the connection; a final line may lack its newline
+                    lines, partial = [partial] if partial else [], b''
+                if len(partial) > MAX_LINE_LENGTH:
+                    writer.write(b"Error: Request line too long.\n")
+                    break
+                if lines:
+                    # Run the batch on a worker thread, in the connection's session
+                    responses = await loop.run_in_executor(None, session.run, self.dispatch_lines, lines)
+                    writer.write(responses)
+                    # drain() only suspends when the transport buffer is above the high-water mark
+                    await writer.drain()
+                if not data:
+                    break
+        except ConnectionError as e:
+            logging.info(f"Client connection lost: {e}")
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self):
+        """Starts listening for connections."""
+        self._server = await asyncio.start_server(self.handle_client, self.host, self.port,
+                                                  limit=MAX_LINE_LENGTH, backlog=LISTEN_BACKLOG)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"Calculator server listening on {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        """Starts the server, if needed, and serves until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """Stops accepting connections and closes the listening socket."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+def run_server(command_handler: CommandHandler, host: str = '127.0.0.1', port: int = 8765):
+    """
+    Runs a CalculatorServer until interrupted.
+
+    Args:
+        command_handler (CommandHandler): The handler with the registered commands.
+        host (str): The interface to listen on.
+        port (int): The TCP port to listen on.
+    """
+    server = CalculatorServer(command_handler, host, port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logging.info("Calculator server interrupted and exiting gracefully.")
+    finally:
+        CalculationHistory.flush_storage()
@@ -0,0 +1,66 @@
+"""app/startup_profile.py
+This module profiles the cold start of the application. It starts a fresh interpreter with Python's
+`-X importtime` option, creates the App and registers its commands exactly as the REPL does before the
+first prompt, and reports the total time together with the modules that took longest to import.
+"""
+import os
+import subprocess
+import sys
+import time
+from typing import List, NamedTuple, Tuple
+
+# The work done before the first prompt, without entering the REPL
+STARTUP_CODE = "from app import App; App().initialize_commands()"
+
+class ImportTime(NamedTuple):
+    """Import time of one module in microseconds, as reported by `-X importtime`."""
+    module: str
+    self_us: int
+    cumulative_us: int
+
+def parse_import_times(report: str) -> List[ImportTime]:
+    """
+    Parses the `-X importtime` lines of an interpreter's stderr output.
+
+    Args:
+        report (str): The stderr output; lines not starting with 'import time:' are ignored.
+
+    Returns:
+        List[ImportTime]: One entry per imported module, in import completion order.
+    """
+    times = []
+    for line in report.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():  # The header line
+            continue
+        times.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+def measure_startup(code: str = STARTUP_CODE) -> Tuple[float, List[ImportTime]]:
+    """
+    Runs `code` in a fresh interpreter with import timing enabled.
+
+    Returns:
+        Tuple[float, List[ImportTime]]: The wall-clock seconds the interpreter ran and its import times.
+    """
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                               cwd=os.getcwd(), check=True)
+    return time.perf_counter() - start, parse_import_times(completed.stderr)
+
+def format_startup_profile(elapsed: float, times: List[ImportTime], top: int = 20) -> str:
+    """Formats the total startup time and the `top` modules with the largest cumulative import time."""
+    total_us = sum(entry.self_us for entry in times)
+    lines = [f"Cold start: {elapsed * 1000:.1f} ms, of which imports {total_us / 1000:.1f} ms "
+             f"({len(times)} modules)",
+             f"{'cumulative ms':>13} {'self ms':>8}  module"]
+    for entry in sorted(times, key=lambda entry: entry.cumulative_us, reverse=True)[:top]:
+        lines.append(f"{entry.cumulative_us / 1000:13.1f} {entry.self_us / 1000:8.1f}  {entry.module}")
+    return "\n".join(lines)
+
+def print_startup_profile(top: int = 20):
+    """Measures the application's cold start and prints the import-time breakdown."""
+    elapsed, times = measure_startup()
+    print(format_startup_profile(elapsed, times, top))
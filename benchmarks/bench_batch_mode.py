@@ -0,0 +1,62 @@
+"""benchmarks/bench_batch_mode.py
+Compares lines per second of `main.py --batch` against piping the same calculations through the
+interactive REPL. Both run as subprocesses so start-up cost is included. Run from the repository root:
+
+    python -m benchmarks.bench_batch_mode --lines 200000
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+def write_batch_input(path: str, lines: int, seed: int = 0):
+    """Write `lines` random calculation lines in batch format."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as stream:
+        for _ in range(lines):
+            stream.write(f"{rng.choice(OPERATIONS)} {rng.randint(-999, 999)} {rng.randint(0, 99)}\n")
+
+def write_repl_input(batch_path: str, repl_path: str):
+    """Translate batch lines into the keystrokes the REPL expects for the same calculations."""
+    with open(batch_path, encoding='utf-8') as source, open(repl_path, 'w', encoding='utf-8') as target:
+        for line in source:
+            operation, num1, num2 = line.split()
+            target.write(f"{operation}\n{num1} {num2}\nexit\n")
+        target.write("exit\n")
+
+def time_run(args, stdin_path: str) -> float:
+    """Time a main.py subprocess fed from stdin_path, discarding its output."""
+    with open(stdin_path, encoding='utf-8') as stdin:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'main.py', *args], stdin=stdin, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        return time.perf_counter() - start
+
+def main():
+    """Run both modes and print lines per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, default=200_000, help="Lines evaluated in batch mode")
+    parser.add_argument('--repl-lines', type=int, default=5_000, help="Lines evaluated through the REPL")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        batch_path = os.path.join(tmp, 'batch.txt')
+        repl_source = os.path.join(tmp, 'repl_source.txt')
+        repl_path = os.path.join(tmp, 'repl.txt')
+        write_batch_input(batch_path, args.lines)
+        write_batch_input(repl_source, args.repl_lines)
+        write_repl_input(repl_source, repl_path)
+
+        repl_rate = args.repl_lines / time_run([], repl_path)
+        batch_rate = args.lines / time_run(['--batch', '-'], batch_path)
+
+    print(f"REPL : {repl_rate:>12,.0f} lines/s")
+    print(f"batch: {batch_rate:>12,.0f} lines/s ({batch_rate / repl_rate:.1f}x)")
+
+if __name__ == "__main__":
+    main()
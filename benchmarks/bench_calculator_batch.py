@@ -0,0 +1,61 @@
+"""benchmarks/bench_calculator_batch.py
+Compares the throughput of the per-call Calculator path against Calculator.batch for the same
+operand pairs. Run from the repository root:
+
+    python -m benchmarks.bench_calculator_batch --pairs 1000000
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+from app.calculator import Calculator
+from app.calculator.calculations import CalculationHistory
+from app.calculator.operations import ArithmeticOperations as AO
+
+def make_operands(pairs: int, seed: int = 0):
+    """Build two lists of Decimal operands; roughly one divisor in ten is zero."""
+    rng = random.Random(seed)
+    a_values = [Decimal(rng.randint(-10_000, 10_000)) for _ in range(pairs)]
+    b_values = [Decimal(rng.randint(0, 9) and rng.randint(1, 10_000)) for _ in range(pairs)]
+    return a_values, b_values
+
+def bench_per_call(operation, a_values, b_values) -> float:
+    """Time one Calculator call per pair, catching division by zero like perform_operation does."""
+    CalculationHistory.clear_history()
+    start = time.perf_counter()
+    for a, b in zip(a_values, b_values):
+        try:
+            operation(a, b)
+        except ZeroDivisionError:
+            pass
+    return time.perf_counter() - start
+
+def bench_batch(operation, a_values, b_values) -> float:
+    """Time a single Calculator.batch call over all pairs."""
+    CalculationHistory.clear_history()
+    start = time.perf_counter()
+    Calculator.batch(operation, a_values, b_values)
+    return time.perf_counter() - start
+
+def main():
+    """Run the comparison for every operation and print pairs per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pairs', type=int, default=200_000, help="Number of operand pairs per run")
+    args = parser.parse_args()
+
+    a_values, b_values = make_operands(args.pairs)
+    cases = [
+        ('add', Calculator.add, AO.addition),
+        ('subtract', Calculator.subtract, AO.subtraction),
+        ('multiply', Calculator.multiply, AO.multiplication),
+        ('divide', Calculator.divide, AO.division),
+    ]
+    print(f"{'operation':<10} {'per-call/s':>14} {'batch/s':>14} {'speedup':>8}")
+    for name, per_call_method, operation in cases:
+        per_call = bench_per_call(per_call_method, a_values, b_values)
+        batch = bench_batch(operation, a_values, b_values)
+        print(f"{name:<10} {args.pairs / per_call:>14,.0f} {args.pairs / batch:>14,.0f} {per_call / batch:>7.2f}x")
+    CalculationHistory.clear_history()
+
+if __name__ == "__main__":
+    main()
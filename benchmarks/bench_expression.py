@@ -0,0 +1,48 @@
+"""benchmarks/bench_expression.py
+Compares evaluating a batch of expressions with and without the compiled-expression cache: every line
+parsed, folded and compiled anew (CompiledExpression), against compile_expression, which parses each
+distinct source once. The batch repeats a small set of expressions, as a batch file typically does.
+Run from the repository root:
+
+    python -m benchmarks.bench_expression --lines 100000
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+from app.calculator.expression import CompiledExpression, compile_expression, expression_cache_info
+
+EXPRESSIONS = [
+    "(2 + 3) * 4 / 7",
+    "x * 2 + 1",
+    "(x - 1) / (x + 1)",
+    "1.5 * x * x - 3 * x + 0.25",
+    "-(x + 10) / 4 * 3",
+    "100 / (x + 2) - 7 * x",
+]
+
+def make_lines(lines: int, seed: int = 0):
+    """Build (expression, x) pairs drawn from EXPRESSIONS with random positive values of x."""
+    rng = random.Random(seed)
+    return [(rng.choice(EXPRESSIONS), Decimal(rng.randint(1, 1000))) for _ in range(lines)]
+
+def bench(compile_function, lines) -> float:
+    """Time compiling and evaluating every line with the given compile function."""
+    start = time.perf_counter()
+    for source, x in lines:
+        compile_function(source).evaluate({'x': x})
+    return time.perf_counter() - start
+
+def main():
+    """Run both variants and print lines per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lines', type=int, default=100_000, help="Number of expressions to evaluate")
+    args = parser.parse_args()
+    lines = make_lines(args.lines)
+    uncached = bench(CompiledExpression, lines)
+    cached = bench(compile_expression, lines)
+    print(f"{'uncached':<9} {args.lines / uncached:>12,.0f} lines/s")
+    print(f"{'cached':<9} {args.lines / cached:>12,.0f} lines/s   {uncached / cached:.1f}x   {expression_cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""benchmarks/bench_history_csv.py
+Compares the streaming csv-module history saver/loader with the former pandas implementation. Every
+case runs in a fresh subprocess so its peak RSS can be reported alongside the wall-clock time. Run
+from the repository root (10M rows needs several GB of RAM for the pandas cases):
+
+    python -m benchmarks.bench_history_csv --rows 10000000
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from app.calculator.calculation import Calculation, paused_gc
+from app.calculator.history_csv import read_history_csv, write_history_csv
+from app.calculator.operations import ArithmeticOperations as AO
+from app.calculator.registry import OPERATIONS as REGISTRY
+
+OPERATIONS = REGISTRY.functions  # Stored operation name -> function, as CalculationHistory loads them
+CASES = ['save-csv', 'save-pandas', 'load-csv', 'load-pandas']
+
+def make_history(rows: int):
+    """Build a deterministic history of `rows` calculations."""
+    functions = [AO.addition, AO.subtraction, AO.multiplication, AO.division]
+    with paused_gc():
+        return [Calculation(Decimal(i % 9973) / 7, Decimal(i % 101 + 1), functions[i % 4]) for i in range(rows)]
+
+def pandas_save(path: str, history):
+    """The former DataFrame-based saver."""
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+    df = pd.DataFrame([{'fld_Operation': calc.operation.__name__, 'fld_Operand1': calc.num1,
+                        'fld_Operand2': calc.num2} for calc in history])
+    df.to_csv(path, index=False)
+
+def pandas_load(path: str):
+    """The former read_csv/iterrows-based loader."""
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+    df = pd.read_csv(path)
+    return [Calculation(Decimal(row['fld_Operand1']), Decimal(row['fld_Operand2']), OPERATIONS[row['fld_Operation']])
+            for _, row in df.iterrows() if row['fld_Operation'] in OPERATIONS]
+
+def run_case(case: str, path: str, rows: int):
+    """Run one case in this process and print its elapsed time and peak RSS."""
+    history = make_history(rows) if case.startswith('save') else None
+    start = time.perf_counter()
+    if case == 'save-csv':
+        write_history_csv(path, history)
+    elif case == 'save-pandas':
+        pandas_save(path, history)
+    elif case == 'load-csv':
+        with paused_gc():
+            history = list(read_history_csv(path, OPERATIONS))
+    else:
+        history = pandas_load(path)
+    elapsed = time.perf_counter() - start
+    print(f"{elapsed} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}")
+
+def main():
+    """Run every case in a subprocess and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10_000_000, help="History rows saved and loaded")
+    parser.add_argument('--case', choices=CASES, help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.case:
+        run_case(args.case, args.path, args.rows)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history.csv')
+        print(f"{'case':<12} {'seconds':>9} {'rows/s':>12} {'peak RSS MB':>12}")
+        for case in CASES:
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_history_csv', '--case', case,
+                                     '--path', path, '--rows', str(args.rows)],
+                                    capture_output=True, text=True, check=True).stdout.split()
+            elapsed, peak_kb = float(output[0]), int(output[1])
+            print(f"{case:<12} {elapsed:>9.2f} {args.rows / elapsed:>12,.0f} {peak_kb / 1024:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
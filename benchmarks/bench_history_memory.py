@@ -0,0 +1,85 @@
+"""benchmarks/bench_history_memory.py
+Reports bytes per history entry for the storage layouts of CalculationHistory, measured with
+tracemalloc: the original list of Calculation objects with an instance __dict__, the current list of
+slotted Calculation objects, ColumnarHistory with and without its cached-result column, and
+RingBufferHistory holding 10,000 entries in memory. Run from the repository root:
+
+    python -m benchmarks.bench_history_memory --entries 1000000 --distinct 10000
+"""
+import argparse
+import gc
+import os
+import random
+import tempfile
+import tracemalloc
+from decimal import Decimal
+from app.calculator.calculation import Calculation
+from app.calculator.columnar import ColumnarHistory
+from app.calculator.operations import ArithmeticOperations as AO
+from app.calculator.ring_buffer import RingBufferHistory
+
+OPERATIONS = [AO.addition, AO.subtraction, AO.multiplication, AO.division]
+
+class DictCalculation:
+    """The original Calculation layout, with a per-instance __dict__."""
+    def __init__(self, num1, num2, operation):
+        self.num1 = num1
+        self.num2 = num2
+        self.operation = operation
+
+def make_operands(entries: int, distinct: int, seed: int = 0):
+    """Build operand triples drawn from `distinct` operand values, parsed freshly like user input."""
+    rng = random.Random(seed)
+    texts = [str(Decimal(rng.randint(-10**6, 10**6)) / 100) for _ in range(distinct)]
+    return [(rng.choice(OPERATIONS), rng.choice(texts), rng.choice(texts)) for _ in range(entries)]
+
+def measure(build) -> int:
+    """Return the bytes still allocated by the object that build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+def main():
+    """Measure every layout and print bytes per entry."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--entries', type=int, default=1_000_000, help="History entries")
+    parser.add_argument('--distinct', type=int, default=10_000, help="Distinct operand values")
+    args = parser.parse_args()
+    operands = make_operands(args.entries, args.distinct)
+
+    def cached_columnar():
+        store = ColumnarHistory((Calculation(Decimal(a), Decimal(b), op) for op, a, b in operands), cache_results=True)
+        for calculation in store:
+            try:
+                calculation.compute()
+            except ZeroDivisionError:
+                pass
+        return store
+
+    spill_dir = tempfile.mkdtemp()
+
+    def ring_buffer():
+        store = RingBufferHistory(10_000, os.path.join(spill_dir, 'history.spill'))
+        store.extend(Calculation(Decimal(a), Decimal(b), op) for op, a, b in operands)
+        return store
+
+    layouts = [
+        ("list of Calculation with __dict__ (original)",
+         lambda: [DictCalculation(Decimal(a), Decimal(b), op) for op, a, b in operands]),
+        ("list of slotted Calculation",
+         lambda: [Calculation(Decimal(a), Decimal(b), op) for op, a, b in operands]),
+        ("ColumnarHistory",
+         lambda: ColumnarHistory(Calculation(Decimal(a), Decimal(b), op) for op, a, b in operands)),
+        ("ColumnarHistory with computed result column", cached_columnar),
+        ("RingBufferHistory, 10,000 entries in memory", ring_buffer),
+    ]
+    print(f"{args.entries:,} entries, {args.distinct:,} distinct operand values")
+    for name, build in layouts:
+        print(f"{name:<46} {measure(build) / args.entries:>8.1f} bytes/entry")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""benchmarks/bench_history_threads.py
+Measures history appends per second from 1 to N threads: all threads sharing one session's history (the
+lock-free list append), sharing one ColumnarHistory-backed history (every append takes the history's
+lock), and each thread in a session of its own. Appends go through Calculator.add, as from the REPL or a
+server. Run from the repository root:
+
+    python -m benchmarks.bench_history_threads --appends 100000 --threads 1 2 4 8
+"""
+import argparse
+import threading
+import time
+from decimal import Decimal
+from typing import Callable, List
+from app.calculator import Calculator
+from app.calculator.calculations import History, Session
+from app.calculator.columnar import ColumnarHistory
+
+def run_threads(sessions: List[Session], appends: int) -> float:
+    """Run one thread per session, each making `appends` additions under its session; returns the seconds."""
+    a, b = Decimal(3), Decimal(7)
+    start_line = threading.Barrier(len(sessions) + 1)
+
+    def worker():
+        start_line.wait()
+        for _ in range(appends):
+            Calculator.add(a, b)
+    threads = [threading.Thread(target=session.run, args=(worker,)) for session in sessions]
+    for thread in threads:
+        thread.start()
+    start_line.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+def shared(storage: Callable[[], list]) -> Callable[[int], List[Session]]:
+    """The sessions of a run with every thread sharing one session, whose history has the given storage."""
+    def sessions(threads: int) -> List[Session]:
+        return [Session(History(storage()))] * threads
+    return sessions
+
+def main():
+    """Time each mode at each thread count and print appends per second, checking no append was lost."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--appends', type=int, default=100_000, help="Appends per thread")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8], help="Thread counts to run")
+    args = parser.parse_args()
+    modes = {
+        'shared': shared(list),
+        'shared-columnar': shared(ColumnarHistory),
+        'per-session': lambda threads: [Session() for _ in range(threads)],
+    }
+
+    print(f"{'mode':<16} {'threads':>7} {'appends/s':>12}")
+    for name, make_sessions in modes.items():
+        for threads in args.threads:
+            sessions = make_sessions(threads)
+            elapsed = run_threads(sessions, args.appends)
+            recorded = sum(len(session.history.get_history()) for session in set(sessions))
+            assert recorded == threads * args.appends, f"{name}: {recorded:,} of {threads * args.appends:,} recorded"
+            print(f"{name:<16} {threads:>7} {threads * args.appends / elapsed:>12,.0f}")
+
+if __name__ == "__main__":
+    main()
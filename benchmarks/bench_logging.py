@@ -0,0 +1,68 @@
+"""benchmarks/bench_logging.py
+Measures calculations per second through calc_utils.calculate with logging off, with the synchronous
+handlers of logging.conf (a rotating log file and a stream, here a temporary file and os.devnull), with
+the same handlers behind the queue listener, and with the queue plus 1% sampling of per-operation
+records. "queued ops/s" is the rate seen by the caller; "drained ops/s" includes writing out the queue.
+Run from the repository root:
+
+    python -m benchmarks.bench_logging --ops 50000
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from app.calculator.calc_utils import calculate
+from app.calculator.calculations import CalculationHistory
+from app.logging_pipeline import set_operation_sampling, start_queue_logging, stop_queue_logging
+
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def install_handlers(directory: str):
+    """Replace the root handlers with the file and stream handlers logging.conf configures."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    formatter = logging.Formatter(FORMAT, '%Y-%m-%d %H:%M:%S')
+    file_handler = RotatingFileHandler(os.path.join(directory, 'app.log'), 'a', 1048576, 5)
+    stream_handler = logging.StreamHandler(open(os.devnull, 'w', encoding='utf-8'))  # pylint: disable=consider-using-with
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+def run(ops: int) -> float:
+    """Time `ops` calculations, clearing the history first."""
+    CalculationHistory.clear_history()
+    start = time.perf_counter()
+    for i in range(ops):
+        calculate(str(i), '7', 'divide')
+    return time.perf_counter() - start
+
+def main():
+    """Run every logging mode and print calculations per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ops', type=int, default=50_000, help="Number of calculations per mode")
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    print(f"{'mode':<16} {'queued ops/s':>14} {'drained ops/s':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        install_handlers(directory)
+        for mode in ('off', 'sync', 'queue', 'queue+sample'):
+            root.setLevel(logging.WARNING if mode == 'off' else logging.INFO)
+            set_operation_sampling(0.01 if mode == 'queue+sample' else 1)
+            if mode.startswith('queue'):
+                start_queue_logging()
+            start = time.perf_counter()
+            elapsed = run(args.ops)
+            stop_queue_logging()
+            drained = time.perf_counter() - start
+            print(f"{mode:<16} {args.ops / elapsed:>14,.0f} {args.ops / drained:>14,.0f}")
+        install_handlers(directory)  # Closes the handlers before the directory is removed
+    set_operation_sampling(1)
+    CalculationHistory.clear_history()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""benchmarks/bench_metrics.py
+Measures the overhead of the built-in metrics on Calculator operations and CommandHandler commands, with
+the metrics off and on. Run from the repository root:
+
+    python -m benchmarks.bench_metrics --ops 200000
+"""
+import argparse
+import time
+from decimal import Decimal
+from app.calculator import Calculator
+from app.calculator.calculations import CalculationHistory
+from app.calculator.metrics import METRICS
+from app.commands import CommandHandler
+from app.plugins.add import AddCommand
+
+def bench_operations(ops: int) -> float:
+    """Time `ops` Calculator.add calls, the best of three runs."""
+    a, b = Decimal(3), Decimal(7)
+    best = float('inf')
+    for _ in range(3):
+        CalculationHistory.clear_history()
+        start = time.perf_counter()
+        for _ in range(ops):
+            Calculator.add(a, b)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_commands(handler: CommandHandler, ops: int) -> float:
+    """Time `ops` evaluations of `add 3 7` through the command handler, the best of three runs."""
+    best = float('inf')
+    for _ in range(3):
+        CalculationHistory.clear_history()
+        start = time.perf_counter()
+        for _ in range(ops):
+            handler.evaluate_command('add', '3', '7')
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    """Run both paths with the metrics off and on and print operations per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ops', type=int, default=200_000, help="Number of operations per run")
+    args = parser.parse_args()
+    handler = CommandHandler()
+    handler.register_command(AddCommand())
+
+    print(f"{'path':<10} {'off ops/s':>12} {'on ops/s':>12} {'overhead':>9}")
+    for name, bench in (('operation', bench_operations),
+                        ('command', lambda ops: bench_commands(handler, ops))):
+        METRICS.disable()
+        off = bench(args.ops)
+        METRICS.enable()
+        on = bench(args.ops)
+        METRICS.disable()
+        print(f"{name:<10} {args.ops / off:>12,.0f} {args.ops / on:>12,.0f} {on / off - 1:>8.0%}")
+    METRICS.reset()
+    CalculationHistory.clear_history()
+
+if __name__ == "__main__":
+    main()
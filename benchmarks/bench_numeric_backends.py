@@ -0,0 +1,89 @@
+"""benchmarks/bench_numeric_backends.py
+Compares the throughput of the decimal, fraction and float numeric backends for every operation on three
+paths: one Calculator.calculate call per pair, one Calculator.batch call over all pairs (NumPy arrays
+for the float backend) and batch-mode text lines through evaluate_line. Run from the repository root:
+
+    python -m benchmarks.bench_numeric_backends --pairs 100000
+"""
+import argparse
+import random
+import time
+from app.batch import evaluate_line
+from app.calculator import Calculator
+from app.calculator.calculations import CalculationHistory
+from app.calculator.numeric import BACKENDS, use_backend
+from app.calculator.registry import OPERATIONS
+
+OPERATIONS_BENCHMARKED = ('add', 'multiply', 'divide', 'modulo', 'power', 'sqrt')
+
+def make_operand_texts(command: str, pairs: int, seed: int = 0):
+    """Build operand texts for an operation: two-decimal numbers, small exponents for power."""
+    rng = random.Random(seed)
+    a_texts = [f"{rng.randint(1, 1_000_000) / 100:.2f}" for _ in range(pairs)]
+    if command == 'power':
+        b_texts = [str(rng.randint(0, 4)) for _ in range(pairs)]
+    else:
+        b_texts = [f"{rng.randint(1, 100_000) / 100:.2f}" for _ in range(pairs)]
+    return a_texts, b_texts
+
+def bench_per_call(operation, a_values, b_values) -> float:
+    """Time one recorded Calculator.calculate call per pair."""
+    CalculationHistory.clear_history()
+    start = time.perf_counter()
+    for a, b in zip(a_values, b_values):
+        Calculator.calculate(a, b, operation.function)
+    return time.perf_counter() - start
+
+def bench_batch(operation, a_values, b_values, record: bool = True) -> float:
+    """Time a single Calculator.batch call over all pairs."""
+    CalculationHistory.clear_history()
+    start = time.perf_counter()
+    Calculator.batch(operation.function, a_values, b_values, record=record)
+    return time.perf_counter() - start
+
+def bench_lines(lines) -> float:
+    """Time parsing and evaluating batch-mode lines."""
+    start = time.perf_counter()
+    for line in lines:
+        evaluate_line(line)
+    return time.perf_counter() - start
+
+def main():
+    """Run every backend and operation and print operations per second, relative to the decimal backend."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pairs', type=int, default=100_000, help="Number of operand pairs per run")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS),
+                        help="Backends to compare")
+    parser.add_argument('--no-record', action='store_true',
+                        help="Time Calculator.batch without recording the history, i.e. the arithmetic alone")
+    args = parser.parse_args()
+
+    print(f"{'backend':<9} {'operation':<9} {'per-call/s':>12} {'batch/s':>12} {'lines/s':>12} {'vs decimal':>11}")
+    for command in OPERATIONS_BENCHMARKED:
+        operation = OPERATIONS[command]
+        a_texts, b_texts = make_operand_texts(command, args.pairs)
+        if operation.arity == 1:
+            lines = [f"{command} {a}" for a in a_texts]
+            b_texts = ['0'] * args.pairs
+        else:
+            lines = [f"{command} {a} {b}" for a, b in zip(a_texts, b_texts)]
+        baseline = None
+        for name in args.backends:
+            with use_backend(name) as backend:
+                a_values = [backend.parse(text) for text in a_texts]
+                b_values = [backend.parse(text) for text in b_texts]
+                if name == 'float':
+                    import numpy  # pylint: disable=import-outside-toplevel
+                    batch_a, batch_b = numpy.array(a_values), numpy.array(b_values)
+                else:
+                    batch_a, batch_b = a_values, b_values
+                per_call = bench_per_call(operation, a_values, b_values)
+                batch = bench_batch(operation, batch_a, batch_b, record=not args.no_record)
+                line_time = bench_lines(lines)
+            baseline = baseline or batch
+            print(f"{name:<9} {command:<9} {args.pairs / per_call:>12,.0f} {args.pairs / batch:>12,.0f} "
+                  f"{args.pairs / line_time:>12,.0f} {baseline / batch:>10.2f}x")
+    CalculationHistory.clear_history()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""benchmarks/bench_oneshot.py
+Measures the wall-clock time of one calculation per process, as scripts run it: the one-shot mode
+(`main.py add 2 3`), batch mode fed a single line, and the interactive REPL driven through stdin. Every
+run is a fresh interpreter started from the repository root:
+
+    python -m benchmarks.bench_oneshot --runs 20
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+MODES = {
+    'one-shot': (['main.py', 'add', '2', '3'], None),
+    'batch': (['main.py', '--batch', '-'], "add 2 3\n"),
+    'repl': (['main.py'], "add\n2 3\nexit\nexit\n"),
+}
+
+def run(arguments, stdin) -> float:
+    """Run main.py once and return its wall-clock time in seconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *arguments], input=stdin, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start
+
+def main():
+    """Time every mode and print the median and best run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20, help="Process starts per mode")
+    args = parser.parse_args()
+    run(*MODES['one-shot'])  # Make sure the plugin manifest exists, as after any earlier start
+    for mode, (arguments, stdin) in MODES.items():
+        times = [run(arguments, stdin) for _ in range(args.runs)]
+        print(f"{mode:<9} median {statistics.median(times) * 1000:7.1f} ms   best {min(times) * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""benchmarks/bench_parallel.py
+Measures how ParallelCalculator scales from one worker up to the machine's core count. A high decimal
+precision is used by default so each calculation does enough work to be worth shipping to a worker;
+lower it with --precision to see where transfer overhead starts to dominate. It first measures the
+work the calling process does serially per operation, with forked workers (parsing the results) and with
+the encoding pool (also encoding the operands), against the arithmetic itself: that ratio bounds the
+speedup whatever the core count. Run from the repository root:
+
+    python -m benchmarks.bench_parallel --operations 200000 --precision 500
+    python -m benchmarks.bench_parallel --no-fork
+"""
+import argparse
+import decimal
+import os
+import random
+import time
+from decimal import Decimal
+from app.calculator.operations import ArithmeticOperations as AO
+from app.calculator.parallel import ParallelCalculator, _encode_chunks, _evaluate_in_process
+from app.calculator.numeric import get_backend
+
+OPERATIONS = [AO.addition, AO.subtraction, AO.multiplication, AO.division]
+
+def make_operations(count: int, seed: int = 0):
+    """Build a list of random (operation, num1, num2) tuples."""
+    rng = random.Random(seed)
+    return [(rng.choice(OPERATIONS), Decimal(rng.randint(1, 10**6)), Decimal(rng.randint(1, 10**6)))
+            for _ in range(count)]
+
+def serial_costs(operations, context: decimal.Context, chunk_size: int):
+    """Seconds per operation of the arithmetic, of encoding the operands and of parsing the results."""
+    with decimal.localcontext(context):
+        start = time.perf_counter()
+        results, _ = _evaluate_in_process(operations)
+        compute = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in _encode_chunks(operations, chunk_size):
+            pass
+        encode = time.perf_counter() - start
+        encoded = [str(result) for result in results]
+        parse = get_backend().parse
+        start = time.perf_counter()
+        for result in encoded:
+            parse(result)
+        decode = time.perf_counter() - start
+    return compute / len(operations), encode / len(operations), decode / len(operations)
+
+def main():
+    """Evaluate the same batch with 1..N workers and print throughput and speedup."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--operations', type=int, default=200_000, help="Operations per batch")
+    parser.add_argument('--precision', type=int, default=500, help="Decimal precision used by every worker")
+    parser.add_argument('--chunk-size', type=int, default=5_000, help="Operations sent to a worker at a time")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help="Largest worker count tried")
+    parser.add_argument('--no-fork', dest='fork', action='store_false',
+                        help="Use the reused pool the caller encodes chunks for, even where it could fork")
+    args = parser.parse_args()
+
+    operations = make_operations(args.operations)
+    context = decimal.Context(prec=args.precision)
+    compute, encode, decode = serial_costs(operations, context, args.chunk_size)
+    print(f"arithmetic {compute * 1e6:.2f} µs/op; in the caller: encode {encode * 1e6:.2f} µs/op, "
+          f"parse results {decode * 1e6:.2f} µs/op")
+    print(f"speedup bound: {(compute + decode) / decode:.1f}x forked, "
+          f"{(compute + encode + decode) / (encode + decode):.1f}x encoding pool\n")
+    baseline = None
+    print(f"{'workers':>7} {'ops/s':>14} {'speedup':>8} {'efficiency':>10}")
+    for workers in range(1, args.max_workers + 1):
+        with ParallelCalculator(workers=workers, chunk_size=args.chunk_size, context=context, fork=args.fork) as engine:
+            engine.evaluate(operations[:args.chunk_size * workers], record=False)  # Warm up the pool
+            start = time.perf_counter()
+            engine.evaluate(operations, record=False)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>7} {args.operations / elapsed:>14,.0f} {speedup:>7.2f}x {speedup / workers:>9.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""benchmarks/bench_startup.py
+Measures the cold start of the application up to a served `show_menu`: creating the App, registering
+the commands and printing the menu. Every run is a fresh interpreter, timed from the outside, once with
+the eager plugin import (App.load_plugins) and once with the cached plugin manifest. Run from the
+repository root:
+
+    python -m benchmarks.bench_startup --runs 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+STARTUP = {
+    'eager': "app.load_plugins()",
+    'manifest': "app.load_plugin_manifest()",
+}
+
+SCRIPT = """
+import contextlib, io, sys
+from app import App, DynamicMenuCommand
+app = App()
+{register}
+app.command_handler.register_command(DynamicMenuCommand(app.command_handler))
+with contextlib.redirect_stdout(io.StringIO()):
+    app.command_handler.execute_command('show_menu')
+print(sum(1 for name in sys.modules if name.startswith('app.plugins.')))
+"""
+
+def run(mode: str, environment: dict) -> tuple:
+    """Start one interpreter and return its wall-clock time and the number of plugin modules it imported."""
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-c', SCRIPT.format(register=STARTUP[mode])], env=environment,
+                               check=True, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    return elapsed, int(completed.stdout.split()[-1])
+
+def main():
+    """Time both startup modes and print the median of each."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20, help="Interpreter starts per mode")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        environment = dict(os.environ, CALC_PLUGIN_MANIFEST=os.path.join(directory, 'manifest.json'))
+        run('manifest', environment)  # Write the manifest once, as the first start after a change would
+        for mode in STARTUP:
+            times, plugin_modules = [], 0
+            for _ in range(args.runs):
+                elapsed, plugin_modules = run(mode, environment)
+                times.append(elapsed)
+            print(f"{mode:<9} median {statistics.median(times) * 1000:7.1f} ms"
+                  f"   plugin modules imported: {plugin_modules}")
+
+if __name__ == "__main__":
+    main()
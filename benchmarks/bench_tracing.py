@@ -0,0 +1,68 @@
+"""benchmarks/bench_tracing.py
+Measures the overhead of span tracing on Calculator operations and CommandHandler commands, with tracing
+off, on for every trace and on with sampling. Run from the repository root:
+
+    python -m benchmarks.bench_tracing --ops 100000 --sample-rate 0.01
+"""
+import argparse
+import logging
+import time
+from decimal import Decimal
+from app.calculator import Calculator
+from app.calculator.calculations import CalculationHistory
+from app.calculator.tracing import TRACER
+from app.commands import CommandHandler
+from app.plugins.add import AddCommand
+
+def bench_operations(ops: int) -> float:
+    """Time `ops` Calculator.add calls, each traced on its own, the best of three runs."""
+    a, b = Decimal(3), Decimal(7)
+    best = float('inf')
+    for _ in range(3):
+        CalculationHistory.clear_history()
+        TRACER.reset()
+        start = time.perf_counter()
+        for _ in range(ops):
+            TRACER.trace('bench', 'add', Calculator.add, a, b) if TRACER.enabled else Calculator.add(a, b)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_commands(handler: CommandHandler, ops: int) -> float:
+    """Time `ops` evaluations of `add 3 7` through the command handler, the best of three runs."""
+    best = float('inf')
+    for _ in range(3):
+        CalculationHistory.clear_history()
+        TRACER.reset()
+        start = time.perf_counter()
+        for _ in range(ops):
+            handler.evaluate_command('add', '3', '7')
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    """Run both paths with tracing off, fully on and sampled, and print operations per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--ops', type=int, default=100_000, help="Number of operations per run")
+    parser.add_argument('--sample-rate', type=float, default=0.01, help="Sample rate of the sampled run")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)  # Time the spans, not the log handlers
+    handler = CommandHandler()
+    handler.register_command(AddCommand())
+
+    print(f"{'path':<10} {'off ops/s':>12} {'on ops/s':>12} {'sampled ops/s':>14} {'on overhead':>12} {'sampled':>8}")
+    for name, bench in (('operation', bench_operations),
+                        ('command', lambda ops: bench_commands(handler, ops))):
+        TRACER.disable()
+        off = bench(args.ops)
+        TRACER.enable(1.0)
+        on = bench(args.ops)
+        TRACER.enable(args.sample_rate)
+        sampled = bench(args.ops)
+        TRACER.disable()
+        print(f"{name:<10} {args.ops / off:>12,.0f} {args.ops / on:>12,.0f} {args.ops / sampled:>14,.0f} "
+              f"{on / off - 1:>12.0%} {sampled / off - 1:>8.0%}")
+    TRACER.reset()
+    CalculationHistory.clear_history()
+
+if __name__ == "__main__":
+    main()
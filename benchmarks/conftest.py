@@ -0,0 +1,150 @@
+"""benchmarks/conftest.py
+The pytest side of the benchmarks: the `perf` fixture times a hot path, every result is written to a JSON
+file, and each result is compared with the stored baseline, failing its test when it is slower than the
+baseline by more than the regression threshold. Tests marked `benchmark` are skipped unless selected:
+
+    python -m pytest benchmarks -m benchmark
+    python -m pytest benchmarks -m benchmark --benchmark-threshold 0.10 --benchmark-max-entries 10000000
+    python -m pytest benchmarks -m benchmark --benchmark-save-baseline
+
+Timings depend on the machine, so record the baseline on the machine that compares against it.
+"""
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from typing import Callable, Dict, Optional
+import pytest
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def pytest_addoption(parser):
+    """Adds the options of the benchmark run."""
+    group = parser.getgroup('benchmarks')
+    group.addoption('--benchmark-json', default=os.path.join(BENCHMARKS_DIR, 'results.json'),
+                    help="File the results are written to")
+    group.addoption('--benchmark-baseline', default=os.path.join(BENCHMARKS_DIR, 'baseline.json'),
+                    help="Baseline file the results are compared with")
+    group.addoption('--benchmark-threshold', type=float, default=0.25,
+                    help="Fraction by which a result may be slower than the baseline before its test fails")
+    group.addoption('--benchmark-save-baseline', action='store_true',
+                    help="Store the results in the baseline file instead of comparing with it")
+    group.addoption('--benchmark-repeat', type=int, default=5, help="Timing runs per result; the best is kept")
+    group.addoption('--benchmark-max-entries', type=int, default=1_000_000,
+                    help="Largest history size benchmarked (up to 10000000; the larger sizes need GBs of RAM)")
+
+def pytest_collection_modifyitems(config, items):
+    """Skips the benchmarks unless they are selected with `-m benchmark`."""
+    if 'benchmark' in (config.getoption('markexpr') or ''):
+        return
+    skip = pytest.mark.skip(reason="benchmark; select with -m benchmark")
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+class PerfRecorder:
+    """
+    Times functions and keeps the results by name, comparing each with the baseline.
+
+    Attributes:
+        results (Dict[str, dict]): The results of this run by name.
+        baseline (Dict[str, dict]): The baseline results by name, empty without a baseline file.
+        threshold (float): The fraction by which a result may be slower than its baseline.
+        repeat (int): The timing runs per result.
+        compare (bool): Whether results are compared with the baseline; not while saving a new one.
+    """
+    def __init__(self, baseline: Dict[str, dict], threshold: float, repeat: int, compare: bool):
+        self.results: Dict[str, dict] = {}
+        self.baseline = baseline
+        self.threshold = threshold
+        self.repeat = repeat
+        self.compare = compare
+
+    def measure(self, name: str, function: Callable[[], object], ops: int = 1, number: Optional[int] = None,
+                setup: Optional[Callable[[], object]] = None) -> dict:
+        """
+        Times `function`, which performs `ops` operations per call, and records the best of the timing runs.
+        Each run calls setup() first, untimed, then the function `number` times (by default, as many times
+        as take 0.2 s). Fails the calling test if the result regressed past the threshold.
+        """
+        timer = timeit.Timer(function, setup or (lambda: None))
+        if number is None:
+            number, _ = timer.autorange()
+        times = timer.repeat(self.repeat, number)
+        seconds_per_op = min(times) / (number * ops)
+        result = {'seconds_per_op': seconds_per_op, 'ops_per_second': 1 / seconds_per_op,
+                  'mean_seconds_per_op': sum(times) / len(times) / (number * ops), 'number': number, 'ops': ops,
+                  'repeat': self.repeat}
+        baseline = self.baseline.get(name)
+        if baseline and self.compare:
+            result['baseline_seconds_per_op'] = baseline['seconds_per_op']
+            result['change'] = seconds_per_op / baseline['seconds_per_op'] - 1
+        self.results[name] = result
+        if result.get('change', 0) > self.threshold:
+            pytest.fail(f"{name} regressed by {result['change']:.0%}: {seconds_per_op * 1e6:.3f} µs per op "
+                        f"against {baseline['seconds_per_op'] * 1e6:.3f} µs in the baseline "
+                        f"(threshold {self.threshold:.0%}).")
+        return result
+
+def _load_results(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['results']
+
+def _write_results(path: str, results: Dict[str, dict]):
+    document = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'machine': {'python': sys.version.split()[0], 'implementation': platform.python_implementation(),
+                    'platform': platform.platform(), 'processor': platform.processor(), 'cpus': os.cpu_count()},
+        'results': dict(sorted(results.items())),
+    }
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2)
+        file.write('\n')
+    os.replace(temporary_path, path)
+
+RECORDER = pytest.StashKey[PerfRecorder]()
+
+def pytest_configure(config):
+    """Creates the recorder of the run, comparing with the baseline unless a new baseline is being saved."""
+    config.stash[RECORDER] = PerfRecorder(_load_results(config.getoption('benchmark_baseline')),
+                                          config.getoption('benchmark_threshold'),
+                                          config.getoption('benchmark_repeat'),
+                                          compare=not config.getoption('benchmark_save_baseline'))
+
+def pytest_sessionfinish(session):
+    """Writes the results, and the new baseline when asked to."""
+    config = session.config
+    recorder = config.stash[RECORDER]
+    if not recorder.results:
+        return
+    _write_results(config.getoption('benchmark_json'), recorder.results)
+    if config.getoption('benchmark_save_baseline'):
+        # Merged, so a run of some of the benchmarks updates only their entries
+        _write_results(config.getoption('benchmark_baseline'), {**recorder.baseline, **recorder.results})
+
+@pytest.fixture
+def perf(request):
+    """Times a hot path: perf(name, function, ops=1, number=None, setup=None), see PerfRecorder.measure."""
+    return request.config.stash[RECORDER].measure
+
+@pytest.fixture
+def max_entries(request):
+    """The largest history size to benchmark."""
+    return request.config.getoption('benchmark_max_entries')
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Prints the results with their change from the baseline."""
+    recorder = config.stash[RECORDER]
+    if not recorder.results:
+        return
+    terminalreporter.section('benchmarks')
+    terminalreporter.write_line(f"{'name':<42} {'µs/op':>12} {'ops/s':>14} {'vs baseline':>12}")
+    for name, result in sorted(recorder.results.items()):
+        change = f"{result['change']:+.1%}" if 'change' in result else 'new'
+        terminalreporter.write_line(f"{name:<42} {result['seconds_per_op'] * 1e6:>12.3f} "
+                                    f"{result['ops_per_second']:>14,.0f} {change:>12}")
@@ -0,0 +1,77 @@
+"""benchmarks/loadgen.py
+Load generator for the `main.py --serve` calculator server. Opens many concurrent connections, keeps a
+fixed number of pipelined requests in flight on each one, and reports requests per second and p50/p99
+latency. Start the server first, then run from the repository root:
+
+    python main.py --serve --port 8765 2>/dev/null &
+    python -m benchmarks.loadgen --port 8765 --connections 1000 --requests 100 --pipeline 8
+"""
+import argparse
+import asyncio
+import random
+import resource
+import time
+from collections import deque
+from typing import List
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+def raise_open_file_limit(needed: int):
+    """Raise the soft limit on open files so thousands of client sockets fit."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+async def run_connection(host: str, port: int, requests: int, pipeline: int, latencies: List[float], seed: int):
+    """Send `requests` requests on one connection with up to `pipeline` outstanding at a time."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at = deque()
+    sent = received = 0
+    while received < requests:
+        while sent < requests and len(sent_at) < pipeline:
+            writer.write(f"{rng.choice(OPERATIONS)} {rng.randint(1, 999)} {rng.randint(1, 99)}\n".encode())
+            sent_at.append(time.perf_counter())
+            sent += 1
+        await writer.drain()
+        line = await reader.readline()
+        if not line:
+            break
+        latencies.append(time.perf_counter() - sent_at.popleft())
+        received += 1
+    writer.close()
+    await writer.wait_closed()
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Return the value at the given fraction of a sorted list (nearest rank)."""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+async def run(args):
+    """Run all connections concurrently and print the summary."""
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_connection(args.host, args.port, args.requests, args.pipeline, latencies, seed)
+                           for seed in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"connections: {args.connections}, pipeline depth: {args.pipeline}")
+    print(f"requests   : {len(latencies):,} in {elapsed:.2f}s ({len(latencies) / elapsed:,.0f} req/s)")
+    if latencies:
+        print(f"latency    : p50 {percentile(latencies, 0.50) * 1000:.2f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+def main():
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--connections', type=int, default=1000, help="Concurrent client connections")
+    parser.add_argument('--requests', type=int, default=100, help="Requests sent on each connection")
+    parser.add_argument('--pipeline', type=int, default=8, help="Requests in flight per connection")
+    args = parser.parse_args()
+    raise_open_file_limit(args.connections + 64)
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
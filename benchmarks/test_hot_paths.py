@@ -0,0 +1,144 @@
+"""benchmarks/test_hot_paths.py
+Benchmarks of the calculator's hot paths: Calculator operations, the overhead that perform_operation,
+calculate and calculate_and_print add on top, history appends and deletes from a thousand to ten million
+entries, saving and loading the history CSV, and batch mode. The CSV and batch benchmarks use seeded data
+from tests/data_generator.py. Run from the repository root (see conftest.py):
+
+    python -m pytest benchmarks -m benchmark
+
+Log records below WARNING are dropped before reaching a handler, as in a run without logging configured,
+so these measure the calculation path without log I/O (benchmarks/bench_logging.py covers logging).
+"""
+import contextlib
+import io
+import os
+from decimal import Decimal
+import pytest
+from app.batch import run_batch
+from app.calculator import Calculator
+from app.calculator.calc_utils import calculate, calculate_and_print, perform_operation
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory
+from app.calculator.operations import ArithmeticOperations as AO
+from tests.data_generator import generate_test_data, write_batch_file, write_history_csv
+
+pytestmark = pytest.mark.benchmark
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide', 'power', 'modulo']
+HISTORY_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+BATCH_LINES = [10 ** 4, 10 ** 5]
+CALLS = 1000  # Calls per timed run of the per-call paths, so the timer's own overhead is negligible
+
+@pytest.fixture(autouse=True)
+def history_file(tmp_path, monkeypatch):
+    """Points the history CSV at a temporary file and leaves the history empty after each benchmark."""
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('CALC_HISTORY_FILE', 'history.csv')
+    CalculationHistory.clear_history()
+    yield tmp_path / 'history.csv'
+    CalculationHistory.clear_history()
+
+def fill_history(entries: int):
+    """Makes the history hold exactly `entries` calculations, sharing one object to keep memory low."""
+    history = CalculationHistory.get_history()
+    if len(history) > entries:
+        del history[entries:]
+    else:
+        history.extend([Calculation(Decimal('1.5'), Decimal(3), AO.multiplication)] * (entries - len(history)))
+
+def size_label(entries: int) -> str:
+    """The label of a history size in result names, such as 1e6, which also sorts by size."""
+    return f"1e{len(str(entries)) - 1}"
+
+def skip_above(entries: int, max_entries: int):
+    """Skips the benchmark of a history size above --benchmark-max-entries."""
+    if entries > max_entries:
+        pytest.skip(f"{entries:,} entries is above --benchmark-max-entries {max_entries:,}")
+
+@pytest.mark.parametrize('operation', OPERATIONS)
+def test_calculator_operation(perf, operation):
+    """Calculator throughput per operation, recording every calculation."""
+    method = getattr(Calculator, operation)
+    a, b = Decimal('7.25'), Decimal(3)
+
+    def run():
+        for _ in range(CALLS):
+            method(a, b)
+    perf(f'calculator.{operation}', run, ops=CALLS, setup=CalculationHistory.clear_history)
+
+def test_calculator_sqrt(perf):
+    """Calculator throughput of the unary square root."""
+    a = Decimal('7.25')
+
+    def run():
+        for _ in range(CALLS):
+            Calculator.sqrt(a)
+    perf('calculator.sqrt', run, ops=CALLS, setup=CalculationHistory.clear_history)
+
+@pytest.mark.parametrize('path', ['perform_operation', 'calculate', 'calculate_and_print'])
+def test_calculation_path(perf, path):
+    """The cost of an addition through each layer of calc_utils, to compare with calculator.add."""
+    a, b = Decimal('7.25'), Decimal(3)
+    calls = {
+        'perform_operation': lambda: perform_operation(a, b, 'add'),
+        'calculate': lambda: calculate('7.25', '3', 'add'),
+        'calculate_and_print': lambda: calculate_and_print('7.25', '3', 'add'),
+    }
+    call = calls[path]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(CALLS):
+                call()
+    perf(f'calc_utils.{path}', run, ops=CALLS, setup=CalculationHistory.clear_history)
+
+@pytest.mark.parametrize('entries', HISTORY_SIZES)
+def test_history_append(perf, max_entries, entries):
+    """Appending to a history of `entries` calculations, one call per calculation."""
+    skip_above(entries, max_entries)
+    calculation = Calculation(Decimal(2), Decimal(3), AO.addition)
+
+    def run():
+        for _ in range(CALLS):
+            CalculationHistory.add_calculation(calculation)
+    perf(f'history.append[{size_label(entries)}]', run, ops=CALLS, number=1, setup=lambda: fill_history(entries))
+
+@pytest.mark.parametrize('entries', HISTORY_SIZES)
+def test_history_delete(perf, max_entries, entries):
+    """
+    Deleting the middle calculation of a history of `entries` calculations. Without a journal each delete
+    also rewrites the history CSV, which dominates.
+    """
+    skip_above(entries, max_entries)
+    perf(f'history.delete[{size_label(entries)}]',
+         lambda: CalculationHistory.delete_calculation_by_index(entries // 2), number=1,
+         setup=lambda: fill_history(entries))
+
+@pytest.mark.parametrize('entries', HISTORY_SIZES)
+def test_history_csv_save(perf, max_entries, entries):
+    """Saving a history of `entries` generated calculations to CSV, per row."""
+    skip_above(entries, max_entries)
+    CalculationHistory.add_calculations([Calculation(a, b, function)
+                                         for a, b, _, function, _ in generate_test_data(entries)])
+    perf(f'history.csv_save[{size_label(entries)}]', CalculationHistory.save_history_to_csv, ops=entries, number=1)
+
+@pytest.mark.parametrize('entries', HISTORY_SIZES)
+def test_history_csv_load(perf, max_entries, history_file, entries):
+    """Loading a generated history CSV file of `entries` calculations, per row."""
+    skip_above(entries, max_entries)
+    write_history_csv(str(history_file), entries)
+    perf(f'history.csv_load[{size_label(entries)}]', CalculationHistory.load_history_from_csv, ops=entries, number=1,
+         setup=CalculationHistory.clear_history)
+    assert len(CalculationHistory.get_history()) == entries and history_file.exists()
+
+@pytest.mark.parametrize('lines', BATCH_LINES)
+def test_batch_file(perf, tmp_path, lines):
+    """Batch mode over a generated input file of `lines` lines, per line, writing the results to a file."""
+    source, output_path = str(tmp_path / 'input.txt'), str(tmp_path / 'output.txt')
+    write_batch_file(source, lines)
+
+    def run():
+        with open(output_path, 'w', encoding='utf-8') as output:
+            run_batch(source, output)
+    perf(f'batch.run_batch[{size_label(lines)}]', run, ops=lines, number=1)
+    assert os.path.getsize(output_path) > 0
@@ -1,6 +1,85 @@
 """main.py: Main module of the application."""
+import sys
 from app import App
 
+def parse_arguments(argv=None):
+    """Parses the command-line arguments of the application."""
+    import argparse  # Not needed on the one-shot fast path
+    parser = argparse.ArgumentParser(description="Advanced Python Calculator")
+    parser.add_argument('command', nargs='?',
+                        help="Run this single command, e.g. 'add', with the following arguments and exit.")
+    parser.add_argument('args', nargs=argparse.REMAINDER, help="Arguments of the one-shot command.")
+    parser.add_argument('--log', action='store_true',
+                        help="For a one-shot command, log to the application log file as the REPL does.")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="Evaluate lines such as 'add 2 3' from FILE ('-' for stdin) and write the results "
+                             "to stdout, without the interactive REPL.")
+    parser.add_argument('--record-history', action='store_true',
+                        help="In batch mode, record every calculation in the calculation history, which is "
+                             "loaded from and saved back to the history CSV file (CALC_HISTORY_FILE).")
+    parser.add_argument('--backend', choices=('decimal', 'fraction', 'float'),
+                        help="Numeric backend for this run: exact 'decimal' (default), exact rational 'fraction', "
+                             "or fast 'float'. Overrides CALC_NUMERIC_BACKEND.")
+    parser.add_argument('--serve', action='store_true',
+                        help="Serve commands over a TCP line protocol instead of starting the interactive REPL.")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface the server listens on.")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port the server listens on.")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="Print an import-time breakdown of the application's cold start and exit.")
+    return parser.parse_args(argv)
+
+def use_backend_option(backend):
+    """Makes the --backend option, if given, the numeric backend of the session."""
+    if backend:
+        from app.calculator.numeric import set_backend
+        set_backend(backend)
+
+def run_batch_mode(source, record_history=False, backend=None):
+    """
+    Runs batch mode with the --backend option, or else the numeric backend the environment configures, as a
+    one-shot command does. With --record-history the calculations are added to the saved history.
+    """
+    from app.batch import run_batch
+    from app.calculator.calculations import CalculationHistory
+    from app.oneshot import select_backend
+    if record_history:
+        CalculationHistory.load_history_from_csv()
+    run_batch(source, record_history=record_history, backend=select_backend(backend))
+    if record_history and CalculationHistory.get_latest_history() is not None:
+        CalculationHistory.save_history_to_csv()
+
+def main(argv=None):
+    """
+    Runs a one-shot command, batch or server mode when requested, otherwise the interactive application.
+    Returns the exit code.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and not argv[0].startswith('-'):
+        # Fast path for `main.py <command> <args...>`: no option parsing, App or REPL setup
+        from app.oneshot import run_command
+        return run_command(argv[0], argv[1:])
+    args = parse_arguments(argv)
+    # The modes are imported only when selected, keeping them out of the REPL's startup
+    if args.command:
+        from app.oneshot import run_command
+        return run_command(args.command, args.args, log=args.log, backend=args.backend)
+    if args.startup_profile:
+        from app.startup_profile import print_startup_profile
+        print_startup_profile()
+    elif args.batch:
+        run_batch_mode(args.batch, args.record_history, args.backend)
+    elif args.serve:
+        from app.server import run_server
+        app = App()
+        use_backend_option(args.backend)
+        app.initialize_commands()
+        run_server(app.command_handler, args.host, args.port)
+    else:
+        # Initialize and start the application
+        app = App()
+        use_backend_option(args.backend)
+        app.start()
+    return 0
+
 if __name__ == "__main__":
-    # Initialize and start the application
-    App().start()
+    sys.exit(main())
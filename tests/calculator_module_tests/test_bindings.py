@@ -0,0 +1,149 @@
+"""tests/test_bindings.py
+Test suite for named bindings and the dependency graph behind them.
+"""
+from decimal import Decimal
+import pytest
+from app.calculator.bindings import CircularReferenceError, DependencyGraph, Formula, parse_definition
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory as CH
+from app.calculator.expression import BinaryOperation, ExpressionError
+from app.calculator.operations import ArithmeticOperations as AO
+
+@pytest.fixture
+def graph():
+    """A dependency graph that does not record its calculations."""
+    return DependencyGraph()
+
+def names(variables):
+    """The names of a list of variables."""
+    return [variable.name for variable in variables]
+
+def test_command_and_expression_definitions(graph):
+    """Test that a name can be bound to a calculator command, an expression or a constant."""
+    graph.bind('x', 'add 2 3')
+    graph.bind('y', 'x * 2 + 1')
+    graph.bind('z', '1.50')
+    graph.bind('w', 'multiply y z')
+    assert [graph.get(name) for name in 'xyzw'] == [5, 11, Decimal('1.50'), Decimal('16.50')]
+
+def test_parse_definition():
+    """Test that a command definition becomes a single operation with number or name operands."""
+    tree = parse_definition('divide x 4')
+    assert isinstance(tree, BinaryOperation) and tree.operation is AO.division
+    with pytest.raises(ExpressionError, match="Please use: <operation> <operand1> <operand2>"):
+        parse_definition('add 2')
+    with pytest.raises(ExpressionError, match="Invalid operand: '2x'."):
+        parse_definition('add 2x 3')
+    with pytest.raises(ExpressionError, match="Please use: <operation> <operand>"):
+        parse_definition('sqrt 2 3')
+
+def test_registry_operations(graph):
+    """Test that every registered operation can define a binding, unary ones included."""
+    graph.bind('x', 'sqrt 16')
+    graph.bind('y', 'power x 2')
+    graph.bind('z', 'y % 5 + sqrt (x)')
+    assert [graph.get(name) for name in 'xyz'] == [4, 16, 3]
+
+def test_rebinding_recomputes_only_downstream(graph):
+    """Test that changing an input recomputes its dependents in order and nothing else."""
+    graph.bind('a', '1')
+    graph.bind('b', '10')
+    graph.bind('c', 'a + 1')
+    graph.bind('d', 'c * 2')
+    graph.bind('e', 'b * 3')
+    before = graph.recomputations
+    assert names(graph.bind('a', '4')) == ['a', 'c', 'd']
+    assert graph.get('d') == 10
+    assert graph.get('e') == 30
+    assert graph.recomputations - before == 5  # a, a + 1, c, c * 2, d
+
+def test_unchanged_value_stops_propagation(graph):
+    """Test that a recomputed value equal to the previous one is not propagated further."""
+    graph.bind('a', '3')
+    graph.bind('b', 'a * 0')
+    graph.bind('c', 'b + 1')
+    before = graph.recomputations
+    assert names(graph.bind('a', '7')) == ['a']
+    assert graph.recomputations - before == 2  # a and a * 0
+    assert names(graph.bind('a', 'add 3 4')) == []
+
+def test_identical_subexpressions_are_shared(graph):
+    """Test that identical subexpressions are computed once and shared between bindings."""
+    graph.bind('x', '2')
+    graph.bind('y', '(x + 1) * (x + 1)')
+    assert graph.node_count() == 2
+    graph.bind('z', 'add x 1')
+    assert graph.node_count() == 2
+    formula = graph.variable('z').source
+    assert isinstance(formula, Formula) and formula is graph.variable('y').source.left
+    assert graph.get('y') == 9
+
+def test_unused_nodes_are_dropped(graph):
+    """Test that rebinding a name drops the operations no binding uses any more."""
+    graph.bind('x', '2')
+    graph.bind('y', 'x * 3 - 1')
+    assert graph.node_count() == 2
+    graph.bind('y', 'x')
+    assert graph.node_count() == 0
+    assert graph.variable('x').dependents == {id(graph.variable('y')): graph.variable('y')}
+
+def test_formula_is_a_calculation(graph):
+    """Test that an operation node is the Calculation of its latest computation."""
+    graph.bind('x', '6')
+    graph.bind('y', 'divide x 4')
+    formula = graph.variable('y').source
+    assert isinstance(formula, Calculation)
+    assert (formula.num1, formula.num2, formula.operation) == (6, 4, AO.division)
+    graph.bind('x', '8')
+    assert formula.num1 == 8 and formula.compute() == 2
+
+def test_errors_propagate_and_recover(graph):
+    """Test that a division by zero puts its dependents in error until the input changes."""
+    graph.bind('d', '0')
+    graph.bind('q', 'divide 1 d')
+    graph.bind('r', 'q + 1')
+    with pytest.raises(ZeroDivisionError):
+        graph.get('r')
+    assert names(graph.bind('d', '4')) == ['d', 'q', 'r']
+    assert graph.get('r') == Decimal('1.25')
+
+def test_invalid_bindings(graph):
+    """Test that undefined names, invalid names and cycles are rejected without changing the graph."""
+    graph.bind('x', '1')
+    graph.bind('y', 'x + 1')
+    with pytest.raises(ExpressionError, match="Name 'nope' is not defined."):
+        graph.bind('z', 'nope * 2')
+    with pytest.raises(ExpressionError, match="Invalid name: '2x'."):
+        graph.bind('2x', '1')
+    with pytest.raises(CircularReferenceError):
+        graph.bind('x', 'y * 2')
+    with pytest.raises(CircularReferenceError):
+        graph.bind('x', 'add x 1')
+    assert names(graph.variables()) == ['x', 'y']
+    assert graph.get('x') == 1
+    assert graph.node_count() == 1
+
+def test_recorded_calculations():
+    """Test that a recording graph adds every calculation it performs to the history."""
+    graph = DependencyGraph(record=True)
+    CH.clear_history()
+    graph.bind('x', 'add 2 3')
+    graph.bind('y', 'x * 2')
+    graph.bind('x', '1')
+    assert CH.get_history() == [Calculation(Decimal(2), Decimal(3), AO.addition),
+                                Calculation(Decimal(5), Decimal(2), AO.multiplication),
+                                Calculation(Decimal(1), Decimal(2), AO.multiplication)]
+    CH.clear_history()
+
+def test_negation_is_not_recorded():
+    """Test that negating a name is computed and propagated without recording a made-up subtraction."""
+    graph = DependencyGraph(record=True)
+    CH.clear_history()
+    graph.bind('x', '4')
+    graph.bind('y', '-x * 2')
+    assert graph.get('y') == -8
+    graph.bind('x', '1')
+    assert graph.get('y') == -2
+    assert CH.get_history() == [Calculation(Decimal(-4), Decimal(2), AO.multiplication),
+                                Calculation(Decimal(-1), Decimal(2), AO.multiplication)]
+    CH.clear_history()
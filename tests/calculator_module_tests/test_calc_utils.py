@@ -17,6 +17,10 @@ from app.calculator.calc_utils import calculate_and_print, perform_operation
     ("4", "5", "multiply", "The result of 4 multiply 5 is equal to 20\n"),
     ("20", "4", "divide", "The result of 20 divide 4 is equal to 5\n"),
     ("1", "0", "divide", "An error occurred: Cannot divide by zero\n"),
+    ("2", "10", "power", "The result of 2 power 10 is equal to 1024\n"),
+    ("-7", "3", "modulo", "The result of -7 modulo 3 is equal to -1\n"),
+    ("16", "0", "sqrt", "The result of sqrt 16 is equal to 4\n"),
+    ("-4", "0", "sqrt", "An error occurred: Cannot take the square root of a negative number.\n"),
     ("9", "3", "unknown", "Unknown operation: unknown\n"), # Test for unknown operation
     ("a", "3", "add", "Invalid number input: a or 3 is not a valid number.\n"), # Testing invalid number input
     ("5", "b", "subtract", "Invalid number input: 5 or b is not a valid number.\n") # Testing another invalid number input
@@ -46,8 +50,8 @@ def test_perform_operation_unexpected_exception():
     # Exception message to simulate
     exception_message = "mock unexpected exception"
 
-    # Setup the mock to replace the specified operation with one that raises an exception
-    with patch.object(Calculator, operation_name, side_effect=Exception(exception_message)):
+    # Setup the mock to replace the calculation of every operation with one that raises an exception
+    with patch.object(Calculator, 'calculate', side_effect=Exception(exception_message)):
         # Call perform_operation and expect it to handle the unexpected exception
         result_message = perform_operation(Decimal('1'), Decimal('2'), operation_name)
 
@@ -59,8 +63,8 @@ def test_perform_operation_logs_error_on_value_error(caplog):
     """Tests the perform_opeartion function's ability to handle ValueError gracefully."""
     caplog.set_level(logging.ERROR)
 
-    # Mock the add method of Calculator to raise ValueError
-    with patch('app.calculator.Calculator.add', side_effect=ValueError("Mocked error")):
+    # Mock the calculate method of Calculator to raise ValueError
+    with patch('app.calculator.Calculator.calculate', side_effect=ValueError("Mocked error")):
         # Assuming 'add' is the operation that we're testing
         perform_operation(Decimal("1"), Decimal("2"), "add")
 
@@ -6,11 +6,11 @@ calculation, and clearing the history.
 """
 from decimal import Decimal
 from unittest.mock import patch
-import pandas as pd
 import pytest
 from app.calculator.calculation import Calculation
 from app.calculator.operations import ArithmeticOperations as AO
 from app.calculator.calculations import CalculationHistory as CH
+from app.calculator.history_csv import EmptyHistoryFileError
 
 def setup_function(function):
     """Setup for tests clears the calculation history before each test function is run."""
@@ -109,7 +109,7 @@ def test_load_history_from_csv():
 
 def test_load_history_from_csv_empty_file():
     """Test loading history from an empty CSV file."""
-    with patch('app.calculator.calculations.pd.read_csv', side_effect=pd.errors.EmptyDataError):
+    with patch('app.calculator.calculations.read_history_csv', side_effect=EmptyHistoryFileError):
         # Since the file is empty, it should log the appropriate message
         with patch('app.calculator.calculations.logging.info') as mock_logging:
             CH.load_history_from_csv()
@@ -117,7 +117,7 @@ def test_load_history_from_csv_empty_file():
 
 def test_load_history_from_csv_file_not_found():
     """Test loading history when the CSV file is not found."""
-    with patch('app.calculator.calculations.pd.read_csv', side_effect=FileNotFoundError):
+    with patch('app.calculator.calculations.read_history_csv', side_effect=FileNotFoundError):
         # Since the file is not found, it should log the appropriate message
         with patch('app.calculator.calculations.logging.info') as mock_logging:
             CH.load_history_from_csv()
@@ -125,7 +125,7 @@ def test_load_history_from_csv_file_not_found():
 
 def test_load_history_from_csv_other_error():
     """Test loading history when an unexpected error occurs."""
-    with patch('app.calculator.calculations.pd.read_csv', side_effect=Exception("An unexpected error")):
+    with patch('app.calculator.calculations.read_history_csv', side_effect=Exception("An unexpected error")):
         # Since an unexpected error occurs, it should log the error message
         with patch('app.calculator.calculations.logging.error') as mock_logging:
             CH.load_history_from_csv()
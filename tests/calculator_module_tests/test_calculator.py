@@ -3,8 +3,11 @@ Test suite for the Calculator class in the calculator package. Tests the Calcula
 to correctly perform arithmetic operations (addition, subtraction, multiplication, division)
 and records each operation in the calculation history.
 """
+from decimal import Decimal
+import numpy as np
 import pytest
 from app.calculator import Calculator
+from app.calculator.operations import ArithmeticOperations as ao
 from app.calculator.calculations import CalculationHistory as ch
 
 @pytest.fixture(autouse=True)
@@ -28,3 +31,42 @@ def test_multiply():
 def test_divide():
     '''Test that calculator divide function works '''    
     assert Calculator.divide(2,2) == 1
+
+def test_batch_computes_each_pair():
+    '''Test that batch applies the operation to every pair and records them all'''
+    results, undefined = Calculator.add_many([1, 2, 3], [4, 5, 6])
+    assert results == [5, 7, 9]
+    assert undefined == [False, False, False]
+    assert len(ch.get_history()) == 3
+
+def test_batch_division_by_zero_mask():
+    '''Test that division by zero is reported per element instead of aborting the batch'''
+    results, undefined = Calculator.divide_many([Decimal('8'), Decimal('1'), Decimal('9')],
+                                                [Decimal('2'), Decimal('0'), Decimal('3')])
+    assert results == [4, None, 3]
+    assert undefined == [False, True, False]
+
+def test_batch_arithmetic_error_mask():
+    '''Test that invalid operations and overflows are masked per element like division by zero'''
+    results, undefined = Calculator.batch(ao.power, [Decimal('2'), Decimal('-4'), Decimal('10'), Decimal('0')],
+                                          [Decimal('3'), Decimal('0.5'), Decimal('1E+999999'), Decimal('0')])
+    assert results == [8, None, None, None]
+    assert undefined == [False, True, True, True]
+    results, undefined = Calculator.batch(ao.square_root, [Decimal('-1'), Decimal('9')], [0, 0], record=False)
+    assert results == [None, 3] and undefined == [True, False]
+
+def test_batch_accepts_numpy_arrays():
+    '''Test that batch converts NumPy operands to Decimal'''
+    results, _ = Calculator.multiply_many(np.array([1.5, 2]), np.array([2, 3]))
+    assert results == [Decimal('3.0'), Decimal('6.0')]
+    assert all(isinstance(result, Decimal) for result in results)
+
+def test_batch_without_recording():
+    '''Test that batch can skip history recording'''
+    Calculator.batch(ao.subtraction, [5], [3], record=False)
+    assert not ch.get_history()
+
+def test_batch_length_mismatch():
+    '''Test that batch rejects operand sequences of different lengths'''
+    with pytest.raises(ValueError):
+        Calculator.subtract_many([1, 2], [1])
@@ -0,0 +1,82 @@
+"""tests/test_columnar.py
+Test suite for the ColumnarHistory storage backend and its CalculationView entries.
+"""
+from decimal import Decimal
+from unittest.mock import patch
+import pytest
+from app.calculator import Calculator
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory as CH, History, Session
+from app.calculator.columnar import CalculationView, ColumnarHistory
+from app.calculator.operations import ArithmeticOperations as AO
+
+CALCULATIONS = [
+    Calculation(Decimal('1'), Decimal('2'), AO.addition),
+    Calculation(Decimal('2.0'), Decimal('2'), AO.multiplication),
+    Calculation(Decimal('1'), Decimal('0'), AO.division),
+]
+
+def test_entries_read_back_as_views():
+    """Test that stored calculations come back as equal views with exact operands."""
+    store = ColumnarHistory(CALCULATIONS)
+    assert len(store) == 3
+    assert store == CALCULATIONS
+    assert isinstance(store[0], CalculationView)
+    assert repr(store[1]) == "Calculation(2.0, 2, multiplication)"
+    assert store[-1] == CALCULATIONS[-1]
+    assert store[0:2] == CALCULATIONS[0:2]
+
+def test_operands_are_interned():
+    """Test that repeated operand values are stored once."""
+    store = ColumnarHistory(CALCULATIONS)
+    assert len(store._values) == 4  # pylint: disable=protected-access  # 1, 2, 2.0 and 0
+
+def test_delete_insert_and_clear():
+    """Test the mutating sequence operations."""
+    store = ColumnarHistory(CALCULATIONS)
+    del store[0]
+    assert list(store) == CALCULATIONS[1:]
+    store.insert(0, CALCULATIONS[0])
+    assert list(store) == CALCULATIONS
+    store[2] = CALCULATIONS[0]
+    assert store[2] == CALCULATIONS[0]
+    store.clear()
+    assert len(store) == 0
+    with pytest.raises(IndexError):
+        store[0]  # pylint: disable=pointless-statement
+
+def test_cached_results_are_computed_once():
+    """Test that the result column stores each result after the first computation."""
+    store = ColumnarHistory(CALCULATIONS, cache_results=True)
+    assert store[0].compute() == 3
+    calls = []
+    store._operations[0] = lambda a, b: calls.append((a, b))  # pylint: disable=protected-access
+    assert store[0].compute() == 3
+    assert not calls
+
+def test_cached_undefined_result():
+    """Test that a division by zero is remembered and raised again."""
+    store = ColumnarHistory(CALCULATIONS, cache_results=True)
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError):
+            store[2].compute()
+
+def test_view_ignores_cache_after_positions_shift():
+    """Test that a view taken before a delete does not read another entry's cached result."""
+    store = ColumnarHistory(CALCULATIONS, cache_results=True)
+    view = store[1]
+    del store[0]
+    store[0].compute()
+    assert view.compute() == Decimal('4.0')
+
+def test_calculation_history_uses_columnar_storage():
+    """Test that CalculationHistory works unchanged on top of ColumnarHistory."""
+    with Session().active():
+        CH.use_storage(ColumnarHistory())
+        Calculator.add(Decimal('2'), Decimal('3'))
+        Calculator.divide_many([Decimal('4')], [Decimal('2')])
+        assert CH.get_latest_history() == Calculation(Decimal('4'), Decimal('2'), AO.division)
+        assert len(CH.get_history()) == 2
+        with patch.object(History, 'save_history_to_csv'):
+            CH.delete_calculation_by_index(0)
+        assert CH.get_history() == [Calculation(Decimal('4'), Decimal('2'), AO.division)]
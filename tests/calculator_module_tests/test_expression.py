@@ -0,0 +1,125 @@
+"""tests/test_expression.py
+Test suite for the expression tokenizer, parser, constant folding, compiler and compiled-expression cache.
+"""
+import re
+from decimal import Decimal, localcontext
+import pytest
+from app.calculator import Calculator
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory as CH
+from app.calculator.expression import (BinaryOperation, CompiledExpression, ExpressionError, Name, Number,
+                                       compile_expression, expression_cache_info, fold_constants,
+                                       parse_expression, tokenize)
+from app.calculator.operations import ArithmeticOperations as AO
+
+@pytest.mark.parametrize("source, result", [
+    ("2 + 3", "5"),
+    ("(2 + 3) * 4 / 5", "4"),
+    ("2 + 3 * 4", "14"),
+    ("10 - 4 - 3", "3"),
+    ("12 / 2 / 3", "2"),
+    ("-3 * -(2 + 1)", "9"),
+    ("+1.5 * .5e1", "7.5"),
+    ("1.10 + 2.20", "3.30"),
+    ("-2 ^ 2", "-4"),
+    ("2 ^ 3 ^ 2", "512"),
+    ("2 ^ -1 * 3", "1.5"),
+    ("17 % 5 * 2", "4"),
+    ("sqrt(9) + sqrt(2 * 8)", "7"),
+])
+def test_evaluates_with_precedence_and_associativity(source, result):
+    """Test that operators follow the usual precedence, left associativity and exact Decimal arithmetic."""
+    assert str(CompiledExpression(source).evaluate()) == result
+
+@pytest.mark.parametrize("source, message", [
+    ("", "Empty expression."),
+    ("2 +", "Unexpected end of expression."),
+    ("(1 + 2", "Missing ')' for '(' at position 0."),
+    ("1 + 2)", "Unexpected ')' at position 5."),
+    ("2 $ 3", "Unexpected character '$' at position 2."),
+    ("2 3", "Unexpected '3' at position 2."),
+    ("cos(1)", "Unknown function 'cos' at position 0."),
+    ("add(1)", "Unknown function 'add' at position 0."),
+])
+def test_invalid_expressions(source, message):
+    """Test that malformed expressions raise an ExpressionError saying where."""
+    with pytest.raises(ExpressionError, match=re.escape(message)):
+        CompiledExpression(source)
+
+def test_tokenize():
+    """Test that the tokenizer reports kinds, texts and positions."""
+    assert tokenize("x*(1.5+y)") == [('name', 'x', 0), ('symbol', '*', 1), ('symbol', '(', 2), ('number', '1.5', 3),
+                                     ('symbol', '+', 6), ('name', 'y', 7), ('symbol', ')', 8)]
+
+def test_constants_are_folded_with_their_steps():
+    """Test that constant subexpressions fold into one Number that remembers the folded calculations."""
+    tree = fold_constants(parse_expression("(2 + 3) * x"))
+    assert isinstance(tree, BinaryOperation)
+    assert isinstance(tree.left, Number) and tree.left.value == 5
+    assert tree.left.steps == (Calculation(Decimal(2), Decimal(3), AO.addition),)
+    assert isinstance(tree.right, Name)
+
+def test_negative_literals_are_not_rounded():
+    """Test that a negative literal keeps every digit, like a positive one, whatever the context precision."""
+    digits = "1.23456789012345678901234567890123456789"
+    with localcontext() as context:
+        context.prec = 5
+        literal = parse_expression("-" + digits)
+    assert isinstance(literal, Number)
+    assert literal.value == Decimal("-" + digits)
+    assert str(literal.value) == "-" + digits
+
+def test_division_by_zero_is_not_folded():
+    """Test that a failing constant operation is left to fail at evaluation time."""
+    compiled = CompiledExpression("1 / 0 + 2")
+    with pytest.raises(ZeroDivisionError):
+        compiled.evaluate()
+
+def test_names_are_bound_at_evaluation():
+    """Test that names are looked up in the given mapping on every evaluation."""
+    compiled = CompiledExpression("2 * x + y")
+    assert compiled.names == frozenset({'x', 'y'})
+    assert compiled.evaluate({'x': Decimal(5), 'y': Decimal(1)}) == 11
+    assert compiled.evaluate({'x': Decimal(1), 'y': Decimal(0)}) == 2
+    with pytest.raises(ExpressionError, match="Name 'y' is not defined."):
+        compiled.evaluate({'x': Decimal(1)})
+
+def test_every_sub_operation_is_recorded():
+    """Test that recording adds folded and compiled sub-operations to the history in evaluation order."""
+    CH.clear_history()
+    CompiledExpression("(2 + 3) * x - 1").evaluate({'x': Decimal(4)}, record=True)
+    assert CH.get_history() == [Calculation(Decimal(2), Decimal(3), AO.addition),
+                                Calculation(Decimal(5), Decimal(4), AO.multiplication),
+                                Calculation(Decimal(20), Decimal(1), AO.subtraction)]
+    CH.clear_history()
+    CompiledExpression("(2 + 3) * x - 1").evaluate({'x': Decimal(4)})
+    assert not CH.get_history()
+
+def test_negation_is_not_recorded():
+    """Test that a minus sign negates its operand without recording a subtraction from zero."""
+    CH.clear_history()
+    assert CompiledExpression("-x * 2 + -(1 + 2)").evaluate({'x': Decimal(4)}, record=True) == -11
+    assert CH.get_history() == [Calculation(Decimal(-4), Decimal(2), AO.multiplication),
+                                Calculation(Decimal(1), Decimal(2), AO.addition),
+                                Calculation(Decimal(-8), Decimal(-3), AO.addition)]
+    CH.clear_history()
+
+def test_failed_operation_is_recorded_like_calculator():
+    """Test that a division by zero is recorded before it fails, as Calculator.divide does."""
+    CH.clear_history()
+    with pytest.raises(ZeroDivisionError):
+        Calculator.evaluate("4 / (1 - 1)")
+    assert CH.get_latest_history() == Calculation(Decimal(4), Decimal(0), AO.division)
+    CH.clear_history()
+
+def test_compiled_expressions_are_cached_by_source_and_context():
+    """Test that repeated sources reuse the compiled form, and that a different precision does not."""
+    first = compile_expression("7 / 3 + 0")
+    hits = expression_cache_info().hits
+    assert compile_expression("  7 / 3 + 0 ") is first
+    assert expression_cache_info().hits == hits + 1
+    with localcontext() as context:
+        context.prec = 3
+        short = compile_expression("7 / 3 + 0")
+        assert short is not first
+        assert str(short.evaluate()) == "2.33"
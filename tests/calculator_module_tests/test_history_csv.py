@@ -0,0 +1,82 @@
+"""tests/test_history_csv.py
+Test suite for the streaming history CSV reader and writer.
+"""
+from decimal import Decimal
+import pytest
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory as CH
+from app.calculator.history_csv import EmptyHistoryFileError, read_history_csv, write_history_csv
+from app.calculator.operations import ArithmeticOperations as AO
+from app.calculator.registry import OPERATIONS as REGISTRY
+from tests import data_generator
+
+OPERATIONS = {'addition': AO.addition, 'division': AO.division}
+
+def test_round_trip_keeps_decimal_text_exactly(tmp_path):
+    """Test that operands survive a write and read without any loss of precision."""
+    path = str(tmp_path / "history.csv")
+    calculations = [Calculation(Decimal('0.1'), Decimal('123456789012345678901234567890.123456789'), AO.addition),
+                    Calculation(Decimal('-1E+5'), Decimal('3.000'), AO.division)]
+    assert write_history_csv(path, iter(calculations)) == 2
+    loaded = list(read_history_csv(path, OPERATIONS))
+    assert [(str(calc.num1), str(calc.num2), calc.operation) for calc in loaded] == \
+        [(str(calc.num1), str(calc.num2), calc.operation) for calc in calculations]
+
+def test_read_skips_unknown_operations(tmp_path):
+    """Test that rows with operations missing from the mapping are skipped."""
+    path = tmp_path / "history.csv"
+    path.write_text("fld_Operation,fld_Operand1,fld_Operand2\naddition,1,2\nunknown,3,4\n", encoding='utf-8')
+    assert len(list(read_history_csv(str(path), OPERATIONS))) == 1
+
+def test_read_accepts_reordered_columns(tmp_path):
+    """Test that columns are located by header name."""
+    path = tmp_path / "history.csv"
+    path.write_text("fld_Operand2,fld_Operation,fld_Operand1\n2,division,8\n", encoding='utf-8')
+    calc = next(read_history_csv(str(path), OPERATIONS))
+    assert calc.compute() == 4
+
+def test_read_empty_file(tmp_path):
+    """Test that a file without a header is reported as empty."""
+    path = tmp_path / "history.csv"
+    path.write_text("", encoding='utf-8')
+    with pytest.raises(EmptyHistoryFileError):
+        list(read_history_csv(str(path), OPERATIONS))
+
+def test_read_missing_column(tmp_path):
+    """Test that a header without the required columns is rejected."""
+    path = tmp_path / "history.csv"
+    path.write_text("fld_Operation,fld_Operand1\naddition,1\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(read_history_csv(str(path), OPERATIONS))
+
+def test_read_skips_blank_and_short_rows(tmp_path):
+    """Test that blank and short rows are skipped instead of failing the whole load."""
+    path = tmp_path / "history.csv"
+    path.write_text("fld_Operation,fld_Operand1,fld_Operand2\naddition,1,2\n\naddition\n,\ndivision,8,4\n", encoding='utf-8')
+    loaded = list(read_history_csv(str(path), OPERATIONS))
+    assert [(calc.operation, calc.num1, calc.num2) for calc in loaded] == \
+        [(AO.addition, Decimal('1'), Decimal('2')), (AO.division, Decimal('8'), Decimal('4'))]
+
+def test_generated_history_round_trip(tmp_path):
+    """Test that a large generated history file loads every row and saves back to the same file content."""
+    source, saved = tmp_path / "generated.csv", tmp_path / "saved.csv"
+    data_generator.write_history_csv(str(source), 50_000)
+    loaded = list(read_history_csv(str(source), REGISTRY.functions))
+    records = data_generator.generate_test_data(50_000)
+    assert len(loaded) == 50_000
+    assert [(calc.num1, calc.num2, calc.operation) for calc in loaded[:100]] == \
+        [(a, b, function) for a, b, _, function, _ in records[:100]]
+    write_history_csv(str(saved), loaded)
+    assert saved.read_bytes().replace(b'\r\n', b'\n') == source.read_bytes()
+
+def test_history_save_and_load_through_environment(tmp_path, monkeypatch):
+    """Test that CalculationHistory saves and reloads through the configured file."""
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('CALC_HISTORY_FILE', 'history.csv')
+    CH.clear_history()
+    CH.add_calculation(Calculation(Decimal('0.1'), Decimal('0.2'), AO.addition))
+    CH.save_history_to_csv()
+    CH.clear_history()
+    CH.load_history_from_csv()
+    assert CH.get_latest_history().compute() == Decimal('0.3')
+    CH.clear_history()
@@ -0,0 +1,165 @@
+"""tests/test_journal.py
+Test suite for the HistoryJournal write-ahead log and its use by CalculationHistory.
+"""
+import os
+from decimal import Decimal
+from unittest.mock import patch
+import pytest
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory as CH, History, Session, current_history
+from app.calculator.journal import HistoryJournal, JournalCorruptedError
+from app.calculator.operations import ArithmeticOperations as AO
+
+@pytest.fixture
+def journal_path(tmp_path):
+    """Provide a journal path and make sure no journal stays attached after the test."""
+    CH.clear_history()
+    yield str(tmp_path / "history.journal")
+    CH.detach_journal()
+    CH.clear_history()
+
+def as_tuples(history):
+    """Reduce calculations to comparable tuples."""
+    return [(calc.operation, calc.num1, calc.num2) for calc in history]
+
+def test_replay_applies_adds_deletes_and_clears(journal_path):
+    """Test that replay rebuilds the history from every kind of record."""
+    journal = HistoryJournal(journal_path)
+    journal.record_adds([Calculation(Decimal('1'), Decimal('2'), AO.addition),
+                         Calculation(Decimal('3'), Decimal('4'), AO.subtraction)])
+    journal.record_clear()
+    journal.record_add(Calculation(Decimal('5'), Decimal('6'), AO.multiplication))
+    journal.record_add(Calculation(Decimal('0.1'), Decimal('3'), AO.division))
+    journal.record_delete(0)
+    journal.close()
+    assert as_tuples(HistoryJournal(journal_path).replay()) == [(AO.division, Decimal('0.1'), Decimal('3'))]
+
+def test_replay_skips_torn_record(journal_path):
+    """Test that a partially written final record is skipped."""
+    journal = HistoryJournal(journal_path)
+    journal.record_add(Calculation(Decimal('1'), Decimal('2'), AO.addition))
+    journal.close()
+    with open(journal_path, 'a', encoding='utf-8') as stream:
+        stream.write("A,addit")
+    assert len(HistoryJournal(journal_path).replay()) == 1
+    with open(journal_path, encoding='utf-8') as stream:
+        assert not stream.read().endswith("A,addit")
+
+def test_append_after_torn_record_survives_replay(journal_path):
+    """Test that a record appended after a torn one is not glued onto it and lost."""
+    journal = HistoryJournal(journal_path)
+    journal.record_add(Calculation(Decimal('1'), Decimal('2'), AO.addition))
+    journal.close()
+    with open(journal_path, 'a', encoding='utf-8') as stream:
+        stream.write("A,addit")
+    journal = HistoryJournal(journal_path)
+    assert len(journal.replay()) == 1
+    journal.record_add(Calculation(Decimal('3'), Decimal('4'), AO.subtraction))
+    journal.close()
+    assert as_tuples(HistoryJournal(journal_path).replay()) == [(AO.addition, Decimal('1'), Decimal('2')),
+                                                               (AO.subtraction, Decimal('3'), Decimal('4'))]
+
+def test_cut_record_that_still_parses_is_dropped(journal_path):
+    """Test that a record cut inside an operand fails its checksum instead of replaying the wrong value."""
+    journal = HistoryJournal(journal_path)
+    journal.record_add(Calculation(Decimal('1'), Decimal('2'), AO.addition))
+    journal.record_add(Calculation(Decimal('3'), Decimal('45'), AO.subtraction))
+    journal.close()
+    with open(journal_path, 'rb') as stream:
+        content = stream.read()
+    with open(journal_path, 'wb') as stream:
+        stream.write(content[:content.index(b"A,subtraction,3,4") + len(b"A,subtraction,3,4")] + b",0\r\n")
+    assert as_tuples(HistoryJournal(journal_path).replay()) == [(AO.addition, Decimal('1'), Decimal('2'))]
+
+def test_journal_without_checksums_is_still_replayed(journal_path):
+    """Test that a journal written before records carried checksums replays."""
+    with open(journal_path, 'w', encoding='utf-8') as stream:
+        stream.write("E,0\r\nA,addition,1,2\r\nA,division,3,4\r\nD,0\r\n")
+    journal = HistoryJournal(journal_path)
+    journal.record_add(Calculation(Decimal('5'), Decimal('6'), AO.multiplication))
+    journal.close()
+    assert as_tuples(HistoryJournal(journal_path).replay()) == [(AO.division, Decimal('3'), Decimal('4')),
+                                                               (AO.multiplication, Decimal('5'), Decimal('6'))]
+
+def test_history_changes_survive_restart(journal_path):
+    """Test that CalculationHistory changes are journaled and replayed on attach."""
+    CH.attach_journal(HistoryJournal(journal_path))
+    CH.add_calculation(Calculation(Decimal('1'), Decimal('2'), AO.addition))
+    CH.add_calculations([Calculation(Decimal('3'), Decimal('4'), AO.subtraction),
+                         Calculation(Decimal('5'), Decimal('6'), AO.multiplication)])
+    with patch.object(History, 'save_history_to_csv') as mock_save:
+        CH.delete_calculation_by_index(1)
+    mock_save.assert_not_called()
+    expected = as_tuples(CH.get_history())
+    CH.detach_journal()
+
+    with Session().active():  # A restarted process starts with an empty history
+        CH.attach_journal(HistoryJournal(journal_path))
+        assert as_tuples(CH.get_history()) == expected
+        CH.detach_journal()
+
+def test_compaction_writes_snapshot_and_truncates_journal(journal_path):
+    """Test that compaction folds the journal into the snapshot without changing the history."""
+    CH.attach_journal(HistoryJournal(journal_path, compact_every=0))
+    CH.add_calculations([Calculation(Decimal(i), Decimal(1), AO.addition) for i in range(10)])
+    CH.delete_calculation_by_index(0)
+    current_history()._journal.compact()  # pylint: disable=protected-access
+    CH.add_calculation(Calculation(Decimal('7'), Decimal('8'), AO.division))
+    with open(journal_path, encoding='utf-8') as stream:
+        header, record = stream.read().splitlines()
+    assert header == "E,1,crc32"
+    assert record.startswith("A,division,7,8,")
+    expected = as_tuples(CH.get_history())
+    CH.detach_journal()
+    assert as_tuples(HistoryJournal(journal_path).replay()) == expected
+
+def test_crash_between_snapshot_and_truncation(journal_path):
+    """Test that a snapshot published before the journal was truncated is not replayed twice."""
+    CH.attach_journal(HistoryJournal(journal_path, compact_every=0))
+    CH.add_calculations([Calculation(Decimal(i), Decimal(1), AO.addition) for i in range(5)])
+    CH.delete_calculation_by_index(1)
+    replace = os.replace
+
+    def crash_on_journal(source, destination):
+        if destination == journal_path:
+            raise OSError("Simulated crash")
+        replace(source, destination)
+    with patch('app.calculator.journal.os.replace', side_effect=crash_on_journal):
+        with pytest.raises(OSError):
+            current_history()._journal.compact()  # pylint: disable=protected-access
+    expected = as_tuples(CH.get_history())
+    CH.detach_journal()
+    assert as_tuples(HistoryJournal(journal_path).replay()) == expected
+
+def test_damaged_record_before_the_last_is_an_error(journal_path):
+    """Test that an unreadable record followed by others stops replay instead of shifting later deletes."""
+    journal = HistoryJournal(journal_path)
+    journal.record_adds([Calculation(Decimal(i), Decimal(1), AO.addition) for i in range(3)])
+    journal.close()
+    with open(journal_path, 'a', encoding='utf-8') as stream:
+        stream.write("D,one\nD,0\n")
+    with pytest.raises(JournalCorruptedError):
+        HistoryJournal(journal_path).replay()
+
+def test_automatic_background_compaction(journal_path):
+    """Test that reaching compact_every records starts a background compaction."""
+    journal = HistoryJournal(journal_path, compact_every=5)
+    CH.attach_journal(journal)
+    CH.add_calculations([Calculation(Decimal(i), Decimal(1), AO.addition) for i in range(5)])
+    journal._compaction_thread.join()  # pylint: disable=protected-access
+    assert journal.records_since_compaction == 0
+    assert len(HistoryJournal(journal_path).replay()) == 5
+
+def test_fsync_always_syncs_every_record(journal_path):
+    """Test that the 'always' policy fsyncs after each write."""
+    journal = HistoryJournal(journal_path, fsync_policy='always')
+    with patch('app.calculator.journal.os.fsync') as mock_fsync:
+        journal.record_clear()
+        journal.record_clear()
+    assert mock_fsync.call_count == 2
+    journal.close()
+
+def test_invalid_fsync_policy(journal_path):
+    """Test that an unknown fsync policy is rejected."""
+    with pytest.raises(ValueError):
+        HistoryJournal(journal_path, fsync_policy='sometimes')
@@ -0,0 +1,91 @@
+"""tests/test_memo.py
+Test suite for the ResultCache LRU memo cache and its use by Calculation.compute().
+"""
+import threading
+from decimal import Decimal, localcontext
+from unittest.mock import Mock
+import pytest
+from app.calculator.calculation import Calculation
+from app.calculator.memo import RESULT_CACHE, ResultCache
+from app.calculator.operations import ArithmeticOperations as AO
+
+def test_repeated_results_are_cached():
+    """Test that a repeated computation is a hit and does not call the operation again."""
+    cache = ResultCache(maxsize=8)
+    operation = Mock(return_value=Decimal('5'))
+    assert cache.compute(operation, Decimal('2'), Decimal('3')) == Decimal('5')
+    assert cache.compute(operation, Decimal('2'), Decimal('3')) == Decimal('5')
+    assert operation.call_count == 1
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 8}
+
+def test_key_distinguishes_scale_and_context():
+    """Test that equal operands with a different scale, or another decimal context, are cached separately."""
+    cache = ResultCache(maxsize=8)
+    assert str(cache.compute(AO.multiplication, Decimal('2'), Decimal('2'))) == '4'
+    assert str(cache.compute(AO.multiplication, Decimal('2.0'), Decimal('2'))) == '4.0'
+    with localcontext() as context:
+        context.prec = 3
+        assert str(cache.compute(AO.division, Decimal('1'), Decimal('3'))) == '0.333'
+    assert str(cache.compute(AO.division, Decimal('1'), Decimal('3'))) == '0.3333333333333333333333333333'
+    assert cache.stats()['misses'] == 4
+
+def test_least_recently_used_is_evicted():
+    """Test that the cache stays within maxsize by evicting the least recently used result."""
+    cache = ResultCache(maxsize=2)
+    for a in ('1', '2', '1', '3'):
+        cache.compute(AO.addition, Decimal(a), Decimal('1'))
+    assert cache.stats()['evictions'] == 1
+    cache.compute(AO.addition, Decimal('1'), Decimal('1'))  # Still cached: it was used after '2'
+    assert cache.stats()['hits'] == 2
+    cache.resize(1)
+    assert cache.stats()['size'] == 1
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 1}
+
+def test_errors_are_not_cached():
+    """Test that a ZeroDivisionError is raised every time rather than cached."""
+    cache = ResultCache(maxsize=8)
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError):
+            cache.compute(AO.division, Decimal('1'), Decimal('0'))
+    assert cache.stats()['size'] == 0
+
+def test_disabled_cache_computes_directly():
+    """Test that a maxsize of 0 bypasses the cache entirely."""
+    cache = ResultCache(maxsize=0)
+    operation = Mock(return_value=Decimal('1'))
+    cache.compute(operation, Decimal('1'), Decimal('1'))
+    cache.compute(operation, Decimal('1'), Decimal('1'))
+    assert operation.call_count == 2
+    assert cache.stats()['misses'] == 0
+    with pytest.raises(ValueError):
+        ResultCache(maxsize=-1)
+
+def test_concurrent_use_keeps_counters_consistent():
+    """Test that lookups from several threads are all counted and the size bound holds."""
+    cache = ResultCache(maxsize=16)
+
+    def work():
+        for i in range(500):
+            cache.compute(AO.addition, Decimal(i % 32), Decimal('1'))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 2000
+    assert stats['size'] <= 16
+
+def test_calculation_compute_uses_shared_cache():
+    """Test that Calculation.compute() goes through the shared RESULT_CACHE."""
+    RESULT_CACHE.resize(8)
+    try:
+        RESULT_CACHE.clear()
+        Calculation(Decimal('7'), Decimal('3'), AO.subtraction).compute()
+        assert Calculation(Decimal('7'), Decimal('3'), AO.subtraction).compute() == Decimal('4')
+        assert RESULT_CACHE.stats()['hits'] == 1
+    finally:
+        RESULT_CACHE.resize(0)
+        RESULT_CACHE.clear()
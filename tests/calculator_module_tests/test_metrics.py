@@ -0,0 +1,102 @@
+"""tests/test_metrics.py
+Test suite for the built-in metrics: latency histograms, counters, gauges and the Prometheus export.
+"""
+from decimal import Decimal
+import pytest
+from app.calculator import Calculator
+from app.calculator.calculations import CalculationHistory as CH
+from app.calculator.metrics import METRICS, LatencyHistogram, Metrics
+
+@pytest.fixture
+def metrics_on():
+    """Turns the shared metrics on, from a clean state, for the duration of a test."""
+    METRICS.reset()
+    METRICS.enable()
+    yield METRICS
+    METRICS.disable()
+    METRICS.reset()
+
+def test_histogram_counts_small_values_exactly():
+    """Test that values below the precision range land in their own buckets."""
+    histogram = LatencyHistogram(precision_bits=4)
+    for value in (1, 2, 3, 15):
+        histogram.record(value)
+    assert [histogram.percentile(q) for q in (25, 50, 75, 100)] == [1, 2, 3, 15]
+    assert (histogram.count, histogram.total, histogram.min, histogram.max) == (4, 21, 1, 15)
+
+def test_histogram_relative_error_is_bounded():
+    """Test that percentiles of large values are within the histogram's relative precision."""
+    histogram = LatencyHistogram()
+    values = [1_000 * i for i in range(1, 1001)]  # 1 µs to 1 ms
+    for value in values:
+        histogram.record(value)
+    for q in (50, 90, 99):
+        exact = values[int(len(values) * q / 100) - 1]
+        assert abs(histogram.percentile(q) - exact) <= exact / 32
+    assert histogram.percentile(100) == 1_000_000
+    assert histogram.mean == pytest.approx(500_500)
+
+def test_empty_histogram():
+    """Test that an empty histogram reports zeros."""
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0 and histogram.mean == 0
+
+def test_histogram_rejects_low_precision():
+    """Test that a histogram needs at least 2 precision bits."""
+    with pytest.raises(ValueError):
+        LatencyHistogram(precision_bits=1)
+
+def test_disabled_metrics_record_nothing():
+    """Test that calculations are not timed while the metrics are off."""
+    METRICS.reset()
+    Calculator.add(Decimal(1), Decimal(2))
+    assert not METRICS.calls and not METRICS.latencies
+
+def test_operations_are_counted_and_timed(metrics_on):
+    """Test that Calculator operations record calls, latencies and errors by exception type."""
+    Calculator.add(Decimal(1), Decimal(2))
+    Calculator.add(Decimal(3), Decimal(4))
+    with pytest.raises(ZeroDivisionError):
+        Calculator.divide(Decimal(1), Decimal(0))
+    assert metrics_on.calls == {('operation', 'addition'): 2, ('operation', 'division'): 1}
+    assert metrics_on.errors == {('operation', 'division', 'ZeroDivisionError'): 1}
+    assert metrics_on.latencies[('operation', 'addition')].count == 2
+    assert len(CH.get_history()) >= 3
+
+def test_gauges_are_read_on_collection():
+    """Test that gauges are read when the metrics are collected and failing gauges are left out."""
+    metrics = Metrics()
+    values = iter([1, 2])
+    metrics.register_gauge('calculator_test_gauge', "A test gauge.", lambda: next(values))
+    metrics.register_gauge('calculator_broken_gauge', "A failing gauge.", lambda: 1 / 0)
+    assert metrics.gauges() == {'calculator_test_gauge': 1}
+    assert metrics.gauges() == {'calculator_test_gauge': 2}
+
+def test_prometheus_export(tmp_path):
+    """Test the Prometheus text format of counters, latency summaries and gauges."""
+    metrics = Metrics()
+    metrics.record('command', 'add', 2_000)
+    metrics.record('command', 'divide', 4_000, ZeroDivisionError())
+    metrics.register_gauge('calculator_history_size', "Calculations in the history.", lambda: 7)
+    text = metrics.to_prometheus()
+    assert '# TYPE calculator_calls_total counter' in text
+    assert 'calculator_calls_total{kind="command",name="add"} 1' in text
+    assert 'calculator_errors_total{kind="command",name="divide",type="ZeroDivisionError"} 1' in text
+    assert 'calculator_latency_seconds{kind="command",name="add",quantile="0.99"} 0.000002000' in text
+    assert 'calculator_latency_seconds_count{kind="command",name="divide"} 1' in text
+    assert text.endswith('# TYPE calculator_history_size gauge\ncalculator_history_size 7\n')
+    path = tmp_path / 'metrics.prom'
+    metrics.write_prometheus(str(path))
+    assert path.read_text(encoding='utf-8') == text
+    assert not (tmp_path / 'metrics.prom.tmp').exists()
+
+def test_report():
+    """Test the plain-text table of the metrics."""
+    metrics = Metrics()
+    assert metrics.report() == "No calls recorded."
+    metrics.record('operation', 'addition', 1_500)
+    metrics.record('operation', 'addition', 2_500, OverflowError())
+    report = metrics.report().splitlines()
+    assert report[0].split()[:4] == ['kind', 'name', 'calls', 'errors']
+    assert report[1].split()[:5] == ['operation', 'addition', '2', '1', '2.0']
+    assert report[2] == "error operation addition OverflowError: 1"
@@ -0,0 +1,149 @@
+"""tests/test_numeric.py
+Test suite for the numeric backends and the operations, batches and expressions evaluated with them.
+"""
+import threading
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+import numpy
+import pytest
+from app.batch import evaluate_line
+from app.calculator import Calculator
+from app.calculator.bindings import DependencyGraph
+from app.calculator.calculations import CalculationHistory as CH
+from app.calculator.expression import compile_expression
+from app.calculator.numeric import (DecimalBackend, FloatBackend, FractionBackend, create_backend, get_backend,
+                                    parse_stored_number, set_backend, use_backend)
+from app.calculator.operations import ArithmeticOperations as AO
+from app.calculator.parallel import ParallelCalculator
+
+def setup_function(function):
+    """Setup for tests clears the calculation history before each test function is run."""
+    CH.clear_history()
+
+@pytest.mark.parametrize("backend, text, value", [
+    (DecimalBackend(), "0.1", Decimal("0.1")),
+    (FractionBackend(), "1/3", Fraction(1, 3)),
+    (FractionBackend(), "0.25", Fraction(1, 4)),
+    (FloatBackend(), "1e3", 1000.0),
+])
+def test_parse(backend, text, value):
+    """Test that each backend parses operands to its own number type."""
+    parsed = backend.parse(text)
+    assert parsed == value
+    assert type(parsed) is backend.type
+
+@pytest.mark.parametrize("backend", [DecimalBackend(), FractionBackend(), FloatBackend()])
+@pytest.mark.parametrize("text", ["abc", "1/0", ""])
+def test_parse_invalid_raises_invalid_operation(backend, text):
+    """Test that every backend reports a malformed operand as InvalidOperation, as Decimal does."""
+    with pytest.raises(InvalidOperation):
+        backend.parse(text)
+
+def test_convert_many():
+    """Test converting lists and NumPy arrays, keeping the shortest form of floats."""
+    assert DecimalBackend().convert_many(numpy.array([0.1, 2.5])) == [Decimal("0.1"), Decimal("2.5")]
+    assert FractionBackend().convert_many([0.1, 2, Decimal("0.5")]) == [Fraction(1, 10), Fraction(2), Fraction(1, 2)]
+    converted = FloatBackend().convert_many(numpy.array([1, 2], dtype=numpy.int64))
+    assert converted == [1.0, 2.0] and all(type(value) is float for value in converted)
+
+def test_create_backend():
+    """Test creating backends by name, with a decimal context for the decimal backend."""
+    backend = create_backend('decimal', precision=5, rounding='ROUND_DOWN')
+    assert (backend.context.prec, backend.context.rounding) == (5, 'ROUND_DOWN')
+    assert isinstance(create_backend('fraction'), FractionBackend)
+    for name, options in [('binary', {}), ('float', {'precision': 5}), ('decimal', {'rounding': 'ROUND_SIDEWAYS'})]:
+        with pytest.raises(ValueError):
+            create_backend(name, **options)
+
+def test_use_backend_is_scoped():
+    """Test that use_backend applies to its block only, together with its decimal context."""
+    assert isinstance(get_backend(), DecimalBackend)
+    with use_backend(create_backend('decimal', precision=3)):
+        assert Calculator.divide(Decimal(1), Decimal(3)) == Decimal("0.333")
+        with use_backend('float'):
+            assert evaluate_line("divide 1 4") == "0.25"
+    assert isinstance(get_backend(), DecimalBackend)
+    assert evaluate_line("divide 1 3") == "0.3333333333333333333333333333"
+
+def test_set_backend_is_per_thread():
+    """Test that set_backend changes the backend of the calling thread only."""
+    seen = []
+    def worker():
+        set_backend('fraction')
+        seen.append(evaluate_line("divide 1 3"))
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert seen == ["1/3"]
+    assert isinstance(get_backend(), DecimalBackend)
+
+@pytest.mark.parametrize("backend_name, line, result", [
+    ('fraction', "divide 1 3", "1/3"),
+    ('fraction', "power 1/4 0.5", "1/2"),
+    ('fraction', "power 2 -2", "1/4"),
+    ('fraction', "sqrt 9/4", "3/2"),
+    ('fraction', "modulo -7/2 2", "-3/2"),
+    ('float', "divide 1 4", "0.25"),
+    ('float', "modulo -7 3", "-1.0"),
+    ('float', "sqrt 2", "1.4142135623730951"),
+    ('float', "power 0 0", "error: 0 to the power of 0 is undefined."),
+    ('float', "power -8 0.5", "error: Cannot raise a negative number to a fractional power."),
+    ('float', "divide 1 0", "error: Cannot divide by zero"),
+])
+def test_operations_per_backend(backend_name, line, result):
+    """Test that every operation, and its error cases, work on the numbers of each backend."""
+    with use_backend(backend_name):
+        assert evaluate_line(line) == result
+
+def test_fraction_arithmetic_is_exact():
+    """Test that the fraction backend keeps rational results exact where Decimal rounds."""
+    assert evaluate_line("eval 1 / 3 * 3") == "0.9999999999999999999999999999"
+    with use_backend('fraction'):
+        assert evaluate_line("eval 1 / 3 * 3") == "1"
+        assert AO.addition(Fraction(1, 3), Fraction(1, 6)) == Fraction(1, 2)
+
+def test_float_batch_is_vectorized():
+    """Test Calculator.batch on NumPy arrays with the float backend, masking division by zero."""
+    with use_backend('float'):
+        results, undefined = Calculator.batch(AO.division, numpy.array([1.0, 2.0, 3.0]), numpy.array([4.0, 0.0, 2.0]))
+    assert results == [0.25, None, 1.5]
+    assert undefined == [False, True, False]
+    assert [calculation.num1 for calculation in CH.get_history()] == [1.0, 2.0, 3.0]
+
+def test_batch_converts_to_backend_type():
+    """Test that Calculator.batch converts operands to the current backend's type."""
+    with use_backend('fraction'):
+        results, _ = Calculator.batch(AO.division, [1, 2], [3, 4], record=False)
+    assert results == [Fraction(1, 3), Fraction(1, 2)]
+
+def test_expression_cache_is_keyed_by_backend():
+    """Test that an expression compiled under one backend is not reused under another."""
+    decimal_result = compile_expression("1 / 4").evaluate()
+    with use_backend('float'):
+        float_result = compile_expression("1 / 4").evaluate()
+    assert type(decimal_result) is Decimal and type(float_result) is float
+
+def test_bindings_with_fraction_backend():
+    """Test that let bindings keep exact rationals and propagate them with the fraction backend."""
+    with use_backend('fraction'):
+        graph = DependencyGraph()
+        graph.bind('x', "divide 1 3")
+        graph.bind('y', "x * 3")
+        assert graph.get('y') == Fraction(1)
+        changed = graph.bind('x', "1 / 6")
+    assert [variable.name for variable in changed] == ['x', 'y']
+    assert graph.get('y') == Fraction(1, 2)
+
+def test_parallel_calculator_uses_backend():
+    """Test that the parallel engine evaluates and returns numbers of its backend."""
+    operations = [(AO.division, Fraction(1), Fraction(3)), (AO.division, Fraction(1), Fraction(0))]
+    with ParallelCalculator(workers=2, chunk_size=1, backend=FractionBackend()) as engine:
+        results, undefined = engine.evaluate(operations, record=False)
+    assert results == [Fraction(1, 3), None]
+    assert undefined == [False, True]
+
+@pytest.mark.parametrize("text, value", [("1/3", Fraction(1, 3)), ("0.10", Decimal("0.10")), ("2.5", Decimal("2.5"))])
+def test_parse_stored_number(text, value):
+    """Test that stored operands read back exactly, whatever backend wrote them."""
+    parsed = parse_stored_number(text)
+    assert parsed == value and type(parsed) is type(value)
@@ -1,8 +1,8 @@
 """Tests for the ArithmeticOperations class in calculator/operations.py
-This suite uses Faker and randomized test data to evaluate arithmetic operations (addition, subtraction,
+This suite uses seeded, randomly generated test data to evaluate arithmetic operations (addition, subtraction,
 multiplication, and division), ensuring functionality across a range of Decimal inputs.
 """
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 import pytest
 from app.calculator.operations import ArithmeticOperations as AO
 
@@ -14,3 +14,28 @@ def test_division_by_zero():
     """Test division by zero is handled as expected."""
     with pytest.raises(ZeroDivisionError):
         AO.division(Decimal('1'), Decimal('0'))
+
+@pytest.mark.parametrize("function, a, b, result", [
+    (AO.power, '2', '10', '1024'),
+    (AO.power, '-2', '3', '-8'),
+    (AO.power, '4', '0.5', '2.000000000000000000000000000'),
+    (AO.modulo, '7', '3', '1'),
+    (AO.modulo, '-7', '3', '-1'),
+    (AO.modulo, '7.5', '2', '1.5'),
+    (AO.square_root, '2.25', '0', '1.5'),
+])
+def test_power_modulo_and_square_root(function, a, b, result):
+    """Test the operations added with the operation registry."""
+    assert str(function(Decimal(a), Decimal(b))) == result
+
+@pytest.mark.parametrize("function, a, b, error", [
+    (AO.power, '0', '-1', ZeroDivisionError),
+    (AO.power, '0', '0', InvalidOperation),
+    (AO.power, '-8', '0.5', InvalidOperation),
+    (AO.modulo, '1', '0', ZeroDivisionError),
+    (AO.square_root, '-1', '0', InvalidOperation),
+])
+def test_undefined_results(function, a, b, error):
+    """Test that undefined results raise an ArithmeticError rather than returning NaN or Infinity."""
+    with pytest.raises(error):
+        function(Decimal(a), Decimal(b))
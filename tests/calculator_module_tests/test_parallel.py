@@ -0,0 +1,65 @@
+"""tests/test_parallel.py
+Test suite for the ParallelCalculator process-pool engine.
+"""
+import decimal
+from decimal import Decimal
+import pytest
+from app.calculator.calculations import CalculationHistory as CH
+from app.calculator.operations import ArithmeticOperations as AO
+from app.calculator.parallel import ParallelCalculator
+
+OPERATIONS = [
+    (AO.addition, Decimal('1'), Decimal('2')),
+    (AO.division, Decimal('1'), Decimal('0')),
+    (AO.multiplication, Decimal('3'), Decimal('4')),
+    (AO.subtraction, Decimal('10'), Decimal('4')),
+    (AO.division, Decimal('9'), Decimal('3')),
+]
+
+def setup_function(function):
+    """Setup for tests clears the calculation history before each test function is run."""
+    CH.clear_history()
+
+@pytest.mark.parametrize("workers, fork", [(1, False), (2, False), (2, True)])
+def test_evaluate_keeps_input_order(workers, fork):
+    """Test that results and the zero-division mask come back in input order, from forked or pooled workers."""
+    with ParallelCalculator(workers=workers, chunk_size=2, fork=fork) as engine:
+        results, undefined = engine.evaluate(OPERATIONS)
+    assert results == [3, None, 12, 6, 3]
+    assert undefined == [False, True, False, False, False]
+
+@pytest.mark.parametrize("workers, fork", [(1, False), (2, False), (2, True)])
+def test_evaluate_masks_arithmetic_errors(workers, fork):
+    """Test that an invalid operation or overflow in one pair is masked instead of aborting the batch."""
+    operations = [(AO.square_root, Decimal('-1'), Decimal('0')), (AO.power, Decimal('10'), Decimal('1E+999999')),
+                  (AO.power, Decimal('2'), Decimal('10'))]
+    with ParallelCalculator(workers=workers, chunk_size=1, fork=fork) as engine:
+        results, undefined = engine.evaluate(operations, record=False)
+    assert results == [None, None, 1024]
+    assert undefined == [True, True, False]
+
+def test_evaluate_records_history_in_order():
+    """Test that history entries are appended in input order."""
+    with ParallelCalculator(workers=2, chunk_size=2) as engine:
+        engine.evaluate(OPERATIONS)
+    history = CH.get_history()
+    assert [(calc.operation, calc.num1, calc.num2) for calc in history] == OPERATIONS
+
+def test_evaluate_without_recording():
+    """Test that history recording can be skipped."""
+    with ParallelCalculator(workers=1) as engine:
+        engine.evaluate(OPERATIONS, record=False)
+    assert not CH.get_history()
+
+@pytest.mark.parametrize("workers, fork", [(1, False), (2, False), (2, True)])
+def test_workers_use_the_given_decimal_context(workers, fork):
+    """Test that every worker computes with the configured precision."""
+    context = decimal.Context(prec=5)
+    with ParallelCalculator(workers=workers, chunk_size=1, context=context, fork=fork) as engine:
+        results, _ = engine.evaluate([(AO.division, Decimal('1'), Decimal('3'))] * 3, record=False)
+    assert results == [Decimal('0.33333')] * 3
+
+def test_invalid_chunk_size():
+    """Test that a chunk size below one is rejected."""
+    with pytest.raises(ValueError):
+        ParallelCalculator(chunk_size=0)
@@ -0,0 +1,75 @@
+"""tests/test_registry.py
+Test suite for the operation registry and the dispatch tables every front end resolves operations through.
+"""
+from decimal import Decimal
+import pytest
+from app.batch import evaluate_line
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory as CH
+from app.calculator.expression import CompiledExpression
+from app.calculator.operations import ArithmeticOperations as AO
+from app.calculator.registry import OPERATIONS, Operation, OperationRegistry
+
+def cube(num1: Decimal, num2: Decimal) -> Decimal:
+    """A unary operation registered by the tests, as a plugin would."""
+    return num1 ** 3
+
+@pytest.fixture
+def registered_cube():
+    """Registers `cube` in the shared registry for the duration of a test."""
+    OPERATIONS.register('cube', cube, arity=1, symbol='@', description="Cube a number.")
+    yield OPERATIONS['cube']
+    OPERATIONS.unregister('cube')
+
+def test_builtin_operations():
+    """Test that the built-in operations are resolvable by command, stored name and symbol."""
+    assert [operation.command for operation in OPERATIONS] == ['add', 'subtract', 'multiply', 'divide',
+                                                                'power', 'modulo', 'sqrt']
+    assert OPERATIONS['add'] == Operation('add', AO.addition, 2, '+', "Add two numbers together.")
+    assert OPERATIONS.names['division'] is OPERATIONS.symbols['/'] is OPERATIONS.get('divide')
+    assert OPERATIONS.functions['square_root'] is AO.square_root
+    assert OPERATIONS['sqrt'].arity == 1 and OPERATIONS['sqrt'].name == 'square_root'
+    assert OPERATIONS.get('factorial') is None and 'factorial' not in OPERATIONS
+
+def test_dispatch_tables_are_read_only():
+    """Test that the dispatch tables cannot be changed except through register."""
+    with pytest.raises(TypeError):
+        OPERATIONS.commands['cube'] = OPERATIONS['add']  # type: ignore[index]
+
+def test_registration_conflicts():
+    """Test that commands, stored names and symbols must be unique, and re-registering is harmless."""
+    registry = OperationRegistry()
+    add = registry.register('add', AO.addition, symbol='+')
+    assert registry.register('add', AO.addition, symbol='+') is not None and len(registry) == 1
+    assert registry['add'] == add
+    with pytest.raises(ValueError, match="'add' is already registered"):
+        registry.register('add', AO.subtraction)
+    with pytest.raises(ValueError, match="named 'addition' is already registered"):
+        registry.register('plus', AO.addition)
+    with pytest.raises(ValueError, match="Symbol '\\+' is already used by 'add'"):
+        registry.register('subtract', AO.subtraction, symbol='+')
+    with pytest.raises(ValueError, match="must take 1 or 2 operands"):
+        registry.register('sum3', AO.subtraction, arity=3)
+
+def test_registered_operation_reaches_every_front_end(registered_cube, tmp_path, monkeypatch):
+    """Test that an operation registered by a plugin works in batch lines, expressions and history files."""
+    assert registered_cube.name == 'cube'
+    assert evaluate_line("cube 3") == "27"
+    assert CompiledExpression("cube(2) + 1").evaluate() == 9
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('CALC_HISTORY_FILE', 'history.csv')
+    CH.clear_history()
+    CH.add_calculation(Calculation(Decimal('2'), Decimal('0'), cube))
+    CH.add_calculation(Calculation(Decimal('2'), Decimal('8'), AO.power))
+    CH.save_history_to_csv()
+    CH.clear_history()
+    CH.load_history_from_csv()
+    assert [calculation.compute() for calculation in CH.get_history()] == [8, 256]
+    CH.clear_history()
+
+def test_unregistered_operation_is_unknown():
+    """Test that unregistering an operation removes it from every table."""
+    OPERATIONS.register('cube', cube, arity=1)
+    OPERATIONS.unregister('cube')
+    assert 'cube' not in OPERATIONS.commands and 'cube' not in OPERATIONS.functions
+    assert evaluate_line("cube 3") == "error: Unknown operation: cube"
@@ -0,0 +1,133 @@
+"""tests/test_ring_buffer.py
+Test suite for the RingBufferHistory storage backend and its spill-to-disk eviction.
+"""
+from decimal import Decimal
+from unittest.mock import patch
+import pytest
+from app.calculator import Calculator
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory as CH, History, Session
+from app.calculator.operations import ArithmeticOperations as AO
+from app.calculator.ring_buffer import PAGE_SIZE, RingBufferHistory
+
+def make_calculations(count):
+    """Returns `count` distinct additions."""
+    return [Calculation(Decimal(i), Decimal('0.5'), AO.addition) for i in range(count)]
+
+@pytest.fixture
+def ring(tmp_path):
+    """A ring buffer keeping three calculations in memory."""
+    store = RingBufferHistory(3, str(tmp_path / 'history.spill'))
+    yield store
+    store.close()
+
+def test_capacity_must_be_positive(tmp_path):
+    """Test that a ring without room for a single entry is rejected."""
+    with pytest.raises(ValueError):
+        RingBufferHistory(0, str(tmp_path / 'history.spill'))
+
+def test_oldest_entries_are_evicted(ring):
+    """Test that only `capacity` entries stay in memory and the rest go to the segment file."""
+    calculations = make_calculations(5)
+    ring.extend(calculations)
+    assert len(ring) == 5
+    assert ring.cold_size == 2
+    assert ring.evictions == 2
+    assert list(ring) == calculations
+    assert ring[-1] == calculations[-1]
+    assert ring[0:2] == calculations[0:2]
+
+def test_cold_reads_page_in_once(ring):
+    """Test that evicted entries are read back from disk a page at a time and counted."""
+    calculations = make_calculations(PAGE_SIZE + 10)
+    ring.extend(calculations)
+    assert ring[0] == calculations[0]
+    assert ring[1] == calculations[1]
+    assert ring[PAGE_SIZE] == calculations[PAGE_SIZE]
+    assert ring[-1] == calculations[-1]
+    stats = ring.stats()
+    assert stats['cold_hits'] == 3
+    assert stats['hot_hits'] == 1
+    assert stats['page_ins'] == 2
+    assert stats['hot_size'] == 3
+    assert stats['segment_bytes'] > 0
+
+def test_cached_page_sees_later_evictions(ring):
+    """Test that a page read before more evictions is refreshed rather than served stale."""
+    calculations = make_calculations(6)
+    ring.extend(calculations[:4])
+    assert ring[0] == calculations[0]
+    ring.extend(calculations[4:])
+    assert ring[2] == calculations[2]
+    assert list(ring) == calculations
+
+def test_mutating_cold_and_hot_entries(ring):
+    """Test set, delete and insert on both sides of the eviction boundary."""
+    calculations = make_calculations(6)
+    ring.extend(calculations)
+    replacement = Calculation(Decimal('9'), Decimal('9'), AO.multiplication)
+    ring[0] = replacement
+    ring[-1] = replacement
+    assert ring[0] == replacement
+    assert ring[5] == replacement
+    del ring[1]
+    del ring[-2]
+    assert list(ring) == [replacement, calculations[2], calculations[3], replacement]
+    ring.insert(0, calculations[1])
+    assert ring[0] == calculations[1]
+    ring.insert(len(ring), calculations[0])
+    assert ring[-1] == calculations[0]
+    assert len(ring._hot) == 3  # pylint: disable=protected-access
+
+def test_retention_drops_the_oldest_cold_entries(tmp_path):
+    """Test that past the retention limit the oldest evicted entries are dropped, bounding the cold index."""
+    ring = RingBufferHistory(3, str(tmp_path / 'history.spill'), retention=8)
+    calculations = make_calculations(100)
+    ring.extend(calculations)
+    assert ring.cold_size <= 8 + 2
+    assert ring.stats()['dropped'] == 100 - len(ring)
+    assert list(ring) == calculations[-len(ring):]
+    assert ring[0] == calculations[100 - len(ring)]
+    ring.close()
+
+def test_compaction_reclaims_dead_space(tmp_path):
+    """Test that once deleted entries outnumber the live ones the segment file is rewritten without them."""
+    ring = RingBufferHistory(3, str(tmp_path / 'history.spill'))
+    calculations = make_calculations(4 * PAGE_SIZE)
+    ring.extend(calculations)
+    full_size = ring.stats()['segment_bytes']
+    ring[0]  # pylint: disable=pointless-statement
+    for _ in range(3 * PAGE_SIZE):
+        del ring[0]
+    stats = ring.stats()
+    assert stats['compactions'] >= 1
+    assert stats['segment_bytes'] < full_size / 2
+    assert stats['dead_entries'] < len(ring)
+    assert list(ring) == calculations[3 * PAGE_SIZE:]
+    ring.append(calculations[0])
+    assert ring[-4] == calculations[-3]
+    assert ring[len(ring) - 4] == calculations[-3]
+    ring.close()
+
+def test_clear_truncates_segment(ring):
+    """Test that clearing removes every entry and the spilled data."""
+    ring.extend(make_calculations(5))
+    ring.clear()
+    assert len(ring) == 0
+    assert ring.stats()['segment_bytes'] == 0
+    with pytest.raises(IndexError):
+        ring[0]  # pylint: disable=pointless-statement
+    ring.extend(make_calculations(4))
+    assert list(ring) == make_calculations(4)
+
+def test_calculation_history_uses_ring_storage(ring):
+    """Test that CalculationHistory works unchanged on top of RingBufferHistory."""
+    with Session().active():
+        CH.use_storage(ring)
+        Calculator.add_many([Decimal(i) for i in range(5)], [Decimal('1')] * 5)
+        Calculator.divide(Decimal('4'), Decimal('2'))
+        assert CH.get_latest_history() == Calculation(Decimal('4'), Decimal('2'), AO.division)
+        assert len(CH.get_history()) == 6
+        with patch.object(History, 'save_history_to_csv'):
+            CH.delete_calculation_by_index(0)
+        assert CH.get_history()[0] == Calculation(Decimal('1'), Decimal('1'), AO.addition)
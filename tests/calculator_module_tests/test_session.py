@@ -0,0 +1,148 @@
+"""tests/test_session.py
+Test suite for per-session calculation histories and their use from several threads.
+"""
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from app.calculator import Calculator
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import (DEFAULT_SESSION, CalculationHistory as CH, History, Session,
+                                         current_history, current_session)
+from app.calculator.columnar import ColumnarHistory
+from app.calculator.operations import ArithmeticOperations as AO
+
+THREADS = 8
+APPENDS = 5_000
+
+def setup_function(function):
+    """Setup for tests clears the default session's history before each test function is run."""
+    CH.clear_history()
+
+def append_from_threads(session: Session):
+    """Makes THREADS threads each add APPENDS calculations under the session at the same time."""
+    start_line = threading.Barrier(THREADS)
+
+    def worker():
+        start_line.wait()
+        for value in range(APPENDS):
+            Calculator.add(Decimal(value), Decimal(1))
+    threads = [threading.Thread(target=session.run, args=(worker,)) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_sessions_keep_separate_histories():
+    """Test that calculations are recorded in the current session's history only."""
+    session = Session()
+    with session.active():
+        assert current_session() is session
+        Calculator.multiply(Decimal('2'), Decimal('3'))
+        Calculator.add_many([Decimal('1')], [Decimal('1')])
+        assert len(CH.get_history()) == 2
+    assert current_session() is DEFAULT_SESSION
+    assert not CH.get_history()
+    assert session.history.get_latest_history() == Calculation(Decimal('1'), Decimal('1'), AO.addition)
+
+def test_new_threads_start_in_the_default_session():
+    """Test that a session made current in one thread is not current in another."""
+    with Session().active():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(current_session).result() is DEFAULT_SESSION
+
+def test_session_run_in_a_thread_pool():
+    """Test that Session.run records a pool task's calculations in that session."""
+    sessions = [Session() for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda session: session.run(Calculator.divide, Decimal(8), Decimal(2)), sessions))
+    assert results == [Decimal(4)] * 4
+    assert all(len(session.history.get_history()) == 1 for session in sessions)
+    assert not CH.get_history()
+
+def test_asyncio_tasks_keep_their_sessions():
+    """Test that each asyncio task stays in the session it made current, across awaits."""
+    async def client(session: Session) -> int:
+        with session.active():
+            for _ in range(3):
+                Calculator.add(Decimal(1), Decimal(2))
+                await asyncio.sleep(0)
+            return len(current_history().get_history())
+
+    async def main():
+        return await asyncio.gather(client(Session()), client(Session()))
+    assert asyncio.run(main()) == [3, 3]
+
+def test_concurrent_appends_are_not_lost():
+    """Test that appends from many threads to one list-backed history all land."""
+    session = Session()
+    append_from_threads(session)
+    assert len(session.history.get_history()) == THREADS * APPENDS
+
+def test_concurrent_appends_to_locked_storage():
+    """Test that appends from many threads to a storage that is not thread-safe all land, in one piece."""
+    session = Session(History(ColumnarHistory()))
+    append_from_threads(session)
+    history = session.history.get_history()
+    assert len(history) == THREADS * APPENDS
+    assert sorted(calculation.num1 for calculation in history) == \
+        sorted(Decimal(value) for value in range(APPENDS) for _ in range(THREADS))
+
+def test_deletes_and_clears_race_with_appends(monkeypatch):
+    """Test that deleting and clearing while other threads append never raises or leaves the lock held."""
+    session = Session()
+    history = session.history
+    monkeypatch.setattr(history, 'save_history_to_csv', lambda: None)  # Each delete would rewrite the CSV
+    errors = []
+
+    def edit():
+        for _ in range(500):
+            history.get_latest_history()
+            try:
+                history.delete_calculation_by_index(0)
+            except IndexError:
+                pass
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(e)
+        history.clear_history()
+    editor = threading.Thread(target=edit)
+    editor.start()
+    append_from_threads(session)
+    editor.join()
+    assert not errors
+    assert history.lock.acquire(blocking=False)
+    history.lock.release()
+
+def test_storage_switches_race_with_appends(tmp_path):
+    """Test that no append is lost or left unjournaled while the storage is replaced and a journal attached."""
+    from app.calculator.journal import HistoryJournal
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads often, so appends interleave with the switches
+    session = Session()
+    history = session.history
+    done = threading.Event()
+
+    def switch():
+        while not done.is_set():
+            history.use_storage(ColumnarHistory())
+            history.use_storage([])
+    switcher = threading.Thread(target=switch)
+    switcher.start()
+    try:
+        append_from_threads(session)
+    finally:
+        done.set()
+        switcher.join()
+    assert len(history.get_history()) == THREADS * APPENDS
+    journal = HistoryJournal(str(tmp_path / 'history.journal'))
+    attacher = threading.Thread(target=history.attach_journal, args=(journal,))
+    attacher.start()
+    try:
+        append_from_threads(session)
+    finally:
+        attacher.join()
+        sys.setswitchinterval(switch_interval)
+    journaled = len(history.get_history())
+    history.detach_journal()
+    assert len(HistoryJournal(str(tmp_path / 'history.journal')).replay()) == journaled
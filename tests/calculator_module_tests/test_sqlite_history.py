@@ -0,0 +1,153 @@
+"""tests/test_sqlite_history.py
+Test suite for the SQLiteHistory storage backend and its indexed queries.
+"""
+import time
+from decimal import Decimal
+from unittest.mock import patch
+import pytest
+from app.calculator import Calculator
+from app.calculator.calculation import Calculation
+from app.calculator.calculations import CalculationHistory as CH, History, Session
+from app.calculator.operations import ArithmeticOperations as AO
+from app.calculator.sqlite_history import SQLiteHistory
+
+CALCULATIONS = [
+    Calculation(Decimal('1'), Decimal('2'), AO.addition),
+    Calculation(Decimal('2.0'), Decimal('2'), AO.multiplication),
+    Calculation(Decimal('1'), Decimal('0'), AO.division),
+    Calculation(Decimal('9'), Decimal('3'), AO.division),
+]
+
+@pytest.fixture
+def database(tmp_path):
+    """Path of a fresh history database."""
+    return str(tmp_path / 'history.db')
+
+@pytest.fixture
+def store(database):
+    """An SQLiteHistory holding CALCULATIONS."""
+    history = SQLiteHistory(database)
+    history.extend(CALCULATIONS)
+    yield history
+    history.close()
+
+def test_entries_read_back_in_order(store):
+    """Test that stored calculations come back equal, with exact operands, oldest first."""
+    assert len(store) == 4
+    assert list(store) == CALCULATIONS
+    assert repr(store[1]) == "Calculation(2.0, 2, multiplication)"
+    assert store[-1] == CALCULATIONS[-1]
+    assert store[1:3] == CALCULATIONS[1:3]
+    with pytest.raises(IndexError):
+        store[4]  # pylint: disable=pointless-statement
+
+def test_history_persists_across_connections(database):
+    """Test that buffered appends are committed on close and read back by a new instance."""
+    history = SQLiteHistory(database, batch_size=10)
+    history.append(CALCULATIONS[0])
+    history.close()
+    reopened = SQLiteHistory(database)
+    assert list(reopened) == [CALCULATIONS[0]]
+    reopened.close()
+
+def test_appends_are_batched(database):
+    """Test that appends are committed in one transaction per batch."""
+    history = SQLiteHistory(database, batch_size=3)
+    with patch.object(history, 'flush', wraps=history.flush) as mock_flush:
+        for calculation in CALCULATIONS[:3]:
+            history.append(calculation)
+    assert mock_flush.call_count == 1
+    history.append(CALCULATIONS[3])
+    assert len(history) == 4
+    assert history[-1] == CALCULATIONS[3]  # Reads see buffered appends
+    history.close()
+
+def test_wal_mode_and_indexes(store):
+    """Test that the database uses WAL mode and indexes operation and timestamp queries."""
+    connection = store._connection  # pylint: disable=protected-access
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    plan = connection.execute("EXPLAIN QUERY PLAN SELECT id FROM calculations WHERE operation = ? AND id > ?"
+                              " ORDER BY id", ('division', 0)).fetchall()
+    assert 'idx_calculations_operation' in plan[0][-1]
+    plan = connection.execute("EXPLAIN QUERY PLAN SELECT id FROM calculations WHERE created_at >= ?"
+                              " ORDER BY created_at, id LIMIT 1", (0,)).fetchall()
+    assert 'idx_calculations_created_at' in plan[0][-1]
+
+def test_query_by_operation_and_time(store):
+    """Test filtering by operation name or function and by a time window."""
+    divisions = [record.calculation for record in store.query('division')]
+    assert divisions == CALCULATIONS[2:]
+    assert [record.calculation for record in store.query(AO.multiplication)] == [CALCULATIONS[1]]
+    time.sleep(0.01)
+    since = time.time()
+    later = Calculation(Decimal('8'), Decimal('4'), AO.division)
+    store.append(later)
+    assert [record.calculation for record in store.query('division', since=since)] == [later]
+    assert [record.calculation for record in store.query(until=since)] == CALCULATIONS
+    assert not list(store.query(since=time.time() + 60))
+
+def test_query_pages_through_large_results(database):
+    """Test that results larger than one fetch are read completely."""
+    history = SQLiteHistory(database)
+    history.extend(Calculation(Decimal(i), Decimal('1'), AO.subtraction) for i in range(2500))
+    assert sum(1 for _ in history.query('subtraction')) == 2500
+    assert sum(1 for _ in history) == 2500
+    history.close()
+
+def test_delete_by_id_and_index(store):
+    """Test deleting rows by their id and by position."""
+    first = next(store.query('division'))
+    store.delete_by_id(first.id)
+    assert list(store) == CALCULATIONS[:2] + CALCULATIONS[3:]
+    with pytest.raises(KeyError):
+        store.delete_by_id(first.id)
+    del store[0]
+    assert list(store) == [CALCULATIONS[1], CALCULATIONS[3]]
+
+def test_positions_follow_deletes_and_reopening(database):
+    """Test that positional access stays right after deletes, batched appends and reopening the database."""
+    history = SQLiteHistory(database, batch_size=2)
+    history.extend(CALCULATIONS)
+    del history[1]
+    history.append(CALCULATIONS[0])  # Still buffered
+    expected = [CALCULATIONS[0], CALCULATIONS[2], CALCULATIONS[3], CALCULATIONS[0]]
+    assert [history[i] for i in range(len(history))] == expected
+    assert history[-3] == CALCULATIONS[2]
+    with pytest.raises(IndexError):
+        history[4]  # pylint: disable=pointless-statement
+    history.close()
+    reopened = SQLiteHistory(database)
+    assert [reopened[i] for i in range(-4, 0)] == expected
+    del reopened[-1]
+    reopened.append(CALCULATIONS[1])
+    reopened.flush()
+    assert list(reopened) == expected[:3] + [CALCULATIONS[1]]
+    assert reopened[3] == CALCULATIONS[1]
+    reopened.close()
+
+def test_set_insert_and_clear(store):
+    """Test replacing, appending through insert() and clearing."""
+    store[0] = CALCULATIONS[3]
+    assert store[0] == CALCULATIONS[3]
+    store.insert(len(store), CALCULATIONS[0])
+    assert store[-1] == CALCULATIONS[0]
+    with pytest.raises(NotImplementedError):
+        store.insert(0, CALCULATIONS[0])
+    store.clear()
+    assert len(store) == 0
+    assert not list(store)
+
+def test_calculation_history_uses_sqlite_storage(database):
+    """Test that CalculationHistory works unchanged on top of SQLiteHistory."""
+    with Session().active():
+        CH.use_storage(SQLiteHistory(database))
+        Calculator.add(Decimal('2'), Decimal('3'))
+        Calculator.divide_many([Decimal('4')], [Decimal('2')])
+        assert CH.get_latest_history() == Calculation(Decimal('4'), Decimal('2'), AO.division)
+        assert len(CH.get_history()) == 2
+        with patch.object(History, 'save_history_to_csv') as mock_save:
+            CH.delete_calculation_by_index(0)
+        mock_save.assert_not_called()  # The delete is already in the database
+        CH.flush_storage()
+        assert list(CH.get_history()) == [Calculation(Decimal('4'), Decimal('2'), AO.division)]
+        CH.get_history().close()
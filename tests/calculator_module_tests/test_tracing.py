@@ -0,0 +1,131 @@
+"""tests/test_tracing.py
+Test suite for span tracing: sampling, nesting, the event bound, the Chrome trace export and the spans of
+calculations.
+"""
+import json
+import logging
+from decimal import Decimal
+import pytest
+from app.calculator import Calculator
+from app.calculator.calc_utils import calculate
+from app.calculator.calculations import CalculationHistory as CH
+from app.calculator.tracing import TRACER, Tracer, traced
+
+@pytest.fixture
+def tracer_on():
+    """Turns the shared tracer on, from a clean state, for the duration of a test."""
+    TRACER.reset()
+    TRACER.enable()
+    yield TRACER
+    TRACER.disable()
+    TRACER.reset()
+    CH.clear_history()
+
+def span_names(tracer):
+    """The (category, name) of every recorded span, in order of completion."""
+    return [(category, name) for category, name, *_ in tracer.events]
+
+def test_nested_spans_are_recorded_inside_their_parent():
+    """Test that spans within a trace are recorded and lie within the span of the trace."""
+    tracer = Tracer()
+    tracer.enable()
+    result = tracer.trace('test', 'outer', lambda: tracer.span('test', 'inner', lambda x: x * 2, 21))
+    assert result == 42
+    (_, inner, inner_start, inner_end, tid), (_, outer, outer_start, outer_end, _) = tracer.events
+    assert (inner, outer) == ('inner', 'outer')
+    assert outer_start <= inner_start <= inner_end <= outer_end
+
+def test_span_outside_a_trace_records_nothing():
+    """Test that a span never starts a trace on its own."""
+    tracer = Tracer()
+    tracer.enable()
+    assert tracer.span('test', 'alone', lambda: 'ok') == 'ok'
+    assert not tracer.events
+
+def test_sampling_keeps_whole_traces_evenly():
+    """Test that a sample rate of 0.25 keeps every fourth trace, with all of its spans."""
+    tracer = Tracer()
+    tracer.enable(sample_rate=0.25)
+    for i in range(8):
+        tracer.trace('test', f'trace {i}', tracer.span, 'test', f'span {i}', lambda: None)
+    assert [name for _, name, *_ in tracer.events] == ['span 3', 'trace 3', 'span 7', 'trace 7']
+
+def test_invalid_sample_rate():
+    """Test that a sample rate outside 0 to 1 is rejected."""
+    with pytest.raises(ValueError):
+        Tracer().enable(sample_rate=1.5)
+
+def test_trace_is_closed_when_the_function_raises():
+    """Test that an exception is re-raised, its span recorded, and the next call starts a new trace."""
+    tracer = Tracer()
+    tracer.enable(sample_rate=0.5)
+    with pytest.raises(ZeroDivisionError):
+        tracer.trace('test', 'failing', lambda: 1 / 0)  # Not sampled
+    with pytest.raises(ZeroDivisionError):
+        tracer.trace('test', 'failing', lambda: 1 / 0)  # Sampled
+    assert span_names(tracer) == [('test', 'failing')]
+    tracer.span('test', 'after', lambda: None)
+    assert len(tracer.events) == 1  # No trace was left open for the span
+
+def test_events_beyond_the_bound_are_dropped():
+    """Test that at most max_events are kept and the rest counted as dropped."""
+    tracer = Tracer()
+    tracer.enable(max_events=3)
+    for _ in range(5):
+        tracer.trace('test', 'step', lambda: None)
+    assert len(tracer.events) == 3 and tracer.dropped == 2
+    assert tracer.to_chrome_trace()['otherData']['dropped_events'] == 2
+
+def test_chrome_trace_export(tmp_path):
+    """Test the trace-event document: thread names, complete events in microseconds, written atomically."""
+    tracer = Tracer()
+    tracer.enable()
+    tracer.record('test', 'manual', 1_000, 3_500)
+    tracer.trace('test', 'call', lambda: None)
+    path = tmp_path / 'trace.json'
+    tracer.write_chrome_trace(str(path))
+    document = json.loads(path.read_text(encoding='utf-8'))
+    metadata, manual, call = document['traceEvents']
+    assert metadata['ph'] == 'M' and metadata['args']['name'] == 'MainThread'
+    assert manual == {'name': 'manual', 'cat': 'test', 'ph': 'X', 'ts': 1.0, 'dur': 2.5,
+                      'pid': metadata['pid'], 'tid': metadata['tid']}
+    assert call['name'] == 'call' and call['dur'] >= 0
+    assert not (tmp_path / 'trace.json.tmp').exists()
+
+def test_traced_decorator(tracer_on):
+    """Test that a decorated function starts a trace, passes keyword arguments and runs untraced when off."""
+    @traced('test')
+    def scale(value, factor=1):
+        return value * factor
+
+    assert scale(2, factor=3) == 6
+    assert span_names(tracer_on) == [('test', 'scale')]
+    tracer_on.disable()
+    assert scale(4) == 4
+    assert len(tracer_on.events) == 1
+
+def test_calculation_spans(tracer_on):
+    """Test that a calculation is traced from parsing to the history append and the computation."""
+    assert calculate('2', '3', 'add') == "The result of 2 add 3 is equal to 5"
+    assert span_names(tracer_on) == [
+        ('calculator', 'parse'), ('calculator', 'parse'), ('history', 'add_calculation'),
+        ('operation', 'addition'), ('calculator', 'perform_operation'), ('calculator', 'calculate')]
+
+def test_calculator_outside_a_trace_records_nothing(tracer_on):
+    """Test that Calculator methods called outside a trace record no spans but still record the calculation."""
+    assert Calculator.add(Decimal(1), Decimal(2)) == Decimal(3)
+    assert not tracer_on.events and len(CH.get_history()) == 1
+
+def test_log_handler_spans(tracer_on):
+    """Test that the handlers of a traced logger record a span per handled record within a trace."""
+    logger = logging.getLogger('tests.tracing')
+    handler = logging.NullHandler()
+    logger.addHandler(handler)
+    try:
+        tracer_on.trace_handlers(logger)
+        tracer_on.trace_handlers(logger)  # Tracing the handlers twice records one span per record
+        tracer_on.trace('test', 'logging', logger.warning, "traced")
+        logger.warning("outside a trace")
+        assert span_names(tracer_on) == [('logging', 'NullHandler'), ('test', 'logging')]
+    finally:
+        logger.removeHandler(handler)
@@ -0,0 +1,110 @@
+"""tests/data_generator.py
+Seeded, NumPy-vectorized generation of test data for the arithmetic operations: operand, operation and
+expected-result records for the parametrized tests, and large input files for the batch, history CSV and
+benchmark tests. The same seed always gives the same data.
+
+Operands are integers from 0 to 99, and every third second operand is a single digit, with a zero divisor
+replaced by 1. Since there are only 4 x 100 x 100 distinct records, every record with its expected result,
+and every line of text, is built once into a table. NumPy draws the index of each record, so a million
+records take well under a second.
+"""
+import functools
+from decimal import Decimal, getcontext
+from typing import List, Tuple
+import numpy as np
+from app.calculator.history_csv import HEADER
+from app.calculator.registry import OPERATIONS
+
+DEFAULT_SEED = 1234
+OPERATION_NAMES = ('add', 'subtract', 'multiply', 'divide')
+DIVIDE = OPERATION_NAMES.index('divide')
+OPERAND_LIMIT = 100  # Operands are drawn from range(OPERAND_LIMIT)
+SMALL_OPERAND_EVERY = 3  # Every third second operand is a single digit, making zero divisors likely
+FILE_CHUNK_RECORDS = 1 << 20  # Records joined into one write when writing files
+
+_OPERANDS = tuple(Decimal(value) for value in range(OPERAND_LIMIT))
+
+def generate_columns(num_records: int, seed: int = DEFAULT_SEED) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generates the records as columns: the first operands, the second operands and the index of each
+    record's operation in OPERATION_NAMES.
+    """
+    rng = np.random.default_rng(seed)
+    num1 = rng.integers(0, OPERAND_LIMIT, num_records)
+    num2 = rng.integers(0, OPERAND_LIMIT, num_records)
+    small = np.arange(num_records) % SMALL_OPERAND_EVERY == 0
+    num2[small] = rng.integers(0, 10, int(small.sum()))
+    operation = rng.integers(0, len(OPERATION_NAMES), num_records)
+    num2[(operation == DIVIDE) & (num2 == 0)] = 1
+    return num1, num2, operation
+
+def _record_keys(num_records: int, seed: int) -> List[int]:
+    """Each record's index into the tables of distinct records."""
+    num1, num2, operation = generate_columns(num_records, seed)
+    return ((operation * OPERAND_LIMIT + num1) * OPERAND_LIMIT + num2).tolist()
+
+def _table(make) -> tuple:
+    """Calls make(operation index, num1, num2) for every distinct record, in record-key order."""
+    return tuple(make(operation, a, b) for operation in range(len(OPERATION_NAMES))
+                 for a in range(OPERAND_LIMIT) for b in range(OPERAND_LIMIT))
+
+@functools.lru_cache(maxsize=None)
+def _record_table(precision: int, rounding: str) -> tuple:
+    """Every distinct record, with its expected result computed under the given decimal context."""
+    functions = [OPERATIONS[name].function for name in OPERATION_NAMES]
+
+    def record(operation, a, b):
+        try:
+            expected = functions[operation](_OPERANDS[a], _OPERANDS[b])
+        except ZeroDivisionError:
+            expected = "ZeroDivisionError"
+        return _OPERANDS[a], _OPERANDS[b], OPERATION_NAMES[operation], functions[operation], expected
+    return _table(record)
+
+def _current_record_table() -> tuple:
+    context = getcontext()
+    return _record_table(context.prec, context.rounding)
+
+def generate_test_data(num_records: int, seed: int = DEFAULT_SEED) -> List[tuple]:
+    """
+    Generates test data for arithmetic operations.
+
+    Returns:
+        List[tuple]: Records of (num1, num2, operation_name, operation_func, expected result), with
+        Decimal operands and results computed under the current decimal context. Equal records are the
+        same tuple.
+    """
+    return list(map(_current_record_table().__getitem__, _record_keys(num_records, seed)))
+
+def _write_lines(path: str, table: tuple, keys: List[int], header: str = '') -> int:
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        if header:
+            file.write(header + '\n')
+        for start in range(0, len(keys), FILE_CHUNK_RECORDS):
+            file.write('\n'.join(map(table.__getitem__, keys[start:start + FILE_CHUNK_RECORDS])) + '\n')
+    return len(keys)
+
+@functools.lru_cache(maxsize=None)
+def _batch_line_table() -> tuple:
+    return _table(lambda operation, a, b: f"{OPERATION_NAMES[operation]} {a} {b}")
+
+@functools.lru_cache(maxsize=None)
+def _history_row_table() -> tuple:
+    names = [OPERATIONS[name].function.__name__ for name in OPERATION_NAMES]
+    return _table(lambda operation, a, b: f"{names[operation]},{a},{b}")
+
+def write_batch_file(path: str, num_records: int, seed: int = DEFAULT_SEED) -> int:
+    """Writes a batch-mode input file of `num_records` lines such as `add 12 7`. Returns the line count."""
+    return _write_lines(path, _batch_line_table(), _record_keys(num_records, seed))
+
+def expected_batch_output(num_records: int, seed: int = DEFAULT_SEED) -> List[str]:
+    """The result lines batch mode writes for the file write_batch_file() writes with the same arguments."""
+    results = tuple(str(record[4]) for record in _current_record_table())
+    return list(map(results.__getitem__, _record_keys(num_records, seed)))
+
+def write_history_csv(path: str, num_records: int, seed: int = DEFAULT_SEED) -> int:
+    """
+    Writes a history CSV file of `num_records` calculations in the format CalculationHistory saves and
+    loads. Returns the row count.
+    """
+    return _write_lines(path, _history_row_table(), _record_keys(num_records, seed), ','.join(HEADER))
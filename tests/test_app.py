@@ -5,6 +5,9 @@ import pytest
 from app import App
 from app import DynamicMenuCommand
 from app.commands import CommandHandler
+from app.calculator.columnar import ColumnarHistory
+from app.calculator.ring_buffer import RingBufferHistory
+from app.calculator.sqlite_history import SQLiteHistory
 
 @pytest.fixture
 def app_instance():
@@ -167,3 +170,160 @@ def test_start_unknown_command_ok(app_instance, caplog):
     # Check if the KeyError is logged
     assert "Unknown command: unknown_command" in caplog.text, \
         "Expected log message for unknown command"
+
+def test_configure_history_attaches_journal(app_instance, tmp_path):
+    '''Test that CALC_HISTORY_JOURNAL attaches a write-ahead journal to the history'''
+    app_instance.settings = {'CALC_HISTORY_JOURNAL': str(tmp_path / 'history.journal'), 'CALC_JOURNAL_FSYNC': 'never'}
+    with patch('app.CalculationHistory.attach_journal') as mock_attach:
+        app_instance.configure_history()
+    journal = mock_attach.call_args[0][0]
+    assert journal.path == str(tmp_path / 'history.journal')
+    assert journal.fsync_policy == 'never'
+    journal.close()
+
+def test_configure_history_with_damaged_journal(app_instance, tmp_path, caplog):
+    '''Test that a journal damaged before its last record is logged and not attached'''
+    journal_path = tmp_path / 'history.journal'
+    journal_path.write_text("E,0\nD,one\nC\n", encoding='utf-8')
+    app_instance.settings = {'CALC_HISTORY_JOURNAL': str(journal_path), 'CALC_JOURNAL_FSYNC': 'never'}
+    app_instance.configure_history()
+    assert "History journal not attached: Unreadable journal record 1" in caplog.text
+    assert journal_path.read_text(encoding='utf-8') == "E,0\nD,one\nC\n"
+
+def test_configure_history_selects_columnar_storage(app_instance):
+    '''Test that CALC_HISTORY_STORAGE=columnar switches the history to ColumnarHistory'''
+    app_instance.settings = {'CALC_HISTORY_STORAGE': 'columnar', 'CALC_HISTORY_CACHE_RESULTS': 'true'}
+    with patch('app.CalculationHistory.use_storage') as mock_use_storage:
+        app_instance.configure_history()
+    storage = mock_use_storage.call_args[0][0]
+    assert isinstance(storage, ColumnarHistory)
+    assert storage.cache_results
+
+def test_configure_history_selects_ring_storage(app_instance, tmp_path):
+    '''Test that CALC_HISTORY_STORAGE=ring switches the history to a bounded RingBufferHistory'''
+    spill_path = str(tmp_path / 'history.spill')
+    app_instance.settings = {'CALC_HISTORY_STORAGE': 'ring', 'CALC_HISTORY_CAPACITY': '5',
+                             'CALC_HISTORY_SPILL_FILE': spill_path}
+    with patch('app.CalculationHistory.use_storage') as mock_use_storage:
+        app_instance.configure_history()
+    storage = mock_use_storage.call_args[0][0]
+    assert isinstance(storage, RingBufferHistory)
+    assert storage.capacity == 5
+    assert storage.spill_path == spill_path
+    storage.close()
+
+def test_configure_history_with_invalid_capacity(app_instance, tmp_path, caplog):
+    '''Test that an invalid CALC_HISTORY_CAPACITY or CALC_HISTORY_RETENTION is logged and the defaults used'''
+    app_instance.settings = {'CALC_HISTORY_STORAGE': 'ring', 'CALC_HISTORY_CAPACITY': 'lots',
+                             'CALC_HISTORY_RETENTION': '-1',
+                             'CALC_HISTORY_SPILL_FILE': str(tmp_path / 'history.spill')}
+    with patch('app.CalculationHistory.use_storage') as mock_use_storage:
+        app_instance.configure_history()
+    storage = mock_use_storage.call_args[0][0]
+    assert storage.capacity == 10000
+    assert storage.retention == 1000000
+    assert "Invalid CALC_HISTORY_CAPACITY 'lots'" in caplog.text
+    assert "Invalid CALC_HISTORY_RETENTION '-1'" in caplog.text
+    storage.close()
+
+def test_configure_history_selects_sqlite_storage(app_instance, tmp_path):
+    '''Test that CALC_HISTORY_STORAGE=sqlite switches the history to SQLiteHistory at CALC_HISTORY_DB'''
+    database_path = str(tmp_path / 'history.db')
+    app_instance.settings = {'CALC_HISTORY_STORAGE': 'sqlite', 'CALC_HISTORY_DB': database_path}
+    with patch('app.CalculationHistory.use_storage') as mock_use_storage:
+        app_instance.configure_history()
+    storage = mock_use_storage.call_args[0][0]
+    assert isinstance(storage, SQLiteHistory)
+    assert storage.path == database_path
+    storage.close()
+
+def test_configure_result_cache(app_instance):
+    '''Test that CALC_RESULT_CACHE_SIZE sizes the shared result cache'''
+    app_instance.settings = {'CALC_RESULT_CACHE_SIZE': '128'}
+    with patch('app.RESULT_CACHE.resize') as mock_resize:
+        app_instance.configure_result_cache()
+    mock_resize.assert_called_once_with(128)
+
+@pytest.mark.parametrize("size", ['many', '-5', '1.5'])
+def test_configure_result_cache_with_invalid_size(app_instance, caplog, size):
+    '''Test that an invalid or negative CALC_RESULT_CACHE_SIZE is logged and leaves the cache disabled'''
+    app_instance.settings = {'CALC_RESULT_CACHE_SIZE': size}
+    with patch('app.RESULT_CACHE.resize') as mock_resize:
+        app_instance.configure_result_cache()
+    mock_resize.assert_called_once_with(0)
+    assert f"Invalid CALC_RESULT_CACHE_SIZE '{size}'" in caplog.text
+
+@pytest.mark.parametrize("settings, backend_name, precision", [
+    ({'CALC_NUMERIC_BACKEND': 'fraction'}, 'fraction', None),
+    ({'CALC_NUMERIC_BACKEND': 'float'}, 'float', None),
+    ({'CALC_DECIMAL_PRECISION': '6', 'CALC_DECIMAL_ROUNDING': 'ROUND_DOWN'}, 'decimal', 6),
+    ({'CALC_NUMERIC_BACKEND': 'binary'}, 'decimal', None),
+    ({'CALC_DECIMAL_ROUNDING': 'ROUND_SIDEWAYS'}, 'decimal', None),
+])
+def test_configure_numeric_backend(app_instance, settings, backend_name, precision):
+    '''Test that CALC_NUMERIC_BACKEND and the decimal settings select the session's numeric backend'''
+    app_instance.settings = settings
+    with patch('app.set_backend') as mock_set_backend:
+        app_instance.configure_numeric_backend()
+    backend = mock_set_backend.call_args[0][0]
+    assert backend.name == backend_name
+    if precision is not None:
+        assert backend.context.prec == precision
+
+def test_load_environment_file_when_present(app_instance):
+    '''Test that a .env file found above the application package is loaded with python-dotenv'''
+    with patch('os.path.isfile', return_value=True), patch('app.dotenv.load_dotenv') as mock_load_dotenv:
+        app_instance.load_environment_file()
+    mock_load_dotenv.assert_called_once()
+    assert mock_load_dotenv.call_args[0][0].endswith('.env')
+
+def test_load_environment_file_when_absent(app_instance):
+    '''Test that nothing is loaded when there is no .env file'''
+    with patch('os.path.isfile', return_value=False), patch('app.dotenv.load_dotenv') as mock_load_dotenv:
+        app_instance.load_environment_file()
+    mock_load_dotenv.assert_not_called()
+
+@pytest.fixture
+def repl_app(app_instance, tmp_path):
+    '''An app with its commands registered, using a temporary plugin manifest'''
+    app_instance.settings['CALC_PLUGIN_MANIFEST'] = str(tmp_path / 'manifest.json')
+    app_instance.initialize_commands()
+    return app_instance
+
+def test_execute_line_inline_arguments_and_pipeline(repl_app, capsys):
+    '''Test that `;` runs several inline commands in one pass and `_` carries the previous result'''
+    with patch('builtins.input') as mock_input:
+        repl_app.execute_line("add 2 3 ; multiply _ 4;subtract _ _")
+    mock_input.assert_not_called()
+    assert capsys.readouterr().out.splitlines() == [
+        "The result of 2 add 3 is equal to 5",
+        "The result of 5 multiply 4 is equal to 20",
+        "The result of 20 subtract 20 is equal to 0",
+    ]
+    assert repl_app.last_result == '0'
+
+def test_execute_line_without_previous_result(repl_app, capsys):
+    '''Test that `_` before any calculation is an error that stops the rest of the line'''
+    repl_app.execute_line("add _ 1 ; add 1 1")
+    assert capsys.readouterr().out == "Error: there is no previous result to use for '_'.\n"
+
+def test_execute_line_failed_calculation_clears_previous_result(repl_app, capsys):
+    '''Test that a division by zero leaves no previous result for `_`'''
+    repl_app.execute_line("add 1 1 ; divide _ 0 ; add _ 1")
+    output = capsys.readouterr().out.splitlines()
+    assert output[1] == "An error occurred: Cannot divide by zero"
+    assert output[2] == "Error: there is no previous result to use for '_'."
+
+def test_execute_line_unknown_command_stops_line(repl_app, caplog):
+    '''Test that an unknown command shows the menu and skips the remaining commands'''
+    with patch.object(repl_app.command_handler, 'execute_command', wraps=repl_app.command_handler.execute_command) as mock_execute:
+        repl_app.execute_line("factorial 5 ; add 1 1")
+    assert "Unknown command: factorial 5" in caplog.text
+    assert [call.args[0] for call in mock_execute.call_args_list] == ['factorial', 'show_menu']
+
+def test_execute_line_exit(repl_app):
+    '''Test that `exit` inside a line exits after the commands before it'''
+    with pytest.raises(SystemExit) as ex:
+        repl_app.execute_line("add 1 1 ; exit ; add 2 2")
+    assert ex.value.code == 0
+    assert repl_app.last_result == '2'
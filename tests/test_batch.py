@@ -0,0 +1,116 @@
+"""tests/test_batch.py
+Test suite for the non-interactive batch mode in app.batch and its main.py entry point.
+"""
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from app import batch
+from app.batch import evaluate_line, read_lines, run_batch, write_results
+from app.calculator.calculations import CalculationHistory, current_history
+from main import main
+from tests.data_generator import expected_batch_output, write_batch_file
+
+@pytest.mark.parametrize("line, expected", [
+    ("add 2 3", "5"),
+    ("subtract 10 4", "6"),
+    ("multiply 1.5 4", "6.0"),
+    ("divide 9 3", "3"),
+    ("divide 1 0", "error: Cannot divide by zero"),
+    ("power 2 3", "8"),
+    ("modulo 7 0", "error: Cannot divide by zero"),
+    ("sqrt 2.25", "1.5"),
+    ("sqrt -1", "error: Cannot take the square root of a negative number."),
+    ("sqrt 4 5", "error: Invalid line format: 'sqrt 4 5'. Please use: <operation> <operand>"),
+    ("factorial 5 1", "error: Unknown operation: factorial"),
+    ("add a 3", "error: Invalid number input: a or 3 is not a valid number."),
+    ("add 2", "error: Invalid line format: 'add 2'. Please use: <operation> <operand1> <operand2>"),
+    ("eval (2 + 3) * 4 / 5", "4"),
+    ("eval 1 / (2 - 2)", "error: Cannot divide by zero"),
+    ("eval 2 +", "error: Unexpected end of expression."),
+    ("eval 2 ^ 3 % 5 + sqrt(16)", "7"),
+])
+def test_evaluate_line(line, expected):
+    """Test that every kind of line evaluates to its result or an error message."""
+    assert evaluate_line(line) == expected
+
+def test_read_lines_skips_blank_and_comment_lines():
+    """Test that blank lines and comments are not evaluated."""
+    stream = StringIO("add 1 2\n\n# comment\n  multiply 2 2  \n")
+    assert list(read_lines(stream)) == ["add 1 2", "multiply 2 2"]
+
+def test_evaluate_line_records_history_when_requested():
+    """Test that history is only recorded when record_history is set."""
+    CalculationHistory.clear_history()
+    evaluate_line("add 1 2")
+    assert not CalculationHistory.get_history()
+    evaluate_line("add 1 2", record_history=True)
+    assert len(CalculationHistory.get_history()) == 1
+    CalculationHistory.clear_history()
+
+def test_write_results_writes_in_chunks():
+    """Test that results are joined into one write per chunk."""
+    output = StringIO()
+    with patch.object(batch, 'WRITE_CHUNK_LINES', 2), patch.object(output, 'write', wraps=output.write) as mock_write:
+        count = write_results(iter(["1", "2", "3"]), output)
+    assert count == 3
+    assert mock_write.call_count == 2
+    assert output.getvalue() == "1\n2\n3\n"
+
+def test_run_batch_from_file(tmp_path):
+    """Test a batch run from an input file."""
+    source = tmp_path / "input.txt"
+    source.write_text("add 2 3\ndivide 1 0\n", encoding='utf-8')
+    output = StringIO()
+    assert run_batch(str(source), output) == 2
+    assert output.getvalue() == "5\nerror: Cannot divide by zero\n"
+
+def test_run_batch_generated_file(tmp_path):
+    """Test a batch run over a large generated input file, line for line."""
+    source = tmp_path / "input.txt"
+    write_batch_file(str(source), 20_000)
+    output = StringIO()
+    assert run_batch(str(source), output) == 20_000
+    assert output.getvalue().splitlines() == expected_batch_output(20_000)
+
+def test_run_batch_with_backend(tmp_path):
+    """Test that a batch run can select its own numeric backend without changing the session's."""
+    source = tmp_path / "input.txt"
+    source.write_text("divide 1 3\neval 1 / 3 * 3\n", encoding='utf-8')
+    output = StringIO()
+    run_batch(str(source), output, backend='fraction')
+    assert output.getvalue() == "1/3\n1\n"
+    assert evaluate_line("divide 1 4") == "0.25"
+
+def test_main_batch_with_backend_option(capsys):
+    """Test that `main.py --batch - --backend float` evaluates with floats."""
+    with patch('sys.stdin', StringIO("multiply 3 4\n")):
+        main(['--batch', '-', '--backend', 'float'])
+    assert capsys.readouterr().out == "12.0\n"
+
+def test_main_batch_from_stdin(capsys):
+    """Test that `main.py --batch -` reads from stdin and writes only results to stdout."""
+    with patch('sys.stdin', StringIO("multiply 3 4\n")):
+        main(['--batch', '-'])
+    assert capsys.readouterr().out == "12\n"
+
+def test_main_batch_uses_numeric_settings(capsys, monkeypatch):
+    """Test that batch mode selects the numeric backend from the environment, as one-shot mode does."""
+    monkeypatch.setenv('CALC_NUMERIC_BACKEND', 'fraction')
+    with patch('sys.stdin', StringIO("divide 1 3\n")):
+        main(['--batch', '-'])
+    assert capsys.readouterr().out == "1/3\n"
+
+def test_main_batch_saves_recorded_history(capsys, monkeypatch, tmp_path):
+    """Test that --record-history adds the batch's calculations to the saved history CSV."""
+    monkeypatch.setenv('DATA_DIR', str(tmp_path))
+    monkeypatch.setenv('CALC_HISTORY_FILE', 'history.csv')
+    CalculationHistory.clear_history()
+    for line in ("add 1 2\n", "multiply 3 4\n"):
+        with patch('sys.stdin', StringIO(line)):
+            main(['--batch', '-', '--record-history'])
+    assert capsys.readouterr().out == "3\n12\n"
+    CalculationHistory.clear_history()
+    CalculationHistory.load_history_from_csv()
+    assert [calculation.operation.__name__ for calculation in current_history().get_history()] == [
+        'addition', 'multiplication']
+    CalculationHistory.clear_history()
@@ -111,3 +111,30 @@ def test_command_execute_not_implemented():
 
     # Optionally, assert on the message of the error, if specificity is needed
     assert "Command execution not implemented." in str(exc_info.value)
+
+def test_evaluate_command(command_handler):
+    """
+    Test that evaluate_command returns the output of the command's evaluate method.
+    """
+    command1 = MockCommand("test1")
+    command_handler.register_command(command1)
+    with patch.object(MockCommand, "evaluate", return_value="result") as mock_evaluate:
+        assert command_handler.evaluate_command("test1", "a", "b") == "result"
+        mock_evaluate.assert_called_once_with("a", "b")
+
+def test_evaluate_nonexistent_command(command_handler):
+    """
+    Verify that evaluating a non-existent command raises KeyError.
+    """
+    with pytest.raises(KeyError):
+        command_handler.evaluate_command("nonexistent")
+
+def test_evaluate_interactive_only_command(caplog, command_handler):
+    """
+    Test that evaluating a command without non-interactive support returns and logs an error.
+    """
+    command_handler.register_command(MockCommand("test1"))
+    with caplog.at_level(logging.ERROR):
+        response = command_handler.evaluate_command("test1")
+    assert response == "Error: Command 'test1' is only available interactively."
+    assert "error evaluating command 'test1'" in caplog.text.lower()
@@ -0,0 +1,48 @@
+"""tests/test_data_generator.py
+Test suite for the seeded test-data generator in tests/data_generator.py.
+"""
+from decimal import Decimal, localcontext
+import numpy as np
+from app.calculator.history_csv import HEADER
+from tests.data_generator import (OPERATION_NAMES, expected_batch_output, generate_columns, generate_test_data,
+                                  write_batch_file, write_history_csv)
+
+def test_same_seed_same_records():
+    """Test that a seed always generates the same records and another seed different ones."""
+    assert generate_test_data(1000, seed=1) == generate_test_data(1000, seed=1)
+    assert generate_test_data(1000, seed=1) != generate_test_data(1000, seed=2)
+
+def test_records_keep_the_operand_rules():
+    """Test the operand ranges, the single-digit second operands and that no divisor is zero."""
+    num1, num2, operation = generate_columns(30_000)
+    assert num1.min() >= 0 and num1.max() <= 99 and num2.max() <= 99
+    assert num2[::3].max() <= 9
+    assert not np.any((operation == OPERATION_NAMES.index('divide')) & (num2 == 0))
+    assert set(np.unique(operation)) == set(range(len(OPERATION_NAMES)))
+
+def test_expected_results_match_the_operations():
+    """Test that every record's expected result is what its operation computes."""
+    for a, b, name, function, result in generate_test_data(2000):
+        assert name in OPERATION_NAMES and function(a, b) == result
+
+def test_expected_results_follow_the_decimal_context():
+    """Test that expected results are computed under the decimal context current at generation."""
+    with localcontext() as context:
+        context.prec = 5
+        records = generate_test_data(2000)
+    quotients = [result for _, _, name, _, result in records if name == 'divide' and len(str(result)) > 6]
+    assert quotients and all(len(result.as_tuple().digits) <= 5 for result in quotients)
+    assert isinstance(records[0][0], Decimal)
+
+def test_files_match_the_records(tmp_path):
+    """Test that the batch and history files hold the generated records, in order."""
+    records = generate_test_data(500, seed=3)
+    batch_path, history_path = tmp_path / 'input.txt', tmp_path / 'history.csv'
+    assert write_batch_file(str(batch_path), 500, seed=3) == 500
+    assert write_history_csv(str(history_path), 500, seed=3) == 500
+    batch_lines = batch_path.read_text(encoding='utf-8').splitlines()
+    history_lines = history_path.read_text(encoding='utf-8').splitlines()
+    assert batch_lines == [f"{name} {a} {b}" for a, b, name, _, _ in records]
+    assert history_lines[0] == ','.join(HEADER)
+    assert history_lines[1:] == [f"{function.__name__},{a},{b}" for a, b, _, function, _ in records]
+    assert expected_batch_output(500, seed=3) == [str(result) for *_, result in records]
@@ -0,0 +1,33 @@
+"""tests/test_eval_command.py
+Test suite for the EvalCommand expression plugin.
+"""
+from unittest.mock import patch
+from app.calculator.calculations import CalculationHistory
+from app.plugins.eval import EvalCommand
+
+def test_evaluate_returns_result_message():
+    """Test that an expression passed as arguments is evaluated and recorded."""
+    CalculationHistory.clear_history()
+    assert EvalCommand().evaluate('(2', '+', '3)', '*', '4') == "The result of (2 + 3) * 4 is equal to 20"
+    assert len(CalculationHistory.get_history()) == 2
+    CalculationHistory.clear_history()
+
+def test_evaluate_reports_errors():
+    """Test that invalid expressions and divisions by zero give error messages."""
+    assert EvalCommand().evaluate('2', '*') == "Invalid expression: Unexpected end of expression."
+    assert EvalCommand().evaluate('1/0') == "An error occurred: Cannot divide by zero"
+    assert EvalCommand().evaluate('sqrt(0 - 4)') == "An error occurred: Cannot take the square root of a negative number."
+
+def test_execute_inline_does_not_prompt():
+    """Test that `eval <expression>` prints the result without prompting."""
+    with patch('builtins.input') as mock_input, patch('builtins.print') as mock_print:
+        EvalCommand().execute('1.5', '*', '2')
+    mock_input.assert_not_called()
+    mock_print.assert_called_once_with("The result of 1.5 * 2 is equal to 3.0")
+
+def test_execute_prompts_until_exit():
+    """Test that `eval` without arguments evaluates entered expressions until 'exit'."""
+    with patch('builtins.input', side_effect=['8 / 4 - 1', 'exit']), patch('builtins.print') as mock_print:
+        EvalCommand().execute()
+    printed_messages = [call_args[0][0] for call_args in mock_print.call_args_list]
+    assert "The result of 8 / 4 - 1 is equal to 1" in printed_messages
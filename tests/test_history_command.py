@@ -6,7 +6,8 @@ import unittest
 from decimal import Decimal
 from unittest.mock import patch, MagicMock, call
 from io import StringIO
-from app.calculator.calculations import CalculationHistory
+from app.calculator import Calculator
+from app.calculator.calculations import DEFAULT_SESSION, CalculationHistory, Session
 from app.plugins.history import HistoryCommand
 from app.calculator.calculation import Calculation
 from app.calculator.operations import ArithmeticOperations as AO
@@ -158,8 +159,9 @@ class TestHistoryCommandExecute(unittest.TestCase):
         mock_delete_calculation.assert_called_once_with(-1)
 
     @patch('app.calculator.calculations.CalculationHistory.delete_calculation_by_index')
+    @patch('app.calculator.calculations.CalculationHistory.get_history', return_value=[Calculation(Decimal('2'), Decimal('3'), AO.addition)])
     @patch('builtins.print')
-    def test_delete_specific_calculation_value_error(self, mock_print, _):
+    def test_delete_specific_calculation_value_error(self, mock_print, _, __):
         """Test handling of ValueError when deleting a specific calculation."""
 
         # Mock input to return a non-numeric value, simulating a ValueError
@@ -192,9 +194,10 @@ class TestHistoryCommandExecute(unittest.TestCase):
         # Check if the correct error message is printed
         mock_print.assert_called_with("No history available to delete.")
 
+    @patch('app.calculator.calculations.CalculationHistory.get_history', return_value=[Calculation(Decimal('2'), Decimal('3'), AO.addition)])
     @patch('builtins.input', return_value='10')  # Simulate entering an out-of-range index
     @patch('builtins.print')  # Mock the print function
-    def test_delete_specific_calculation_index_error(self, mock_print, mock_input):
+    def test_delete_specific_calculation_index_error(self, mock_print, mock_input, _):
         """Test IndexError"""
         history_command = HistoryCommand()
         history_command._delete_calculation_from_history()
@@ -221,3 +224,18 @@ class TestHistoryCommandExecute(unittest.TestCase):
 
         # Call the method you want to test
         mock_history_command._display_all_calculations()
+
+def test_history_command_bound_to_a_session(capsys):
+    """Test that a HistoryCommand bound to a session shows and clears that session's history only."""
+    session = Session()
+    session.run(Calculator.add, Decimal('2'), Decimal('3'))
+    default_history = DEFAULT_SESSION.history
+    default_history.clear_history()
+    default_history.add_calculation(Calculation(Decimal('7'), Decimal('1'), AO.subtraction))
+    command = HistoryCommand(session)
+    command.process_choice('2')
+    command.process_choice('3')
+    assert "1. Calculation(2, 3, addition) results in 5" in capsys.readouterr().out
+    assert not session.history.get_history()
+    assert len(default_history.get_history()) == 1
+    default_history.clear_history()
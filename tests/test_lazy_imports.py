@@ -0,0 +1,24 @@
+"""tests/test_lazy_imports.py
+Test suite for the lazy import layer in app.lazy_imports.
+"""
+import sys
+from unittest.mock import patch
+from app.lazy_imports import lazy_import
+
+def test_module_is_imported_on_first_attribute_access():
+    """Test that the placeholder imports its module only when an attribute is used."""
+    module = lazy_import('json')
+    with patch('app.lazy_imports.importlib.import_module', return_value=sys.modules['json']) as mock_import:
+        assert 'not loaded' in repr(module)
+        mock_import.assert_not_called()
+        assert module.dumps([1]) == '[1]'
+        assert module.loads('2') == 2
+    mock_import.assert_called_once_with('json')
+    assert 'loaded' in repr(module)
+
+def test_attributes_can_be_patched():
+    """Test that unittest.mock can patch attributes of a lazily imported module."""
+    module = lazy_import('json')
+    with patch.object(module, 'dumps', return_value='patched'):
+        assert module.dumps([1]) == 'patched'
+    assert module.dumps([1]) == '[1]'
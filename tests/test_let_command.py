@@ -0,0 +1,41 @@
+"""tests/test_let_command.py
+Test suite for the LetCommand bindings plugin.
+"""
+from unittest.mock import patch
+from app.calculator.calculations import CalculationHistory
+from app.plugins.let import LetCommand
+
+def test_bindings_update_dependents():
+    """Test that rebinding a name reports the bindings it updated."""
+    command = LetCommand()
+    assert command.evaluate('x', '=', 'add', '2', '3') == "x = 5"
+    assert command.evaluate('y', '=', 'x', '*', '2') == "y = 10"
+    assert command.evaluate('x=1') == "x = 1 (updated: y = 2)"
+    assert command.evaluate('y') == "y = 2"
+    assert command.evaluate() == "x = 1\ny = 2"
+    CalculationHistory.clear_history()
+
+def test_errors_are_reported():
+    """Test that invalid statements, undefined names and divisions by zero give messages."""
+    command = LetCommand()
+    assert command.evaluate() == "No bindings defined."
+    assert command.evaluate('x') == "Name 'x' is not defined."
+    assert command.evaluate('x', '=', 'y', '+', '1') == "Invalid let statement: Name 'y' is not defined."
+    assert command.evaluate('x', 'y').startswith("Invalid let statement: 'x y'. Please use: let <name> =")
+    assert command.evaluate('q', '=', 'divide', '1', '0') == "q = error: Cannot divide by zero"
+    CalculationHistory.clear_history()
+
+def test_execute_inline_and_prompt():
+    """Test that `let` evaluates inline statements, and prompts for statements without arguments."""
+    command = LetCommand()
+    with patch('builtins.input') as mock_input, patch('builtins.print') as mock_print:
+        command.execute('a', '=', '4')
+    mock_input.assert_not_called()
+    mock_print.assert_called_once_with("a = 4")
+    with patch('builtins.input', side_effect=['b = a / 8', 'a = 2', 'exit']), patch('builtins.print') as mock_print:
+        command.execute()
+    printed_messages = [call_args[0][0] for call_args in mock_print.call_args_list]
+    assert "a = 4" in printed_messages
+    assert "b = 0.5" in printed_messages
+    assert "a = 2 (updated: b = 0.25)" in printed_messages
+    CalculationHistory.clear_history()
@@ -0,0 +1,98 @@
+"""tests/test_logging_pipeline.py
+Test suite for the queue-based logging pipeline and the sampling of per-operation records.
+"""
+import logging
+import threading
+from unittest.mock import patch
+import pytest
+from app import App
+from app.calculator.calc_utils import calculate
+from app.logging_pipeline import (OPERATION_LOGGER, LocalQueueHandler, SamplingFilter, set_operation_sampling,
+                                  start_queue_logging, stop_queue_logging)
+
+class RecordingHandler(logging.Handler):
+    """Collects the messages it handles, with the threads that handled them."""
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread())
+
+@pytest.fixture
+def recording_handler():
+    """Attaches a RecordingHandler to the root logger at INFO level for the duration of a test."""
+    root = logging.getLogger()
+    handler = RecordingHandler()
+    previous_level = root.level
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    yield handler
+    stop_queue_logging()
+    root.removeHandler(handler)
+    root.setLevel(previous_level)
+    set_operation_sampling(1)
+
+def make_record(level=logging.INFO, msg="message %s", args=("x",)):
+    """Builds a log record of the operations logger."""
+    return logging.LogRecord(OPERATION_LOGGER, level, __file__, 0, msg, args, None)
+
+def test_sampling_filter_keeps_rate():
+    """Test that the filter keeps an evenly spread fraction of INFO records and every warning."""
+    sampling = SamplingFilter(0.25)
+    kept = [sampling.filter(make_record()) for _ in range(8)]
+    assert kept == [False, False, False, True, False, False, False, True]
+    assert all(sampling.filter(make_record(logging.WARNING)) for _ in range(3))
+
+@pytest.mark.parametrize("rate", [-0.1, 1.5])
+def test_sampling_filter_invalid_rate(rate):
+    """Test that a sampling rate outside [0, 1] is rejected."""
+    with pytest.raises(ValueError):
+        SamplingFilter(rate)
+
+def test_local_queue_handler_does_not_format():
+    """Test that records are enqueued with their arguments, leaving formatting to the listener."""
+    record = make_record()
+    assert LocalQueueHandler(None).prepare(record) is record
+    assert record.msg == "message %s" and record.args == ("x",)
+
+def test_queue_logging_writes_on_listener_thread(recording_handler):
+    """Test that with queue logging the root handlers run on the listener thread and are restored on stop."""
+    listener = start_queue_logging()
+    assert start_queue_logging() is listener
+    assert recording_handler not in logging.getLogger().handlers
+    logging.getLogger(OPERATION_LOGGER).info("Result of %s: %s", "add", 5)
+    stop_queue_logging()
+    assert "Result of add: 5" in recording_handler.messages
+    assert threading.main_thread() not in recording_handler.threads
+    assert recording_handler in logging.getLogger().handlers
+
+def test_operation_sampling(recording_handler):
+    """Test that sampling drops per-operation INFO records but keeps warnings and other loggers' records."""
+    set_operation_sampling(0)
+    calculate('2', '3', 'add')
+    calculate('1', '0', 'divide')
+    logging.info("Not an operation record")
+    assert recording_handler.messages == ["Division by zero attempt.", "Not an operation record"]
+    set_operation_sampling(1)
+    assert not logging.getLogger(OPERATION_LOGGER).filters
+
+def test_calculation_logs_lazily(caplog):
+    """Test that the hot path passes its values as arguments instead of formatting them eagerly."""
+    caplog.set_level(logging.INFO, logger=OPERATION_LOGGER)
+    calculate('2', '3', 'add')
+    record = next(r for r in caplog.records if r.msg.startswith("Operation %s completed"))
+    assert record.name == OPERATION_LOGGER
+    assert record.getMessage() == "Operation add completed successfully. Result: 5"
+
+def test_app_configure_logging_pipeline():
+    """Test that CALC_LOG_QUEUE and CALC_LOG_SAMPLE_RATE configure the logging pipeline."""
+    app_instance = App()
+    app_instance.settings = {'CALC_LOG_QUEUE': 'true', 'CALC_LOG_SAMPLE_RATE': '0.1'}
+    with patch('app.logging_pipeline.start_queue_logging') as mock_start, \
+         patch('app.logging_pipeline.set_operation_sampling') as mock_sampling:
+        app_instance.configure_logging_pipeline()
+    mock_start.assert_called_once_with()
+    mock_sampling.assert_called_once_with(0.1)
@@ -0,0 +1,87 @@
+"""tests/test_oneshot.py
+Test suite for the one-shot command mode in app.oneshot and its main.py entry point.
+"""
+import sys
+from unittest.mock import patch
+import pytest
+from app.oneshot import EXIT_ERROR, EXIT_OK, EXIT_UNKNOWN_COMMAND, find_command, run_command
+from main import main
+
+@pytest.fixture(autouse=True)
+def manifest_path(tmp_path, monkeypatch):
+    """Keep the plugin manifest of these tests in a temporary directory."""
+    monkeypatch.setenv('CALC_PLUGIN_MANIFEST', str(tmp_path / 'manifest.json'))
+
+def test_run_command_prints_result(capsys):
+    """Test that a one-shot command prints its output and succeeds."""
+    assert run_command('add', ['2', '3']) == EXIT_OK
+    assert capsys.readouterr().out == "The result of 2 add 3 is equal to 5\n"
+
+@pytest.mark.parametrize('name, args, message', [
+    ('divide', ['1', '0'], "An error occurred: Cannot divide by zero"),
+    ('add', ['a', 'b'], "Invalid number input: a or b is not a valid number."),
+    ('modulo', ['7', '0'], "An error occurred: Cannot divide by zero"),
+])
+def test_run_command_failed_calculation(capsys, name, args, message):
+    """Test that a calculation that fails prints its error on stderr and exits with the error code."""
+    assert main([name, *args]) == EXIT_ERROR
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == message + "\n"
+
+def test_run_command_unknown(capsys):
+    """Test that an unknown command is reported on stderr with its own exit code."""
+    assert run_command('factorial', ['5']) == EXIT_UNKNOWN_COMMAND
+    assert capsys.readouterr().err == "Unknown command: factorial\n"
+
+def test_run_command_interactive_only(capsys):
+    """Test that a command that cannot run non-interactively fails with an error on stderr."""
+    assert run_command('history', []) == EXIT_ERROR
+    assert "only available interactively" in capsys.readouterr().err
+
+def test_find_command_imports_only_on_use():
+    """Test that looking up a command does not load its plugin."""
+    command = find_command('divide')
+    assert command.name == 'divide'
+    assert command._command is None  # pylint: disable=protected-access
+    assert find_command('nothing') is None
+
+def test_main_one_shot_fast_path(capsys):
+    """Test that `main.py subtract 2 -3` runs the command without parsing options or starting the REPL."""
+    with patch('main.parse_arguments') as mock_parse, patch('app.App.start') as mock_start:
+        assert main(['subtract', '2', '-3']) == EXIT_OK
+    mock_parse.assert_not_called()
+    mock_start.assert_not_called()
+    assert capsys.readouterr().out == "The result of 2 subtract -3 is equal to 5\n"
+
+def test_main_one_shot_with_log():
+    """Test that --log switches a one-shot command to the application's logging configuration."""
+    with patch('app.App.configure_logging') as mock_configure_logging:
+        assert main(['--log', 'multiply', '2', '4']) == EXIT_OK
+    mock_configure_logging.assert_called_once()
+
+def test_main_one_shot_backend_option(capsys):
+    """Test that --backend selects the numeric backend of a one-shot command."""
+    assert main(['--backend', 'fraction', 'divide', '1', '3']) == EXIT_OK
+    assert capsys.readouterr().out == "The result of 1 divide 3 is equal to 1/3\n"
+
+@pytest.mark.parametrize('environment, output', [
+    ({'CALC_NUMERIC_BACKEND': 'fraction'}, "The result of 1 divide 3 is equal to 1/3\n"),
+    ({'CALC_DECIMAL_PRECISION': '4'}, "The result of 1 divide 3 is equal to 0.3333\n"),
+    ({'CALC_DECIMAL_PRECISION': '4', 'CALC_DECIMAL_ROUNDING': 'ROUND_UP'}, "The result of 1 divide 3 is equal to 0.3334\n"),
+    ({'CALC_NUMERIC_BACKEND': 'binary'}, "The result of 1 divide 3 is equal to 0.3333333333333333333333333333\n"),
+])
+def test_main_one_shot_numeric_environment(capsys, monkeypatch, environment, output):
+    """Test that the numeric backend settings of the environment apply to one-shot commands."""
+    for variable, value in environment.items():
+        monkeypatch.setenv(variable, value)
+    assert main(['divide', '1', '3']) == EXIT_OK
+    assert capsys.readouterr().out == output
+    assert main(['--backend', 'decimal', 'divide', '1', '3']) == EXIT_OK  # The option overrides them
+    assert capsys.readouterr().out == "The result of 1 divide 3 is equal to 0.3333333333333333333333333333\n"
+
+def test_main_exit_code(capsys):
+    """Test that running main.py as a script exits with the command's exit code."""
+    with patch.object(sys, 'argv', ['main.py', 'unknown']):
+        assert main() == EXIT_UNKNOWN_COMMAND
+    capsys.readouterr()
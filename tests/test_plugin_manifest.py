@@ -0,0 +1,79 @@
+"""tests/test_plugin_manifest.py
+Test suite for the cached plugin manifest and the LazyCommand stand-ins registered from it.
+"""
+import json
+from unittest.mock import patch
+import pytest
+from app import App
+from app.commands import LazyCommand
+from app.commands.manifest import PluginManifest
+from app.plugins.add import AddCommand
+
+@pytest.fixture
+def manifest(tmp_path):
+    """A manifest of the application's plugins stored in a temporary directory."""
+    return PluginManifest(str(tmp_path / 'manifest.json'))
+
+def test_manifest_describes_every_plugin_command(manifest):
+    """Test that the first load scans the plugins and writes their commands to the manifest."""
+    commands = {entry['name']: entry for entry in manifest.load()}
+    assert set(commands) == {'add', 'subtract', 'multiply', 'divide', 'power', 'modulo', 'sqrt',
+                             'eval', 'history', 'let', 'profile', 'stats'}
+    assert commands['add'] == {'name': 'add', 'description': 'Add two numbers together.',
+                               'module': 'app.plugins.add', 'class': 'AddCommand'}
+    with open(manifest.path, encoding='utf-8') as file:
+        assert set(json.load(file)['plugins']) == set(commands)
+
+def test_fresh_manifest_is_served_without_imports(manifest):
+    """Test that an up-to-date manifest is used as is, without scanning (importing) any plugin."""
+    expected = manifest.load()
+    with patch.object(manifest, 'scan_plugin') as mock_scan, patch.object(manifest, 'write') as mock_write:
+        assert manifest.load() == expected
+    mock_scan.assert_not_called()
+    mock_write.assert_not_called()
+
+def test_changed_plugin_is_rescanned(manifest):
+    """Test that only a plugin whose files have a newer mtime is scanned again."""
+    manifest.load()
+    mtimes = manifest.plugin_mtimes()
+    mtimes['add'] += 1
+    with patch.object(manifest, 'plugin_mtimes', return_value=mtimes), \
+         patch.object(manifest, 'scan_plugin', wraps=manifest.scan_plugin) as mock_scan:
+        manifest.load()
+    mock_scan.assert_called_once_with('add')
+    with open(manifest.path, encoding='utf-8') as file:
+        assert json.load(file)['plugins']['add']['mtime'] == mtimes['add']
+
+def test_unreadable_manifest_is_rebuilt(manifest):
+    """Test that a corrupt manifest file is ignored and replaced."""
+    with open(manifest.path, 'w', encoding='utf-8') as file:
+        file.write('{not json')
+    assert len(manifest.load()) == 12
+
+def test_plugin_import_error_is_logged(manifest, caplog):
+    """Test that a plugin failing to import is left out and reported."""
+    with patch('app.commands.manifest.importlib.import_module', side_effect=ImportError('Simulated ImportError')):
+        assert not manifest.load()
+    assert "Error importing plugin" in caplog.text
+
+def test_lazy_command_imports_on_first_use():
+    """Test that a LazyCommand imports its plugin only when first executed, and only once."""
+    command = LazyCommand('add', 'Add two numbers together.', 'app.plugins.add', 'AddCommand')
+    with patch('app.commands.importlib.import_module') as mock_import:
+        mock_import.return_value.AddCommand = AddCommand
+        assert command.name == 'add'
+        mock_import.assert_not_called()
+        assert command.evaluate('2', '3') == "The result of 2 add 3 is equal to 5"
+        assert command.evaluate('1', '1') == "The result of 1 add 1 is equal to 2"
+    mock_import.assert_called_once_with('app.plugins.add')
+
+def test_app_registers_lazy_commands(tmp_path):
+    """Test that the application registers the manifest's commands as LazyCommands."""
+    app = App()
+    app.settings['CALC_PLUGIN_MANIFEST'] = str(tmp_path / 'manifest.json')
+    app.initialize_commands()
+    commands = app.command_handler.commands
+    assert isinstance(commands['divide'], LazyCommand)
+    assert 'show_menu' in commands
+    assert ('history', "Manage calculation history (retrieve, clear, save, load, delete).") \
+        in app.command_handler.get_commands()
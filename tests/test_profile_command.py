@@ -0,0 +1,124 @@
+"""tests/test_profile_command.py
+Test suite for the profile command, the shared Profiler and profiling configured from the settings.
+"""
+import logging
+import pstats
+import threading
+from unittest.mock import patch
+import pytest
+from app import App
+from app.calculator.calculations import CalculationHistory
+from app.calculator.calculation import Calculation
+from app.calculator.operations import ArithmeticOperations as AO
+from app.commands import CommandHandler
+from app.plugins.add import AddCommand
+from app.plugins.profile import ProfileCommand
+from app.profiling import PROFILER
+
+@pytest.fixture(autouse=True)
+def clean_profiler():
+    """Leaves the shared profiler stopped and empty after every test."""
+    yield
+    PROFILER.stop_cpu()
+    PROFILER.stop_memory()
+    PROFILER.last_profile = None
+
+@pytest.fixture
+def handler():
+    """A CommandHandler with the add and profile commands."""
+    command_handler = CommandHandler()
+    command_handler.register_command(AddCommand())
+    command_handler.register_command(ProfileCommand())
+    return command_handler
+
+def test_profile_commands_between_start_and_stop(handler):
+    """Test that only the commands between start and stop are profiled and the report is sorted as asked."""
+    assert handler.evaluate_command('profile', 'start').startswith("CPU profiling started")
+    assert handler.evaluate_command('profile', 'start') == "CPU profiling is already on."
+    handler.evaluate_command('add', '2', '3')
+    report = handler.evaluate_command('profile', 'stop', 'tottime', '5')
+    assert "Ordered by: internal time" in report
+    assert "List reduced from" in report
+    stats = pstats.Stats(PROFILER.last_profile)
+    assert any(function == 'perform_operation' for _, _, function in stats.stats)
+    handler.evaluate_command('add', '1', '1')
+    assert pstats.Stats(PROFILER.last_profile).total_calls == stats.total_calls
+    assert handler.evaluate_command('profile', 'stop') == "CPU profiling is not on."
+
+def test_only_one_thread_runs_under_the_profile(handler):
+    """Test that a command run while another thread is profiled runs unprofiled, as cProfile is not thread-safe."""
+    handler.evaluate_command('profile', 'start')
+    inside, release = threading.Event(), threading.Event()
+
+    def profiled():
+        inside.set()
+        release.wait(timeout=2)
+    worker = threading.Thread(target=PROFILER.runcall, args=(profiled,))
+    worker.start()
+    inside.wait(timeout=2)
+    assert handler.evaluate_command('add', '2', '3') == "The result of 2 add 3 is equal to 5"
+    release.set()
+    worker.join()
+    stats = pstats.Stats(PROFILER.last_profile)
+    assert any(function == 'profiled' for _, _, function in stats.stats)
+    assert not any(function == 'perform_operation' for _, _, function in stats.stats)
+
+def test_profile_stats_and_dump(handler, tmp_path):
+    """Test reporting a running profile and writing it in pstats format."""
+    assert handler.evaluate_command('profile', 'stats') == (
+        "Profile error: Nothing has been profiled yet; start with 'profile start'.")
+    handler.evaluate_command('profile', 'start')
+    handler.evaluate_command('add', '2', '3')
+    assert "function calls" in handler.evaluate_command('profile', 'stats', 'ncalls')
+    path = tmp_path / 'session.pstats'
+    assert handler.evaluate_command('profile', 'dump', str(path)) == f"CPU profile written to {path}"
+    assert pstats.Stats(str(path)).total_calls > 0
+
+def test_profile_invalid_sort_key(handler):
+    """Test that an unknown sort key is reported instead of raising."""
+    handler.evaluate_command('profile', 'start')
+    assert handler.evaluate_command('profile', 'stats', 'speed').startswith("Profile error: Unknown sort key 'speed'")
+
+def test_memory_snapshots_show_growth_by_site(handler):
+    """Test that the second snapshot shows the allocation sites that grew, such as new history entries."""
+    assert handler.evaluate_command('profile', 'memory').startswith("Memory tracing started")
+    kept = [Calculation(i, i, AO.addition) for i in range(2000)]
+    CalculationHistory.add_calculations(kept)
+    report = handler.evaluate_command('profile', 'memory')
+    assert report.startswith("Top ")
+    assert "test_profile_command.py" in report
+    assert handler.evaluate_command('profile', 'memory', 'stop') == "Memory tracing stopped."
+    assert handler.evaluate_command('profile', 'memory', 'stop') == "Memory tracing is not on."
+    CalculationHistory.clear_history()
+
+def test_profile_status_and_invalid_command(handler):
+    """Test the status message and the usage shown for an invalid subcommand."""
+    assert handler.evaluate_command('profile').startswith("CPU profiling is off, memory tracing is off.")
+    assert handler.evaluate_command('profile', 'dump').startswith("Invalid profile command: 'dump'.")
+
+@pytest.fixture
+def app_instance():
+    """An App whose logging is configured before the test captures the log."""
+    return App()
+
+def test_configure_profiling_from_settings(app_instance, tmp_path, caplog):
+    """Test that CALC_PROFILE starts profiling and the exit report logs it and writes CALC_PROFILE_OUTPUT."""
+    output_path = tmp_path / 'app.pstats'
+    app_instance.settings = {'CALC_PROFILE': 'cpu, memory, disk', 'CALC_PROFILE_OUTPUT': str(output_path)}
+    with patch('app.atexit.register') as mock_register:
+        app_instance.configure_profiling()
+    assert "Unknown CALC_PROFILE mode 'disk'" in caplog.text
+    assert PROFILER.cpu_profile is not None and PROFILER.tracing
+    report, *report_args = mock_register.call_args[0]
+    caplog.set_level(logging.INFO)
+    report(*report_args)
+    assert "CPU profile of this session" in caplog.text
+    assert "Memory growth during this session" in caplog.text
+    assert output_path.exists()
+    assert PROFILER.cpu_profile is None and not PROFILER.tracing
+
+def test_configure_profiling_off_by_default(app_instance):
+    """Test that nothing is profiled without CALC_PROFILE."""
+    app_instance.settings = {}
+    app_instance.configure_profiling()
+    assert PROFILER.cpu_profile is None
@@ -0,0 +1,202 @@
+"""tests/test_server.py
+Test suite for the asyncio CalculatorServer in app.server.
+"""
+import asyncio
+import threading
+import pytest
+from app.calculator.calculations import DEFAULT_SESSION, CalculationHistory, current_history
+from app.commands import Command, CommandHandler
+from app.plugins.add import AddCommand
+from app.plugins.divide import DivideCommand
+from app.plugins.history import HistoryCommand
+from app.plugins.let import LetCommand
+from app.plugins.profile import ProfileCommand
+from app.plugins.stats import StatsCommand
+from app.server import CalculatorServer
+
+@pytest.fixture
+def server():
+    """Provide a server whose handler knows the add, divide, history, profile and stats commands."""
+    command_handler = CommandHandler()
+    for command in (AddCommand(), DivideCommand(), HistoryCommand(), ProfileCommand(), StatsCommand()):
+        command_handler.register_command(command)
+    return CalculatorServer(command_handler, port=0)
+
+@pytest.mark.parametrize("request_line, expected", [
+    ("add 2 3\n", "The result of 2 add 3 is equal to 5"),
+    ("divide 1 0\n", "An error occurred: Cannot divide by zero"),
+    ("add 1\n", "Error: Invalid input format. Please use: <operand1> <operand2>"),
+    ("unknown 1 2\n", "Error: Unknown command: unknown"),
+    ("history\n", "Error: Command 'history' is only available interactively."),
+    ("profile dump /tmp/x\n", "Error: 'profile dump /tmp/x' is not available over the server."),
+    ("stats export /tmp/x\n", "Error: 'stats export /tmp/x' is not available over the server."),
+    ("stats reset\n", "Error: 'stats reset' is not available over the server."),
+    ("   \n", "Error: Empty request."),
+])
+def test_dispatch(server, request_line, expected):
+    """Test that each request line is answered with a single response line."""
+    assert server.dispatch(request_line) == expected
+
+def test_stats_table_is_available(server):
+    """Test that server clients may read the metrics table."""
+    assert server.dispatch("stats\n").startswith("Metrics are off")
+
+def test_pipelined_requests_are_answered_in_order(server):
+    """Test that requests sent without waiting for responses are answered in request order."""
+    async def scenario():
+        await server.start()
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        writer.write(b"add 1 1\nadd 2 2\ndivide 9 3\n")
+        await writer.drain()
+        responses = [(await reader.readline()).decode().strip() for _ in range(3)]
+        writer.close()
+        await writer.wait_closed()
+        await server.stop()
+        return responses
+
+    assert asyncio.run(scenario()) == [
+        "The result of 1 add 1 is equal to 2",
+        "The result of 2 add 2 is equal to 4",
+        "The result of 9 divide 3 is equal to 3",
+    ]
+
+def test_concurrent_connections(server):
+    """Test that many clients can be served at the same time."""
+    async def client(number):
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        writer.write(f"add {number} 1\n".encode())
+        response = (await reader.readline()).decode().strip()
+        writer.close()
+        await writer.wait_closed()
+        return response
+
+    async def scenario():
+        await server.start()
+        responses = await asyncio.gather(*(client(number) for number in range(50)))
+        await server.stop()
+        return responses
+
+    responses = asyncio.run(scenario())
+    assert responses == [f"The result of {number} add 1 is equal to {number + 1}" for number in range(50)]
+
+class WaitCommand(Command):
+    """A command that blocks until its event is set, standing in for a slow calculation."""
+    def __init__(self):
+        super().__init__()
+        self.name = "wait"
+        self.event = threading.Event()
+
+    def evaluate(self, *args):
+        return "done" if self.event.wait(timeout=2) else "timed out"
+
+def test_slow_command_does_not_stall_other_connections(server):
+    """Test that a connection is answered while another connection's command is still running."""
+    wait = WaitCommand()
+    server.command_handler.register_command(wait)
+
+    async def scenario():
+        await server.start()
+        slow_reader, slow_writer = await asyncio.open_connection('127.0.0.1', server.port)
+        slow_writer.write(b"wait\n")
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        writer.write(b"add 2 2\n")
+        response = (await asyncio.wait_for(reader.readline(), timeout=5)).decode().strip()
+        wait.event.set()
+        slow_response = (await slow_reader.readline()).decode().strip()
+        for stream in (writer, slow_writer):
+            stream.close()
+            await stream.wait_closed()
+        await server.stop()
+        return response, slow_response
+
+    assert asyncio.run(scenario()) == ("The result of 2 add 2 is equal to 4", "done")
+
+class OperandsCommand(Command):
+    """A command listing the first operand of every calculation in the current session's history."""
+    def __init__(self):
+        super().__init__()
+        self.name = "operands"
+
+    def evaluate(self, *args):
+        return ' '.join(str(calculation.num1) for calculation in current_history().get_history())
+
+def test_server_history_is_bounded():
+    """Test that the server records requests in the connection's history, keeping only the most recent ones."""
+    command_handler = CommandHandler()
+    command_handler.register_command(AddCommand())
+    command_handler.register_command(OperandsCommand())
+    server = CalculatorServer(command_handler, port=0, history_limit=3)
+    CalculationHistory.clear_history()
+
+    async def scenario():
+        await server.start()
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        writer.write(b"".join(f"add {number} 1\n".encode() for number in range(5)) + b"add 9 9\noperands")
+        writer.write_eof()
+        responses = (await reader.read()).decode().splitlines()
+        writer.close()
+        await writer.wait_closed()
+        await server.stop()
+        return responses
+
+    responses = asyncio.run(scenario())
+    assert responses[-2] == "The result of 9 add 9 is equal to 18"
+    assert responses[-1] == "3 4 9"
+    assert not DEFAULT_SESSION.history.get_history()
+
+def test_connections_have_separate_histories(server):
+    """Test that each connection records in a session of its own and sees only its own calculations."""
+    server.command_handler.register_command(OperandsCommand())
+
+    async def request(stream, line):
+        reader, writer = stream
+        writer.write(line.encode() + b"\n")
+        return (await reader.readline()).decode().strip()
+
+    async def scenario():
+        await server.start()
+        first = await asyncio.open_connection('127.0.0.1', server.port)
+        second = await asyncio.open_connection('127.0.0.1', server.port)
+        await request(first, "add 1 1")
+        await request(second, "add 2 2")
+        await request(first, "add 3 3")
+        operands = await request(first, "operands"), await request(second, "operands")
+        for _, writer in (first, second):
+            writer.close()
+            await writer.wait_closed()
+        third = await asyncio.open_connection('127.0.0.1', server.port)
+        operands += (await request(third, "operands"),)
+        third[1].close()
+        await third[1].wait_closed()
+        await server.stop()
+        return operands
+
+    CalculationHistory.clear_history()
+    assert asyncio.run(scenario()) == ("1 3", "2", "")
+    assert not DEFAULT_SESSION.history.get_history()
+
+def test_connections_have_separate_bindings(server):
+    """Test that two connections binding the same name each see only their own binding."""
+    server.command_handler.register_command(LetCommand())
+
+    async def request(stream, line):
+        reader, writer = stream
+        writer.write(line.encode() + b"\n")
+        return (await reader.readline()).decode().strip()
+
+    async def scenario():
+        await server.start()
+        first = await asyncio.open_connection('127.0.0.1', server.port)
+        second = await asyncio.open_connection('127.0.0.1', server.port)
+        await request(first, "let x = add 1 1")
+        await request(second, "let x = add 5 5")
+        await request(first, "let y = x * 10")
+        values = await request(first, "let y"), await request(second, "let x"), await request(second, "let y")
+        for _, writer in (first, second):
+            writer.close()
+            await writer.wait_closed()
+        await server.stop()
+        return values
+
+    assert asyncio.run(scenario()) == ("y = 20", "x = 10", "Name 'y' is not defined.")
+    CalculationHistory.clear_history()
@@ -0,0 +1,62 @@
+"""tests/test_startup_profile.py
+Test suite for the startup profiler and a regression guard on the application's cold start.
+"""
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+import pytest
+from app.startup_profile import ImportTime, format_startup_profile, parse_import_times
+from main import main
+
+# Seconds from the first import of the application until its commands are registered
+STARTUP_TIME_LIMIT = 0.5
+# Dependencies the REPL must not import before the first prompt
+DEFERRED_MODULES = ['dotenv', 'sqlite3', 'asyncio', 'pkgutil', 'unittest.mock', 'pandas', 'numpy',
+                    'app.calculator.journal', 'app.plugins.add', 'app.plugins.history']
+
+COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+from app import App
+App().initialize_commands()
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+REPORT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        900 |     app.commands
+import time:      1500 |       2400 | app
+"""
+
+def test_parse_import_times():
+    """Test that -X importtime output is parsed into module timings, skipping the header."""
+    assert parse_import_times(REPORT + "some other output\n") == [
+        ImportTime('_io', 120, 120), ImportTime('app.commands', 300, 900), ImportTime('app', 1500, 2400)]
+
+def test_format_startup_profile_lists_slowest_imports():
+    """Test that the report shows the total and the slowest modules first."""
+    report = format_startup_profile(0.05, parse_import_times(REPORT), top=2)
+    lines = report.splitlines()
+    assert lines[0] == "Cold start: 50.0 ms, of which imports 1.9 ms (3 modules)"
+    assert lines[2].endswith("app") and lines[3].endswith("app.commands")
+    assert len(lines) == 4
+
+def test_main_startup_profile(capsys):
+    """Test that `main.py --startup-profile` prints the profile without starting the REPL."""
+    with patch('app.startup_profile.measure_startup', return_value=(0.05, parse_import_times(REPORT))), \
+         patch('app.App.start') as mock_start:
+        main(['--startup-profile'])
+    assert "Cold start: 50.0 ms" in capsys.readouterr().out
+    mock_start.assert_not_called()
+
+@pytest.mark.slow
+def test_cold_start_regression():
+    """Test that a fresh interpreter reaches the first prompt quickly, without the deferred dependencies."""
+    completed = subprocess.run([sys.executable, '-c', COLD_START], capture_output=True, text=True, check=True)
+    result = json.loads(completed.stdout.splitlines()[-1])
+    imported = [module for module in DEFERRED_MODULES if module in result['modules']]
+    assert not imported, f"Imported during startup: {imported}"
+    assert result['elapsed'] < STARTUP_TIME_LIMIT, \
+        f"Cold start took {result['elapsed']:.3f}s, over the {STARTUP_TIME_LIMIT}s limit"
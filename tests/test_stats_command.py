@@ -0,0 +1,100 @@
+"""tests/test_stats_command.py
+Test suite for the stats command and the per-command metrics of the CommandHandler.
+"""
+import pytest
+from app.calculator.metrics import METRICS
+from app.commands import Command, CommandHandler
+from app.plugins.add import AddCommand
+from app.plugins.eval import EvalCommand
+from app.plugins.stats import StatsCommand
+
+class FailingCommand(Command):
+    """A command whose evaluation always fails."""
+    def __init__(self):
+        super().__init__()
+        self.name = "fail"
+
+    def evaluate(self, *args):
+        raise RuntimeError("Simulated failure")
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Starts every test with the shared metrics off and empty, and leaves them that way."""
+    METRICS.disable()
+    METRICS.reset()
+    yield
+    METRICS.disable()
+    METRICS.reset()
+
+@pytest.fixture
+def handler():
+    """A CommandHandler with the add, fail and stats commands."""
+    command_handler = CommandHandler()
+    for command in (AddCommand(), FailingCommand(), StatsCommand()):
+        command_handler.register_command(command)
+    return command_handler
+
+def test_stats_on_records_commands(handler):
+    """Test that with metrics on, commands and their errors are counted per command."""
+    assert handler.evaluate_command('stats', 'on') == "Metrics on."
+    handler.evaluate_command('add', '2', '3')
+    assert handler.evaluate_command('fail') == "Error: Simulated failure"
+    assert METRICS.calls[('command', 'add')] == 1
+    assert METRICS.calls[('operation', 'addition')] == 1
+    assert METRICS.errors == {('command', 'fail', 'RuntimeError'): 1}
+    report = handler.evaluate_command('stats')
+    assert "Metrics are off" not in report
+    assert any(line.split()[:3] == ['command', 'add', '1'] for line in report.splitlines())
+
+def test_stats_off_records_nothing(handler, capsys):
+    """Test that with metrics off, commands run without being recorded."""
+    handler.execute_command('add', '2', '3')
+    assert "The result of 2 add 3 is equal to 5" in capsys.readouterr().out
+    assert not METRICS.calls
+    assert handler.evaluate_command('stats').startswith("Metrics are off")
+
+def test_stats_reset_and_off(handler):
+    """Test that stats reset discards the metrics and stats off stops recording."""
+    handler.evaluate_command('stats', 'on')
+    handler.evaluate_command('add', '1', '1')
+    assert handler.evaluate_command('stats', 'reset') == "Metrics reset."
+    assert handler.evaluate_command('stats', 'off') == "Metrics off."
+    assert ('command', 'add') not in METRICS.calls and not METRICS.enabled
+
+def test_stats_export(handler, tmp_path, monkeypatch):
+    """Test exporting to a given file and to CALC_METRICS_FILE."""
+    handler.evaluate_command('stats', 'on')
+    handler.evaluate_command('add', '1', '1')
+    path = tmp_path / 'metrics.prom'
+    assert handler.evaluate_command('stats', 'export', str(path)) == f"Metrics written to {path}"
+    assert 'calculator_calls_total{kind="operation",name="addition"} 1' in path.read_text(encoding='utf-8')
+    default_path = tmp_path / 'default.prom'
+    monkeypatch.setenv('CALC_METRICS_FILE', str(default_path))
+    handler.evaluate_command('stats', 'export')
+    assert default_path.exists()
+    assert handler.evaluate_command('stats', 'export', str(tmp_path / 'missing' / 'x.prom')).startswith(
+        "Could not write metrics")
+
+def test_stats_invalid_subcommand(handler):
+    """Test that an unknown subcommand shows the usage."""
+    assert handler.evaluate_command('stats', 'bogus').startswith("Invalid stats command: 'bogus'.")
+
+def test_reported_failures_are_counted(handler, capsys):
+    """Test that commands reporting a failure as their message, not raising, are counted as errors."""
+    handler.register_command(EvalCommand())
+    handler.evaluate_command('stats', 'on')
+    assert handler.evaluate_command('add', '1', 'x') == "Invalid number input: 1 or x is not a valid number."
+    handler.execute_command('add', '2', '3')
+    handler.execute_command('add', '2')
+    assert handler.evaluate_command('eval', '1 / 0') == "An error occurred: Cannot divide by zero"
+    handler.execute_command('eval', '1 +')
+    assert handler.evaluate_command('stats', 'bogus').startswith("Invalid stats command")
+    capsys.readouterr()
+    assert METRICS.calls[('command', 'add')] == 3
+    assert METRICS.errors == {
+        ('command', 'add', 'InvalidOperation'): 1,
+        ('command', 'add', 'ValueError'): 1,
+        ('command', 'eval', 'ZeroDivisionError'): 1,
+        ('command', 'eval', 'ExpressionError'): 1,
+        ('command', 'stats', 'ValueError'): 1,
+    }
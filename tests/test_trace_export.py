@@ -0,0 +1,91 @@
+"""tests/test_trace_export.py
+Test suite for tracing REPL lines and commands in the application and writing the Chrome trace file.
+"""
+import json
+import logging
+from unittest.mock import patch
+import pytest
+from app import App
+from app.calculator.calculations import CalculationHistory
+from app.calculator.tracing import TRACER
+from app.plugins.add import AddCommand
+from app.plugins.multiply import MultiplyCommand
+
+@pytest.fixture(autouse=True)
+def clean_tracer():
+    """Leaves the shared tracer off and empty after every test."""
+    yield
+    TRACER.disable()
+    TRACER.reset()
+    CalculationHistory.clear_history()
+
+@pytest.fixture
+def app_instance():
+    """An App with the add and multiply commands, created before the test captures the log."""
+    app = App()
+    app.command_handler.register_command(AddCommand())
+    app.command_handler.register_command(MultiplyCommand())
+    return app
+
+def test_line_is_traced_down_to_the_history(app_instance, capsys):
+    """Test that each command of a REPL line is a span of the line's trace, down to the history append."""
+    TRACER.enable()
+    app_instance.execute_line('add 2 3 ; multiply 5 4')
+    assert capsys.readouterr().out.splitlines()[-1] == "The result of 5 multiply 4 is equal to 20"
+    events = {(category, name): (start, end) for category, name, start, end, _ in TRACER.events}
+    line_start, line_end = events[('repl', 'execute_line')]
+    for span in (('command', 'add'), ('command', 'multiply'), ('calculator', 'parse'),
+                 ('history', 'add_calculation'), ('operation', 'multiplication')):
+        start, end = events[span]
+        assert line_start <= start <= end <= line_end
+    assert len(TRACER.events) == 15  # The line, 2 commands and 6 spans per calculation
+
+def test_sampled_out_lines_are_not_traced(app_instance, capsys):
+    """Test that a line whose trace is not sampled records no span, not even for its commands."""
+    TRACER.enable(sample_rate=0.5)
+    app_instance.execute_line('add 2 3')
+    assert not TRACER.events
+    app_instance.execute_line('add 2 3')
+    assert TRACER.events[-1][:2] == ('repl', 'execute_line')
+    capsys.readouterr()
+
+def test_configure_tracing_from_settings(app_instance, tmp_path):
+    """Test that CALC_TRACE_FILE turns tracing on and the trace is written there at exit."""
+    trace_path = tmp_path / 'trace.json'
+    app_instance.settings = {'CALC_TRACE_FILE': str(trace_path), 'CALC_TRACE_SAMPLE_RATE': '0.5'}
+    with patch('app.atexit.register') as mock_register, patch.object(TRACER, 'trace_handlers') as mock_handlers:
+        app_instance.configure_tracing()
+    assert TRACER.enabled and TRACER.sample_rate == 0.5
+    mock_handlers.assert_called_once_with()
+    write, *write_args = mock_register.call_args[0]
+    write(*write_args)
+    assert json.loads(trace_path.read_text(encoding='utf-8'))['otherData']['sample_rate'] == 0.5
+
+def test_configure_tracing_with_invalid_sample_rate(app_instance, tmp_path, caplog):
+    """Test that an invalid sample rate is logged and every line is traced instead."""
+    app_instance.settings = {'CALC_TRACE_FILE': str(tmp_path / 'trace.json'), 'CALC_TRACE_SAMPLE_RATE': 'often'}
+    with patch('app.atexit.register'), patch.object(TRACER, 'trace_handlers'):
+        app_instance.configure_tracing()
+    assert "Invalid CALC_TRACE_SAMPLE_RATE 'often'" in caplog.text
+    assert TRACER.enabled and TRACER.sample_rate == 1
+
+def test_tracing_off_by_default(app_instance):
+    """Test that nothing is traced without CALC_TRACE_FILE."""
+    app_instance.settings = {}
+    app_instance.configure_tracing()
+    assert not TRACER.enabled
+
+def test_write_trace_failure_is_logged(tmp_path, caplog):
+    """Test that a trace file that cannot be written is logged rather than raised at exit."""
+    caplog.set_level(logging.ERROR)
+    App.write_trace(str(tmp_path / 'missing' / 'trace.json'))
+    assert "Could not write the trace" in caplog.text
+
+def test_session_span(app_instance, monkeypatch):
+    """Test that the REPL session is recorded as one span when it ends."""
+    TRACER.enable()
+    monkeypatch.setattr('builtins.input', lambda _: 'exit')
+    monkeypatch.setattr(app_instance, 'initialize_commands', lambda: None)
+    with pytest.raises(SystemExit):
+        app_instance.start()
+    assert [name for _, name, *_ in TRACER.events] == ['execute_line', 'flush_storage', 'session']
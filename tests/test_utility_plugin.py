@@ -7,7 +7,10 @@ from app.plugins.add import AddCommand
 from app.plugins.subtract import SubtractCommand
 from app.plugins.divide import DivideCommand
 from app.plugins.multiply import MultiplyCommand
-from app.plugins import execute_operation, parse_input
+from app.plugins.power import PowerCommand
+from app.plugins.modulo import ModuloCommand
+from app.plugins.sqrt import SqrtCommand
+from app.plugins import evaluate_operation, execute_operation, parse_input
 
 class TestPluginCommands(unittest.TestCase):
     """Tests for plugins/__init__.py"""
@@ -51,6 +54,27 @@ class TestPluginCommands(unittest.TestCase):
         """
         self._test_command_registration_and_execution(MultiplyCommand, '2 2', "The result of 2 multiply 2 is equal to 4")
 
+    def test_power_command_registration_and_execution(self):
+        """
+        Test that the PowerCommand is correctly registered and executed.
+        """
+        self._test_command_registration_and_execution(PowerCommand, '2 8', "The result of 2 power 8 is equal to 256")
+
+    def test_modulo_command_registration_and_execution(self):
+        """
+        Test that the ModuloCommand is correctly registered and executed.
+        """
+        self._test_command_registration_and_execution(ModuloCommand, '8 3', "The result of 8 modulo 3 is equal to 2")
+
+    def test_sqrt_command_registration_and_execution(self):
+        """
+        Test that the SqrtCommand takes a single operand when prompting and inline.
+        """
+        self._test_command_registration_and_execution(SqrtCommand, '81', "The result of sqrt 81 is equal to 9")
+        self.assertEqual(SqrtCommand().evaluate('0.25'), "The result of sqrt 0.25 is equal to 0.5")
+        with self.assertRaisesRegex(ValueError, "Please use: <operand>"):
+            SqrtCommand().evaluate('4', '2')
+
     @patch('builtins.input', side_effect=['1 2 3', 'exit'])
     @patch('builtins.print')
     def test_execute_operation_with_invalid_input(self, mock_print, mock_input):
@@ -66,6 +90,39 @@ class TestPluginCommands(unittest.TestCase):
         # Check if the error message is in any of the printed messages.
         self.assertTrue(any("Invalid input format. Please use: <operand1> <operand2>" in message for message in printed_messages), "Expected error message not found in any print call.")
 
+    def test_evaluate_commands_without_prompting(self):
+        """
+        Test that the arithmetic commands evaluate inline operands without prompting for input.
+        """
+        cases = [(AddCommand, "The result of 5 add 3 is equal to 8"),
+                 (SubtractCommand, "The result of 5 subtract 3 is equal to 2"),
+                 (MultiplyCommand, "The result of 5 multiply 3 is equal to 15"),
+                 (DivideCommand, "The result of 6 divide 3 is equal to 2")]
+        with patch('builtins.input') as mock_input:
+            for command_cls, expected_result in cases:
+                operands = ('6', '3') if command_cls is DivideCommand else ('5', '3')
+                self.assertEqual(command_cls().evaluate(*operands), expected_result)
+            mock_input.assert_not_called()
+
+    def test_execute_with_inline_operands(self):
+        """
+        Test that executing an arithmetic command with inline operands prints the result without prompting.
+        """
+        with patch('builtins.input') as mock_input, patch('builtins.print') as mock_print:
+            MultiplyCommand().execute('6', '7')
+            DivideCommand().execute('1', '2', '3')
+        mock_input.assert_not_called()
+        printed_messages = [call_args[0][0] for call_args in mock_print.call_args_list]
+        self.assertEqual(printed_messages, ["The result of 6 multiply 7 is equal to 42",
+                                            "Error: Invalid input format. Please use: <operand1> <operand2>"])
+
+    def test_evaluate_operation_with_invalid_arguments(self):
+        """
+        Test that evaluate_operation rejects anything other than two operands.
+        """
+        with self.assertRaises(ValueError):
+            evaluate_operation(('1', '2', '3'), "add")
+
 # Parsing tests
 def test_parse_input_valid():
     """Test parsing valid input."""